@@ -0,0 +1,136 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+# Versión de los datos y filas de las consultas
+import cache_consultas as cache
+
+#########################################################
+# AGREGADOS DE INVERSIÓN COMUNES A TODOS LOS REPORTES
+#########################################################
+
+# Periodos de inversión y columna de diferencia porcentual de cada uno
+PERIODOS = {
+    'CERRADO': 'DIFERENCIA_PORCENTUAL_T',
+    'CORRIDO': 'DIFERENCIA_PORCENTUAL',
+}
+
+# Actividades económicas de la IED en Colombia (solo se muestran en el reporte de Colombia)
+ACTIVIDADES_IED = [
+    'Servicios financieros y empresariales',
+    'Industrias manufactureras',
+    'Comercio al por mayor y al por menor, restaurantes y hoteles',
+    'Transportes, almacenamiento y comunicaciones',
+    'Electricidad, gas y agua',
+    'Servicios comunales sociales y personales',
+    'Construcción',
+    'Agricultura, caza, silvicultura y pesca',
+]
+
+# Etiqueta de la fila del total mundial en las tablas de participación de las agrupaciones
+ETIQUETAS_MUNDO = {
+    'IED': 'Total IED del Mundo en Colombia',
+    'ICE': 'Total ICE de Colombia en el Mundo',
+}
+
+# Total mundial de IED e ICE: fila 'TOTAL' de la tabla de países
+QUERY_MUNDO = """
+SELECT A.CATEGORIA,
+    A.UNIDAD,
+    A.SUMA_INVERSION_T_1,
+    A.SUMA_INVERSION_T,
+    A.{diferencia}
+FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_{periodo} AS A
+WHERE A.AGRUPACION = 'PAISES'
+    AND A.UNIDAD IN ('TOTAL')
+    AND A.CATEGORIA IN ('IED', 'ICE');
+"""
+
+# IED por actividad económica
+QUERY_ACTIVIDADES = """
+SELECT A.UNIDAD,
+    A.SUMA_INVERSION_T_1,
+    A.SUMA_INVERSION_T,
+    A.{diferencia}
+FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_ACTIVIDADES_{periodo} AS A
+WHERE A.AGRUPACION = 'ACTIVIDADES'
+    AND A.UNIDAD NOT IN ('TOTAL')
+    AND A.UNIDAD IN ({actividades})
+    AND A.TABLA = 'INVERSIÓN ACTIVIDADES'
+    AND A.CATEGORIA = 'IED';
+"""
+
+
+class AgregadosInversion:
+    """
+    Agregados de inversión que no dependen de la unidad del reporte: el total mundial de IED e ICE y la IED por
+    actividad económica, por periodo. Son los mismos para todos los reportes de una versión de datos, por lo que se
+    consultan una sola vez y se comparten entre reportes (ver obtener_agregados_inversion).
+
+    Atributos:
+    - mundo: diccionario {(categoría, periodo): DataFrame con la fila 'TOTAL'} para 'IED' e 'ICE'.
+    - actividades: diccionario {periodo: DataFrame con la IED de cada actividad}.
+    """
+    def __init__(self, mundo, actividades):
+        self.mundo = mundo
+        self.actividades = actividades
+
+    @classmethod
+    def cargar(cls, session):
+        """
+        Consulta el total mundial y las actividades de cada periodo y construye los agregados.
+        """
+        actividades_sql = ', '.join(f"'{actividad}'" for actividad in ACTIVIDADES_IED)
+        mundo = {}
+        actividades = {}
+        for periodo, diferencia in PERIODOS.items():
+            columnas = ['UNIDAD', 'SUMA_INVERSION_T_1', 'SUMA_INVERSION_T', diferencia]
+            totales = cache.filas_a_dataframe(session.sql(QUERY_MUNDO.format(periodo=periodo, diferencia=diferencia)).collect(),
+                                              ['CATEGORIA'] + columnas)
+            for categoria in ETIQUETAS_MUNDO:
+                mundo[(categoria, periodo)] = totales.loc[totales['CATEGORIA'] == categoria, columnas].reset_index(drop=True)
+            query_actividades = QUERY_ACTIVIDADES.format(periodo=periodo, diferencia=diferencia, actividades=actividades_sql)
+            actividades[periodo] = cache.filas_a_dataframe(session.sql(query_actividades).collect(), columnas)
+        return cls(mundo, actividades)
+
+    def total_mundo(self, categoria, periodo, etiqueta=None):
+        """
+        Retorna una copia de la fila del total mundial de una categoría ('IED' o 'ICE') y periodo.
+
+        Parámetros:
+        - categoria: 'IED' o 'ICE'.
+        - periodo: 'CERRADO' o 'CORRIDO'.
+        - etiqueta: (opcional) texto de la columna UNIDAD; por defecto se conserva 'TOTAL'.
+
+        Retorna:
+        - DataFrame de una fila con UNIDAD, SUMA_INVERSION_T_1, SUMA_INVERSION_T y la diferencia porcentual.
+        """
+        total = self.mundo[(categoria, periodo)].copy()
+        if etiqueta is not None:
+            total['UNIDAD'] = etiqueta
+        return total
+
+    def actividades_ied(self, periodo):
+        """
+        Retorna una copia de la IED por actividad económica del periodo.
+        """
+        return self.actividades[periodo].copy()
+
+
+# Agregados de la versión actual de los datos, compartidos por todo el proceso
+_AGREGADOS = cache.MemoPorVersion(AgregadosInversion.cargar)
+
+
+def obtener_agregados_inversion(session, version=None):
+    """
+    Retorna los AgregadosInversion de la versión de los datos, consultándolos solo la primera vez.
+
+    Igual que el índice de geografía, los agregados se comparten entre todas las sesiones y reportes del proceso y se
+    resuelven con la versión de la llave del reporte (geo_params['VERSION']), no con un intervalo propio.
+
+    Parámetros:
+    - session: sesión activa (SesionCache, SesionLocal o sesión de Snowpark).
+    - version: (opcional) versión de los datos del reporte; por defecto cache_consultas.version_datos(session).
+
+    Retorna:
+    - AgregadosInversion.
+    """
+    return _AGREGADOS.obtener(session, version)
@@ -0,0 +1,228 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import json
+import hashlib
+import threading
+import archivos_cache as ac
+
+#########################################################
+# ALMACÉN DE REPORTES PRE-GENERADOS POR CONTENIDO
+#########################################################
+
+# Carpeta del almacén donde pregeneracion.py publica los reportes. Vacía: sin almacén (solo generación a demanda)
+DIRECTORIO_ALMACEN = os.environ.get('TRES_EJES_ALMACEN_DIR', '')
+# Umbral de exportaciones con el que se pre-generan los reportes (el mismo valor por defecto de la aplicación)
+UMBRAL_PREGENERADO = [10000]
+# Archivos que definen el contenido de los reportes: si cambia alguno cambia la versión de plantilla
+ARCHIVOS_PLANTILLA = [
+    'datos.py',
+    'documentos.py',
+    'descarga.py',
+    'formatos.py',
+    'resumen.py',
+    'geografia.py',
+    'agregados_inversion.py',
+    'Insumos/doc_top_left.png',
+    'Insumos/doc_bottom_right.png',
+]
+
+_version_plantilla = None
+_candado_version = threading.Lock()
+
+
+def version_plantilla():
+    """
+    Retorna la versión de plantilla de los reportes: un hash de los archivos de ARCHIVOS_PLANTILLA.
+
+    Un cambio en el código o en las imágenes de los documentos cambia la versión, por lo que los reportes
+    pre-generados con la plantilla anterior dejan de servirse sin tener que borrarlos. La variable de entorno
+    TRES_EJES_VERSION_PLANTILLA reemplaza el cálculo (por ejemplo, con el commit desplegado).
+    """
+    global _version_plantilla
+    with _candado_version:
+        if _version_plantilla is None:
+            version = os.environ.get('TRES_EJES_VERSION_PLANTILLA')
+            if not version:
+                base = os.path.dirname(os.path.abspath(__file__))
+                huella = hashlib.sha256()
+                for archivo in ARCHIVOS_PLANTILLA:
+                    huella.update(archivo.encode('utf-8'))
+                    try:
+                        with open(os.path.join(base, archivo), 'rb') as f:
+                            huella.update(f.read())
+                    except FileNotFoundError:
+                        huella.update(b'\0')
+                version = huella.hexdigest()[:16]
+            _version_plantilla = version
+        return _version_plantilla
+
+
+def llave_almacen(agrupacion, unidad, umbral, version):
+    """
+    Construye la llave de un reporte en el almacén.
+
+    Parámetros:
+    - agrupacion: 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA' o 'DEPARTAMENTOS'.
+    - unidad: unidad seleccionada (por ejemplo 'América' o 'Colombia').
+    - umbral: lista o tupla con el umbral de exportaciones.
+    - version: versión de los datos.
+
+    Retorna:
+    - llave: tupla (agrupacion, unidad, umbral, version de datos, version de plantilla).
+    """
+    return (agrupacion, unidad, tuple(umbral) if umbral else None, version, version_plantilla())
+
+
+def _llave_json(llave):
+    # La llave como se guarda en el manifiesto (las tuplas quedan como listas)
+    return json.loads(json.dumps(list(llave), ensure_ascii=False))
+
+
+class AlmacenReportes:
+    """
+    Almacén en disco de los reportes pre-generados, direccionado por contenido.
+
+    Los archivos Word y Excel se guardan una sola vez en objetos/ con el hash SHA-256 de sus bytes como nombre, de
+    modo que un reporte que no cambia entre versiones no ocupa espacio adicional. Cada llave de llave_almacen tiene
+    en indice/ un manifiesto JSON con los hashes y los nombres de descarga. El manifiesto se publica después de los
+    objetos y con os.replace, por lo que un lector nunca ve un reporte a medio escribir.
+    """
+    def __init__(self, directorio=None):
+        self.directorio = directorio if directorio is not None else DIRECTORIO_ALMACEN
+
+    @property
+    def activo(self):
+        return bool(self.directorio)
+
+    ####################
+    # Lectura y escritura
+    ####################
+
+    def obtener(self, llave):
+        """
+        Retorna los archivos de un reporte pre-generado, o None si no existe.
+
+        Retorna:
+        - tupla (docx, xlsx, nombre_docx, nombre_xlsx) con los bytes y los nombres de descarga, o None.
+        """
+        manifiesto = self._leer_manifiesto(llave)
+        if manifiesto is None:
+            return None
+        try:
+            docx = self._leer_objeto(manifiesto['docx'])
+            xlsx = self._leer_objeto(manifiesto['xlsx'])
+        except (OSError, KeyError):
+            return None
+        if docx is None or xlsx is None:
+            return None
+        return docx, xlsx, manifiesto['nombre_docx'], manifiesto['nombre_xlsx']
+
+    def contiene(self, llave):
+        """
+        Indica si el almacén tiene el reporte de la llave.
+        """
+        return self._leer_manifiesto(llave) is not None
+
+    def guardar(self, llave, docx, xlsx, nombre_docx, nombre_xlsx):
+        """
+        Guarda los archivos de un reporte y publica su manifiesto.
+
+        Parámetros:
+        - llave: llave de llave_almacen.
+        - docx, xlsx: bytes del documento Word y del archivo Excel.
+        - nombre_docx, nombre_xlsx: nombres de los archivos para la descarga.
+        """
+        # 1. Objetos por contenido (si ya existen no se vuelven a escribir)
+        manifiesto = {
+            'llave': _llave_json(llave),
+            'docx': self._guardar_objeto(docx),
+            'xlsx': self._guardar_objeto(xlsx),
+            'nombre_docx': nombre_docx,
+            'nombre_xlsx': nombre_xlsx,
+        }
+        # 2. Manifiesto de la llave
+        ac.escribir_bytes_atomico(self._ruta_manifiesto(llave), json.dumps(manifiesto, ensure_ascii=False).encode('utf-8'))
+
+    def limpiar(self, conservar):
+        """
+        Elimina los manifiestos cuya versión de datos o de plantilla no está en conservar, y los objetos que
+        ya no usa ningún manifiesto.
+
+        Parámetros:
+        - conservar: conjunto de tuplas (version de datos, version de plantilla) que se mantienen.
+
+        Retorna:
+        - número de archivos eliminados.
+        """
+        eliminados = 0
+        usados = set()
+        directorio_indice = os.path.join(self.directorio, 'indice')
+        directorio_objetos = os.path.join(self.directorio, 'objetos')
+
+        # 1. Manifiestos de versiones anteriores
+        for nombre in (os.listdir(directorio_indice) if os.path.isdir(directorio_indice) else []):
+            ruta = os.path.join(directorio_indice, nombre)
+            try:
+                with open(ruta, 'rb') as f:
+                    manifiesto = json.loads(f.read().decode('utf-8'))
+                vigente = tuple(manifiesto['llave'][-2:]) in conservar
+            except (OSError, ValueError, KeyError):
+                vigente = False
+            if vigente:
+                usados.update((manifiesto['docx'], manifiesto['xlsx']))
+                continue
+            try:
+                os.remove(ruta)
+                eliminados += 1
+            except FileNotFoundError:
+                pass
+
+        # 2. Objetos sin manifiesto
+        for nombre in (os.listdir(directorio_objetos) if os.path.isdir(directorio_objetos) else []):
+            if nombre not in usados and not nombre.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(directorio_objetos, nombre))
+                    eliminados += 1
+                except FileNotFoundError:
+                    pass
+        return eliminados
+
+    ##########################
+    # Archivos del almacén
+    ##########################
+
+    def _ruta_manifiesto(self, llave):
+        nombre = hashlib.sha256(repr(tuple(llave)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directorio, 'indice', f'{nombre}.json')
+
+    def _leer_manifiesto(self, llave):
+        # Retorna el manifiesto de la llave o None si no existe o es de otra llave
+        if not self.directorio:
+            return None
+        try:
+            with open(self._ruta_manifiesto(llave), 'rb') as f:
+                manifiesto = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        return manifiesto if manifiesto.get('llave') == _llave_json(llave) else None
+
+    def _leer_objeto(self, huella):
+        # Retorna los bytes del objeto o None si no existe o su contenido no coincide con el hash
+        try:
+            with open(os.path.join(self.directorio, 'objetos', huella), 'rb') as f:
+                contenido = f.read()
+        except FileNotFoundError:
+            return None
+        return contenido if hashlib.sha256(contenido).hexdigest() == huella else None
+
+    def _guardar_objeto(self, contenido):
+        huella = hashlib.sha256(contenido).hexdigest()
+        ruta = os.path.join(self.directorio, 'objetos', huella)
+        if not os.path.exists(ruta):
+            ac.escribir_bytes_atomico(ruta, contenido)
+        return huella
+
+
+# Almacén único del proceso
+almacen_reportes = AlmacenReportes()
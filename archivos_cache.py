@@ -0,0 +1,81 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import threading
+
+#########################################################
+# ESCRITURA ATÓMICA Y RECORTE LRU DE ARCHIVOS EN DISCO
+#########################################################
+
+
+def escribir_atomico(ruta, escribir):
+    """
+    Escribe un archivo de forma atómica: escribir recibe la ruta de un archivo temporal propio del proceso y del
+    hilo, y al terminar se publica con os.replace, por lo que un lector nunca ve un archivo a medio escribir.
+
+    Parámetros:
+    - ruta: ruta final del archivo.
+    - escribir: función que recibe la ruta temporal y escribe en ella el contenido.
+    """
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f'{ruta}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        # No dejar el temporal si la escritura falló a medias
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+
+
+def escribir_bytes_atomico(ruta, contenido):
+    """
+    Escribe bytes en ruta con escribir_atomico.
+
+    Parámetros:
+    - ruta: ruta final del archivo.
+    - contenido: bytes a escribir.
+    """
+    def escribir(temporal):
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+    escribir_atomico(ruta, escribir)
+
+
+def recortar_lru(directorio, extension, tamano_maximo):
+    """
+    Elimina los archivos con la extensión usados hace más tiempo (fecha de modificación) hasta que el total del
+    directorio quede por debajo del tamaño máximo. Quien lee un archivo debe actualizar su fecha con os.utime.
+
+    Parámetros:
+    - directorio: directorio a recortar.
+    - extension: extensión de los archivos que cuentan para el tamaño (ej. '.parquet').
+    - tamano_maximo: tamaño máximo en bytes.
+
+    Retorna:
+    - número de archivos eliminados.
+    """
+    archivos = []
+    for nombre in os.listdir(directorio):
+        if nombre.endswith(extension):
+            ruta = os.path.join(directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except FileNotFoundError:
+                continue
+            archivos.append((estado.st_mtime, estado.st_size, ruta))
+    total = sum(tamano for _, tamano, _ in archivos)
+    eliminados = 0
+    for _, tamano, ruta in sorted(archivos):
+        if total <= tamano_maximo:
+            break
+        try:
+            os.remove(ruta)
+            eliminados += 1
+        except FileNotFoundError:
+            pass
+        total -= tamano
+    return eliminados
@@ -0,0 +1,172 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import time
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+# Datos
+import datos as dat
+# Documentos
+import documentos as doc
+# Datos sintéticos y sesión local
+import datos_sinteticos as sint
+import snapshot_local as snap
+
+#########################################################
+# BENCHMARK DE GENERACIÓN DE REPORTES CON DATOS SINTÉTICOS
+#########################################################
+# Uso: python benchmark.py --escala 1 --repeticiones 5
+# Mide, para las seis agrupaciones, el mismo flujo de descarga.generar_documentos (bundle, process_data,
+# documento Word y Excel) sobre un snapshot sintético servido por DuckDB, sin credenciales de Snowflake.
+
+# Imágenes del documento (las mismas de main.py)
+top_left_img = 'Insumos/doc_top_left.png'
+bottom_right = 'Insumos/doc_bottom_right.png'
+
+# Agrupación: (argumento con la unidad, función del documento Word)
+AGRUPACIONES = {
+    'CONTINENTES': ('continentes', doc.create_document_continentes),
+    'HUBS': ('hubs', doc.create_document_hubs),
+    'TLCS': ('tlcs', doc.create_document_tlcs),
+    'PAISES': ('paises', doc.create_document_paises),
+    'COLOMBIA': (None, doc.create_document_colombia),
+    'DEPARTAMENTOS': ('departamentos', doc.create_document_departamentos),
+}
+
+
+class SesionMedida:
+    """
+    Envoltorio de una sesión que cuenta las consultas enviadas con sql(query).
+    """
+    def __init__(self, session):
+        self.session = session
+        self.consultas = 0
+        self._candado = threading.Lock()
+
+    def __getattr__(self, nombre):
+        return getattr(self.session, nombre)
+
+    def sql(self, query):
+        with self._candado:
+            self.consultas += 1
+        return self.session.sql(query)
+
+
+def unidades_benchmark(tablas):
+    """
+    Elige una unidad por agrupación a partir de las correlativas sintéticas.
+
+    Retorna:
+    - diccionario {agrupacion: unidad o None para COLOMBIA}.
+    """
+    paises = tablas[('GEOGRAFIA', 'PAISES_CORRELATIVA')]
+    departamentos = tablas[('GEOGRAFIA', 'DIAN_DEPARTAMENTOS')]
+    return {
+        'CONTINENTES': paises['CONTINENTE_DANE_DIAN_EXPORTACIONES'].iloc[0],
+        'HUBS': paises['HUB__C_EXPORTACIONES'].iloc[0],
+        'TLCS': paises['TLCS_EXPORTACIONES'].iloc[0],
+        'PAISES': paises['COUNTRY_OR_AREA_UNSD'].iloc[0],
+        'COLOMBIA': None,
+        'DEPARTAMENTOS': departamentos['DEPARTAMENTO_DIAN'].iloc[0],
+    }
+
+
+def generar_reporte(session, agrupacion, unidad, directorio_salida, umbral=[10000]):
+    """
+    Genera el documento Word y el Excel de una agrupación igual que descarga.generar_documentos, sin Streamlit.
+
+    Parámetros:
+    - session: sesión con sql(query).collect().
+    - agrupacion: 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA' o 'DEPARTAMENTOS'.
+    - unidad: unidad seleccionada (None para COLOMBIA).
+    - directorio_salida: carpeta donde se escriben los archivos.
+    - umbral: lista con el umbral de exportaciones para el conteo de empresas.
+    """
+    # 1. Argumentos de la agrupación
+    argumento, crear_documento = AGRUPACIONES[agrupacion]
+    filtros = {'continentes': None, 'paises': None, 'hubs': None, 'tlcs': None, 'departamentos': None}
+    if argumento:
+        filtros[argumento] = [unidad]
+
+    # 2. Extraer una sola vez los insumos y procesarlos
+    bundle = dat.construir_report_bundle(session, agrupacion, umbral=umbral, **filtros)
+    tables = dat.process_data(session, agrupacion, umbral=umbral, bundle=bundle, **filtros)
+
+    # 3. Documento Word y Excel
+    file_path_docx = os.path.join(directorio_salida, f'Tres Ejes {agrupacion}.docx')
+    file_path_xlsx = os.path.join(directorio_salida, f'Tres Ejes {agrupacion}.xlsx')
+    argumentos_documento = dict(tablas=tables, file_path=file_path_docx, header_image_left=top_left_img, footer_image=bottom_right,
+                                session=session, geo_params=bundle.geo_params, bundle=bundle)
+    if argumento:
+        argumentos_documento['titulo'] = unidad
+    crear_documento(**argumentos_documento)
+    dat.guardar_tablas_en_excel(session=session, agrupacion=agrupacion, umbral=umbral, file_path=file_path_xlsx, bundle=bundle, **filtros)
+
+
+def medir(session, agrupacion, unidad, directorio_salida, repeticiones, memoria=True):
+    """
+    Ejecuta varias veces generar_reporte y mide latencia, número de consultas y memoria pico.
+
+    Retorna:
+    - diccionario con p50 y p95 en milisegundos, consultas por reporte y memoria pico en MB.
+    """
+    latencias = []
+    consultas = []
+    memoria_pico = 0
+    for _ in range(repeticiones):
+        sesion_medida = SesionMedida(session)
+        if memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        generar_reporte(sesion_medida, agrupacion, unidad, directorio_salida)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if memoria:
+            memoria_pico = max(memoria_pico, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        consultas.append(sesion_medida.consultas)
+    return {
+        'AGRUPACION': agrupacion,
+        'P50_MS': np.percentile(latencias, 50),
+        'P95_MS': np.percentile(latencias, 95),
+        'CONSULTAS': int(np.median(consultas)),
+        'MEMORIA_PICO_MB': memoria_pico / 1024 / 1024 if memoria else np.nan,
+    }
+
+
+def main():
+    # 1. Argumentos de la línea de comandos
+    parser = argparse.ArgumentParser(description='Benchmark de generación de reportes Tres Ejes con datos sintéticos.')
+    parser.add_argument('--escala', type=int, default=1, help='Multiplicador del tamaño de las tablas sintéticas.')
+    parser.add_argument('--semilla', type=int, default=sint.SEMILLA, help='Semilla del generador de datos.')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Reportes generados por agrupación.')
+    parser.add_argument('--agrupaciones', nargs='+', default=list(AGRUPACIONES), choices=list(AGRUPACIONES))
+    parser.add_argument('--directorio', default=None, help='Carpeta del snapshot sintético (por defecto una temporal).')
+    parser.add_argument('--sin-memoria', action='store_true', help='No medir memoria pico (tracemalloc agrega sobrecosto).')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        # 2. Datos sintéticos y sesión local
+        directorio = args.directorio or os.path.join(temporal, 'snapshot')
+        tablas = sint.generar_tablas(args.escala, args.semilla)
+        for (esquema, tabla), data in tablas.items():
+            snap.guardar_tabla_snapshot(data, directorio, esquema, tabla)
+        session = snap.SesionLocal(directorio)
+        unidades = unidades_benchmark(tablas)
+
+        # 3. Calentamiento (primer acceso a los Parquet) y medición por agrupación
+        resultados = []
+        for agrupacion in args.agrupaciones:
+            generar_reporte(session, agrupacion, unidades[agrupacion], temporal)
+            resultados.append(medir(session, agrupacion, unidades[agrupacion], temporal, args.repeticiones, memoria=not args.sin_memoria))
+
+    # 4. Resultados
+    print(f'Escala {args.escala}, semilla {args.semilla}, {args.repeticiones} repeticiones por agrupación')
+    print(pd.DataFrame(resultados).round(1).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
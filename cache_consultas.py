@@ -0,0 +1,378 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import re
+import time
+import hashlib
+import shutil
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+import pandas as pd
+import pyarrow as pa
+import archivos_cache as ac
+
+#########################################################
+# CACHE PERSISTENTE DE CONSULTAS SEGÚN VERSIÓN DE DATOS
+#########################################################
+
+# Avisos de la cache (por ejemplo, resultados que no se pudieron guardar)
+logger = logging.getLogger(__name__)
+
+# Carpeta local donde se guardan los resultados en Parquet
+DIRECTORIO_CACHE = os.environ.get('TRES_EJES_CACHE_DIR', '.cache_consultas')
+# Tamaño máximo de la cache en disco (MB). Al superarlo se eliminan los resultados usados hace más tiempo (LRU)
+TAMANO_MAXIMO_CACHE_MB = int(os.environ.get('TRES_EJES_CACHE_MB', 512))
+# Segundos durante los cuales se reutiliza la versión de datos antes de volver a consultarla
+INTERVALO_VERSION = int(os.environ.get('TRES_EJES_CACHE_INTERVALO_VERSION', 300))
+
+# Consulta de la versión de los datos: las tablas ST_* solo cambian cuando cambia la fecha de actualización
+QUERY_VERSION_DATOS = """
+SELECT MAX(A.VALOR) AS VERSION
+FROM DOCUMENTOS_COLOMBIA.PARAMETROS.PARAMETROS AS A
+WHERE A.PARAMETRO = 'Fecha de actualización';
+"""
+
+
+def normalizar_sql(query):
+    """
+    Normaliza el texto de una consulta SQL para usarlo como llave de la cache.
+
+    Parámetros:
+    - query: consulta SQL.
+
+    Retorna:
+    - query normalizada: espacios y saltos de línea colapsados y sin el punto y coma final.
+    """
+    return re.sub(r'\s+', ' ', query).strip().rstrip(';').strip()
+
+
+def es_consulta_lectura(query):
+    """
+    Indica si una consulta es de solo lectura (SELECT o WITH) y por lo tanto se puede guardar en la cache.
+
+    Parámetros:
+    - query: consulta SQL.
+
+    Retorna:
+    - True si la consulta empieza por SELECT o WITH.
+    """
+    return re.match(r'^\s*(SELECT|WITH)\b', query, flags=re.IGNORECASE) is not None
+
+
+def version_datos(session):
+    """
+    Retorna la versión de los datos ('Fecha de actualización' de PARAMETROS) de la sesión.
+
+    Parámetros:
+    - session: sesión activa (SesionCache, SesionLocal o sesión de Snowpark).
+
+    Retorna:
+    - version: texto con la versión de los datos.
+    """
+    # SesionCache ya conoce la versión y la reutiliza durante su intervalo
+    if hasattr(session, 'version_datos'):
+        return session.version_datos()
+    filas = session.sql(QUERY_VERSION_DATOS).collect()
+    return str(filas[0]['VERSION']) if filas else 'SIN VERSION'
+
+
+def filas_a_dataframe(filas, columnas=None):
+    """
+    Convierte las filas de collect() en un DataFrame.
+
+    Parámetros:
+    - filas: lista de filas (Row de Snowpark, o diccionarios de la cache o de la sesión local).
+    - columnas: (opcional) lista de columnas; con ella el DataFrame trae las columnas aunque no haya filas.
+
+    Retorna:
+    - DataFrame con una fila por cada fila de collect().
+    """
+    return pd.DataFrame([fila.as_dict() if hasattr(fila, 'as_dict') else dict(fila) for fila in filas], columns=columnas)
+
+
+def fijar_version(session, version):
+    """
+    Fija la versión de los datos de un reporte en la sesión mientras se genera.
+
+    Con una SesionCache todas las consultas del reporte se leen y se guardan en la carpeta de esa versión (la de la
+    llave del reporte) y la carpeta no se elimina hasta que el reporte termina. Con otras sesiones no hace nada.
+    Uso: with fijar_version(session, version) as sesion_reporte: ...
+
+    Parámetros:
+    - session: sesión activa (SesionCache, SesionLocal o sesión de Snowpark).
+    - version: versión de los datos del reporte.
+
+    Retorna:
+    - administrador de contexto que entrega la sesión que debe usar el reporte.
+    """
+    if isinstance(session, SesionCache) and version is not None:
+        return session.con_version(version)
+    return nullcontext(session)
+
+
+class MemoPorVersion:
+    """
+    Valor calculado una sola vez por versión de datos y compartido por todas las sesiones y reportes del proceso
+    (por ejemplo el índice de geografía o los agregados de inversión).
+
+    El valor se resuelve siempre con la versión que se entrega, que debe ser la misma de la llave del reporte: así un
+    reporte de una versión nunca usa un valor calculado con otra. Si no se entrega, se usa version_datos(session).
+    """
+    def __init__(self, cargar):
+        # cargar: función cargar(session) que calcula el valor
+        self._cargar = cargar
+        self._version = None
+        self._valor = None
+        self._candado = threading.Lock()
+
+    def obtener(self, session, version=None):
+        """
+        Retorna el valor de la versión, calculándolo solo si es la primera vez o si la versión cambió.
+
+        Parámetros:
+        - session: sesión activa (SesionCache, SesionLocal o sesión de Snowpark).
+        - version: (opcional) versión de los datos del reporte.
+
+        Retorna:
+        - el valor de cargar(session) para la versión.
+        """
+        if version is None:
+            version = version_datos(session)
+        with self._candado:
+            if self._valor is None or self._version != version:
+                self._valor = self._cargar(session)
+                self._version = version
+            return self._valor
+
+
+class TrabajoCache:
+    """
+    Trabajo ya resuelto con la misma interfaz que un AsyncJob de Snowpark (result()).
+    """
+    def __init__(self, filas):
+        self._filas = filas
+
+    def result(self):
+        return self._filas
+
+
+class TrabajoPendienteCache:
+    """
+    Trabajo asíncrono de Snowpark que guarda su resultado en la cache al terminar.
+    """
+    def __init__(self, sesion_cache, ruta, trabajo):
+        self._sesion_cache = sesion_cache
+        self._ruta = ruta
+        self._trabajo = trabajo
+
+    def result(self):
+        filas = self._trabajo.result()
+        self._sesion_cache._guardar(self._ruta, filas)
+        return filas
+
+
+class ConsultaCache:
+    """
+    Envoltorio de session.sql(query) que responde collect() desde la cache cuando el resultado ya existe.
+    """
+    def __init__(self, sesion_cache, query, version=None):
+        self._sesion_cache = sesion_cache
+        self._query = query
+        self._version = version
+
+    def collect(self):
+        # 1. Consultas que no son de lectura: siempre a la sesión original
+        if not es_consulta_lectura(self._query):
+            return self._sesion_cache.session.sql(self._query).collect()
+        # 2. Resultado en cache
+        ruta = self._sesion_cache._ruta_resultado(self._query, self._version)
+        filas = self._sesion_cache._leer(ruta)
+        if filas is not None:
+            return filas
+        # 3. Consultar y guardar (solo si la versión fijada sigue siendo la actual, ver _vigente)
+        filas = self._sesion_cache.session.sql(self._query).collect()
+        if self._sesion_cache._vigente(self._version):
+            self._sesion_cache._guardar(ruta, filas)
+        return filas
+
+
+class ConsultaCacheAsync(ConsultaCache):
+    """
+    Variante de ConsultaCache para sesiones de Snowpark con trabajos asíncronos (collect_nowait).
+    """
+    def collect_nowait(self):
+        # 1. Consultas que no son de lectura: siempre a la sesión original
+        if not es_consulta_lectura(self._query):
+            return self._sesion_cache.session.sql(self._query).collect_nowait()
+        # 2. Resultado en cache
+        ruta = self._sesion_cache._ruta_resultado(self._query, self._version)
+        filas = self._sesion_cache._leer(ruta)
+        if filas is not None:
+            return TrabajoCache(filas)
+        # 3. Enviar el trabajo y guardar el resultado cuando se recoja
+        trabajo = self._sesion_cache.session.sql(self._query).collect_nowait()
+        if not self._sesion_cache._vigente(self._version):
+            return trabajo
+        return TrabajoPendienteCache(self._sesion_cache, ruta, trabajo)
+
+
+class SesionVersion:
+    """
+    Vista de una SesionCache con la versión de datos de un reporte fijada (ver fijar_version).
+
+    sql(query) lee y guarda en la carpeta de la versión fijada y version_datos() retorna esa versión, de modo que
+    todos los insumos del reporte se resuelven con la versión de su llave. Cualquier otro atributo se delega a la
+    SesionCache.
+    """
+    def __init__(self, sesion_cache, version):
+        self._sesion_cache = sesion_cache
+        self._version = version
+
+    def __getattr__(self, nombre):
+        return getattr(self._sesion_cache, nombre)
+
+    def sql(self, query):
+        return self._sesion_cache.sql(query, version=self._version)
+
+    def version_datos(self):
+        return self._version
+
+
+class SesionCache:
+    """
+    Sesión de Snowflake con cache persistente de resultados.
+
+    Expone la misma interfaz sql(query).collect() de Snowpark. Cada resultado se guarda como Parquet en una carpeta
+    por versión de datos ('Fecha de actualización' de PARAMETROS), con llave igual al hash del SQL normalizado.
+    Cuando la versión cambia se eliminan las carpetas de versiones anteriores que ningún reporte en curso tiene
+    fijada (con_version), y el tamaño total se mantiene por debajo de TAMANO_MAXIMO_CACHE_MB eliminando primero
+    los resultados usados hace más tiempo.
+    Cualquier otro atributo (connection, write_pandas, etc.) se delega a la sesión original.
+    """
+    def __init__(self, session, directorio=None, tamano_maximo_mb=None, intervalo_version=None):
+        self.session = session
+        self.directorio = directorio or DIRECTORIO_CACHE
+        self.tamano_maximo = (tamano_maximo_mb if tamano_maximo_mb is not None else TAMANO_MAXIMO_CACHE_MB) * 1024 * 1024
+        self.intervalo_version = intervalo_version if intervalo_version is not None else INTERVALO_VERSION
+        self._version = None
+        self._version_consultada = 0
+        self._soporta_async = None
+        self._candado = threading.Lock()
+        # Versión -> número de reportes en curso que la tienen fijada
+        self._fijadas = {}
+
+    def __getattr__(self, nombre):
+        return getattr(self.session, nombre)
+
+    def sql(self, query, version=None):
+        """
+        Devuelve un objeto con collect() (y collect_nowait() si la sesión original lo soporta) servido desde la cache.
+
+        Parámetros:
+        - query: consulta SQL.
+        - version: (opcional) versión de los datos fijada por el reporte. Por defecto la versión actual.
+        """
+        if self._soporta_async is None:
+            self._soporta_async = hasattr(self.session.sql(query), 'collect_nowait')
+        if self._soporta_async:
+            return ConsultaCacheAsync(self, query, version)
+        return ConsultaCache(self, query, version)
+
+    ####################
+    # Versión de datos
+    ####################
+
+    def version_datos(self):
+        """
+        Retorna la versión actual de los datos y elimina la cache de versiones anteriores cuando cambia.
+        """
+        with self._candado:
+            ahora = time.time()
+            if self._version is None or ahora - self._version_consultada > self.intervalo_version:
+                filas = self.session.sql(QUERY_VERSION_DATOS).collect()
+                version = str(filas[0]['VERSION']) if filas else 'SIN VERSION'
+                self._version_consultada = ahora
+                if version != self._version:
+                    self._version = version
+                    self._invalidar_versiones_anteriores()
+            return self._version
+
+    @contextmanager
+    def con_version(self, version):
+        """
+        Fija la versión de los datos de un reporte mientras dura el bloque with y entrega una SesionVersion.
+        La carpeta de la versión no se elimina mientras algún reporte la tenga fijada.
+
+        Parámetros:
+        - version: versión de los datos de la llave del reporte.
+        """
+        with self._candado:
+            self._fijadas[version] = self._fijadas.get(version, 0) + 1
+        try:
+            yield SesionVersion(self, version)
+        finally:
+            with self._candado:
+                self._fijadas[version] -= 1
+                if not self._fijadas[version]:
+                    del self._fijadas[version]
+                    # Último reporte de una versión anterior: su carpeta ya no se usa
+                    if self._version is not None and version != self._version:
+                        shutil.rmtree(self._directorio_version(version), ignore_errors=True)
+
+    def _vigente(self, version):
+        # Los resultados consultados con una versión fijada que ya no es la actual son datos de la versión nueva:
+        # no se guardan en la carpeta de la versión anterior
+        return version is None or version == self.version_datos()
+
+    def _directorio_version(self, version=None):
+        if version is None:
+            version = self.version_datos()
+        return os.path.join(self.directorio, hashlib.sha256(version.encode('utf-8')).hexdigest()[:16])
+
+    def _invalidar_versiones_anteriores(self):
+        # Eliminar las carpetas de versiones distintas a la actual que ningún reporte en curso tiene fijadas
+        if not os.path.isdir(self.directorio):
+            return
+        conservar = {os.path.basename(self._directorio_version(version)) for version in [self._version, *self._fijadas]}
+        for nombre in os.listdir(self.directorio):
+            if nombre not in conservar:
+                shutil.rmtree(os.path.join(self.directorio, nombre), ignore_errors=True)
+
+    ##########################
+    # Lectura y escritura
+    ##########################
+
+    def _ruta_resultado(self, query, version=None):
+        llave = hashlib.sha256(normalizar_sql(query).encode('utf-8')).hexdigest()
+        return os.path.join(self._directorio_version(version), f'{llave}.parquet')
+
+    def _leer(self, ruta):
+        # Retorna las filas guardadas o None si no existen
+        try:
+            filas = pd.read_parquet(ruta).to_dict('records')
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        # Marcar el uso para la política LRU
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+        return filas
+
+    def _guardar(self, ruta, filas):
+        # Un disco lleno o un resultado que Parquet no puede representar no rompen el reporte: se avisa y se sigue
+        # sin cache para ese resultado. Cualquier otro error es un defecto y se propaga
+        try:
+            df = filas_a_dataframe(filas)
+            ac.escribir_atomico(ruta, lambda temporal: df.to_parquet(temporal, index=False))
+            # Eliminar los resultados usados hace más tiempo hasta quedar por debajo del tamaño máximo
+            ac.recortar_lru(os.path.dirname(ruta), '.parquet', self.tamano_maximo)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning('No se pudo guardar el resultado en la cache de consultas (%s): %r', ruta, e)
+
+    def limpiar(self):
+        """
+        Elimina toda la cache en disco.
+        """
+        shutil.rmtree(self.directorio, ignore_errors=True)
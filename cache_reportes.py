@@ -0,0 +1,321 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import time
+import uuid
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import archivos_cache as ac
+
+#########################################################
+# CACHE DE REPORTES COMPARTIDA ENTRE SESIONES
+#########################################################
+
+# Avisos de la cache (por ejemplo, reportes que no se pudieron respaldar en disco)
+logger = logging.getLogger(__name__)
+
+# Memoria máxima (MB) de los reportes guardados. Al superarla se eliminan los usados hace más tiempo (LRU)
+MEMORIA_MAXIMA_REPORTES_MB = int(os.environ.get('TRES_EJES_CACHE_REPORTES_MB', 256))
+# Carpeta opcional donde se guardan los reportes que salen de memoria. Vacía: sin respaldo en disco
+DIRECTORIO_REPORTES = os.environ.get('TRES_EJES_CACHE_REPORTES_DIR', '')
+# Tamaño máximo (MB) de la carpeta de respaldo en disco
+DISCO_MAXIMO_REPORTES_MB = int(os.environ.get('TRES_EJES_CACHE_REPORTES_DISCO_MB', 1024))
+# Con '1', varios servidores que comparten DIRECTORIO_REPORTES generan cada reporte una sola vez (archivo de bloqueo)
+REPORTES_ENTRE_PROCESOS = os.environ.get('TRES_EJES_CACHE_REPORTES_COMPARTIDA', '') == '1'
+# Segundos sin renovar después de los cuales un archivo de bloqueo se considera abandonado (servidor caído).
+# El servidor que genera renueva su bloqueo cada TIEMPO_MAXIMO_BLOQUEO / 4 segundos
+TIEMPO_MAXIMO_BLOQUEO = int(os.environ.get('TRES_EJES_CACHE_REPORTES_BLOQUEO', 600))
+# Segundos entre revisiones mientras otro servidor genera el reporte
+INTERVALO_ESPERA_BLOQUEO = 0.5
+
+
+def llave_reporte(agrupacion, unidad, umbral, version):
+    """
+    Construye la llave de un reporte en la cache.
+
+    Parámetros:
+    - agrupacion: 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA' o 'DEPARTAMENTOS'.
+    - unidad: unidad seleccionada (por ejemplo 'América' o 'Colombia').
+    - umbral: lista o tupla con el umbral de exportaciones.
+    - version: versión de los datos.
+
+    Retorna:
+    - llave: tupla (agrupacion, unidad, umbral, version).
+    """
+    return (agrupacion, unidad, tuple(umbral) if umbral else None, version)
+
+
+def tamano_artefacto(artefacto):
+    """
+    Retorna el tamaño en bytes de los archivos de un ArtefactoReporte.
+    """
+    return len(artefacto.docx) + len(artefacto.xlsx)
+
+
+def _leer_bloqueo(bloqueo):
+    # Token del dueño del archivo de bloqueo, o None si no existe
+    try:
+        with open(bloqueo, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    except FileNotFoundError:
+        return None
+
+
+def _liberar_bloqueo(bloqueo, token):
+    # Elimina el archivo de bloqueo solo si todavía tiene el token entregado (no el de otro servidor)
+    if token is None or _leer_bloqueo(bloqueo) != token:
+        return
+    try:
+        os.remove(bloqueo)
+    except FileNotFoundError:
+        pass
+
+
+def _renovar_bloqueo(bloqueo, token, terminado, intervalo):
+    # Actualiza la fecha de modificación del bloqueo mientras se genera, para que otros servidores no lo den por
+    # abandonado en generaciones largas. Se detiene al terminar o si el bloqueo dejó de ser propio
+    while not terminado.wait(intervalo):
+        if _leer_bloqueo(bloqueo) != token:
+            return
+        try:
+            os.utime(bloqueo, None)
+        except FileNotFoundError:
+            return
+
+
+class CacheReportes:
+    """
+    Cache de reportes generados (ArtefactoReporte) compartida por todas las sesiones del proceso.
+
+    Cada reporte se guarda con llave (agrupacion, unidad, umbral, versión de datos), de modo que cambiar de
+    agrupación en la interfaz no afecta los reportes de otras selecciones ni de otros usuarios. La memoria se
+    mantiene por debajo de memoria_maxima_mb eliminando primero los reportes usados hace más tiempo; si hay
+    directorio de respaldo, los reportes eliminados de memoria se guardan en disco y se recuperan desde allí.
+    La invalidación es explícita por llave (invalidar) y, al aparecer una versión de datos nueva, se eliminan
+    solo los reportes de versiones anteriores.
+    obtener_o_generar evita generar el mismo reporte varias veces en paralelo: dentro del proceso las solicitudes
+    idénticas esperan la misma generación y, con entre_procesos, los servidores que comparten el directorio se
+    coordinan con un archivo de bloqueo por llave.
+    """
+    def __init__(self, memoria_maxima_mb=None, directorio=None, disco_maximo_mb=None, entre_procesos=None, tiempo_bloqueo=None):
+        self.memoria_maxima = (memoria_maxima_mb if memoria_maxima_mb is not None else MEMORIA_MAXIMA_REPORTES_MB) * 1024 * 1024
+        self.directorio = directorio if directorio is not None else DIRECTORIO_REPORTES
+        self.disco_maximo = (disco_maximo_mb if disco_maximo_mb is not None else DISCO_MAXIMO_REPORTES_MB) * 1024 * 1024
+        self.entre_procesos = (entre_procesos if entre_procesos is not None else REPORTES_ENTRE_PROCESOS) and bool(self.directorio)
+        self.tiempo_bloqueo = tiempo_bloqueo if tiempo_bloqueo is not None else TIEMPO_MAXIMO_BLOQUEO
+        self._reportes = OrderedDict()
+        self._en_curso = {}
+        self._memoria = 0
+        self._version = None
+        self._candado = threading.Lock()
+
+    ####################
+    # Lectura y escritura
+    ####################
+
+    def obtener(self, llave):
+        """
+        Retorna el reporte guardado con la llave, o None si no existe.
+        """
+        with self._candado:
+            artefacto = self._reportes.get(llave)
+            if artefacto is not None:
+                # Marcar el uso para la política LRU
+                self._reportes.move_to_end(llave)
+                return artefacto
+        # Respaldo en disco: si existe, vuelve a memoria
+        artefacto = self._leer_disco(llave)
+        if artefacto is not None:
+            self.guardar(llave, artefacto)
+        return artefacto
+
+    def guardar(self, llave, artefacto):
+        """
+        Guarda un reporte con la llave y elimina los usados hace más tiempo si se supera la memoria máxima.
+        """
+        desalojados = []
+        with self._candado:
+            # 1. Versión de datos nueva: los reportes de versiones anteriores ya no se van a pedir
+            version = llave[-1]
+            if version != self._version:
+                if self._version is not None:
+                    for anterior in [k for k in self._reportes if k[-1] != version]:
+                        self._memoria -= tamano_artefacto(self._reportes.pop(anterior))
+                self._version = version
+
+            # 2. Guardar o reemplazar el reporte
+            if llave in self._reportes:
+                self._memoria -= tamano_artefacto(self._reportes.pop(llave))
+            self._reportes[llave] = artefacto
+            self._memoria += tamano_artefacto(artefacto)
+
+            # 3. Eliminar los reportes usados hace más tiempo hasta quedar por debajo de la memoria máxima
+            while self._memoria > self.memoria_maxima and len(self._reportes) > 1:
+                llave_antigua, antiguo = self._reportes.popitem(last=False)
+                self._memoria -= tamano_artefacto(antiguo)
+                desalojados.append((llave_antigua, antiguo))
+
+        # 4. Respaldo en disco de los reportes eliminados de memoria (fuera del candado)
+        for llave_antigua, antiguo in desalojados:
+            self._guardar_disco(llave_antigua, antiguo)
+
+    def obtener_o_generar(self, llave, generar):
+        """
+        Retorna el reporte de la llave y, si no existe, lo genera una sola vez aunque varias sesiones lo pidan a la vez.
+
+        Se llama desde los hilos de trabajos.ColaReportes. El primer hilo que pide la llave ejecuta generar(); los
+        hilos que piden la misma llave mientras tanto esperan el mismo Future y reciben el mismo reporte, o la misma
+        excepción si la generación falla.
+
+        Parámetros:
+        - llave: llave de llave_reporte.
+        - generar: función sin argumentos que retorna el ArtefactoReporte.
+
+        Retorna:
+        - artefacto: ArtefactoReporte de la llave.
+        """
+        artefacto = self.obtener(llave)
+        if artefacto is not None:
+            return artefacto
+
+        # 1. Unirse a la generación en curso o registrarse como el hilo que genera
+        with self._candado:
+            artefacto = self._reportes.get(llave)
+            if artefacto is not None:
+                return artefacto
+            futuro = self._en_curso.get(llave)
+            genera = futuro is None
+            if genera:
+                futuro = Future()
+                self._en_curso[llave] = futuro
+
+        if not genera:
+            return futuro.result()
+
+        # 2. Generar y entregar el resultado a los hilos que esperan; si el hilo que genera termina con cualquier
+        # excepción, los que esperan la reciben en lugar de quedarse esperando un resultado que no llegará
+        try:
+            artefacto = self._generar_entre_procesos(llave, generar) if self.entre_procesos else generar()
+            self.guardar(llave, artefacto)
+            futuro.set_result(artefacto)
+            return artefacto
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._candado:
+                self._en_curso.pop(llave, None)
+
+    def _generar_entre_procesos(self, llave, generar):
+        # Un archivo de bloqueo por llave en el directorio compartido: solo el servidor que lo crea genera el reporte
+        # y lo publica en disco; los demás esperan hasta leerlo. El bloqueo guarda un token del dueño, que lo renueva
+        # mientras genera y solo elimina el archivo si todavía es suyo
+        ruta = self._ruta_disco(llave)
+        bloqueo = f'{ruta}.lock'
+        token = f'{os.getpid()}.{threading.get_ident()}.{uuid.uuid4().hex}'
+        os.makedirs(self.directorio, exist_ok=True)
+        while True:
+            # 1. Otro servidor ya publicó el reporte
+            artefacto = self._leer_disco(llave)
+            if artefacto is not None:
+                return artefacto
+            # 2. Tomar el bloqueo: la creación exclusiva del archivo solo la logra un proceso
+            try:
+                descriptor = os.open(bloqueo, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                # Bloqueo abandonado por un servidor caído (sin renovar durante el tiempo máximo): se elimina solo si
+                # sigue siendo el mismo bloqueo que se encontró vencido
+                try:
+                    vencido = time.time() - os.stat(bloqueo).st_mtime > self.tiempo_bloqueo
+                except FileNotFoundError:
+                    continue
+                if vencido:
+                    _liberar_bloqueo(bloqueo, _leer_bloqueo(bloqueo))
+                    continue
+                time.sleep(INTERVALO_ESPERA_BLOQUEO)
+
+        # 3. Generar y publicar el reporte renovando el bloqueo, y liberarlo aunque falle
+        terminado = threading.Event()
+        renovacion = threading.Thread(target=_renovar_bloqueo, args=(bloqueo, token, terminado, self.tiempo_bloqueo / 4),
+                                      name='renovacion-bloqueo', daemon=True)
+        try:
+            os.write(descriptor, token.encode('utf-8'))
+            os.close(descriptor)
+            renovacion.start()
+            artefacto = self._leer_disco(llave)
+            if artefacto is None:
+                artefacto = generar()
+                self._guardar_disco(llave, artefacto)
+            return artefacto
+        finally:
+            terminado.set()
+            _liberar_bloqueo(bloqueo, token)
+
+    def invalidar(self, llave):
+        """
+        Elimina un reporte de la memoria y del respaldo en disco.
+        """
+        with self._candado:
+            artefacto = self._reportes.pop(llave, None)
+            if artefacto is not None:
+                self._memoria -= tamano_artefacto(artefacto)
+        ruta = self._ruta_disco(llave)
+        if ruta:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+    def memoria(self):
+        """
+        Retorna la memoria ocupada (bytes) y el número de reportes en memoria.
+        """
+        with self._candado:
+            return self._memoria, len(self._reportes)
+
+    ##########################
+    # Respaldo en disco
+    ##########################
+
+    def _ruta_disco(self, llave):
+        if not self.directorio:
+            return None
+        nombre = hashlib.sha256(repr(llave).encode('utf-8')).hexdigest()
+        return os.path.join(self.directorio, f'{nombre}.pkl')
+
+    def _leer_disco(self, llave):
+        # Retorna el reporte guardado en disco o None si no existe
+        ruta = self._ruta_disco(llave)
+        if not ruta:
+            return None
+        try:
+            with open(ruta, 'rb') as f:
+                llave_guardada, artefacto = pickle.load(f)
+        except (FileNotFoundError, OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return artefacto if llave_guardada == llave else None
+
+    def _guardar_disco(self, llave, artefacto):
+        # Un disco lleno o sin permisos no rompe el reporte: se avisa y se sigue sin respaldo. Cualquier otro error
+        # es un defecto y se propaga
+        ruta = self._ruta_disco(llave)
+        if not ruta:
+            return
+        try:
+            def escribir(temporal):
+                with open(temporal, 'wb') as f:
+                    pickle.dump((llave, artefacto), f, protocol=pickle.HIGHEST_PROTOCOL)
+            ac.escribir_atomico(ruta, escribir)
+            # Eliminar los reportes guardados hace más tiempo hasta quedar por debajo del tamaño máximo en disco
+            ac.recortar_lru(self.directorio, '.pkl', self.disco_maximo)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning('No se pudo respaldar el reporte %r en disco (%s): %r', llave, ruta, e)
+
+
+# Cache única del proceso: la comparten todas las sesiones de Streamlit
+cache_reportes = CacheReportes()
@@ -1,17 +1,32 @@
 # Librerias
+import copy
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 # import snowflake.connector # [pip install snowflake-connector-python]
 from snowflake.connector.pandas_tools import write_pandas # [pip install "snowflake-connector-python[pandas]"]
 from snowflake.snowpark import Session
+# Versión de los datos
+import cache_consultas as cache
+# Tablas de GEOGRAFIA en memoria
+import geografia as geo
+# Formato numérico colombiano por columnas
+import formatos as fmt
+# Resumen de los tres ejes por columnas
+import resumen as rs
+# Agregados de inversión comunes a todos los reportes
+import agregados_inversion as inv
 
 ######################################################
 # FUNCIONES PARA OBTENER Y TRANSFORMAR DATOS TRES EJES
 ######################################################
 
-def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None):
+def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None, version=None):
     """
-    Extrae datos desde Snowflake aplicando filtros específicos y devuelve los nombres de las columnas para usar como parámetros en las consultas posteriores.
+    Resuelve los parámetros geográficos de la agrupación desde el GeografiaIndex en memoria (geografia.obtener_geografia),
+    sin consultas adicionales a Snowflake, y devuelve los nombres de las columnas para usar como parámetros en las consultas posteriores.
 
     Parámetros:
     session (snowflake.snowpark.Session): Sesión activa en Snowflake.
@@ -22,12 +37,13 @@ def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs
     tlcs (list): Lista de tratados de libre comercio a filtrar.
     departamentos (list): Lista de departamentos a filtrar.
     umbral (list): Lista con el valor de umbral para contar empresas.
+    version (str, opcional): versión de los datos del reporte con la que se resuelve el índice geográfico.
     
     Pasos del proceso:
     1. Verificar que los parámetros son listas o None.
-    2. Construir la consulta SQL base.
-    3. Añadir condiciones a la consulta SQL según los parámetros proporcionados.
-    4. Ejecutar la consulta SQL y convertir los resultados en un DataFrame de pandas.
+    2. Obtener el índice geográfico del proceso.
+    3. Filtrar los países con llave de exportaciones según los parámetros proporcionados.
+    4. Obtener la lista de países de la agrupación.
     5. Devolver los nombres de las columnas en una lista.
 
     Retorna:
@@ -41,39 +57,15 @@ def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs
         if param is not None and not isinstance(param, list):
             raise ValueError("Todos los parámetros deben ser listas o None")
         
-    # 2. Construir la consulta SQL base
-    # Define una consulta SQL básica para extraer datos desde la tabla PAISES_CORRELATIVA en Snowflake.
-    query = """
-    SELECT A.PAIS_LLAVE_EXPORTACIONES,
-        A.CONTINENTE_DANE_DIAN_EXPORTACIONES,
-        A.OFICINA_COMERCIAL_EXPORTACIONES,
-        A.HUB__C_EXPORTACIONES,
-        A.TIPO_ACUERDO_EXPORTACIONES,
-        A.TLCS_EXPORTACIONES,
-        A.PAIS_INVERSION_BANREP,
-        A.PAIS_CODIGO_TURISMO,
-        A.NOMBRE_PAIS_CODIGO_TURISMO,
-        A.COUNTRY_OR_AREA_UNSD
-    FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.PAISES_CORRELATIVA AS A
-    WHERE A.PAIS_LLAVE_EXPORTACIONES IS NOT NULL
-    """
-    
-    # 3. Añadir condiciones a la consulta SQL según los parámetros proporcionados
-    # Añade condiciones a la consulta SQL para filtrar según los parámetros proporcionados (continentes, paises, hubs, tlcs).
-    if continentes:
-        query += f""" AND A.CONTINENTE_DANE_DIAN_EXPORTACIONES IN ({','.join([f"'{continente}'" for continente in continentes])})"""
-    if paises:
-        query += f""" AND A.COUNTRY_OR_AREA_UNSD IN ({','.join([f"'{pais}'" for pais in paises])})"""
-    if hubs:
-        query += f""" AND A.HUB__C_EXPORTACIONES IN ({','.join([f"'{hub}'" for hub in hubs])})"""
-    if tlcs:
-        query += f""" AND A.TLCS_EXPORTACIONES IN ({','.join([f"'{tlc}'" for tlc in tlcs])})"""
+    # 2. Obtener el índice geográfico del proceso
+    # Las tablas de GEOGRAFIA se cargan una sola vez por versión de datos y se comparten entre reportes.
+    geografia = geo.obtener_geografia(session, version)
     
-    # 4. Ejecutar la consulta SQL y convertir los resultados en un DataFrame de pandas
-    # Ejecuta la consulta SQL y convierte los resultados en un DataFrame de pandas.
-    data = pd.DataFrame(session.sql(query).collect()) 
+    # 3. Filtrar los países con llave de exportaciones según los parámetros proporcionados
+    # Equivale a la consulta sobre PAISES_CORRELATIVA con PAIS_LLAVE_EXPORTACIONES IS NOT NULL y los filtros IN (continentes, paises, hubs, tlcs).
+    data = geografia.filas_paises(continentes, paises, hubs, tlcs)
     
-    # Obtener la lista de países para las agrupaciones de países como continentes, tlcs, hubs.
+    # 4. Obtener la lista de países para las agrupaciones de países como continentes, tlcs, hubs.
     if agrupacion in ['CONTINENTES', 'HUBS', 'TLCS']:
         PAISES_lista =  data['COUNTRY_OR_AREA_UNSD'].dropna().unique().tolist()
         paises_anexo_str = ', '.join(PAISES_lista)
@@ -149,24 +141,11 @@ def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs
             }
     
     if agrupacion == 'DEPARTAMENTOS':
-        query_dept = """
-        SELECT A.COD_DIAN_DEPARTAMENTO,
-            A.DEPARTAMENTO_DIAN
-        FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIAN_DEPARTAMENTOS AS A
-        """
-        query_dept += f"""WHERE A.DEPARTAMENTO_DIAN IN ({','.join([f"'{departamento}'" for departamento in departamentos])})"""
-        data = pd.DataFrame(session.sql(query_dept).collect())
+        # Departamentos DIAN elegidos y municipios DIVIPOLA de esos departamentos
+        data = geografia.filas_departamentos(departamentos)
         UNIDAD = data['DEPARTAMENTO_DIAN'].unique().tolist()
         UNIDAD_COD = data['COD_DIAN_DEPARTAMENTO'].unique().tolist()
-        query_mun = """
-        SELECT A.COD_DANE_DEPARTAMENTO,
-            A.DEPARTAMENTO_DANE,
-            A.COD_DANE_MUNICIPIO, 
-            A.MUNICIPIO_DANE
-        FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS AS A
-        """
-        query_mun += f"""WHERE COD_DANE_DEPARTAMENTO IN ({','.join([f"'{UNIDAD_COD_INDIVIDUAL}'" for UNIDAD_COD_INDIVIDUAL in UNIDAD_COD])})"""
-        data_mun = pd.DataFrame(session.sql(query_mun).collect())
+        data_mun = geografia.filas_municipios(UNIDAD_COD)
         MUNICIPIO_TURISMO_COD = data_mun['COD_DANE_MUNICIPIO'].unique().tolist()
         MUNICIPIO_TURISMO = data_mun['MUNICIPIO_DANE'].unique().tolist()
         return {
@@ -179,12 +158,118 @@ def get_data_parametros(session, agrupacion, continentes=None, paises=None, hubs
         }
     
 
+def consulta_oportunidades(params):
+    """
+    Construye la consulta única de las oportunidades de Exportación, IED y Turismo de la unidad.
+
+    La consulta trae (OPORTUNIDAD, CADENA, SECTOR, SUBSECTOR) con la columna EN_UNIDAD, que indica si la fila es
+    de los países o departamentos de la unidad. Como antes, en CONTINENTES, HUBS y TLCS las cadenas de Exportación
+    e IED son las de todos los países, aunque la existencia se revisa con los de la unidad.
+
+    Parámetros:
+    - params: diccionario de get_data_parametros.
+
+    Retorna:
+    - query: consulta SQL, o None si la unidad no tiene códigos (sin oportunidades).
+    """
+    # 1. Condición de la unidad: códigos de país de turismo o de departamento (en Colombia todas las filas)
+    AGRUPACION = params['AGRUPACION']
+    codigos = []
+    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
+        codigos = [pais for pais in params['PAISES_TURISMO_COD'] if pais is not None]
+        columna_codigo = 'A.COD_PAIS'
+    if AGRUPACION in ['DEPARTAMENTOS']:
+        codigos = [departamento for departamento in params['UNIDAD_COD'] if departamento is not None]
+        columna_codigo = 'A.COD_DIVIPOLA_DEPARTAMENTO'
+    if AGRUPACION == 'COLOMBIA':
+        en_unidad = 'TRUE'
+    elif codigos:
+        codigos_sql = ', '.join(f"'{codigo}'" for codigo in codigos)
+        en_unidad = f"COALESCE({columna_codigo} IN ({codigos_sql}), FALSE)"
+    else:
+        return None
+
+    # 2. Consulta única (Exportación e IED solo se limitan a la unidad en países y departamentos)
+    filtro_cadenas = en_unidad if AGRUPACION in ['PAISES', 'DEPARTAMENTOS'] else 'TRUE'
+    return f"""
+        SELECT DISTINCT A.OPORTUNIDAD,
+            A.CADENA,
+            LOWER(A.SECTOR) AS SECTOR,
+            LOWER(A.SUBSECTOR) AS SUBSECTOR,
+            {en_unidad} AS EN_UNIDAD
+        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
+        WHERE (A.OPORTUNIDAD IN ('Exportación', 'IED') AND {filtro_cadenas})
+            OR (A.CADENA IN ('Turismo') AND {en_unidad})
+    """
+
+
+def obtener_oportunidades(session, params, data=None):
+    """
+    Retorna las oportunidades de Exportación, IED y Turismo de la unidad separadas por eje.
+
+    Las tablas de cada eje y la existencia de oportunidades (que antes se sondeaba con otras tres consultas) salen
+    de las filas de consulta_oportunidades. El resultado queda memorizado en params['OPORTUNIDADES'], de modo que
+    verif_ejes y get_data comparten la consulta.
+
+    Parámetros:
+    - session: sesión activa.
+    - params: diccionario de get_data_parametros.
+    - data: (opcional) resultado de consulta_oportunidades ya ejecutado (por ejemplo junto con las demás consultas de
+      get_data). Si no se entrega se consulta aquí.
+
+    Retorna:
+    - tablas: diccionario {'EXPORTACIONES': DataFrame (CADENA, SUBSECTOR), 'INVERSION': DataFrame (CADENA, SUBSECTOR),
+      'TURISMO': DataFrame (SECTOR, SUBSECTOR)}, sin duplicados y ordenados.
+    - existencia: diccionario {'oportunidades_exportacion': bool, 'oportunidades_inversion': bool, 'oportunidades_turismo': bool}.
+    """
+    # 0. Si las oportunidades ya se consultaron para esta solicitud, reutilizarlas
+    if 'OPORTUNIDADES' in params:
+        return params['OPORTUNIDADES']
+
+    # 1. Filas de la consulta única (sin códigos de la unidad no hay oportunidades y no se consulta)
+    columnas = ['OPORTUNIDAD', 'CADENA', 'SECTOR', 'SUBSECTOR', 'EN_UNIDAD']
+    if data is None:
+        query_oportunidades = consulta_oportunidades(params)
+        filas = session.sql(query_oportunidades).collect() if query_oportunidades is not None else []
+        data = cache.filas_a_dataframe(filas, columnas)
+    # Sin filas el resultado no trae columnas
+    data = pd.DataFrame(data, columns=columnas)
+
+    # 2. Filas de cada eje (las mismas condiciones que los antiguos sondeos y consultas)
+    filtrar_cadenas = params['AGRUPACION'] in ['PAISES', 'DEPARTAMENTOS']
+    en_unidad = data['EN_UNIDAD'].fillna(False).astype(bool)
+    exportacion = (data['OPORTUNIDAD'] == 'Exportación') & data['CADENA'].notna() & (data['CADENA'] != 'Turismo')
+    inversion = data['OPORTUNIDAD'] == 'IED'
+    turismo = data['CADENA'] == 'Turismo'
+
+    def eje(filtro, columnas_eje):
+        # Filas distintas ordenadas por sus columnas (igual que SELECT DISTINCT ... ORDER BY 1, 2)
+        return data.loc[filtro, columnas_eje].drop_duplicates().sort_values(columnas_eje, kind='stable').reset_index(drop=True)
+
+    tablas = {
+        'EXPORTACIONES': eje(exportacion & en_unidad if filtrar_cadenas else exportacion, ['CADENA', 'SUBSECTOR']),
+        'INVERSION': eje(inversion & en_unidad if filtrar_cadenas else inversion, ['CADENA', 'SUBSECTOR']),
+        'TURISMO': eje(turismo & en_unidad, ['SECTOR', 'SUBSECTOR']),
+    }
+    existencia = {
+        'oportunidades_exportacion': bool((exportacion & en_unidad).any()),
+        'oportunidades_inversion': bool((inversion & en_unidad).any()),
+        'oportunidades_turismo': bool((turismo & en_unidad).any()),
+    }
+
+    params['OPORTUNIDADES'] = (tablas, existencia)
+    return params['OPORTUNIDADES']
+
+
 def verif_ejes(session, params):
     """
     Función para verificar la existencia de datos en diferentes categorías (exportaciones, inversión y turismo)
-    agrupados por diferentes criterios (CONTINENTES, HUBS, TLCS, PAISES, DEPARTAMENTOS). La función ejecuta
-    consultas SQL en una sesión de Snowflake y agrega los resultados a un diccionario indicando si hay datos
-    disponibles o no en cada categoría y periodo (cerrado o corrido).
+    agrupados por diferentes criterios (CONTINENTES, HUBS, TLCS, PAISES, DEPARTAMENTOS).
+
+    En la extracción de un reporte no se sondea nada: get_data calcula los indicadores con los resultados de sus
+    consultas (verificar_resultados) y los memoriza en params['VERIFICACION'], de donde esta función los retorna.
+    Solo si se necesitan los indicadores sin extraer los datos se sondean las tablas en una sola consulta a Snowflake
+    (UNION ALL de sondeos de existencia con LIMIT 1). La existencia de oportunidades sale de obtener_oportunidades.
 
     Parámetros:
     - session: Sesión activa de Snowflake.
@@ -196,6 +281,10 @@ def verif_ejes(session, params):
                   para cada categoría y periodo.
     """
 
+    # 0. Si la verificación ya se calculó para esta solicitud, reutilizarla
+    if 'VERIFICACION' in params:
+        return params['VERIFICACION']
+
     # 1. Obtener los parámetros según sea la agrupación y unidad
     # Parámetros para los datos de exportaciones
     AGRUPACION = params['AGRUPACION']
@@ -218,486 +307,11 @@ def verif_ejes(session, params):
     # 2. Diccionario para almacenar los resultados
     dict_verif = {}
 
-    # El siguiente proceso no es válido para la agrupación de COLOMBIA ya que esta siempre tiene datos: 
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'DEPARTAMENTOS']:
-
-        # 3. Verificación de exportaciones
-        # Consultas para verificar datos de exportaciones en periodos cerrados y corridos, tanto totales como No Mineras (NME)
-        
-        # Totales
-        # Cerrado
-        query_verif_exportaciones_total_cerrado = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CERRADO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TOTAL';
-        """
-        # Corrido
-        query_verif_exportaciones_total_corrido = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CORRIDO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TOTAL';
-        """
-
-        # NME
-        # Cerrado
-        query_verif_exportaciones_nme_cerrado = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CERRADO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TIPOS'
-            AND A.CATEGORIA = 'No Mineras';
-        """
-        # Corrido
-        query_verif_exportaciones_nme_corrido = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CORRIDO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TIPOS'
-            AND A.CATEGORIA = 'No Mineras';
-        """
+    # Oportunidades: la existencia se calcula con los datos ya consultados
+    _, existencia_oportunidades = obtener_oportunidades(session, params)
+    for clave, existe in existencia_oportunidades.items():
+        dict_verif[clave] = "CON OPORTUNIDADES" if existe else "SIN OPORTUNIDADES"
 
-        # Conteo de empresas
-        # Cerrado
-        query_verif_exportaciones_cuenta_cerrado = f"""
-        SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CERRADO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-        # Corrido
-        query_verif_exportaciones_cuenta_corrido = f"""
-        SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CORRIDO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-
-        # Datos de empresas
-        # Cerrado
-        query_verif_exportaciones_empresas_cerrado = f"""
-            SELECT A.CATEGORIA, 
-                    A.RAZON_SOCIAL,
-                    A.SECTOR_ESTRELLA,
-                    A.SUMA_USD_T_1, 
-                    A.SUMA_USD_T, 
-                    A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_NIT_CERRADO AS A 
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-            ORDER BY SUMA_USD_T DESC LIMIT 5;
-        """
-        # Corrido
-        query_verif_exportaciones_empresas_corrido = f"""
-            SELECT A.CATEGORIA, 
-                    A.RAZON_SOCIAL,
-                    A.SECTOR_ESTRELLA,
-                    A.SUMA_USD_T_1, 
-                    A.SUMA_USD_T, 
-                    A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_NIT_CORRIDO AS A 
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-            ORDER BY SUMA_USD_T DESC LIMIT 5;
-        """
-
-        # Ejecución de consultas y agregar al diccionario si los países o departamentos son válidos o no        
-        df_export_total_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_total_cerrado).collect())
-        df_export_total_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_total_corrido).collect())
-        df_nme_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_nme_cerrado).collect())
-        df_nme_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_nme_corrido).collect())
-        df_conteo_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_cuenta_cerrado).collect())
-        df_conteo_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_cuenta_corrido).collect())
-        df_empresas_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_empresas_cerrado).collect())
-        df_empresas_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_empresas_corrido).collect())
-
-
-        # Verificar y agregar al diccionario dict_verif
-        # Exportaciones Totales
-        if df_export_total_cerrado.empty:
-            dict_verif['exportaciones_totales_cerrado'] = "SIN DATOS DE EXPORTACIONES TOTALES CERRADO"
-        else:
-            dict_verif['exportaciones_totales_cerrado'] = "CON DATOS DE EXPORTACIONES TOTALES CERRADO"
-
-        if df_export_total_corrido.empty:
-            dict_verif['exportaciones_totales_corrido'] = "SIN DATOS DE EXPORTACIONES TOTALES CORRIDO"
-        else:
-            dict_verif['exportaciones_totales_corrido'] = "CON DATOS DE EXPORTACIONES TOTALES CORRIDO"
-
-        # Exportaciones NME
-        if df_nme_cerrado.empty:
-            dict_verif['exportaciones_nme_cerrado'] = "SIN DATOS DE EXPORTACIONES NME CERRADO"
-        else:
-            dict_verif['exportaciones_nme_cerrado'] = "CON DATOS DE EXPORTACIONES NME CERRADO"
-
-        if df_nme_corrido.empty:
-            dict_verif['exportaciones_nme_corrido'] = "SIN DATOS DE EXPORTACIONES NME CORRIDO"
-        else:
-            dict_verif['exportaciones_nme_corrido'] = "CON DATOS DE EXPORTACIONES NME CORRIDO"
-
-        # Conteo de empresas
-        if df_conteo_cerrado.empty:
-            dict_verif['exportaciones_conteo_cerrado'] = "SIN DATOS DE CONTEO CERRADO"
-        else:
-            dict_verif['exportaciones_conteo_cerrado'] = "CON DATOS DE CONTEO CERRADO"
-
-        if df_conteo_corrido.empty:
-            dict_verif['exportaciones_conteo_corrido'] = "SIN DATOS DE CONTEO CORRIDO"
-        else:
-            dict_verif['exportaciones_conteo_corrido'] = "CON DATOS DE CONTEO CORRIDO"
-
-        # Empresas
-        if df_empresas_cerrado.empty:
-            dict_verif['exportaciones_empresas_cerrado'] = "SIN DATOS DE EMPRESAS CERRADO"
-        else:
-            dict_verif['exportaciones_empresas_cerrado'] = "CON DATOS DE EMPRESAS CERRADO"
-
-        if df_empresas_corrido.empty:
-            dict_verif['exportaciones_empresas_corrido'] = "SIN DATOS DE EMPRESAS CORRIDO"
-        else:
-            dict_verif['exportaciones_empresas_corrido'] = "CON DATOS DE EMPRESAS CORRIDO"
-
-
-        # 4. Verificación de inversión 
-        # Consultas para verificar datos de inversión extranjera directa (IED) e inversión colombiana en el exterior (ICE)
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
-            # IED
-            # CERRADO
-            query_verif_ied_cerrado = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'IED'
-            """
-            query_verif_ied_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-            # CORRIDO
-            query_verif_ied_corrido = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'IED'
-            """
-            query_verif_ied_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-
-            # ICE
-            # CERRADO
-            query_verif_ice_cerrado = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_verif_ice_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-            # CORRIDO
-            query_verif_ice_corrido = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_verif_ice_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-
-            # Ejecución de consultas y agregar al diccionario si los países son válidos o no
-
-            # IED
-            try:
-                df_ied_cerrado = pd.DataFrame(session.sql(query_verif_ied_cerrado).collect())
-                if df_ied_cerrado.empty:
-                    dict_verif['ied_cerrado'] = "SIN DATOS DE IED CERRADO"
-                else:
-                    dict_verif['ied_cerrado'] = "CON DATOS DE IED CERRADO"
-            except Exception as e:
-                dict_verif['ied_cerrado'] = "SIN DATOS DE IED CERRADO"
-
-            try:
-                df_ied_corrido = pd.DataFrame(session.sql(query_verif_ied_corrido).collect())
-                if df_ied_corrido.empty:
-                    dict_verif['ied_corrido'] = "SIN DATOS DE IED CORRIDO"
-                else:
-                    dict_verif['ied_corrido'] = "CON DATOS DE IED CORRIDO"
-            except Exception as e:
-                dict_verif['ied_corrido'] = "SIN DATOS DE IED CORRIDO"
-
-            # ICE
-            try:
-                df_ice_cerrado = pd.DataFrame(session.sql(query_verif_ice_cerrado).collect())
-                if df_ice_cerrado.empty:
-                    dict_verif['ice_cerrado'] = "SIN DATOS DE ICE CERRADO"
-                else:
-                    dict_verif['ice_cerrado'] = "CON DATOS DE ICE CERRADO"
-            except Exception as e:
-                dict_verif['ice_cerrado'] = "SIN DATOS DE ICE CERRADO"
-
-            try:
-                df_ice_corrido = pd.DataFrame(session.sql(query_verif_ice_corrido).collect())
-                if df_ice_corrido.empty:
-                    dict_verif['ice_corrido'] = "SIN DATOS DE ICE CORRIDO"
-                else:
-                    dict_verif['ice_corrido'] = "CON DATOS DE ICE CORRIDO"
-            except Exception as e:
-                dict_verif['ice_corrido'] = "SIN DATOS DE ICE CORRIDO"
-
-        
-        # 5. Verificación de turismo
-        # Consultas para verificar datos de turismo en periodos cerrados y corridos, considerando agrupación por países o departamentos
-        # Cerrado
-        query_verif_turismo_cerrado = f"""
-        SELECT A.PAIS_RESIDENCIA,
-            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-        WHERE 1=1
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_verif_turismo_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_verif_turismo_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-        
-        # Corrido
-        query_verif_turismo_corrido = f"""
-        SELECT A.PAIS_RESIDENCIA,
-            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CORRIDO AS A
-        WHERE 1=1
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_verif_turismo_corrido += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_verif_turismo_corrido += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-        
-        # Ejecución de consultas y agregar al diccionario si los países son válidos o no
-        # Turismo
-        try:
-            df_turismo_cerrado = pd.DataFrame(session.sql(query_verif_turismo_cerrado).collect())
-            if df_turismo_cerrado.empty:
-                dict_verif['turismo_cerrado'] = "SIN DATOS DE TURISMO CERRADO"
-            else:
-                dict_verif['turismo_cerrado'] = "CON DATOS DE TURISMO CERRADO"
-        except Exception as e:
-            dict_verif['turismo_cerrado'] = "SIN DATOS DE TURISMO CERRADO"
-
-        try:
-            df_turismo_corrido = pd.DataFrame(session.sql(query_verif_turismo_corrido).collect())
-            if df_turismo_corrido.empty:
-                dict_verif['turismo_corrido'] = "SIN DATOS DE TURISMO CORRIDO"
-            else:
-                dict_verif['turismo_corrido'] = "CON DATOS DE TURISMO CORRIDO"
-        except Exception as e:
-            dict_verif['turismo_corrido'] = "SIN DATOS DE TURISMO CORRIDO"
-        
-    ##############
-    # CONECTIVIDAD
-    ##############
-
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        # Construir consulta
-        query_conectividad = """
-        SELECT A.AEROLINEA AS "Aerolínea",
-            A.CIUDAD_ORIGEN AS "Ciudad Origen",
-            A.CIUDAD_DESTINO AS "Ciudad Destino",
-            A.FRECUENCIAS AS "Frecuencias",
-            A.SEMANA AS "Semana de análisis"
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.CONECTIVIDAD AS A
-        WHERE 1 = 1
-        """
-        # Agregar departamento
-        query_conectividad += f" AND A.COD_DIVIPOLA_DEPARTAMENTO_DESTINO IN ({DEPARTAMENTOS_TURISMO_sql})"
-
-        # Verificación
-        try:
-            # Ejecutar la consulta y recolectar los resultados en un DataFrame
-            df_conectividad = pd.DataFrame(session.sql(query_conectividad).collect())
-            
-            # Verificar si el DataFrame está vacío
-            if df_conectividad.empty:
-                dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
-            else:
-                dict_verif['conectividad'] = "CON DATOS DE CONECTIVIDAD"
-        except Exception as e:
-            dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
-    
-    ###############
-    # OPORTUNIDADES
-    ###############
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'DEPARTAMENTOS']:
-        # Exportación
-        query_oportunidades_exportacion = """
-        SELECT DISTINCT A.CADENA,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.OPORTUNIDAD = 'Exportación' 
-            AND A.CADENA NOT IN ('Turismo')
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_exportacion += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_exportacion += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_exportacion += f" ORDER BY 1, 2 ASC"
-
-        # Verificación
-        try:
-            df_oportunidades_exportacion = pd.DataFrame(session.sql(query_oportunidades_exportacion).collect())
-            if df_oportunidades_exportacion.empty:
-                dict_verif['oportunidades_exportacion'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_exportacion'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_exportacion'] = "SIN OPORTUNIDADES"
-
-        # Inversión
-        query_oportunidades_ied = """
-        SELECT DISTINCT A.CADENA,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.OPORTUNIDAD = 'IED'
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_ied += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_ied += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_ied += f" ORDER BY 1, 2 ASC"
-
-        # Verificación
-        try:
-            df_oportunidades_inversion = pd.DataFrame(session.sql(query_oportunidades_ied).collect())
-            if df_oportunidades_inversion.empty:
-                dict_verif['oportunidades_inversion'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_inversion'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_inversion'] = "SIN OPORTUNIDADES"
-        
-        # Turismo
-        query_oportunidades_turismo = """
-        SELECT DISTINCT A.SECTOR,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.CADENA IN ('Turismo')
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_turismo += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_turismo += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_turismo += f" ORDER BY 1, 2 ASC"
-        # Verificación
-        try:
-            df_oportunidades_turismo = pd.DataFrame(session.sql(query_oportunidades_turismo).collect())
-            if df_oportunidades_turismo.empty:
-                dict_verif['oportunidades_turismo'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_turismo'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_turismo'] = "SIN OPORTUNIDADES"
-
-    
-    #################
-    # PESOS POR MEDIO
-    #################
-        # Mineros
-        # Cerrado
-        query_pesos_mineros_cerrado = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CERRADO AS A 
-        WHERE A.TABLA = 'MEDIO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_minero_cerrado = pd.DataFrame(session.sql(query_pesos_mineros_cerrado).collect())
-            if df_pesos_minero_cerrado.empty:
-                dict_verif['pesos_minero_cerrado'] = "SIN DATOS CERRADO"
-            else:
-                dict_verif['pesos_minero_cerrado'] = "CON DATOS CERRADO"
-        except Exception as e:
-            dict_verif['pesos_minero_cerrado'] = "SIN DATOS CERRADO"
-
-        # Corrido
-        query_pesos_mineros_corrido = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CORRIDO AS A 
-        WHERE A.TABLA = 'MEDIO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_minero_corrido = pd.DataFrame(session.sql(query_pesos_mineros_corrido).collect())
-            if df_pesos_minero_corrido.empty:
-                dict_verif['pesos_minero_corrido'] = "SIN DATOS CORRIDO"
-            else:
-                dict_verif['pesos_minero_corrido'] = "CON DATOS CORRIDO"
-        except Exception as e:
-            dict_verif['pesos_minero_corrido'] = "SIN DATOS CORRIDO"
-
-        # No mineros
-        # Cerrado
-        query_pesos_no_mineros_cerrado = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CERRADO AS A 
-        WHERE A.TABLA = 'MEDIO NO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_no_minero_cerrado = pd.DataFrame(session.sql(query_pesos_no_mineros_cerrado).collect())
-            if df_pesos_no_minero_cerrado.empty:
-                dict_verif['pesos_no_minero_cerrado'] = "SIN DATOS CERRADO"
-            else:
-                dict_verif['pesos_no_minero_cerrado'] = "CON DATOS CERRADO"
-        except Exception as e:
-            dict_verif['pesos_no_minero_cerrado'] = "SIN DATOS CERRADO"
-
-        # Corrido
-        query_pesos_no_mineros_corrido = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CORRIDO AS A 
-        WHERE A.TABLA = 'MEDIO NO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_no_minero_corrido = pd.DataFrame(session.sql(query_pesos_no_mineros_corrido).collect())
-            if df_pesos_no_minero_corrido.empty:
-                dict_verif['pesos_no_minero_corrido'] = "SIN DATOS CORRIDO"
-            else:
-                dict_verif['pesos_no_minero_corrido'] = "CON DATOS CORRIDO"
-        except Exception as e:
-            dict_verif['pesos_no_minero_corrido'] = "SIN DATOS CORRIDO"
-   
     # Colombia es válidos para los tres ejes siempre:
     if AGRUPACION == 'COLOMBIA':
         dict_verif['exportaciones_totales_cerrado'] = "CON DATOS DE EXPORTACIONES TOTALES CERRADO"
@@ -714,15 +328,191 @@ def verif_ejes(session, params):
         dict_verif['exportaciones_conteo_corrido'] = "CON DATOS DE CONTEO CORRIDO"
         dict_verif['exportaciones_empresas_cerrado'] = "CON DATOS DE EMPRESAS CERRADO"
         dict_verif['exportaciones_empresas_corrido'] = "CON DATOS DE EMPRESAS CORRIDO"
-        dict_verif['oportunidades_exportacion'] = "CON OPORTUNIDADES"
-        dict_verif['oportunidades_inversion'] = "CON OPORTUNIDADES"
-        dict_verif['oportunidades_turismo'] = "CON OPORTUNIDADES"
         dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
         dict_verif['pesos_minero_cerrado'] = "CON DATOS CERRADO"
         dict_verif['pesos_minero_corrido'] = "CON DATOS CORRIDO"
         dict_verif['pesos_no_minero_cerrado'] = "CON DATOS CERRADO"
         dict_verif['pesos_no_minero_corrido'] = "CON DATOS CORRIDO"
+        params['VERIFICACION'] = dict_verif
+        return dict_verif
+
+    # 3. Sondeos de existencia
+    # Cada sondeo es (clave, FROM/WHERE de la tabla, texto con datos, texto sin datos).
+    # Un FROM/WHERE en None indica que no hay códigos para filtrar y el resultado es siempre "sin datos".
+    sondeos = []
+
+    # Exportaciones
+    # Totales y NME
+    for periodo in ['CERRADO', 'CORRIDO']:
+        sondeos.append((f'exportaciones_totales_{periodo.lower()}', f"""
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_{periodo} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD IN ('{UNIDAD}')
+                AND A.TABLA = 'TOTAL'""",
+            f"CON DATOS DE EXPORTACIONES TOTALES {periodo}", f"SIN DATOS DE EXPORTACIONES TOTALES {periodo}"))
+        sondeos.append((f'exportaciones_nme_{periodo.lower()}', f"""
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_{periodo} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD IN ('{UNIDAD}')
+                AND A.TABLA = 'TIPOS'
+                AND A.CATEGORIA = 'No Mineras'""",
+            f"CON DATOS DE EXPORTACIONES NME {periodo}", f"SIN DATOS DE EXPORTACIONES NME {periodo}"))
+
+    # Conteo de empresas y datos de empresas
+    for periodo in ['CERRADO', 'CORRIDO']:
+        sondeos.append((f'exportaciones_conteo_{periodo.lower()}', f"""
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_{periodo} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.VALOR_USD > {UMBRAL}""",
+            f"CON DATOS DE CONTEO {periodo}", f"SIN DATOS DE CONTEO {periodo}"))
+        sondeos.append((f'exportaciones_empresas_{periodo.lower()}', f"""
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_NIT_{periodo} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'""",
+            f"CON DATOS DE EMPRESAS {periodo}", f"SIN DATOS DE EMPRESAS {periodo}"))
+
+    # Inversión: IED e ICE (solo agrupaciones de países)
+    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
+        for categoria in ['IED', 'ICE']:
+            for periodo in ['CERRADO', 'CORRIDO']:
+                desde = None
+                if PAISES_INVERSION:
+                    desde = f"""
+            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_{periodo} AS A
+            WHERE A.AGRUPACION = 'PAISES'
+                AND A.UNIDAD NOT IN ('TOTAL')
+                AND A.CATEGORIA = '{categoria}'
+                AND A.UNIDAD IN ({PAISES_INVERSION_sql})"""
+                sondeos.append((f'{categoria.lower()}_{periodo.lower()}', desde,
+                                f"CON DATOS DE {categoria} {periodo}", f"SIN DATOS DE {categoria} {periodo}"))
+
+    # Turismo
+    for periodo in ['CERRADO', 'CORRIDO']:
+        desde = None
+        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES'] and PAISES_TURISMO:
+            desde = f"""
+            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_{periodo} AS A
+            WHERE A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"""
+        if AGRUPACION in ['DEPARTAMENTOS'] and DEPARTAMENTOS_TURISMO:
+            desde = f"""
+            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_{periodo} AS A
+            WHERE A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"""
+        sondeos.append((f'turismo_{periodo.lower()}', desde,
+                        f"CON DATOS DE TURISMO {periodo}", f"SIN DATOS DE TURISMO {periodo}"))
+
+    # Conectividad (solo departamentos)
+    if AGRUPACION in ['DEPARTAMENTOS']:
+        desde = None
+        if DEPARTAMENTOS_TURISMO:
+            desde = f"""
+            FROM DOCUMENTOS_COLOMBIA.TURISMO.CONECTIVIDAD AS A
+            WHERE A.COD_DIVIPOLA_DEPARTAMENTO_DESTINO IN ({DEPARTAMENTOS_TURISMO_sql})"""
+        sondeos.append(('conectividad', desde, "CON DATOS DE CONECTIVIDAD", "SIN DATOS DE CONECTIVIDAD"))
+
+    # Pesos por medio: mineros y no mineros
+    for clave, tabla in [('pesos_minero', 'MEDIO MINERAS'), ('pesos_no_minero', 'MEDIO NO MINERAS')]:
+        for periodo in ['CERRADO', 'CORRIDO']:
+            sondeos.append((f'{clave}_{periodo.lower()}', f"""
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_{periodo} AS A
+            WHERE A.TABLA = '{tabla}'
+                AND A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD IN ('{UNIDAD}')""",
+                f"CON DATOS {periodo}", f"SIN DATOS {periodo}"))
+
+    # 4. Ejecutar todos los sondeos en una sola consulta
+    consultas = {clave: f"SELECT '{clave}' AS CLAVE, COUNT(*) AS FILAS FROM (SELECT 1 {desde} LIMIT 1)"
+                 for clave, desde, _, _ in sondeos if desde is not None}
+    resultados = {}
+    if consultas:
+        query_verif = "\nUNION ALL\n".join(consultas.values()) + ";"
+        try:
+            resultados = {row['CLAVE']: row['FILAS'] > 0 for row in session.sql(query_verif).collect()}
+        except Exception as e:
+            # Si la consulta consolidada falla se sondea cada tabla por separado; un sondeo con error equivale a sin datos
+            for clave, consulta in consultas.items():
+                try:
+                    resultados[clave] = session.sql(consulta).collect()[0]['FILAS'] > 0
+                except Exception as e:
+                    resultados[clave] = False
+
+    # 5. Agregar al diccionario si hay datos o no
+    for clave, desde, texto_con, texto_sin in sondeos:
+        dict_verif[clave] = texto_con if resultados.get(clave, False) else texto_sin
+
+    params['VERIFICACION'] = dict_verif
+    return dict_verif
+
+
+def verificar_resultados(session, params, resultados):
+    """
+    Calcula los mismos indicadores CON/SIN DATOS de verif_ejes a partir de los resultados de get_data, sin sondear
+    las tablas: cada eje y periodo tiene datos si su consulta trajo filas de la unidad. Así cada tabla se consulta
+    una sola vez, en lugar de un sondeo de existencia seguido de casi la misma consulta.
+
+    El resultado queda memorizado en params['VERIFICACION'], donde lo encuentran verif_ejes y documentos.create_document_*.
 
+    Parámetros:
+    - session: sesión activa (solo se usa si las oportunidades no vienen en resultados).
+    - params: diccionario de get_data_parametros.
+    - resultados: diccionario {clave: DataFrame} de ejecutar_consultas con las consultas de get_data.
+
+    Retorna:
+    - dict_verif: diccionario con las mismas claves y textos de verif_ejes.
+    """
+    AGRUPACION = params['AGRUPACION']
+
+    def hay_datos(clave, filas=None):
+        # La consulta trajo filas (y, si se entrega filas, alguna cumple la condición)
+        df = resultados.get(clave)
+        if df is None or df.empty:
+            return False
+        return bool(filas(df).any()) if filas is not None else True
+
+    # 1. Oportunidades: la existencia se calcula con los datos ya consultados
+    dict_verif = {}
+    _, existencia_oportunidades = obtener_oportunidades(session, params, resultados.get('OPORTUNIDADES'))
+    for clave, existe in existencia_oportunidades.items():
+        dict_verif[clave] = "CON OPORTUNIDADES" if existe else "SIN OPORTUNIDADES"
+
+    # 2. Exportaciones: totales y NME salen de la consulta de categorías (filas 'TOTAL' y 'No Mineras' de los tipos)
+    for periodo in ['CERRADO', 'CORRIDO']:
+        clave = f'CATEGORIAS ST_CATEGORIAS_{periodo}'
+        totales = hay_datos(clave, lambda df: df['TABLA'] == 'TOTAL')
+        nme = hay_datos(clave, lambda df: (df['TABLA'] == 'TIPOS') & (df['CATEGORIA'] == 'No Mineras'))
+        dict_verif[f'exportaciones_totales_{periodo.lower()}'] = f"{'CON' if totales else 'SIN'} DATOS DE EXPORTACIONES TOTALES {periodo}"
+        dict_verif[f'exportaciones_nme_{periodo.lower()}'] = f"{'CON' if nme else 'SIN'} DATOS DE EXPORTACIONES NME {periodo}"
+
+    # Conteo de empresas y empresas (las filas 'Otros' y 'Total' de consulta_top_n no son empresas)
+    for periodo in ['CERRADO', 'CORRIDO']:
+        conteo = hay_datos(f'CONTEO {periodo}')
+        empresas = hay_datos(f'EMPRESAS ST_NIT_{periodo}', lambda df: ~df['CATEGORIA'].isin(['Otros', 'Total']))
+        dict_verif[f'exportaciones_conteo_{periodo.lower()}'] = f"{'CON' if conteo else 'SIN'} DATOS DE CONTEO {periodo}"
+        dict_verif[f'exportaciones_empresas_{periodo.lower()}'] = f"{'CON' if empresas else 'SIN'} DATOS DE EMPRESAS {periodo}"
+
+    # 3. Inversión: IED e ICE (solo agrupaciones de países y Colombia)
+    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
+        for categoria in ['IED', 'ICE']:
+            for periodo in ['CERRADO', 'CORRIDO']:
+                existe = hay_datos(f'INVERSION PAISES {periodo}', lambda df: df['CATEGORIA'] == categoria)
+                dict_verif[f'{categoria.lower()}_{periodo.lower()}'] = f"{'CON' if existe else 'SIN'} DATOS DE {categoria} {periodo}"
+
+    # 4. Turismo: la fila del total de GROUPING SETS existe aunque la unidad no tenga datos
+    for periodo in ['CERRADO', 'CORRIDO']:
+        existe = hay_datos(f'TURISMO {periodo}', lambda df: df['DIMENSION'] != 'TOTAL')
+        dict_verif[f'turismo_{periodo.lower()}'] = f"{'CON' if existe else 'SIN'} DATOS DE TURISMO {periodo}"
+
+    # Conectividad (solo departamentos; en Colombia no se muestra)
+    if AGRUPACION in ['DEPARTAMENTOS', 'COLOMBIA']:
+        dict_verif['conectividad'] = f"{'CON' if hay_datos('CONECTIVIDAD') else 'SIN'} DATOS DE CONECTIVIDAD"
+
+    # 5. Pesos por medio: mineros y no mineros
+    for clave, tabla in [('pesos_minero', 'MEDIOS PESO MINERO'), ('pesos_no_minero', 'MEDIOS PESO NO MINERO')]:
+        for periodo in ['CERRADO', 'CORRIDO']:
+            existe = hay_datos(f'{tabla} ST_CATEGORIAS_PESO_{periodo}')
+            dict_verif[f'{clave}_{periodo.lower()}'] = f"{'CON' if existe else 'SIN'} DATOS {periodo}"
+
+    params['VERIFICACION'] = dict_verif
     return dict_verif
 
 
@@ -779,8 +569,494 @@ def calcular_participacion_porcentual(df, columna, total, nombre_columna_resulta
 
     return df
 
+# Número máximo de consultas que se mantienen en ejecución al mismo tiempo en Snowflake.
+# Se puede ajustar con la variable de entorno TRES_EJES_MAX_CONSULTAS para no saturar el warehouse.
+MAX_CONSULTAS_CONCURRENTES = int(os.environ.get('TRES_EJES_MAX_CONSULTAS', 8))
+
+def ejecutar_consultas(session, consultas, max_concurrencia=None, al_completar=None):
+    """
+    Ejecuta un conjunto de consultas independientes de forma concurrente y devuelve sus resultados como DataFrames.
+
+    Con una sesión de Snowpark cada consulta se envía como trabajo asíncrono (collect_nowait) y se mantienen a lo sumo
+    max_concurrencia trabajos en vuelo: cuando la ventana está llena se espera al trabajo más antiguo antes de enviar
+    el siguiente. Si la sesión no ofrece trabajos asíncronos se usa un pool de hilos del mismo tamaño.
+
+    Parámetros:
+    - session: sesión de Snowflake.
+    - consultas: diccionario {clave: consulta SQL}.
+    - max_concurrencia: (opcional) número máximo de consultas simultáneas. Por defecto MAX_CONSULTAS_CONCURRENTES.
+    - al_completar: (opcional) función al_completar(completadas, total) que se llama cada vez que llega un resultado.
 
-def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None):
+    Retorna:
+    - resultados: diccionario {clave: DataFrame de pandas} con las mismas claves de consultas.
+    """
+    # 1. Definir el tamaño de la ventana de concurrencia
+    if max_concurrencia is None:
+        max_concurrencia = MAX_CONSULTAS_CONCURRENTES
+    max_concurrencia = max(1, int(max_concurrencia))
+
+    resultados = {}
+    claves = list(consultas.keys())
+    if not claves:
+        return resultados
+
+    # 2. Sesión de Snowpark: trabajos asíncronos con ventana deslizante
+    primera = session.sql(consultas[claves[0]])
+    if hasattr(primera, 'collect_nowait'):
+        en_vuelo = deque()
+        for i, clave in enumerate(claves):
+            # Esperar al trabajo más antiguo si la ventana está llena
+            if len(en_vuelo) >= max_concurrencia:
+                clave_lista, trabajo = en_vuelo.popleft()
+                resultados[clave_lista] = pd.DataFrame(trabajo.result())
+                if al_completar:
+                    al_completar(len(resultados), len(claves))
+            df = primera if i == 0 else session.sql(consultas[clave])
+            en_vuelo.append((clave, df.collect_nowait()))
+        # Recoger los trabajos restantes
+        while en_vuelo:
+            clave_lista, trabajo = en_vuelo.popleft()
+            resultados[clave_lista] = pd.DataFrame(trabajo.result())
+            if al_completar:
+                al_completar(len(resultados), len(claves))
+        return resultados
+
+    # 3. Otras sesiones: pool de hilos acotado
+    with ThreadPoolExecutor(max_workers=max_concurrencia) as pool:
+        futuros = {clave: pool.submit(lambda q: session.sql(q).collect(), consultas[clave]) for clave in claves}
+        for clave, futuro in futuros.items():
+            resultados[clave] = pd.DataFrame(futuro.result())
+            if al_completar:
+                al_completar(len(resultados), len(claves))
+    return resultados
+
+def consulta_top_n(consulta_base, columna_etiqueta, columna_t_1, columna_t, columna_diferencia, n=5,
+                   consulta_total=None, etiqueta_total='Total', columnas_no_aplica=None, otros_total=True):
+    """
+    Envuelve una consulta de detalle para que Snowflake devuelva solo las filas que se muestran en el documento:
+    el top-N ordenado por el valor del año T, una fila 'Otros' (solo si hay más de N filas) y una fila de total.
+
+    El ranking se calcula con ROW_NUMBER. Si no se entrega consulta_total, el total de la unidad y la suma del top-N
+    se obtienen en una sola pasada con GROUPING SETS. Si se entrega, el total se toma de esa consulta (por ejemplo, la
+    fila 'No Mineras' de los tipos o la fila 'TOTAL' de inversión) y 'Otros' es la diferencia entre ese total y el top-N,
+    igual que se hacía antes en pandas.
+
+    Parámetros:
+    - consulta_base: consulta SQL de detalle con las columnas de etiqueta, valores y diferencia porcentual.
+    - columna_etiqueta: nombre de la columna con la categoría, país, empresa, etc.
+    - columna_t_1, columna_t: nombres de las columnas con los valores de los periodos T-1 y T.
+    - columna_diferencia: nombre de la columna con la diferencia porcentual.
+    - n: número de filas del top. Si es None se devuelven todas las filas y no se agrega 'Otros'.
+    - consulta_total: (opcional) consulta SQL de una fila con las mismas columnas de valores y diferencia.
+    - etiqueta_total: etiqueta de la fila de total ('Total' o 'TOTAL' según la sección).
+    - columnas_no_aplica: (opcional) lista de columnas adicionales de la consulta base que toman 'No aplica' en 'Otros' y total.
+    - otros_total: si es False solo se devuelve el top-N, sin 'Otros' ni total.
+
+    Retorna:
+    - query: consulta SQL con el top-N, 'Otros' y el total ordenados para el documento.
+    """
+    # 1. Limpiar las consultas de entrada para poder usarlas como subconsultas
+    consulta_base = consulta_base.strip().rstrip(';')
+    columnas_no_aplica = columnas_no_aplica or []
+    adicionales = ''.join(f', {columna}' for columna in columnas_no_aplica)
+    adicionales_no_aplica = ''.join(f", 'No aplica' AS {columna}" for columna in columnas_no_aplica)
+    columnas_salida = f"{columna_etiqueta}{adicionales}, {columna_t_1}, {columna_t}, {columna_diferencia}"
+
+    def diferencia_sql(t, t_1):
+        return f"""CASE
+                WHEN {t_1} = 0 AND {t} > 0 THEN 100
+                WHEN {t_1} = 0 AND {t} = 0 THEN 0
+                WHEN {t} = 0 AND {t_1} > 0 THEN -100
+            ELSE (({t} - {t_1}) / {t_1}) * 100
+            END"""
+
+    # 2. Solo top-N: filtrar el ranking con QUALIFY
+    if not otros_total:
+        filtro_top = f"QUALIFY ROW_NUMBER() OVER (ORDER BY B.{columna_t} DESC) <= {n}" if n is not None else ''
+        return f"""
+        SELECT B.*
+        FROM ({consulta_base}) AS B
+        {filtro_top}
+        ORDER BY B.{columna_t} DESC;
+        """
+
+    # 3. Total: de la consulta entregada o del conjunto vacío de GROUPING SETS
+    if consulta_total is not None:
+        consulta_total = consulta_total.strip().rstrip(';')
+        cte_total = f"""TOTAL AS (
+            SELECT T.{columna_t_1} AS T_1, T.{columna_t} AS T, T.{columna_diferencia} AS DIFERENCIA
+            FROM ({consulta_total}) AS T
+        )"""
+    else:
+        cte_total = f"""TOTAL AS (
+            SELECT A.T_1, A.T, {diferencia_sql('A.T', 'A.T_1')} AS DIFERENCIA
+            FROM AGREGADOS AS A
+            WHERE A.GRUPO = 'TOTAL'
+        )"""
+
+    # 4. Filas del top y condición para 'Otros'
+    en_top = f"R.POSICION <= {n}" if n is not None else 'TRUE'
+
+    # 5. Consulta final: top-N + 'Otros' + total
+    return f"""
+        WITH BASE AS (
+            {consulta_base}
+        ),
+        RANKING AS (
+            SELECT B.*, ROW_NUMBER() OVER (ORDER BY B.{columna_t} DESC) AS POSICION
+            FROM BASE AS B
+        ),
+        AGREGADOS AS (
+            SELECT CASE WHEN GROUPING(R.EN_TOP) = 1 THEN 'TOTAL' WHEN R.EN_TOP THEN 'TOP' ELSE 'RESTO' END AS GRUPO,
+                COALESCE(SUM(R.{columna_t_1}), 0) AS T_1,
+                COALESCE(SUM(R.{columna_t}), 0) AS T
+            FROM (SELECT R.*, {en_top} AS EN_TOP FROM RANKING AS R) AS R
+            GROUP BY GROUPING SETS ((R.EN_TOP), ())
+        ),
+        {cte_total}
+        SELECT {columnas_salida}
+        FROM (
+            SELECT {columnas_salida}, POSICION AS ORDEN
+            FROM RANKING AS R
+            WHERE {en_top}
+            UNION ALL
+            SELECT 'Otros' AS {columna_etiqueta}{adicionales_no_aplica},
+                T.T_1 - A.T_1 AS {columna_t_1},
+                T.T - A.T AS {columna_t},
+                {diferencia_sql('(T.T - A.T)', '(T.T_1 - A.T_1)')} AS {columna_diferencia},
+                999998 AS ORDEN
+            FROM TOTAL AS T
+            CROSS JOIN AGREGADOS AS A
+            WHERE A.GRUPO = 'TOP'
+                AND EXISTS (SELECT 1 FROM AGREGADOS AS X WHERE X.GRUPO = 'RESTO')
+            UNION ALL
+            SELECT '{etiqueta_total}' AS {columna_etiqueta}{adicionales_no_aplica},
+                T.T_1 AS {columna_t_1},
+                T.T AS {columna_t},
+                T.DIFERENCIA AS {columna_diferencia},
+                999999 AS ORDEN
+            FROM TOTAL AS T
+        )
+        ORDER BY ORDEN;
+        """
+
+
+def consulta_turismo_dimensiones(tabla, dimensiones, filtro, columna_diferencia):
+    """
+    Construye una sola consulta de turismo agregada por varias dimensiones con GROUPING SETS.
+
+    En lugar de una consulta con GROUP BY por cada dimensión (país, departamento, ciudad, género, motivo), la tabla
+    se lee una sola vez: cada fila trae en DIMENSION el nombre de la dimensión por la que se agregó y el conjunto
+    vacío agrega la fila del total con DIMENSION = 'TOTAL'. Sobre ese resultado, ROW_NUMBER particionado por
+    DIMENSION ordena cada dimensión por el valor del año T y QUALIFY deja solo su top-N, por lo que las filas
+    transferidas no dependen del tamaño de la unidad. FILAS_DIMENSION indica cuántas filas tiene la dimensión para
+    saber si lleva 'Otros'. El resultado se separa con separar_turismo_dimensiones.
+
+    Parámetros:
+    - tabla: tabla de turismo (por ejemplo 'ST_PAISES_CERRADO').
+    - dimensiones: diccionario {columna por la que se agrega: N del top} (N None para traer todas las filas).
+    - filtro: condición SQL sobre la tabla (alias A).
+    - columna_diferencia: nombre de la columna con la diferencia porcentual.
+
+    Retorna:
+    - query: consulta SQL con DIMENSION, una columna por dimensión, SUMA_TURISMO_T_1, SUMA_TURISMO_T, la diferencia,
+      POSICION y FILAS_DIMENSION, ordenada por DIMENSION y POSICION.
+    """
+    etiquetas = ''.join(f"WHEN GROUPING(A.{dimension}) = 0 THEN '{dimension}' " for dimension in dimensiones)
+    columnas = ''.join(f'A.{dimension}, ' for dimension in dimensiones)
+    conjuntos = ''.join(f'(A.{dimension}), ' for dimension in dimensiones)
+
+    # Filas que se conservan: el total, las dimensiones sin top completas y el top-N de las demás
+    sin_top = ''.join(f", '{dimension}'" for dimension, n in dimensiones.items() if n is None)
+    condiciones = [f"B.DIMENSION IN ('TOTAL'{sin_top})"]
+    for n in sorted({n for n in dimensiones.values() if n is not None}):
+        con_n = ', '.join(f"'{dimension}'" for dimension, n_dimension in dimensiones.items() if n_dimension == n)
+        condiciones.append(f"(B.DIMENSION IN ({con_n}) AND POSICION <= {n})")
+    return f"""
+    SELECT B.*,
+        ROW_NUMBER() OVER (PARTITION BY B.DIMENSION ORDER BY B.SUMA_TURISMO_T DESC NULLS LAST) AS POSICION,
+        COUNT(*) OVER (PARTITION BY B.DIMENSION) AS FILAS_DIMENSION
+    FROM (
+        SELECT CASE {etiquetas}ELSE 'TOTAL' END AS DIMENSION,
+            {columnas}
+            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
+            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
+            CASE 
+                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
+                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
+                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
+            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
+            END AS {columna_diferencia}
+        FROM DOCUMENTOS_COLOMBIA.TURISMO.{tabla} AS A
+        WHERE {filtro}
+        GROUP BY GROUPING SETS ({conjuntos}())
+    ) AS B
+    QUALIFY {' OR '.join(condiciones)}
+    ORDER BY B.DIMENSION, POSICION
+    """
+
+def separar_turismo_dimensiones(df, dimensiones, columna_diferencia, etiqueta_total='TOTAL'):
+    """
+    Separa el resultado de consulta_turismo_dimensiones en una tabla por dimensión con las mismas filas que
+    consulta_top_n: el top-N que ya viene ordenado de la consulta, una fila 'Otros' (solo si la dimensión tiene más
+    de N filas según FILAS_DIMENSION) y el total.
+
+    Parámetros:
+    - df: DataFrame con el resultado de consulta_turismo_dimensiones.
+    - dimensiones: diccionario {dimensión: N del top} (N None para mostrar todas las filas sin 'Otros').
+    - columna_diferencia: nombre de la columna con la diferencia porcentual.
+    - etiqueta_total: etiqueta de la fila de total.
+
+    Retorna:
+    - tablas: diccionario {dimensión: DataFrame con la dimensión, SUMA_TURISMO_T_1, SUMA_TURISMO_T y la diferencia}.
+    """
+    # 1. Total de la unidad: fila del conjunto vacío (sin datos el total es 0, como COALESCE en consulta_top_n)
+    total = df[df['DIMENSION'] == 'TOTAL']
+    total_t_1 = total['SUMA_TURISMO_T_1'].fillna(0).sum()
+    total_t = total['SUMA_TURISMO_T'].fillna(0).sum()
+    diferencia_total = calcular_diferencia_porcentual(total_t, total_t_1)
+
+    tablas = {}
+    for dimension, n in dimensiones.items():
+        columnas = [dimension, 'SUMA_TURISMO_T_1', 'SUMA_TURISMO_T', columna_diferencia]
+        # 2. Top-N de la dimensión (la consulta ya lo trae ordenado por el valor del año T)
+        detalle = df[df['DIMENSION'] == dimension]
+        top = detalle[columnas]
+        filas = [top]
+        # 3. 'Otros': diferencia entre el total y el top-N
+        if n is not None and len(detalle) and detalle['FILAS_DIMENSION'].iloc[0] > n:
+            otros_t_1 = total_t_1 - top['SUMA_TURISMO_T_1'].sum()
+            otros_t = total_t - top['SUMA_TURISMO_T'].sum()
+            filas.append(pd.DataFrame([['Otros', otros_t_1, otros_t, calcular_diferencia_porcentual(otros_t, otros_t_1)]], columns=columnas))
+        # 4. Total
+        filas.append(pd.DataFrame([[etiqueta_total, total_t_1, total_t, diferencia_total]], columns=columnas))
+        tablas[dimension] = pd.concat(filas, ignore_index=True)
+    return tablas
+
+def consulta_categorias_exportaciones(tabla, agrupacion, unidad, categorias, n=5):
+    """
+    Construye una sola consulta con el total, los tipos y el top-N de cada categoría de exportaciones de una unidad.
+
+    Las tablas de categorías se diferencian solo por la columna TABLA, por lo que en lugar de una consulta por
+    categoría se lee la tabla una sola vez: ROW_NUMBER particionado por TABLA ordena cada categoría por el valor del
+    año T y QUALIFY deja solo su top-N. FILAS_TABLA indica cuántas filas tiene la categoría para saber si lleva 'Otros'.
+    El resultado se separa con separar_categorias_exportaciones.
+
+    Parámetros:
+    - tabla: tabla de categorías ('ST_CATEGORIAS_CERRADO' o 'ST_CATEGORIAS_CORRIDO').
+    - agrupacion: agrupación de la unidad.
+    - unidad: unidad seleccionada.
+    - categorias: lista de valores de TABLA con el detalle por categoría.
+    - n: número de filas del top de cada categoría.
+
+    Retorna:
+    - query: consulta SQL con TABLA, CATEGORIA, SUMA_USD_T_1, SUMA_USD_T, DIFERENCIA_PORCENTUAL, POSICION y FILAS_TABLA.
+    """
+    tablas_sql = ', '.join(f"'{valor}'" for valor in ['TOTAL', 'TIPOS'] + list(categorias))
+    return f"""
+        SELECT A.TABLA,
+                A.CATEGORIA,
+                A.SUMA_USD_T_1,
+                A.SUMA_USD_T,
+                A.DIFERENCIA_PORCENTUAL,
+                ROW_NUMBER() OVER (PARTITION BY A.TABLA ORDER BY A.SUMA_USD_T DESC) AS POSICION,
+                COUNT(*) OVER (PARTITION BY A.TABLA) AS FILAS_TABLA
+        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+        WHERE A.AGRUPACION = '{agrupacion}'
+            AND A.UNIDAD = '{unidad}'
+            AND A.TABLA IN ({tablas_sql})
+        QUALIFY A.TABLA IN ('TOTAL', 'TIPOS') OR POSICION <= {n};
+    """
+
+def separar_categorias_exportaciones(df, categorias, n=5):
+    """
+    Separa el resultado de consulta_categorias_exportaciones en las tablas que usa get_data.
+
+    Cada categoría queda con las mismas filas que consulta_top_n con el total de exportaciones no mineras: el top-N,
+    una fila 'Otros' (solo si la categoría tiene más de N filas) y la fila 'Total', que es la fila 'No Mineras' de
+    los tipos. Si la unidad no tiene fila 'No Mineras' la categoría queda solo con su top-N.
+
+    Parámetros:
+    - df: DataFrame con el resultado de consulta_categorias_exportaciones.
+    - categorias: lista de valores de TABLA con el detalle por categoría.
+    - n: número de filas del top de cada categoría.
+
+    Retorna:
+    - tablas: diccionario {'TOTAL': DataFrame, 'TIPOS': DataFrame, categoría: DataFrame} con las columnas
+      CATEGORIA, SUMA_USD_T_1, SUMA_USD_T y DIFERENCIA_PORCENTUAL.
+    """
+    columnas = ['CATEGORIA', 'SUMA_USD_T_1', 'SUMA_USD_T', 'DIFERENCIA_PORCENTUAL']
+    # Sin filas el resultado no trae columnas
+    if df.empty:
+        df = pd.DataFrame(columns=['TABLA'] + columnas + ['POSICION', 'FILAS_TABLA'])
+    df = df.sort_values(['TABLA', 'POSICION'], kind='stable')
+    por_tabla = {tabla: grupo for tabla, grupo in df.groupby('TABLA', sort=False)}
+    vacia = df.iloc[0:0]
+
+    # 1. Total y tipos de la unidad (Mineras y No Mineras en orden alfabético)
+    tablas = {
+        'TOTAL': por_tabla.get('TOTAL', vacia)[columnas].assign(CATEGORIA='Total').reset_index(drop=True),
+        'TIPOS': por_tabla.get('TIPOS', vacia)[columnas].sort_values('CATEGORIA', kind='stable').reset_index(drop=True),
+    }
+
+    # 2. Total de exportaciones no mineras: fila 'Total' de cada categoría
+    no_mineras = tablas['TIPOS'][tablas['TIPOS']['CATEGORIA'] == 'No Mineras']
+
+    # 3. Top-N, 'Otros' y 'Total' de cada categoría
+    for categoria in categorias:
+        detalle = por_tabla.get(categoria, vacia)
+        filas = [detalle[columnas]]
+        if len(no_mineras):
+            total = no_mineras.iloc[0]
+            if len(detalle) and detalle['FILAS_TABLA'].iloc[0] > n:
+                otros_t_1 = total['SUMA_USD_T_1'] - detalle['SUMA_USD_T_1'].sum()
+                otros_t = total['SUMA_USD_T'] - detalle['SUMA_USD_T'].sum()
+                filas.append(pd.DataFrame([['Otros', otros_t_1, otros_t, calcular_diferencia_porcentual(otros_t, otros_t_1)]], columns=columnas))
+            filas.append(pd.DataFrame([['Total', total['SUMA_USD_T_1'], total['SUMA_USD_T'], total['DIFERENCIA_PORCENTUAL']]], columns=columnas))
+        tablas[categoria] = pd.concat(filas, ignore_index=True)
+    return tablas
+
+def consulta_paises_inversion(periodo, columna_diferencia, paises_sql=None, n=5):
+    """
+    Construye una sola consulta con el top-N de países de IED y de ICE de una unidad para un periodo.
+
+    ROW_NUMBER particionado por CATEGORIA ordena los países de cada categoría por el valor del año T y QUALIFY deja
+    solo su top-N. Cada fila trae también el número de países de la categoría (FILAS_CATEGORIA) y la suma de la
+    unidad (GRUPO_T_1 y GRUPO_T), con los que separar_paises_inversion arma 'Otros' y 'TOTAL' sin otra consulta.
+
+    Parámetros:
+    - periodo: 'CERRADO' o 'CORRIDO'.
+    - columna_diferencia: nombre de la columna con la diferencia porcentual del periodo.
+    - paises_sql: (opcional) lista SQL de los países de la unidad. None para todos los países (Colombia).
+    - n: número de filas del top de cada categoría.
+
+    Retorna:
+    - query: consulta SQL con CATEGORIA, UNIDAD, SUMA_INVERSION_T_1, SUMA_INVERSION_T, la diferencia, POSICION,
+      FILAS_CATEGORIA, GRUPO_T_1 y GRUPO_T.
+    """
+    filtro_paises = f"AND A.UNIDAD IN ({paises_sql})" if paises_sql is not None else ''
+    return f"""
+        SELECT A.CATEGORIA,
+            A.UNIDAD,
+            A.SUMA_INVERSION_T_1,
+            A.SUMA_INVERSION_T,
+            A.{columna_diferencia},
+            ROW_NUMBER() OVER (PARTITION BY A.CATEGORIA ORDER BY A.SUMA_INVERSION_T DESC) AS POSICION,
+            COUNT(*) OVER (PARTITION BY A.CATEGORIA) AS FILAS_CATEGORIA,
+            COALESCE(SUM(A.SUMA_INVERSION_T_1) OVER (PARTITION BY A.CATEGORIA), 0) AS GRUPO_T_1,
+            COALESCE(SUM(A.SUMA_INVERSION_T) OVER (PARTITION BY A.CATEGORIA), 0) AS GRUPO_T
+        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_{periodo} AS A
+        WHERE A.AGRUPACION = 'PAISES'
+            AND A.UNIDAD NOT IN ('TOTAL')
+            AND A.CATEGORIA IN ('IED', 'ICE')
+            {filtro_paises}
+        QUALIFY POSICION <= {n};
+    """
+
+def separar_paises_inversion(df, categoria, columna_diferencia, total=None, otros_total=True, n=5):
+    """
+    Separa de consulta_paises_inversion la tabla de países de una categoría con las mismas filas que consulta_top_n:
+    el top-N, una fila 'Otros' (solo si la unidad tiene más de N países) y la fila 'TOTAL'.
+
+    Parámetros:
+    - df: DataFrame con el resultado de consulta_paises_inversion.
+    - categoria: 'IED' o 'ICE'.
+    - columna_diferencia: nombre de la columna con la diferencia porcentual del periodo.
+    - total: (opcional) DataFrame de una fila con el total (el total mundial en Colombia). Por defecto la suma de la unidad.
+    - otros_total: si es False solo se devuelve el top-N, sin 'Otros' ni total.
+    - n: número de filas del top.
+
+    Retorna:
+    - DataFrame con UNIDAD, SUMA_INVERSION_T_1, SUMA_INVERSION_T y la diferencia porcentual.
+    """
+    columnas = ['UNIDAD', 'SUMA_INVERSION_T_1', 'SUMA_INVERSION_T', columna_diferencia]
+    # Sin filas el resultado no trae columnas
+    if df.empty:
+        df = pd.DataFrame(columns=['CATEGORIA'] + columnas + ['POSICION', 'FILAS_CATEGORIA', 'GRUPO_T_1', 'GRUPO_T'])
+
+    # 1. Top-N de la categoría
+    detalle = df[df['CATEGORIA'] == categoria].sort_values('POSICION', kind='stable')
+    filas = [detalle[columnas]]
+    if not otros_total:
+        return pd.concat(filas, ignore_index=True)
+
+    # 2. Total: el entregado o la suma de la unidad (0 si no tiene países)
+    if total is None:
+        total_t_1 = detalle['GRUPO_T_1'].iloc[0] if len(detalle) else 0
+        total_t = detalle['GRUPO_T'].iloc[0] if len(detalle) else 0
+        total = pd.DataFrame([['TOTAL', total_t_1, total_t, calcular_diferencia_porcentual(total_t, total_t_1)]], columns=columnas)
+
+    # 3. 'Otros': diferencia entre el total y el top-N
+    if len(total) and len(detalle) and detalle['FILAS_CATEGORIA'].iloc[0] > n:
+        otros_t_1 = total['SUMA_INVERSION_T_1'].iloc[0] - detalle['SUMA_INVERSION_T_1'].sum()
+        otros_t = total['SUMA_INVERSION_T'].iloc[0] - detalle['SUMA_INVERSION_T'].sum()
+        filas.append(pd.DataFrame([['Otros', otros_t_1, otros_t, calcular_diferencia_porcentual(otros_t, otros_t_1)]], columns=columnas))
+    filas.append(total[columnas].assign(UNIDAD='TOTAL'))
+    return pd.concat(filas, ignore_index=True)
+
+def consulta_conteo_empresas(agrupacion, unidad, umbrales, periodos=None):
+    """
+    Construye la consulta que cuenta en Snowflake las empresas exportadoras distintas por año para uno o varios umbrales.
+
+    La tabla ST_CONTEO_EMPRESAS_* se recorre una sola vez por periodo: se cruza con la lista de umbrales y se agrupa por
+    umbral y año con COUNT(DISTINCT NIT_EXPORTADOR), de modo que solo se transfieren unas pocas filas por umbral.
+
+    Parámetros:
+    - agrupacion: el nivel de agrupación para filtrar los datos.
+    - unidad: la unidad seleccionada según la agrupación.
+    - umbrales: lista de valores USD mínimos exportados para contar la empresa.
+    - periodos: (opcional) lista con 'CERRADO' y/o 'CORRIDO'. Por defecto ambos.
+
+    Retorna:
+    - query: consulta SQL con las columnas PERIODO, UMBRAL, YEAR y EMPRESAS.
+    """
+    # 1. Definir periodos y la lista de umbrales como tabla de valores (SELECT ... UNION ALL para que la consulta
+    # también se pueda ejecutar sobre el snapshot local en DuckDB)
+    if periodos is None:
+        periodos = ['CERRADO', 'CORRIDO']
+    umbrales_sql = ' UNION ALL '.join(f"SELECT {umbral} AS UMBRAL" for umbral in umbrales)
+
+    # 2. Una consulta por periodo sobre su tabla de conteo
+    consultas_periodo = []
+    for periodo in periodos:
+        consultas_periodo.append(f"""
+            SELECT '{periodo}' AS PERIODO,
+                U.UMBRAL,
+                A.YEAR,
+                COUNT(DISTINCT A.NIT_EXPORTADOR) AS EMPRESAS
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_{periodo} AS A
+            INNER JOIN ({umbrales_sql}) AS U
+                ON A.VALOR_USD > U.UMBRAL
+            WHERE A.AGRUPACION = '{agrupacion}'
+                AND A.UNIDAD = '{unidad}'
+            GROUP BY U.UMBRAL, A.YEAR
+        """)
+
+    # 3. Unir los periodos en una sola consulta
+    return "\nUNION ALL\n".join(consultas_periodo) + "\nORDER BY PERIODO, UMBRAL, YEAR;"
+
+
+def get_conteo_empresas(session, agrupacion, unidad, umbrales, periodos=None):
+    """
+    Cuenta las empresas exportadoras distintas por año para varios umbrales en una sola consulta a Snowflake.
+
+    Ejemplo: get_conteo_empresas(session, 'PAISES', 'Estados Unidos', [10000, 100000, 1000000])
+
+    Parámetros:
+    - session: sesión de Snowflake.
+    - agrupacion: el nivel de agrupación para filtrar los datos.
+    - unidad: la unidad seleccionada según la agrupación.
+    - umbrales: lista de valores USD mínimos exportados para contar la empresa.
+    - periodos: (opcional) lista con 'CERRADO' y/o 'CORRIDO'. Por defecto ambos.
+
+    Retorna:
+    - DataFrame de pandas con las columnas PERIODO, UMBRAL, YEAR y EMPRESAS.
+    """
+    query = consulta_conteo_empresas(agrupacion, unidad, umbrales, periodos)
+    return pd.DataFrame(session.sql(query).collect())
+
+
+def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None, geo_params=None, dict_verificacion=None, max_concurrencia=None, al_completar=None):
     """
     Esta función extrae y organiza datos de exportaciones desde una base de datos en Snowflake.
 
@@ -789,23 +1065,27 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
     - agrupacion: el nivel de agrupación para filtrar los datos.
     - unidad: la unidad de medida para filtrar los datos.
     - umbral: valor USD exportado mínimo exportado para contar la empresa. 
+    - geo_params: (opcional) parámetros geográficos ya calculados con get_data_parametros. Si no se entregan se consultan.
+    - dict_verificacion: (opcional) diccionario de verificación ya calculado. Si no se entrega se calcula con los
+      resultados de las consultas (verificar_resultados), sin sondear antes las tablas.
+    - max_concurrencia: (opcional) número máximo de consultas simultáneas. Por defecto MAX_CONSULTAS_CONCURRENTES.
+    - al_completar: (opcional) función al_completar(completadas, total) que recibe el avance de las consultas.
 
     La función realiza los siguientes pasos:
     1. Define las categorías y tipos de tablas a consultar.
-    2. Realiza consultas SQL para obtener los totales de exportaciones en USD.
-    3. Realiza consultas SQL para obtener los tipos de exportaciones en USD.
-    4. Realiza consultas SQL para obtener datos por categoría para año cerrado.
-    5. Realiza consultas SQL para obtener datos por categoría para año corrido.
-    6. Realiza consultas SQL para obtener información de empresas.
-    7. Realiza consultas SQL para contar el número de empresas únicas por año.
-    8. Retorna todos los resultados en un diccionario.
+    2. Construye todas las consultas SQL necesarias según la agrupación.
+    3. Ejecuta las consultas de forma concurrente con ejecutar_consultas y calcula con sus resultados los indicadores CON/SIN DATOS.
+    4. Procesa los totales, tipos, categorías, empresas y conteos de exportaciones.
+    5. Procesa los datos de inversión, turismo, conectividad y oportunidades.
+    6. Retorna todos los resultados en un diccionario.
     """
 
     ######################################
     # OBTENER PARÁMETROS SEGÚN SEA EL CASO
     ######################################
 
-    geo_params = get_data_parametros(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    if geo_params is None:
+        geo_params = get_data_parametros(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
 
     # Parámetros para los datos de exportaciones
     AGRUPACION = geo_params['AGRUPACION']
@@ -828,20 +1108,10 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         DEPARTAMENTOS_TURISMO = [departamento for departamento in geo_params['UNIDAD_COD'] if departamento is not None]
         DEPARTAMENTOS_TURISMO_sql = ', '.join(f"'{departamento}'" for departamento in DEPARTAMENTOS_TURISMO)
         
-    #################################
-    # INDICADOR DE PRESENCIA DE DATOS
-    #################################
-
-    dict_verificacion = verif_ejes(session, geo_params)
-    
     ##################################
     # Diccionario para hoja de resumen
     ##################################
-    datos_resumen = {}
-
-    ###############
-    # Exportaciones
-    ###############
+    datos_resumen = rs.ResumenDatos()
 
     # 1. Definir las categorías y tipos de tablas a consultar
     categorias = ['CONTINENTE', 'DEPARTAMENTOS', 'HUBS', 'PAIS', 'SECTORES', 'SUBSECTORES', 'TLCS']
@@ -849,25 +1119,177 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
     tablas_peso = ['ST_CATEGORIAS_PESO_CERRADO', 'ST_CATEGORIAS_PESO_CORRIDO']
     tablas_nit_empresas = ['ST_NIT_CERRADO', 'ST_NIT_CORRIDO']
 
+    ###########################
+    # CONSTRUCCIÓN DE CONSULTAS
+    ###########################
+    # Las consultas solo dependen de los parámetros, por lo que se construyen todas primero, se ejecutan en paralelo
+    # con ejecutar_consultas y el procesamiento posterior lee los resultados por clave. No se sondea antes si hay
+    # datos: cada tabla se consulta una sola vez y los indicadores CON/SIN DATOS salen de sus resultados.
+    consultas = {}
+
+    # Exportaciones: total, tipos y top 5 de cada categoría en USD en una sola consulta por periodo
+    for tabla in tablas_usd:
+        consultas[f'CATEGORIAS {tabla}'] = consulta_categorias_exportaciones(tabla, AGRUPACION, UNIDAD, categorias)
+
+    # Total de exportaciones no mineras: es la fila 'Total' de las tablas de empresas
+    totales_nme_sql = {}
+    for tabla in tablas_usd:
+        totales_nme_sql[tabla] = f"""
+            SELECT A.SUMA_USD_T_1,
+                    A.SUMA_USD_T,
+                    A.DIFERENCIA_PORCENTUAL
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.TABLA = 'TIPOS'
+                AND A.CATEGORIA = 'No Mineras'
+        """
+
+    # Exportaciones: top 5 de empresas, 'Otros' y 'Total'
+    for tabla, tabla_usd in zip(tablas_nit_empresas, tablas_usd):
+        query = f"""
+            SELECT A.CATEGORIA,
+                    A.RAZON_SOCIAL,
+                    A.SECTOR_ESTRELLA,
+                    A.SUMA_USD_T_1,
+                    A.SUMA_USD_T,
+                    A.DIFERENCIA_PORCENTUAL
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+        """
+        consultas[f'EMPRESAS {tabla}'] = consulta_top_n(query, 'CATEGORIA', 'SUMA_USD_T_1', 'SUMA_USD_T', 'DIFERENCIA_PORCENTUAL',
+                                                      consulta_total=totales_nme_sql[tabla_usd],
+                                                      columnas_no_aplica=['RAZON_SOCIAL', 'SECTOR_ESTRELLA'])
+
+    # Exportaciones: conteo de empresas para año cerrado y año corrido
+    for periodo in ['CERRADO', 'CORRIDO']:
+        consultas[f'CONTEO {periodo}'] = consulta_conteo_empresas(AGRUPACION, UNIDAD, [UMBRAL], periodos=[periodo])
+
+    # Exportaciones: totales, tipos y medios de transporte en peso
+    for tabla in tablas_peso:
+        # Totales de exportaciones en peso
+        consultas[f'TOTALES PESO {tabla}'] = f"""
+            SELECT 'Total' AS CATEGORIA,
+                    A.SUMA_PESO_T_1,
+                    A.SUMA_PESO_T,
+                    A.DIFERENCIA_PORCENTUAL
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.TABLA = 'TOTAL';
+        """
+        # Tipos de exportaciones en peso
+        consultas[f'TIPOS PESO {tabla}'] = f"""
+            SELECT A.CATEGORIA,
+                    A.SUMA_PESO_T_1,
+                    A.SUMA_PESO_T,
+                    A.DIFERENCIA_PORCENTUAL
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.TABLA = 'TIPOS';
+        """
+        # Medios de transporte mineras
+        consultas[f'MEDIOS PESO MINERO {tabla}'] = f"""
+            SELECT A.CATEGORIA,
+                    A.SUMA_PESO_T_1,
+                    A.SUMA_PESO_T
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.TABLA = 'MEDIO MINERAS';
+        """
+        # Medios de transporte no mineras
+        consultas[f'MEDIOS PESO NO MINERO {tabla}'] = f"""
+            SELECT A.CATEGORIA,
+                    A.SUMA_PESO_T_1,
+                    A.SUMA_PESO_T
+            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
+            WHERE A.AGRUPACION = '{AGRUPACION}'
+                AND A.UNIDAD = '{UNIDAD}'
+                AND A.TABLA = 'MEDIO NO MINERAS';
+        """
+
+    # Inversión: países de IED e ICE de la unidad en una sola consulta por periodo. El total mundial y las
+    # actividades de Colombia no dependen de la unidad: se leen de agregados_inversion, una vez por versión de datos
+    # Sin países de inversión no se consulta y la unidad queda sin datos de IED ni de ICE
+    if (AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES'] and PAISES_INVERSION) or AGRUPACION == 'COLOMBIA':
+        for periodo, columna_diferencia in inv.PERIODOS.items():
+            consultas[f'INVERSION PAISES {periodo}'] = consulta_paises_inversion(periodo, columna_diferencia,
+                                                                                PAISES_INVERSION_sql if AGRUPACION != 'COLOMBIA' else None)
+
+    # Turismo
+    # Una sola consulta por periodo con GROUPING SETS: país, departamento, ciudad, género, motivo y total
+    # Sin códigos de países o departamentos no se consulta y la unidad queda sin datos de turismo
+    filtro_turismo = None
+    # Países
+    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES'] and PAISES_TURISMO:
+        filtro_turismo = f"A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
+    # Departamentos
+    if AGRUPACION in ['DEPARTAMENTOS'] and DEPARTAMENTOS_TURISMO:
+        filtro_turismo = f"A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
+    # Colombia
+    if AGRUPACION == 'COLOMBIA':
+        filtro_turismo = "1 = 1"
+
+    # Dimensiones de cada periodo con el tamaño del top (género muestra todas las filas)
+    dimensiones_turismo_cerrado = {'PAIS_RESIDENCIA': 5, 'DPTO_HOSPEDAJE': 5, 'CIUDAD_HOSPEDAJE': 5, 'DESCRIPCION_GENERO': None, 'MOVC_NOMBRE': 5}
+    dimensiones_turismo_corrido = {'PAIS_RESIDENCIA': 5, 'DPTO_HOSPEDAJE': 5, 'CIUDAD_HOSPEDAJE': 5}
+
+    if filtro_turismo is not None:
+        consultas['TURISMO CERRADO'] = consulta_turismo_dimensiones('ST_PAISES_CERRADO', dimensiones_turismo_cerrado, filtro_turismo, 'DIFERENCIA_PORCENTUAL_T')
+        consultas['TURISMO CORRIDO'] = consulta_turismo_dimensiones('ST_PAISES_CORRIDO', dimensiones_turismo_corrido, filtro_turismo, 'DIFERENCIA_PORCENTUAL')
+
+    # Oportunidades de Exportación, IED y Turismo en una sola consulta (si no se consultaron ya para esta solicitud)
+    if 'OPORTUNIDADES' not in geo_params:
+        query_oportunidades = consulta_oportunidades(geo_params)
+        if query_oportunidades is not None:
+            consultas['OPORTUNIDADES'] = query_oportunidades
+
+    # Conectividad: los datos de conectividad solo se usan en departamentos
+    if AGRUPACION in ['DEPARTAMENTOS'] and DEPARTAMENTOS_TURISMO:
+        # Constuir consulta
+        query_conectividad = """SELECT A.AEROLINEA AS "Aerolínea",
+        A.CIUDAD_ORIGEN AS "Ciudad Origen",
+        A.CIUDAD_DESTINO AS "Ciudad Destino",
+        A.FRECUENCIAS AS "Frecuencias",
+        A.SEMANA AS "Semana de análisis"
+        FROM DOCUMENTOS_COLOMBIA.TURISMO.CONECTIVIDAD AS A
+        WHERE 1 = 1 """
+        # Agregar departamento
+        query_conectividad += f" AND A.COD_DIVIPOLA_DEPARTAMENTO_DESTINO IN ({DEPARTAMENTOS_TURISMO_sql})"
+        consultas['CONECTIVIDAD'] = query_conectividad
+
+    #######################
+    # EJECUCIÓN CONCURRENTE
+    #######################
+    # Se envían todas las consultas a la vez, con a lo sumo max_concurrencia en vuelo
+    resultados = ejecutar_consultas(session, consultas, max_concurrencia, al_completar)
+
+    #################################
+    # INDICADOR DE PRESENCIA DE DATOS
+    #################################
+    # Los indicadores salen de los resultados ya consultados (ver verificar_resultados) y quedan memorizados en
+    # geo_params, donde verif_ejes los encuentra sin volver a sondear las tablas
+    if dict_verificacion is None:
+        dict_verificacion = verificar_resultados(session, geo_params, resultados)
+
+    ###############
+    # Exportaciones
+    ###############
+
     # 2. Consultar los totales de exportaciones en USD
+    # Una sola consulta por periodo trae el total, los tipos y las categorías: se separa por TABLA en memoria
+    tablas_categorias = {tabla: separar_categorias_exportaciones(resultados[f'CATEGORIAS {tabla}'], categorias)
+                         for tabla in tablas_usd if f'CATEGORIAS {tabla}' in resultados}
     totales = {}
     for tabla in tablas_usd:
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_CERRADO' and dict_verificacion['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO') or \
            (tabla == 'ST_CATEGORIAS_CORRIDO' and dict_verificacion['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO'):
-            # Construir la consulta SQL para obtener los totales de exportaciones en USD
-            query_totales = f"""
-                SELECT 'Total' AS CATEGORIA, 
-                        A.SUMA_USD_T_1, 
-                        A.SUMA_USD_T,  
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}' 
-                    AND A.UNIDAD IN ('{UNIDAD}')
-                    AND A.TABLA = 'TOTAL';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_totales).collect())
+            # Tomar la fila del total de la consulta de categorías
+            data = tablas_categorias[tabla]['TOTAL']
             # Almacenar el DataFrame en el diccionario 'totales' con el nombre de la tabla como clave
             totales[tabla] = data
 
@@ -877,19 +1299,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_CERRADO' and dict_verificacion['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO') or \
            (tabla == 'ST_CATEGORIAS_CORRIDO' and dict_verificacion['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO'):
-            # Construir la consulta SQL para obtener los tipos de exportaciones en USD
-            query_tipos = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_USD_T_1, 
-                        A.SUMA_USD_T, 
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}' 
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = 'TIPOS';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_tipos).collect())
+            # Tomar las filas de tipos de la consulta de categorías
+            data = tablas_categorias[tabla]['TIPOS']
             # Calcular el total de exportaciones en USD para agregar participación
             total_t = totales[tabla]['SUMA_USD_T'].sum()
             # Concatenar los datos de tipos con los totales
@@ -898,67 +1309,17 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
             data = calcular_participacion_porcentual(data, 'SUMA_USD_T', total_t, 'PARTICIPACION_T')
             # Almacenar el DataFrame en el diccionario 'tipos' con el nombre de la tabla como clave
             tipos[tabla] = data
-            # Agregar los datos al diccionario de resumen
-            # Inicializar la entrada en el diccionario de resumen para la tabla actual
-            if tabla not in datos_resumen:
-                datos_resumen[tabla] = {}
-            # Recorrer las filas del DataFrame y almacenar los valores en el diccionario
-            for index, row in data.iterrows():
-                categoria = row['CATEGORIA']
-                if categoria not in datos_resumen[tabla]:
-                    datos_resumen[tabla][categoria] = []
-                datos_resumen[tabla][categoria].append({
-                    'sum_usd_t_1': row['SUMA_USD_T_1'],
-                    'sum_usd_t': row['SUMA_USD_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                    'participacion_t': row['PARTICIPACION_T']
-                })
+            # Agregar los datos al resumen por columnas (CERRADO o CORRIDO según la tabla)
+            datos_resumen.agregar('EXPORTACIONES', tabla.rsplit('_', 1)[-1], data, 'CATEGORIA', t_1='SUMA_USD_T_1', t='SUMA_USD_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
 
     # 4. Consultar datos por categoría para año cerrado
     categorias_cerrado = {}
     for categoria in categorias:
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (dict_verificacion['exportaciones_nme_cerrado'] == 'CON DATOS DE EXPORTACIONES NME CERRADO'):
-            # Construir la consulta SQL para obtener datos por categoría para año cerrado
-            query = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_USD_T_1, 
-                        A.SUMA_USD_T, 
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CERRADO AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}' 
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = '{categoria}'
-                ORDER BY A.SUMA_USD_T DESC;
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query).collect())
-            row_num = data.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            data = data.head(5)           
-            # Filtrar los datos totales para 'No Mineras' y cambiar la categoría a 'Total'
-            df_totales_nme = tipos['ST_CATEGORIAS_CERRADO']
-            df_totales_nme = df_totales_nme[df_totales_nme['CATEGORIA'] == 'No Mineras']
-            df_totales_nme['CATEGORIA'] = 'Total'
-            total_t = df_totales_nme['SUMA_USD_T'].sum()
-            total_t_1 = df_totales_nme['SUMA_USD_T_1'].sum()
-            # Calcular datos para la categoría 'Otros'
-            otros_categoria = 'Otros'
-            otros_t = total_t - data['SUMA_USD_T'].sum()
-            otros_t_1 = total_t_1 - data['SUMA_USD_T_1'].sum()
-            otros_porcentual = calcular_diferencia_porcentual(otros_t, otros_t_1)
-            # Crear DataFrame para 'Otros'
-            otros_df = pd.DataFrame({
-                'CATEGORIA': [otros_categoria],
-                'SUMA_USD_T_1': [otros_t_1],
-                'SUMA_USD_T': [otros_t],
-                'DIFERENCIA_PORCENTUAL': [otros_porcentual]
-            })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original
-            # Solo se concatena el otro, en caso de que exista esta categoria:
-            if (row_num <= 5):
-                data = pd.concat([data, df_totales_nme])
-            else:
-                data = pd.concat([data, otros_df, df_totales_nme])
+            # Tomar la tabla de la categoría: ya trae el top 5, 'Otros' (si aplica) y 'Total'
+            data = tablas_categorias['ST_CATEGORIAS_CERRADO'][categoria]
+            total_t = data.loc[data['CATEGORIA'] == 'Total', 'SUMA_USD_T'].sum()
             # Calcular la participación de cada categoría en el total de exportaciones
             data = calcular_participacion_porcentual(data, 'SUMA_USD_T', total_t, 'PARTICIPACION_T')
             # Almacenar el DataFrame en el diccionario 'categorias_cerrado' con la categoría como clave
@@ -969,46 +1330,9 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
     for categoria in categorias:
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (dict_verificacion['exportaciones_nme_corrido'] == 'CON DATOS DE EXPORTACIONES NME CORRIDO'):
-            # Construir la consulta SQL para obtener datos por categoría para año corrido
-            query = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_USD_T_1, 
-                        A.SUMA_USD_T, 
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CORRIDO AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}' 
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = '{categoria}'
-                ORDER BY A.SUMA_USD_T DESC;
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query).collect())
-            row_num = data.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            data = data.head(5)
-            # Filtrar los datos totales para 'No Mineras' y cambiar la categoría a 'Total'
-            df_totales_nme = tipos['ST_CATEGORIAS_CORRIDO']
-            df_totales_nme = df_totales_nme[df_totales_nme['CATEGORIA'] == 'No Mineras']
-            df_totales_nme['CATEGORIA'] = 'Total'
-            total_t = df_totales_nme['SUMA_USD_T'].sum()
-            total_t_1 = df_totales_nme['SUMA_USD_T_1'].sum()
-            # Calcular datos para la categoría 'Otros'
-            otros_categoria = 'Otros'
-            otros_t = total_t - data['SUMA_USD_T'].sum()
-            otros_t_1 = total_t_1 - data['SUMA_USD_T_1'].sum()
-            otros_porcentual = calcular_diferencia_porcentual(otros_t, otros_t_1)
-            # Crear DataFrame para 'Otros'
-            otros_df = pd.DataFrame({
-                'CATEGORIA': [otros_categoria],
-                'SUMA_USD_T_1': [otros_t_1],
-                'SUMA_USD_T': [otros_t],
-                'DIFERENCIA_PORCENTUAL': [otros_porcentual]
-            })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original
-            # Solo se concatena el otro, en caso de que exista esta categoria:
-            if (row_num <= 5):
-                data = pd.concat([data, df_totales_nme])
-            else:
-                data = pd.concat([data, otros_df, df_totales_nme])
+            # Tomar la tabla de la categoría: ya trae el top 5, 'Otros' (si aplica) y 'Total'
+            data = tablas_categorias['ST_CATEGORIAS_CORRIDO'][categoria]
+            total_t = data.loc[data['CATEGORIA'] == 'Total', 'SUMA_USD_T'].sum()
             # Calcular la participación de cada categoría en el total de exportaciones
             data = calcular_participacion_porcentual(data, 'SUMA_USD_T', total_t, 'PARTICIPACION_T')
             # Almacenar el DataFrame en el diccionario 'categorias_corrido' con la categoría como clave
@@ -1020,56 +1344,9 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_NIT_CERRADO' and dict_verificacion['exportaciones_empresas_cerrado'] == 'CON DATOS DE EMPRESAS CERRADO') or \
            (tabla == 'ST_NIT_CORRIDO' and dict_verificacion['exportaciones_empresas_corrido'] == 'CON DATOS DE EMPRESAS CORRIDO'):
-            # Construir la consulta SQL para obtener información de empresas
-            query = f"""
-                SELECT A.CATEGORIA, 
-                        A.RAZON_SOCIAL,
-                        A.SECTOR_ESTRELLA,
-                        A.SUMA_USD_T_1, 
-                        A.SUMA_USD_T, 
-                        A.DIFERENCIA_PORCENTUAL
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A 
-                WHERE A.AGRUPACION = '{AGRUPACION}' 
-                    AND A.UNIDAD = '{UNIDAD}'
-                ORDER BY SUMA_USD_T DESC;
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query).collect())
-            row_num = data.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            data = data.head(5)
-            # Filtrar y cambiar la categoría a 'Total' para los datos totales de 'No Mineras'
-            if tabla == 'ST_NIT_CERRADO':
-                df_totales_nme = tipos['ST_CATEGORIAS_CERRADO']
-            elif tabla == 'ST_NIT_CORRIDO':
-                df_totales_nme = tipos['ST_CATEGORIAS_CORRIDO']
-            df_totales_nme = df_totales_nme[df_totales_nme['CATEGORIA'] == 'No Mineras']
-            df_totales_nme['CATEGORIA'] = 'Total'
-            total_t = df_totales_nme['SUMA_USD_T'].sum()
-            total_t_1 = df_totales_nme['SUMA_USD_T_1'].sum()
-            df_totales_nme['RAZON_SOCIAL'] = 'No aplica'
-            df_totales_nme['SECTOR_ESTRELLA'] = 'No aplica'
-            # Calcular datos para la categoría 'Otros'
-            otros_categoria = 'Otros'
-            otros_razon_social = 'No aplica'
-            otros_sector_estrella = 'No aplica'
-            otros_t = total_t - data['SUMA_USD_T'].sum()
-            otros_t_1 = total_t_1 - data['SUMA_USD_T_1'].sum()
-            otros_porcentual = calcular_diferencia_porcentual(otros_t, otros_t_1)
-            # Crear DataFrame para 'Otros'
-            otros_df = pd.DataFrame({
-                'CATEGORIA': [otros_categoria],
-                'RAZON_SOCIAL': [otros_razon_social],
-                'SECTOR_ESTRELLA': [otros_sector_estrella],       
-                'SUMA_USD_T_1': [otros_t_1],
-                'SUMA_USD_T': [otros_t],
-                'DIFERENCIA_PORCENTUAL': [otros_porcentual]
-            })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original
-            # Solo se concatena el otro, en caso de que exista esta categoria:
-            if (row_num <= 5):
-                data = pd.concat([data, df_totales_nme])
-            else:
-                data = pd.concat([data, otros_df, df_totales_nme])
+            # Tomar el resultado de la consulta: ya trae el top 5 de empresas, 'Otros' (si aplica) y 'Total'
+            data = resultados[f'EMPRESAS {tabla}']
+            total_t = data.loc[data['CATEGORIA'] == 'Total', 'SUMA_USD_T'].sum()
             # Calcular la participación de cada empresa en el total de exportaciones
             data = calcular_participacion_porcentual(data, 'SUMA_USD_T', total_t, 'PARTICIPACION_T')
             # Almacenar el DataFrame en el diccionario 'empresas' con el nombre de la tabla como clave
@@ -1077,51 +1354,31 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
 
     # 7. Contar el número de empresas únicas por año
     conteo = {}
-    # Inicializar el diccionario de resumen
-    datos_resumen['CONTEO'] = {}
 
     # Consultar el conteo de empresas para año cerrado
     # Verificar el diccionario de verificación antes de ejecutar la consulta
     if (dict_verificacion['exportaciones_conteo_cerrado'] == 'CON DATOS DE CONTEO CERRADO'):
-        query_cerrado = f"""
-            SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CERRADO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-        # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-        data_cerrado = pd.DataFrame(session.sql(query_cerrado).collect())
-        # Contar el número de empresas únicas por año
-        conteo_cerrado = data_cerrado.groupby('YEAR')['NIT_EXPORTADOR'].nunique()
+        # Tomar el resultado de la consulta como DataFrame de pandas
+        data_cerrado = resultados['CONTEO CERRADO']
+        # El conteo de empresas únicas por año ya viene calculado desde Snowflake
+        conteo_cerrado = data_cerrado.set_index('YEAR')['EMPRESAS'].rename('NIT_EXPORTADOR')
         # Almacenar el resultado en el diccionario 'conteo' bajo la clave 'CERRADO'
         conteo['CERRADO'] = conteo_cerrado
-        # Inicializar el diccionario de resumen
-        datos_resumen['CONTEO'] = {}
-        # Agregar datos de 'CERRADO'
-        datos_resumen['CONTEO']['CERRADO'] = conteo_cerrado.to_dict()
+        # Agregar al resumen el conteo de 'CERRADO'
+        datos_resumen.agregar('CONTEO', 'CERRADO', data_cerrado, 'YEAR', t='EMPRESAS')
 
     # Consultar el conteo de empresas para año corrido
     # Verificar el diccionario de verificación antes de ejecutar la consulta
     if (dict_verificacion['exportaciones_conteo_corrido'] == 'CON DATOS DE CONTEO CORRIDO'):
-        query_corrido = f"""
-            SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CORRIDO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-        # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-        data_corrido = pd.DataFrame(session.sql(query_corrido).collect())
-        # Contar el número de empresas únicas por año
-        conteo_corrido = data_corrido.groupby('YEAR')['NIT_EXPORTADOR'].nunique()
+        # Tomar el resultado de la consulta como DataFrame de pandas
+        data_corrido = resultados['CONTEO CORRIDO']
+        # El conteo de empresas únicas por año ya viene calculado desde Snowflake
+        conteo_corrido = data_corrido.set_index('YEAR')['EMPRESAS'].rename('NIT_EXPORTADOR')
         # Almacenar el resultado en el diccionario 'conteo' bajo la clave 'CORRIDO'
         conteo['CORRIDO'] = conteo_corrido
 
-        # Agregar datos de 'CORRIDO'
-        datos_resumen['CONTEO']['CORRIDO'] = conteo_corrido.to_dict()
+        # Agregar al resumen el conteo de 'CORRIDO'
+        datos_resumen.agregar('CONTEO', 'CORRIDO', data_corrido, 'YEAR', t='EMPRESAS')
 
     # 8. Consultar los totales de exportaciones en peso
     totales_peso = {}
@@ -1129,19 +1386,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_PESO_CERRADO' and dict_verificacion['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO') or \
            (tabla == 'ST_CATEGORIAS_PESO_CORRIDO' and dict_verificacion['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO'):
-            # Construir la consulta SQL para obtener los totales de exportaciones en peso
-            query_totales = f"""
-                SELECT 'Total' AS CATEGORIA, 
-                        A.SUMA_PESO_T_1, 
-                        A.SUMA_PESO_T, 
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}'
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = 'TOTAL';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_totales).collect())
+            # Tomar el resultado de la consulta como DataFrame de pandas
+            data = resultados[f'TOTALES PESO {tabla}']
             # Almacenar el DataFrame en el diccionario 'totales_peso' con el nombre de la tabla como clave
             totales_peso[tabla] = data
 
@@ -1151,19 +1397,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_PESO_CERRADO' and dict_verificacion['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO') or \
            (tabla == 'ST_CATEGORIAS_PESO_CORRIDO' and dict_verificacion['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO'):
-            # Construir la consulta SQL para obtener los tipos de exportaciones en peso
-            query_totales = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_PESO_T_1, 
-                        A.SUMA_PESO_T, 
-                        A.DIFERENCIA_PORCENTUAL 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}'
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = 'TIPOS';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_totales).collect())
+            # Tomar el resultado de la consulta como DataFrame de pandas
+            data = resultados[f'TIPOS PESO {tabla}']
             # Calcular el total de exportaciones en peso para agregar participación
             total_t = totales_peso[tabla]['SUMA_PESO_T'].sum()
             # Concatenar los datos de tipos con los totales
@@ -1172,21 +1407,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
             data = calcular_participacion_porcentual(data, 'SUMA_PESO_T', total_t, 'PARTICIPACION_T')
             # Almacenar el DataFrame en el diccionario 'tipos_peso' con el nombre de la tabla como clave
             tipos_peso[tabla] = data
-            # Agregar los datos al diccionario de resumen
-            # Inicializar la entrada en el diccionario de resumen para la tabla actual
-            if tabla not in datos_resumen:
-                datos_resumen[tabla] = {}
-            # Recorrer las filas del DataFrame y almacenar los valores en el diccionario
-            for index, row in data.iterrows():
-                categoria = row['CATEGORIA']
-                if categoria not in datos_resumen[tabla]:
-                    datos_resumen[tabla][categoria] = []
-                datos_resumen[tabla][categoria].append({
-                    'sum_peso_t_1': row['SUMA_PESO_T_1'],
-                    'sum_peso_t': row['SUMA_PESO_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                    'participacion_t': row['PARTICIPACION_T']
-                })
+            # Agregar los datos al resumen por columnas (CERRADO o CORRIDO según la tabla)
+            datos_resumen.agregar('EXPORTACIONES PESO', tabla.rsplit('_', 1)[-1], data, 'CATEGORIA', t_1='SUMA_PESO_T_1', t='SUMA_PESO_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
 
     # 9.1 Pesos por medio de transporte: Mineras
     medios_peso_minero = {}
@@ -1194,18 +1416,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_PESO_CERRADO' and dict_verificacion['pesos_minero_cerrado'] == 'CON DATOS CERRADO') or \
         (tabla == 'ST_CATEGORIAS_PESO_CORRIDO' and dict_verificacion['pesos_minero_corrido'] == 'CON DATOS CORRIDO'):
-            # Construir la consulta SQL para obtener los tipos de exportaciones por medio de transporte
-            query_peso_medios_mineros = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_PESO_T_1, 
-                        A.SUMA_PESO_T 
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.{tabla} AS A
-                WHERE A.AGRUPACION = '{AGRUPACION}'
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = 'MEDIO MINERAS';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_peso_medios_mineros).collect())
+            # Tomar el resultado de la consulta como DataFrame de pandas
+            data = resultados[f'MEDIOS PESO MINERO {tabla}']
             # Calcular el total de exportaciones en peso para agregar participación
             total_t_1 = data['SUMA_PESO_T_1'].sum()
             total_t = data['SUMA_PESO_T'].sum()
@@ -1228,18 +1440,8 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         # Verificar el diccionario de verificación antes de ejecutar la consulta
         if (tabla == 'ST_CATEGORIAS_PESO_CERRADO' and dict_verificacion['pesos_no_minero_cerrado'] == 'CON DATOS CERRADO') or \
         (tabla == 'ST_CATEGORIAS_PESO_CORRIDO' and dict_verificacion['pesos_no_minero_corrido'] == 'CON DATOS CORRIDO'):
-            # Construir la consulta SQL para obtener los tipos de exportaciones por medio de transporte
-            query_peso_medios_no_mineros = f"""
-                SELECT A.CATEGORIA, 
-                        A.SUMA_PESO_T_1, 
-                        A.SUMA_PESO_T
-                FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CORRIDO AS A 
-                WHERE A.AGRUPACION = '{AGRUPACION}'
-                    AND A.UNIDAD = '{UNIDAD}'
-                    AND A.TABLA = 'MEDIO NO MINERAS';
-            """
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            data = pd.DataFrame(session.sql(query_peso_medios_no_mineros).collect())
+            # Tomar el resultado de la consulta como DataFrame de pandas
+            data = resultados[f'MEDIOS PESO NO MINERO {tabla}']
             # Calcular el total de exportaciones en peso para agregar participación
             total_t_1 = data['SUMA_PESO_T_1'].sum()
             total_t = data['SUMA_PESO_T'].sum()
@@ -1270,52 +1472,15 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
     ice_total = {}
 
 
+    # Total mundial y actividades: comunes a todos los reportes de la versión de datos
+    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
+        agregados_inversion = inv.obtener_agregados_inversion(session, geo_params.get('VERSION'))
+
     # Los datos de actividades solo son válidos para la agrupación de Colombia:
     if AGRUPACION == 'COLOMBIA':
-        # IED NME ACTIVIDADES
-        # Construir consulta de actividades año cerrado
-        query_actividades_ied_cerrado = """
-        SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_ACTIVIDADES_CERRADO AS A
-        WHERE A.AGRUPACION = 'ACTIVIDADES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.UNIDAD IN ('Servicios financieros y empresariales',
-                            'Industrias manufactureras',
-                            'Comercio al por mayor y al por menor, restaurantes y hoteles',
-                            'Transportes, almacenamiento y comunicaciones',
-                            'Electricidad, gas y agua',
-                            'Servicios comunales sociales y personales',
-                            'Construcción',
-                            'Agricultura, caza, silvicultura y pesca')
-            AND A.TABLA = 'INVERSIÓN ACTIVIDADES'
-            AND A.CATEGORIA = 'IED';
-        """ 
-        # Construir consulta de actividades año corrido
-        query_actividades_ied_corrido = """
-                SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_ACTIVIDADES_CORRIDO AS A
-        WHERE A.AGRUPACION = 'ACTIVIDADES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.UNIDAD IN ('Servicios financieros y empresariales',
-                            'Industrias manufactureras',
-                            'Comercio al por mayor y al por menor, restaurantes y hoteles',
-                            'Transportes, almacenamiento y comunicaciones',
-                            'Electricidad, gas y agua',
-                            'Servicios comunales sociales y personales',
-                            'Construcción',
-                            'Agricultura, caza, silvicultura y pesca')
-            AND A.TABLA = 'INVERSIÓN ACTIVIDADES'
-            AND A.CATEGORIA = 'IED';
-        """
         # Año cerrado
-        # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-        ied_actividades_cerrado = pd.DataFrame(session.sql(query_actividades_ied_cerrado).collect())
+        # Tomar las actividades de los agregados de inversión
+        ied_actividades_cerrado = agregados_inversion.actividades_ied('CERRADO')
         ied_actividades_cerrado_totales_unidad = 'Total'
         ied_actividades_cerrado_totales_t_1 = ied_actividades_cerrado['SUMA_INVERSION_T_1'].sum()
         ied_actividades_cerrado_totales_t = ied_actividades_cerrado['SUMA_INVERSION_T'].sum()
@@ -1334,24 +1499,12 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         ied_actividades_cerrado = calcular_participacion_porcentual(ied_actividades_cerrado, 'SUMA_INVERSION_T', ied_actividades_cerrado_totales_t, 'PARTICIPACION_T')
         # Almacenar el DataFrame en el diccionario 'tipos_peso' con el nombre de la tabla como clave
         ied_colombia_actividades['ied_cerrado'] = ied_actividades_cerrado
-        # Agregar los datos al diccionario de resumen
-        # Inicializar la entrada en el diccionario de resumen para la tabla actual
-        datos_resumen['IED CERRADO ACTIVIDADES'] = {}
-        # Recorrer las filas del DataFrame y almacenar los valores en el diccionario
-        for index, row in ied_actividades_cerrado.iterrows():
-            unidad = row['UNIDAD']
-            if unidad not in datos_resumen['IED CERRADO ACTIVIDADES']:
-                datos_resumen['IED CERRADO ACTIVIDADES'][unidad] = []
-            datos_resumen['IED CERRADO ACTIVIDADES'][unidad].append({
-                'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                'sum_inversion_t': row['SUMA_INVERSION_T'],
-                'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T'],
-                'participacion_t': row['PARTICIPACION_T']
-            })
+        # Agregar los datos al resumen por columnas
+        datos_resumen.agregar('IED ACTIVIDADES', 'CERRADO', ied_actividades_cerrado, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T')
     
         # Año corrido
-        # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-        ied_actividades_corrido = pd.DataFrame(session.sql(query_actividades_ied_corrido).collect())
+        # Tomar las actividades de los agregados de inversión
+        ied_actividades_corrido = agregados_inversion.actividades_ied('CORRIDO')
         ied_actividades_corrido_totales_unidad = 'Total'
         ied_actividades_corrido_totales_t_1 = ied_actividades_corrido['SUMA_INVERSION_T_1'].sum()
         ied_actividades_corrido_totales_t = ied_actividades_corrido['SUMA_INVERSION_T'].sum()
@@ -1370,171 +1523,25 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
         ied_actividades_corrido = calcular_participacion_porcentual(ied_actividades_corrido, 'SUMA_INVERSION_T', ied_actividades_corrido_totales_t, 'PARTICIPACION_T')
         # Almacenar el DataFrame en el diccionario 'tipos_peso' con el nombre de la tabla como clave
         ied_colombia_actividades['ied_corrido'] = ied_actividades_corrido
-        # Agregar los datos al diccionario de resumen
-        # Inicializar la entrada en el diccionario de resumen para la tabla actual
-        datos_resumen['IED CORRIDO ACTIVIDADES'] = {}
-        # Recorrer las filas del DataFrame y almacenar los valores en el diccionario
-        for index, row in ied_actividades_corrido.iterrows():
-            unidad = row['UNIDAD']
-            if unidad not in datos_resumen['IED CORRIDO ACTIVIDADES']:
-                datos_resumen['IED CORRIDO ACTIVIDADES'][unidad] = []
-            datos_resumen['IED CORRIDO ACTIVIDADES'][unidad].append({
-                'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                'sum_inversion_t': row['SUMA_INVERSION_T'],
-                'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                'participacion_t': row['PARTICIPACION_T']
-            })
+        # Agregar los datos al resumen por columnas
+        datos_resumen.agregar('IED ACTIVIDADES', 'CORRIDO', ied_actividades_corrido, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
 
     # IED por países válido para las agrupaciones de 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES' y 'COLOMBIA'
     if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
-        # Construir consulta de paises año cerrado
-        query_paises_ied_cerrado = f"""
-        SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-        WHERE A.AGRUPACION = 'PAISES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.CATEGORIA = 'IED'
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_paises_ied_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-        query_paises_ied_cerrado += f" ORDER BY A.SUMA_INVERSION_T DESC;"
-
-        # Construir consulta de totales año cerrado
-        if AGRUPACION == 'COLOMBIA':
-            query_paises_ied_totales_cerrado = """
-            SELECT A.UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'IED';
-            """ 
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS']:
-            query_paises_ied_totales_cerrado = f"""
-            SELECT 'TOTAL' AS UNIDAD,
-                SUM(A.SUMA_INVERSION_T_1) AS SUMA_INVERSION_T_1,
-                SUM(A.SUMA_INVERSION_T) AS SUMA_INVERSION_T,
-                CASE 
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) > 0 THEN 100
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) = 0 THEN 0
-                    WHEN SUM(A.SUMA_INVERSION_T) = 0 AND SUM(A.SUMA_INVERSION_T_1) > 0 THEN -100
-                ELSE ((SUM(A.SUMA_INVERSION_T) - SUM(A.SUMA_INVERSION_T_1)) / SUM(A.SUMA_INVERSION_T_1)) * 100
-                END AS DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.CATEGORIA = 'IED'
-            """
-            query_paises_ied_totales_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql});" 
-
-        # Construir consulta para participación de agrupaciones sobre la IED total
-        query_ied_totales_cerrado = """
-            SELECT 'Total IED del Mundo en Colombia' AS UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'IED';
-            """  
-
-
-        # Construir consulta de paises año corrido
-        query_paises_ied_corrido = """
-        SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-        WHERE A.AGRUPACION = 'PAISES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.CATEGORIA = 'IED'
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_paises_ied_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-        query_paises_ied_corrido += f" ORDER BY A.SUMA_INVERSION_T DESC;"
-
-        # Construir consulta de totales año corrido
-        if AGRUPACION == 'COLOMBIA':
-            query_paises_ied_totales_corrido = """
-            SELECT A.UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'IED';
-            """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS']:
-            query_paises_ied_totales_corrido = """
-            SELECT 'TOTAL' AS UNIDAD,
-                SUM(A.SUMA_INVERSION_T_1) AS SUMA_INVERSION_T_1,
-                SUM(A.SUMA_INVERSION_T) AS SUMA_INVERSION_T,
-                CASE 
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) > 0 THEN 100
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) = 0 THEN 0
-                    WHEN SUM(A.SUMA_INVERSION_T) = 0 AND SUM(A.SUMA_INVERSION_T_1) > 0 THEN -100
-                ELSE ((SUM(A.SUMA_INVERSION_T) - SUM(A.SUMA_INVERSION_T_1)) / SUM(A.SUMA_INVERSION_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.CATEGORIA = 'IED'
-            """
-            query_paises_ied_totales_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql});" 
-
-        # Construir consulta para participación de agrupaciones sobre la IED total
-        query_ied_totales_corrido = """
-            SELECT 'Total IED del Mundo en Colombia' AS UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'IED';
-        """
-
-        # Ejecutar las consultas solo si hay datos:
+        # Procesar los resultados solo si hay datos:
         if dict_verificacion['ied_cerrado'] == 'CON DATOS DE IED CERRADO':
             # Año cerrado
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            ied_paises_cerrado = pd.DataFrame(session.sql(query_paises_ied_cerrado).collect())
-            # Calcular tamaño del df original para agregar otros en los casos que sea necesario
-            row_num_ied_paises_cerrado = ied_paises_cerrado.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            ied_paises_cerrado = ied_paises_cerrado.head(5)
-
+            # Separar de la consulta de países el top 5, 'Otros' (si aplica) y 'TOTAL'; en PAISES solo el top 5
+            # En Colombia el total es el total mundial
+            ied_paises_cerrado_otros_totales = separar_paises_inversion(resultados['INVERSION PAISES CERRADO'], 'IED', 'DIFERENCIA_PORCENTUAL_T',
+                                                                        total=agregados_inversion.total_mundo('IED', 'CERRADO') if AGRUPACION == 'COLOMBIA' else None,
+                                                                        otros_total=AGRUPACION != 'PAISES')
+            ied_paises_cerrado = ied_paises_cerrado_otros_totales
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                ied_paises_cerrado_total = pd.DataFrame(session.sql(query_paises_ied_totales_cerrado).collect())
+                ied_paises_cerrado_total = ied_paises_cerrado_otros_totales[ied_paises_cerrado_otros_totales['UNIDAD'] == 'TOTAL'].copy()
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                ied_cerrado_total = pd.DataFrame(session.sql(query_ied_totales_cerrado).collect())
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                # Crear otros
-                ied_paises_cerrado_unidad = 'Otros'
-                ied_paises_cerrado_t_1 = ied_paises_cerrado_total['SUMA_INVERSION_T_1'].sum() - ied_paises_cerrado['SUMA_INVERSION_T_1'].sum()
-                ied_paises_cerrado_t = ied_paises_cerrado_total['SUMA_INVERSION_T'].sum() - ied_paises_cerrado['SUMA_INVERSION_T'].sum()
-                ied_paises_cerrado_diferencia_porcentual = calcular_diferencia_porcentual(ied_paises_cerrado_t, ied_paises_cerrado_t_1)
-                # Crear DataFrame para 'Otros'
-                otros_df = pd.DataFrame({
-                    'UNIDAD': [ied_paises_cerrado_unidad],
-                    'SUMA_INVERSION_T_1' : [ied_paises_cerrado_t_1],
-                    'SUMA_INVERSION_T' : [ied_paises_cerrado_t],
-                    'DIFERENCIA_PORCENTUAL_T' : [ied_paises_cerrado_diferencia_porcentual]
-                })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original según agrupación
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                if (row_num_ied_paises_cerrado <= 5):
-                    ied_paises_cerrado_otros_totales = pd.concat([ied_paises_cerrado, ied_paises_cerrado_total])
-                else:
-                    ied_paises_cerrado_otros_totales = pd.concat([ied_paises_cerrado, otros_df, ied_paises_cerrado_total])
-            if AGRUPACION in ['PAISES']:
-                ied_paises_cerrado_otros_totales = pd.concat([ied_paises_cerrado])
-            # Calcular la participación de cada categoría en el total de exportaciones
+                ied_cerrado_total = agregados_inversion.total_mundo('IED', 'CERRADO', inv.ETIQUETAS_MUNDO['IED'])
+            # Calcular la participación de cada país en el total
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
                 total_t = ied_paises_cerrado_total['SUMA_INVERSION_T'].sum()
                 ied_paises_cerrado_otros_totales = calcular_participacion_porcentual(ied_paises_cerrado_otros_totales, 'SUMA_INVERSION_T', total_t, 'PARTICIPACION_T')
@@ -1549,70 +1556,27 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
                 ied_cerrado_agrupaciones = calcular_participacion_porcentual(ied_cerrado_agrupaciones, 'SUMA_INVERSION_T', total_t_ied, 'PARTICIPACION_T')
                 ied_total['ied_cerrado_total'] = ied_cerrado_agrupaciones
 
-            # Agregar los datos al diccionario de resumen
-            datos_resumen['IED CERRADO PAISES'] = {}
-            for index, row in ied_paises_cerrado_otros_totales.iterrows():
-                unidad = row['UNIDAD']
-                if unidad not in datos_resumen['IED CERRADO PAISES']:
-                    datos_resumen['IED CERRADO PAISES'][unidad] = []          
-                entry = {
-                    'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                    'sum_inversion_t': row['SUMA_INVERSION_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T']
-                }            
-                if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                    entry['participacion_t'] = row['PARTICIPACION_T']            
-                datos_resumen['IED CERRADO PAISES'][unidad].append(entry)
-
-            # Agregar los datos al diccionario de resumen por agrupaciones
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']: 
-                datos_resumen['IED CERRADO TOTAL'] = {}
-                for index, row in ied_cerrado_agrupaciones.iterrows():
-                    unidad = row['UNIDAD']
-                    if unidad not in datos_resumen['IED CERRADO TOTAL']:
-                        datos_resumen['IED CERRADO TOTAL'][unidad] = []          
-                    entry = {
-                        'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                        'sum_inversion_t': row['SUMA_INVERSION_T'],
-                        'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T'],
-                        'participacion_t' : row['PARTICIPACION_T']
-                    }            
-                    datos_resumen['IED CERRADO TOTAL'][unidad].append(entry)
-
-        # Ejecutar las consultas solo si hay datos:
+            # Agregar los datos al resumen por columnas (en PAISES la tabla no tiene participación)
+            datos_resumen.agregar('IED PAISES', 'CERRADO', ied_paises_cerrado_otros_totales, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T' if AGRUPACION != 'PAISES' else None)
+
+            # Agregar los datos al resumen por agrupaciones
+            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
+                datos_resumen.agregar('IED TOTAL', 'CERRADO', ied_cerrado_agrupaciones, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T')
+
+        # Procesar los resultados solo si hay datos:
         if dict_verificacion['ied_corrido'] == 'CON DATOS DE IED CORRIDO':
             # Año corrido
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            ied_paises_corrido = pd.DataFrame(session.sql(query_paises_ied_corrido).collect())
-            # Calcular tamaño del df original para agregar otros en los casos que sea necesario
-            row_num_ied_paises_corrido = ied_paises_corrido.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            ied_paises_corrido = ied_paises_corrido.head(5)
+            # Separar de la consulta de países el top 5, 'Otros' (si aplica) y 'TOTAL'; en PAISES solo el top 5
+            # En Colombia el total es el total mundial
+            ied_paises_corrido_otros_totales = separar_paises_inversion(resultados['INVERSION PAISES CORRIDO'], 'IED', 'DIFERENCIA_PORCENTUAL',
+                                                                        total=agregados_inversion.total_mundo('IED', 'CORRIDO') if AGRUPACION == 'COLOMBIA' else None,
+                                                                        otros_total=AGRUPACION != 'PAISES')
+            ied_paises_corrido = ied_paises_corrido_otros_totales
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                ied_paises_corrido_total = pd.DataFrame(session.sql(query_paises_ied_totales_corrido).collect())
+                ied_paises_corrido_total = ied_paises_corrido_otros_totales[ied_paises_corrido_otros_totales['UNIDAD'] == 'TOTAL'].copy()
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                ied_corrido_total = pd.DataFrame(session.sql(query_ied_totales_corrido).collect())
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                # Crear otros
-                ied_paises_corrido_unidad = 'Otros'
-                ied_paises_corrido_t_1 = ied_paises_corrido_total['SUMA_INVERSION_T_1'].sum() - ied_paises_corrido['SUMA_INVERSION_T_1'].sum()
-                ied_paises_corrido_t = ied_paises_corrido_total['SUMA_INVERSION_T'].sum() - ied_paises_corrido['SUMA_INVERSION_T'].sum()
-                ied_paises_corrido_diferencia_porcentual = calcular_diferencia_porcentual(ied_paises_corrido_t, ied_paises_corrido_t_1)
-                # Crear DataFrame para 'Otros'
-                otros_df = pd.DataFrame({
-                    'UNIDAD': [ied_paises_corrido_unidad],
-                    'SUMA_INVERSION_T_1' : [ied_paises_corrido_t_1],
-                    'SUMA_INVERSION_T' : [ied_paises_corrido_t],
-                    'DIFERENCIA_PORCENTUAL' : [ied_paises_corrido_diferencia_porcentual]
-                })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original según agrupación
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                if (row_num_ied_paises_corrido <= 5):
-                    ied_paises_corrido_otros_totales = pd.concat([ied_paises_corrido, ied_paises_corrido_total])
-                else: 
-                    ied_paises_corrido_otros_totales = pd.concat([ied_paises_corrido, otros_df, ied_paises_corrido_total])
-            if AGRUPACION in ['PAISES']:
-                ied_paises_corrido_otros_totales = pd.concat([ied_paises_corrido])
-            # Calcular la participación de cada categoría en el total de exportaciones
+                ied_corrido_total = agregados_inversion.total_mundo('IED', 'CORRIDO', inv.ETIQUETAS_MUNDO['IED'])
+            # Calcular la participación de cada país en el total
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
                 total_t = ied_paises_corrido_total['SUMA_INVERSION_T'].sum()
                 ied_paises_corrido_otros_totales = calcular_participacion_porcentual(ied_paises_corrido_otros_totales, 'SUMA_INVERSION_T', total_t, 'PARTICIPACION_T')
@@ -1627,188 +1591,30 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
                 ied_corrido_agrupaciones = calcular_participacion_porcentual(ied_corrido_agrupaciones, 'SUMA_INVERSION_T', total_t_ied, 'PARTICIPACION_T')
                 ied_total['ied_corrido_total'] = ied_corrido_agrupaciones
 
-            # Agregar los datos al diccionario de resumen
-            datos_resumen['IED CORRIDO PAISES'] = {}
-            for index, row in ied_paises_corrido_otros_totales.iterrows():
-                unidad = row['UNIDAD']
-                if unidad not in datos_resumen['IED CORRIDO PAISES']:
-                    datos_resumen['IED CORRIDO PAISES'][unidad] = []
-                
-                entry = {
-                    'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                    'sum_inversion_t': row['SUMA_INVERSION_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL']
-                }
-                
-                if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                    entry['participacion_t'] = row['PARTICIPACION_T']
-                
-                datos_resumen['IED CORRIDO PAISES'][unidad].append(entry)
-            # Agregar los datos al diccionario de resumen por agrupaciones
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']: 
-                datos_resumen['IED CORRIDO TOTAL'] = {}
-                for index, row in ied_corrido_agrupaciones.iterrows():
-                    unidad = row['UNIDAD']
-                    if unidad not in datos_resumen['IED CORRIDO TOTAL']:
-                        datos_resumen['IED CORRIDO TOTAL'][unidad] = []               
-                    entry = {
-                        'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                        'sum_inversion_t': row['SUMA_INVERSION_T'],
-                        'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                        'participacion_t' : row['PARTICIPACION_T']
-                    }
-                    datos_resumen['IED CORRIDO TOTAL'][unidad].append(entry)
+            # Agregar los datos al resumen por columnas (en PAISES la tabla no tiene participación)
+            datos_resumen.agregar('IED PAISES', 'CORRIDO', ied_paises_corrido_otros_totales, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T' if AGRUPACION != 'PAISES' else None)
+
+            # Agregar los datos al resumen por agrupaciones
+            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
+                datos_resumen.agregar('IED TOTAL', 'CORRIDO', ied_corrido_agrupaciones, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
 
     
     # ICE por países válido para las agrupaciones de 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES' y 'COLOMBIA'
     if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
-        # Construir consulta de paises año cerrado
-        query_paises_ice_cerrado = f"""
-        SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-        WHERE A.AGRUPACION = 'PAISES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.CATEGORIA = 'ICE'
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_paises_ice_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-        query_paises_ice_cerrado += f" ORDER BY A.SUMA_INVERSION_T DESC;"
-
-        # Construir consulta de totales año cerrado
-        if AGRUPACION == 'COLOMBIA':
-            query_paises_ice_totales_cerrado = """
-            SELECT A.UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE';
-            """ 
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS']:
-            query_paises_ice_totales_cerrado = f"""
-            SELECT 'TOTAL' AS UNIDAD,
-                SUM(A.SUMA_INVERSION_T_1) AS SUMA_INVERSION_T_1,
-                SUM(A.SUMA_INVERSION_T) AS SUMA_INVERSION_T,
-                CASE 
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) > 0 THEN 100
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) = 0 THEN 0
-                    WHEN SUM(A.SUMA_INVERSION_T) = 0 AND SUM(A.SUMA_INVERSION_T_1) > 0 THEN -100
-                ELSE ((SUM(A.SUMA_INVERSION_T) - SUM(A.SUMA_INVERSION_T_1)) / SUM(A.SUMA_INVERSION_T_1)) * 100
-                END AS DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_paises_ice_totales_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql});" 
-
-        # Construir consulta para participación de agrupaciones sobre la IED total
-        query_ice_totales_cerrado = """
-            SELECT 'Total ICE de Colombia en el Mundo' AS UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL_T
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE';
-            """ 
-
-
-        # Construir consulta de paises año corrido
-        query_paises_ice_corrido = """
-        SELECT A.UNIDAD,
-            A.SUMA_INVERSION_T_1,
-            A.SUMA_INVERSION_T,
-            A.DIFERENCIA_PORCENTUAL
-        FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-        WHERE A.AGRUPACION = 'PAISES'
-            AND A.UNIDAD NOT IN ('TOTAL')
-            AND A.CATEGORIA = 'ICE'
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_paises_ice_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-        query_paises_ice_corrido += f" ORDER BY A.SUMA_INVERSION_T DESC;"
-
-        # Construir consulta de totales año corrido
-        if AGRUPACION == 'COLOMBIA':
-            query_paises_ice_totales_corrido = """
-            SELECT A.UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE';
-            """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS']:
-            query_paises_ice_totales_corrido = """
-            SELECT 'TOTAL' AS UNIDAD,
-                SUM(A.SUMA_INVERSION_T_1) AS SUMA_INVERSION_T_1,
-                SUM(A.SUMA_INVERSION_T) AS SUMA_INVERSION_T,
-                CASE 
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) > 0 THEN 100
-                    WHEN SUM(A.SUMA_INVERSION_T_1) = 0 AND SUM(A.SUMA_INVERSION_T) = 0 THEN 0
-                    WHEN SUM(A.SUMA_INVERSION_T) = 0 AND SUM(A.SUMA_INVERSION_T_1) > 0 THEN -100
-                ELSE ((SUM(A.SUMA_INVERSION_T) - SUM(A.SUMA_INVERSION_T_1)) / SUM(A.SUMA_INVERSION_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_paises_ice_totales_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql});"
-
-        # Construir consulta para participación de agrupaciones sobre la IED total
-        query_ice_totales_corrido = """
-            SELECT 'Total ICE de Colombia en el Mundo' AS UNIDAD,
-                A.SUMA_INVERSION_T_1,
-                A.SUMA_INVERSION_T,
-                A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE';
-            """
-
-         # Ejecutar las consultas solo si hay datos:
+         # Procesar los resultados solo si hay datos:
         if dict_verificacion['ice_cerrado'] == 'CON DATOS DE ICE CERRADO':
             # Año cerrado
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            ice_paises_cerrado = pd.DataFrame(session.sql(query_paises_ice_cerrado).collect())
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            row_num_ice_paises_cerrado = ice_paises_cerrado.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            ice_paises_cerrado = ice_paises_cerrado.head(5)
+            # Separar de la consulta de países el top 5, 'Otros' (si aplica) y 'TOTAL'; en PAISES solo el top 5
+            # En Colombia el total es el total mundial
+            ice_paises_cerrado_otros_totales = separar_paises_inversion(resultados['INVERSION PAISES CERRADO'], 'ICE', 'DIFERENCIA_PORCENTUAL_T',
+                                                                        total=agregados_inversion.total_mundo('ICE', 'CERRADO') if AGRUPACION == 'COLOMBIA' else None,
+                                                                        otros_total=AGRUPACION != 'PAISES')
+            ice_paises_cerrado = ice_paises_cerrado_otros_totales
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                ice_paises_cerrado_total = pd.DataFrame(session.sql(query_paises_ice_totales_cerrado).collect())
+                ice_paises_cerrado_total = ice_paises_cerrado_otros_totales[ice_paises_cerrado_otros_totales['UNIDAD'] == 'TOTAL'].copy()
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                ice_cerrado_total = pd.DataFrame(session.sql(query_ice_totales_cerrado).collect())
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                # Crear otros
-                ice_paises_cerrado_unidad = 'Otros'
-                ice_paises_cerrado_t_1 = ice_paises_cerrado_total['SUMA_INVERSION_T_1'].sum() - ice_paises_cerrado['SUMA_INVERSION_T_1'].sum()
-                ice_paises_cerrado_t = ice_paises_cerrado_total['SUMA_INVERSION_T'].sum() - ice_paises_cerrado['SUMA_INVERSION_T'].sum()
-                ice_paises_cerrado_diferencia_porcentual = calcular_diferencia_porcentual(ice_paises_cerrado_t, ice_paises_cerrado_t_1)
-                # Crear DataFrame para 'Otros'
-                otros_df = pd.DataFrame({
-                    'UNIDAD': [ice_paises_cerrado_unidad],
-                    'SUMA_INVERSION_T_1' : [ice_paises_cerrado_t_1],
-                    'SUMA_INVERSION_T' : [ice_paises_cerrado_t],
-                    'DIFERENCIA_PORCENTUAL_T' : [ice_paises_cerrado_diferencia_porcentual]
-                })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original según agrupación
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                if (row_num_ice_paises_cerrado <= 5):     
-                    ice_paises_cerrado_otros_totales = pd.concat([ice_paises_cerrado, ice_paises_cerrado_total])
-                else:
-                    ice_paises_cerrado_otros_totales = pd.concat([ice_paises_cerrado, otros_df, ice_paises_cerrado_total])
-            if AGRUPACION in ['PAISES']:
-                ice_paises_cerrado_otros_totales = pd.concat([ice_paises_cerrado])
-            # Calcular la participación de cada categoría en el total de exportaciones
+                ice_cerrado_total = agregados_inversion.total_mundo('ICE', 'CERRADO', inv.ETIQUETAS_MUNDO['ICE'])
+            # Calcular la participación de cada país en el total
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
                 total_t = ice_paises_cerrado_total['SUMA_INVERSION_T'].sum()
                 ice_paises_cerrado_otros_totales = calcular_participacion_porcentual(ice_paises_cerrado_otros_totales, 'SUMA_INVERSION_T', total_t, 'PARTICIPACION_T')
@@ -1823,75 +1629,28 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
                 ice_cerrado_agrupaciones = calcular_participacion_porcentual(ice_cerrado_agrupaciones, 'SUMA_INVERSION_T', total_t_ice, 'PARTICIPACION_T')
                 ice_total['ice_cerrado_total'] = ice_cerrado_agrupaciones
 
-            # Agregar los datos al diccionario de resumen
-            datos_resumen['ICE CERRADO PAISES'] = {}
-            for index, row in ice_paises_cerrado_otros_totales.iterrows():
-                unidad = row['UNIDAD']
-                if unidad not in datos_resumen['ICE CERRADO PAISES']:
-                    datos_resumen['ICE CERRADO PAISES'][unidad] = []
-                
-                entry = {
-                    'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                    'sum_inversion_t': row['SUMA_INVERSION_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T']
-                }
-                
-                if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                    entry['participacion_t'] = row['PARTICIPACION_T']
-                
-                datos_resumen['ICE CERRADO PAISES'][unidad].append(entry)
-
-            # Agregar los datos al diccionario de resumen por agrupaciones
+            # Agregar los datos al resumen por columnas (en PAISES la tabla no tiene participación)
+            datos_resumen.agregar('ICE PAISES', 'CERRADO', ice_paises_cerrado_otros_totales, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T' if AGRUPACION != 'PAISES' else None)
+
+            # Agregar los datos al resumen por agrupaciones
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                datos_resumen['ICE CERRADO TOTAL'] = {}
-                for index, row in ice_cerrado_agrupaciones.iterrows():
-                    unidad = row['UNIDAD']
-                    if unidad not in datos_resumen['ICE CERRADO TOTAL']:
-                        datos_resumen['ICE CERRADO TOTAL'][unidad] = []
-                    
-                    entry = {
-                        'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                        'sum_inversion_t': row['SUMA_INVERSION_T'],
-                        'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T'],
-                        'participacion_t' : row['PARTICIPACION_T']
-                    }              
-                    datos_resumen['ICE CERRADO TOTAL'][unidad].append(entry)
-
-
-        # Ejecutar las consultas solo si hay datos:
+                datos_resumen.agregar('ICE TOTAL', 'CERRADO', ice_cerrado_agrupaciones, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T')
+
+
+        # Procesar los resultados solo si hay datos:
         if dict_verificacion['ice_corrido'] == 'CON DATOS DE ICE CORRIDO':
             # Año corrido
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            ice_paises_corrido = pd.DataFrame(session.sql(query_paises_ice_corrido).collect())
-            # Ejecutar la consulta y almacenar los resultados en un DataFrame de pandas
-            row_num_ice_paises_corrido = ice_paises_corrido.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-            ice_paises_corrido = ice_paises_corrido.head(5)
+            # Separar de la consulta de países el top 5, 'Otros' (si aplica) y 'TOTAL'; en PAISES solo el top 5
+            # En Colombia el total es el total mundial
+            ice_paises_corrido_otros_totales = separar_paises_inversion(resultados['INVERSION PAISES CORRIDO'], 'ICE', 'DIFERENCIA_PORCENTUAL',
+                                                                        total=agregados_inversion.total_mundo('ICE', 'CORRIDO') if AGRUPACION == 'COLOMBIA' else None,
+                                                                        otros_total=AGRUPACION != 'PAISES')
+            ice_paises_corrido = ice_paises_corrido_otros_totales
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                ice_paises_corrido_total = pd.DataFrame(session.sql(query_paises_ice_totales_corrido).collect())
+                ice_paises_corrido_total = ice_paises_corrido_otros_totales[ice_paises_corrido_otros_totales['UNIDAD'] == 'TOTAL'].copy()
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                ice_corrido_total = pd.DataFrame(session.sql(query_ice_totales_corrido).collect())
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                # Crear otros
-                ice_paises_corrido_unidad = 'Otros'
-                ice_paises_corrido_t_1 = ice_paises_corrido_total['SUMA_INVERSION_T_1'].sum() - ice_paises_corrido['SUMA_INVERSION_T_1'].sum()
-                ice_paises_corrido_t = ice_paises_corrido_total['SUMA_INVERSION_T'].sum() - ice_paises_corrido['SUMA_INVERSION_T'].sum()
-                ice_paises_corrido_diferencia_porcentual = calcular_diferencia_porcentual(ice_paises_corrido_t, ice_paises_corrido_t_1)
-                # Crear DataFrame para 'Otros'
-                otros_df = pd.DataFrame({
-                    'UNIDAD': [ice_paises_corrido_unidad],
-                    'SUMA_INVERSION_T_1' : [ice_paises_corrido_t_1],
-                    'SUMA_INVERSION_T' : [ice_paises_corrido_t],
-                    'DIFERENCIA_PORCENTUAL' : [ice_paises_corrido_diferencia_porcentual]
-                })
-            # Concatenar los datos de 'Otros' y los datos totales con el DataFrame original según agrupación
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:     
-                if (row_num_ice_paises_corrido <= 5):
-                    ice_paises_corrido_otros_totales = pd.concat([ice_paises_corrido, ice_paises_corrido_total])
-                else: 
-                    ice_paises_corrido_otros_totales = pd.concat([ice_paises_corrido, otros_df, ice_paises_corrido_total])
-            if AGRUPACION in ['PAISES']:
-                ice_paises_corrido_otros_totales = pd.concat([ice_paises_corrido])
-            # Calcular la participación de cada categoría en el total de exportaciones
+                ice_corrido_total = agregados_inversion.total_mundo('ICE', 'CORRIDO', inv.ETIQUETAS_MUNDO['ICE'])
+            # Calcular la participación de cada país en el total
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
                 total_t = ice_paises_corrido_total['SUMA_INVERSION_T'].sum()
                 ice_paises_corrido_otros_totales = calcular_participacion_porcentual(ice_paises_corrido_otros_totales, 'SUMA_INVERSION_T', total_t, 'PARTICIPACION_T')
@@ -1905,39 +1664,12 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
                 total_t_ice = ice_corrido_total['SUMA_INVERSION_T'].sum()
                 ice_corrido_agrupaciones = calcular_participacion_porcentual(ice_corrido_agrupaciones, 'SUMA_INVERSION_T', total_t_ice, 'PARTICIPACION_T')
                 ice_total['ice_corrido_total'] = ice_corrido_agrupaciones
-            # Agregar los datos al diccionario de resumen
-            datos_resumen['ICE CORRIDO PAISES'] = {}
-            for index, row in ice_paises_corrido_otros_totales.iterrows():
-                unidad = row['UNIDAD']
-                if unidad not in datos_resumen['ICE CORRIDO PAISES']:
-                    datos_resumen['ICE CORRIDO PAISES'][unidad] = []
-                
-                entry = {
-                    'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                    'sum_inversion_t': row['SUMA_INVERSION_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL']
-                }
-                
-                if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'COLOMBIA']:
-                    entry['participacion_t'] = row['PARTICIPACION_T']
-                
-                datos_resumen['ICE CORRIDO PAISES'][unidad].append(entry)
-
-            # Agregar los datos al diccionario de resumen por agrupaciones
+            # Agregar los datos al resumen por columnas (en PAISES la tabla no tiene participación)
+            datos_resumen.agregar('ICE PAISES', 'CORRIDO', ice_paises_corrido_otros_totales, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T' if AGRUPACION != 'PAISES' else None)
+
+            # Agregar los datos al resumen por agrupaciones
             if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                datos_resumen['ICE CORRIDO TOTAL'] = {}
-                for index, row in ice_corrido_agrupaciones.iterrows():
-                    unidad = row['UNIDAD']
-                    if unidad not in datos_resumen['ICE CORRIDO TOTAL']:
-                        datos_resumen['ICE CORRIDO TOTAL'][unidad] = []
-                    
-                    entry = {
-                        'sum_inversion_t_1': row['SUMA_INVERSION_T_1'],
-                        'sum_inversion_t': row['SUMA_INVERSION_T'],
-                        'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                        'participacion_t' : row['PARTICIPACION_T']
-                    }
-                    datos_resumen['ICE CORRIDO TOTAL'][unidad].append(entry)
+                datos_resumen.agregar('ICE TOTAL', 'CORRIDO', ice_corrido_agrupaciones, 'UNIDAD', t_1='SUMA_INVERSION_T_1', t='SUMA_INVERSION_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
     
     #########
     # TURISMO
@@ -1949,557 +1681,61 @@ def get_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs
     # Corrido
     turismo_corrido = {}
 
-    #########
-    # CERRADO
-    #########
-
-    # Construir consulta países
-    query_paises_turismo_paises_cerrado = f"""
-        SELECT A.PAIS_RESIDENCIA,
-            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-            CASE 
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-    WHERE 1=1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_paises_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_paises_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_paises_cerrado += f" AND 1=1"
-    # Group by
-    query_paises_turismo_paises_cerrado += f" GROUP BY A.PAIS_RESIDENCIA ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-
-    # Construir consulta departamentos
-    query_paises_turismo_departamentos_cerrado = f"""
-        SELECT A.DPTO_HOSPEDAJE,
-            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-            CASE 
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_departamentos_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_departamentos_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_departamentos_cerrado += f" AND 1=1"
-    # Group by
-    query_paises_turismo_departamentos_cerrado += f" GROUP BY A.DPTO_HOSPEDAJE ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-
-    # Construir consulta municipos
-    query_paises_turismo_municipio_cerrado = f"""
-        SELECT A.CIUDAD_HOSPEDAJE,
-            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-            CASE 
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_municipio_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_municipio_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_municipio_cerrado += f" AND 1=1"
-    # Group by
-    query_paises_turismo_municipio_cerrado += f" GROUP BY A.CIUDAD_HOSPEDAJE ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-
-    # Construir consulta género
-    query_paises_turismo_genero_cerrado = f"""
-        SELECT A.DESCRIPCION_GENERO,
-            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-            CASE 
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_genero_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_genero_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_genero_cerrado += f" AND 1=1"
-    # Group by
-    query_paises_turismo_genero_cerrado += f" GROUP BY A.DESCRIPCION_GENERO ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-    # Construir consulta motivo
-    query_paises_turismo_motivo_cerrado = f"""
-        SELECT A.MOVC_NOMBRE,
-            SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-            SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,CASE 
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-                WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-                WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-            ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-            END AS DIFERENCIA_PORCENTUAL_T
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_motivo_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_motivo_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_motivo_cerrado += f" AND 1=1"
-    # Group by
-    query_paises_turismo_motivo_cerrado += f" GROUP BY A.MOVC_NOMBRE ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-    #########
-    # CORRIDO
-    #########
-
-    # Construir consulta países
-    query_paises_turismo_paises_corrido = f"""
-    SELECT A.PAIS_RESIDENCIA,
-        SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-        SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-        CASE 
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-            WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-        ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-        END AS DIFERENCIA_PORCENTUAL
-    FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CORRIDO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_paises_corrido += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_paises_corrido += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_paises_corrido += f" AND 1=1"
-    # Group by
-    query_paises_turismo_paises_corrido += f" GROUP BY A.PAIS_RESIDENCIA ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-    
-    # Construir consulta departamentos
-    query_paises_turismo_departamentos_corrido = f"""
-    SELECT A.DPTO_HOSPEDAJE,
-        SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-        SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-        CASE 
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-            WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-        ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-        END AS DIFERENCIA_PORCENTUAL
-    FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CORRIDO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_departamentos_corrido += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_departamentos_corrido += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_departamentos_corrido += f" AND 1=1"
-    # Group by
-    query_paises_turismo_departamentos_corrido += f" GROUP BY A.DPTO_HOSPEDAJE ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-
-    # Construir consulta municipos
-    query_paises_turismo_municipio_corrido = f"""
-    SELECT A.CIUDAD_HOSPEDAJE,
-        SUM(A.SUMA_TURISMO_T_1) AS SUMA_TURISMO_T_1,
-        SUM(A.SUMA_TURISMO_T) AS SUMA_TURISMO_T,
-        CASE 
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) > 0 THEN 100
-            WHEN SUM(A.SUMA_TURISMO_T_1) = 0 AND SUM(A.SUMA_TURISMO_T) = 0 THEN 0
-            WHEN SUM(A.SUMA_TURISMO_T) = 0 AND SUM(A.SUMA_TURISMO_T_1) > 0 THEN -100
-        ELSE ((SUM(A.SUMA_TURISMO_T) - SUM(A.SUMA_TURISMO_T_1)) / SUM(A.SUMA_TURISMO_T_1)) * 100
-        END AS DIFERENCIA_PORCENTUAL
-    FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CORRIDO AS A
-    WHERE 1 = 1
-    """
-    # Países
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        query_paises_turismo_municipio_corrido += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-    # Departamentos
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        query_paises_turismo_municipio_corrido += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-    # Colombia
-    if AGRUPACION == 'COLOMBIA':
-        query_paises_turismo_municipio_corrido += f" AND 1=1"
-    # Group by
-    query_paises_turismo_municipio_corrido += f" GROUP BY A.CIUDAD_HOSPEDAJE ORDER BY SUM(A.SUMA_TURISMO_T) DESC;"
-    
-
-    # Ejecutar solo si hay datos año cerrado
+    # Procesar solo si hay datos año cerrado
     if dict_verificacion['turismo_cerrado'] == 'CON DATOS DE TURISMO CERRADO':
-        # Tablas año cerrado
-        # Ejecutar las consultas y almacenar los resultados en un DataFrame de pandas
-        turismo_paises_cerrado = pd.DataFrame(session.sql(query_paises_turismo_paises_cerrado).collect())
-        turismo_departamentos_cerrado = pd.DataFrame(session.sql(query_paises_turismo_departamentos_cerrado).collect())
-        turismo_municipio_cerrado = pd.DataFrame(session.sql(query_paises_turismo_municipio_cerrado).collect())
-        turismo_genero_cerrado = pd.DataFrame(session.sql(query_paises_turismo_genero_cerrado).collect())
-        turismo_motivo_cerrado = pd.DataFrame(session.sql(query_paises_turismo_motivo_cerrado).collect())
-        # Calcular tamaño de los df
-        row_num_turismo_paises_cerrado = turismo_paises_cerrado.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-        row_num_turismo_departamentos_cerrado = turismo_departamentos_cerrado.shape[0] 
-        row_num_turismo_municipio_cerrado = turismo_municipio_cerrado.shape[0]
-        row_num_turismo_genero_cerrado = turismo_genero_cerrado.shape[0] 
-        row_num_turismo_motivo_cerrado = turismo_motivo_cerrado.shape[0] 
-        # Calcular total
-        turismo_total_cerrado_categoria = 'TOTAL'
-        turismo_total_cerrado_t_1 = turismo_paises_cerrado['SUMA_TURISMO_T_1'].sum()
-        turismo_total_cerrado_t = turismo_paises_cerrado['SUMA_TURISMO_T'].sum()
-        turismo_total_cerrado_diferencia_porcentual = calcular_diferencia_porcentual(turismo_total_cerrado_t, turismo_total_cerrado_t_1)
-        # Tomar top 5 en dataframes válidos
-        turismo_paises_cerrado = turismo_paises_cerrado.head(5)
-        turismo_departamentos_cerrado = turismo_departamentos_cerrado.head(5)
-        turismo_municipio_cerrado = turismo_municipio_cerrado.head(5)
-        turismo_motivo_cerrado = turismo_motivo_cerrado.head(5)
-        # Calcular otros
-        # Lista de DataFrames
-        # Lista de DataFrames y sus tamaños originales
-        dataframes = [
-            (turismo_paises_cerrado, row_num_turismo_paises_cerrado),
-            (turismo_departamentos_cerrado, row_num_turismo_departamentos_cerrado),
-            (turismo_municipio_cerrado, row_num_turismo_municipio_cerrado),
-            (turismo_genero_cerrado, row_num_turismo_genero_cerrado),
-            (turismo_motivo_cerrado, row_num_turismo_motivo_cerrado)
-        ]
-        # Lista para almacenar los DataFrames 'otros'
-        otros_df_list = []
-        # Lista para almacenar los Dataframes 'totales'
-        totales_df_list = []
-        # Loop a través de los DataFrames
-        for df, original_length in dataframes:
-            # Obtener el nombre de la primera columna del DataFrame actual
-            primera_columna = df.columns[0]
-            turismo_otros_cerrado_categoria = 'Otros'
-            turismo_otros_cerrado_t_1 = turismo_total_cerrado_t_1 - df['SUMA_TURISMO_T_1'].sum()
-            turismo_otros_cerrado_t = turismo_total_cerrado_t - df['SUMA_TURISMO_T'].sum()
-            turismo_otros_cerrado_diferencia_porcentual = calcular_diferencia_porcentual(turismo_otros_cerrado_t, turismo_otros_cerrado_t_1)
-            # Crear DataFrame 
-            otros_df = pd.DataFrame({
-                primera_columna: [turismo_otros_cerrado_categoria],
-                'SUMA_TURISMO_T_1': [turismo_otros_cerrado_t_1],
-                'SUMA_TURISMO_T': [turismo_otros_cerrado_t],
-                'DIFERENCIA_PORCENTUAL_T': [turismo_otros_cerrado_diferencia_porcentual]
-            })
-            # Agregar el DataFrame 'otros' a la lista
-            otros_df_list.append(otros_df)
-            # Crear DataFrame de totales
-            totales_df = pd.DataFrame({
-                primera_columna: [turismo_total_cerrado_categoria],
-                'SUMA_TURISMO_T_1': [turismo_total_cerrado_t_1],
-                'SUMA_TURISMO_T': [turismo_total_cerrado_t],
-                'DIFERENCIA_PORCENTUAL_T': [turismo_total_cerrado_diferencia_porcentual]
-            })
-            # Agregar el DataFrame 'totales' a la lista
-            totales_df_list.append(totales_df) 
-
-        # Calcular participación
-        # Loop a través de los DataFrames
-        for i, (df, original_length) in enumerate(dataframes):
-            if df is turismo_genero_cerrado:
-                df_final = pd.concat([df, totales_df_list[i]])
-            else:
-                if original_length <= 5:
-                    df_final = pd.concat([df, totales_df_list[i]])
-                else:
-                    df_final = pd.concat([df, otros_df_list[i], totales_df_list[i]])
+        # Tablas año cerrado: cada dimensión trae el top 5 (todas las filas en género), 'Otros' (si aplica) y 'TOTAL'
+        tablas_turismo_cerrado = separar_turismo_dimensiones(resultados['TURISMO CERRADO'], dimensiones_turismo_cerrado, 'DIFERENCIA_PORCENTUAL_T')
+        for primera_columna, df_final in tablas_turismo_cerrado.items():
+            # Calcular participación sobre el total de turismo
+            turismo_total_cerrado_t = df_final.loc[df_final[primera_columna] == 'TOTAL', 'SUMA_TURISMO_T'].sum()
             df_final = calcular_participacion_porcentual(df_final, 'SUMA_TURISMO_T', turismo_total_cerrado_t, 'PARTICIPACION_T')
-            # Obtener el nombre de la primera columna del DataFrame actual
-            primera_columna = df_final.columns[0]
             turismo_cerrado[primera_columna] = df_final
 
-        # Agregar al diccionario de resumen los datos de interés
+        # Agregar al resumen por columnas los datos de interés
         # País
         if 'PAIS_RESIDENCIA' in turismo_cerrado:
-            # Inicializar el diccionario para almacenar los resultados de turismo cerrado por países
-            datos_resumen['TURISMO CERRADO PAISES'] = {}
-            # Iterar a través de cada fila del DataFrame
-            for index, row in turismo_cerrado['PAIS_RESIDENCIA'].iterrows():
-                unidad = row['PAIS_RESIDENCIA']
-                # Si la unidad no está en el diccionario, agregarla
-                if unidad not in datos_resumen['TURISMO CERRADO PAISES']:
-                    datos_resumen['TURISMO CERRADO PAISES'][unidad] = []
-                
-                # Crear una entrada con los datos relevantes
-                entry = {
-                    'sum_turismo_t_1': row['SUMA_TURISMO_T_1'],
-                    'sum_turismo_t': row['SUMA_TURISMO_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T'],
-                    'participacion_t' : row['PARTICIPACION_T']
-                }
-                # Agregar la entrada al diccionario
-                datos_resumen['TURISMO CERRADO PAISES'][unidad].append(entry)
-        
+            datos_resumen.agregar('TURISMO PAISES', 'CERRADO', turismo_cerrado['PAIS_RESIDENCIA'], 'PAIS_RESIDENCIA', t_1='SUMA_TURISMO_T_1', t='SUMA_TURISMO_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T')
         # Departamentos
         if 'DPTO_HOSPEDAJE' in turismo_cerrado:
-        # Inicializar el diccionario para almacenar los resultados de turismo cerrado por departamentos
-            datos_resumen['TURISMO CERRADO DEPARTAMENTOS'] = {}
-            # Iterar a través de cada fila del DataFrame
-            for index, row in turismo_cerrado['DPTO_HOSPEDAJE'].iterrows():
-                unidad = row['DPTO_HOSPEDAJE']
-                # Si la unidad no está en el diccionario, agregarla
-                if unidad not in datos_resumen['TURISMO CERRADO DEPARTAMENTOS']:
-                    datos_resumen['TURISMO CERRADO DEPARTAMENTOS'][unidad] = []
-                
-                # Crear una entrada con los datos relevantes
-                entry = {
-                    'sum_turismo_t_1': row['SUMA_TURISMO_T_1'],
-                    'sum_turismo_t': row['SUMA_TURISMO_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL_T'],
-                    'participacion_t' : row['PARTICIPACION_T']
-                }
-                # Agregar la entrada al diccionario
-                datos_resumen['TURISMO CERRADO DEPARTAMENTOS'][unidad].append(entry)
-
-    # Ejecutar solo si hay datos año cerrado
+            datos_resumen.agregar('TURISMO DEPARTAMENTOS', 'CERRADO', turismo_cerrado['DPTO_HOSPEDAJE'], 'DPTO_HOSPEDAJE', t_1='SUMA_TURISMO_T_1', t='SUMA_TURISMO_T', variacion='DIFERENCIA_PORCENTUAL_T', participacion='PARTICIPACION_T')
+
+    # Procesar solo si hay datos año cerrado
     if dict_verificacion['turismo_corrido'] == 'CON DATOS DE TURISMO CORRIDO':
-        # Tablas año corrido
-        turismo_paises_corrido = pd.DataFrame(session.sql(query_paises_turismo_paises_corrido).collect())
-        turismo_departamentos_corrido = pd.DataFrame(session.sql(query_paises_turismo_departamentos_corrido).collect())
-        turismo_municipio_corrido = pd.DataFrame(session.sql(query_paises_turismo_municipio_corrido).collect())
-        # Calcular tamaño de los df
-        row_num_turismo_paises_corrido = turismo_paises_corrido.shape[0] # Para utilizar en el if para agregar o no otros de forma correcta
-        row_num_turismo_departamentos_corrido = turismo_departamentos_corrido.shape[0] 
-        row_num_turismo_municipio_corrido = turismo_municipio_corrido.shape[0]           
-        # Calcular total
-        turismo_total_corrido_categoria = 'TOTAL'
-        turismo_total_corrido_t_1 = turismo_paises_corrido['SUMA_TURISMO_T_1'].sum()
-        turismo_total_corrido_t = turismo_paises_corrido['SUMA_TURISMO_T'].sum()
-        turismo_total_corrido_diferencia_porcentual = calcular_diferencia_porcentual(turismo_total_corrido_t, turismo_total_corrido_t_1)
-        # Tomar top 5 en dataframes válidos
-        turismo_paises_corrido = turismo_paises_corrido.head(5)
-        turismo_departamentos_corrido = turismo_departamentos_corrido.head(5)
-        turismo_municipio_corrido = turismo_municipio_corrido.head(5)
-        # Calcular otros
-        # Lista de DataFrames y sus tamaños originales
-        dataframes_corrido = [
-            (turismo_paises_corrido, row_num_turismo_paises_corrido),
-            (turismo_departamentos_corrido, row_num_turismo_departamentos_corrido),
-            (turismo_municipio_corrido, row_num_turismo_municipio_corrido)
-        ]
-        # Lista para almacenar los DataFrames 'otros'
-        otros_corrido_df_list = []
-        # Lista para almacenar los Dataframes 'totales'
-        totales_corrido_df_list = []
-        # Loop a través de los DataFrames
-        for df, original_length in dataframes_corrido:
-            # Obtener el nombre de la primera columna del DataFrame actual
-            primera_columna = df.columns[0]
-
-            turismo_otros_corrido_categoria = 'Otros'
-            turismo_otros_corrido_t_1 = turismo_total_corrido_t_1 - df['SUMA_TURISMO_T_1'].sum()
-            turismo_otros_corrido_t = turismo_total_corrido_t - df['SUMA_TURISMO_T'].sum()
-            turismo_otros_corrido_diferencia_porcentual = calcular_diferencia_porcentual(turismo_otros_corrido_t, turismo_otros_corrido_t_1)
-            # Crear DataFrame 
-            otros_df = pd.DataFrame({
-                primera_columna: [turismo_otros_corrido_categoria],
-                'SUMA_TURISMO_T_1': [turismo_otros_corrido_t_1],
-                'SUMA_TURISMO_T': [turismo_otros_corrido_t],
-                'DIFERENCIA_PORCENTUAL': [turismo_otros_corrido_diferencia_porcentual]
-            })
-            # Agregar el DataFrame 'otros' a la lista
-            otros_corrido_df_list.append(otros_df)
-            # Crear DataFrame 
-            totales_df = pd.DataFrame({
-                primera_columna: [turismo_total_corrido_categoria],
-                'SUMA_TURISMO_T_1': [turismo_total_corrido_t_1],
-                'SUMA_TURISMO_T': [turismo_total_corrido_t],
-                'DIFERENCIA_PORCENTUAL': [turismo_total_corrido_diferencia_porcentual]
-            })
-            # Agregar el DataFrame 'totales' a la lista
-            totales_corrido_df_list.append(totales_df)
-
-        # Calcular participación
-        # Loop a través de los DataFrames
-        for i, (df, original_length) in enumerate(dataframes_corrido):
-            if original_length <= 5:
-                df_final = pd.concat([df, totales_corrido_df_list[i]])
-            else:
-                df_final = pd.concat([df, otros_corrido_df_list[i], totales_corrido_df_list[i]])
+        # Tablas año corrido: cada dimensión trae el top 5, 'Otros' (si aplica) y 'TOTAL'
+        tablas_turismo_corrido = separar_turismo_dimensiones(resultados['TURISMO CORRIDO'], dimensiones_turismo_corrido, 'DIFERENCIA_PORCENTUAL')
+        for primera_columna, df_final in tablas_turismo_corrido.items():
+            # Calcular participación sobre el total de turismo
+            turismo_total_corrido_t = df_final.loc[df_final[primera_columna] == 'TOTAL', 'SUMA_TURISMO_T'].sum()
             df_final = calcular_participacion_porcentual(df_final, 'SUMA_TURISMO_T', turismo_total_corrido_t, 'PARTICIPACION_T')
-            # Obtener el nombre de la primera columna del DataFrame actual
-            primera_columna = df_final.columns[0]
             turismo_corrido[primera_columna] = df_final
 
-        # Agregar al diccionario de resumen los datos de interés
+        # Agregar al resumen por columnas los datos de interés
         # País
         if 'PAIS_RESIDENCIA' in turismo_corrido:
-            # Inicializar el diccionario para almacenar los resultados de turismo corrido por países
-            datos_resumen['TURISMO CORRIDO PAISES'] = {}
-            # Iterar a través de cada fila del DataFrame
-            for index, row in turismo_corrido['PAIS_RESIDENCIA'].iterrows():
-                unidad = row['PAIS_RESIDENCIA']
-                # Si la unidad no está en el diccionario, agregarla
-                if unidad not in datos_resumen['TURISMO CORRIDO PAISES']:
-                    datos_resumen['TURISMO CORRIDO PAISES'][unidad] = []
-                
-                # Crear una entrada con los datos relevantes
-                entry = {
-                    'sum_turismo_t_1': row['SUMA_TURISMO_T_1'],
-                    'sum_turismo_t': row['SUMA_TURISMO_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                    'participacion_t' : row['PARTICIPACION_T']
-                }           
-                # Agregar la entrada al diccionario
-                datos_resumen['TURISMO CORRIDO PAISES'][unidad].append(entry)
-
-        # Departamento
+            datos_resumen.agregar('TURISMO PAISES', 'CORRIDO', turismo_corrido['PAIS_RESIDENCIA'], 'PAIS_RESIDENCIA', t_1='SUMA_TURISMO_T_1', t='SUMA_TURISMO_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
+        # Departamentos
         if 'DPTO_HOSPEDAJE' in turismo_corrido:
-            # Inicializar el diccionario para almacenar los resultados de turismo corrido por departamentos
-            datos_resumen['TURISMO CORRIDO DEPARTAMENTOS'] = {}
-            # Iterar a través de cada fila del DataFrame
-            for index, row in turismo_corrido['DPTO_HOSPEDAJE'].iterrows():
-                unidad = row['DPTO_HOSPEDAJE']
-                # Si la unidad no está en el diccionario, agregarla
-                if unidad not in datos_resumen['TURISMO CORRIDO DEPARTAMENTOS']:
-                    datos_resumen['TURISMO CORRIDO DEPARTAMENTOS'][unidad] = []
-                
-                # Crear una entrada con los datos relevantes
-                entry = {
-                    'sum_turismo_t_1': row['SUMA_TURISMO_T_1'],
-                    'sum_turismo_t': row['SUMA_TURISMO_T'],
-                    'diferencia_porcentual': row['DIFERENCIA_PORCENTUAL'],
-                    'participacion_t' : row['PARTICIPACION_T']
-                }           
-                # Agregar la entrada al diccionario
-                datos_resumen['TURISMO CORRIDO DEPARTAMENTOS'][unidad].append(entry)
+            datos_resumen.agregar('TURISMO DEPARTAMENTOS', 'CORRIDO', turismo_corrido['DPTO_HOSPEDAJE'], 'DPTO_HOSPEDAJE', t_1='SUMA_TURISMO_T_1', t='SUMA_TURISMO_T', variacion='DIFERENCIA_PORCENTUAL', participacion='PARTICIPACION_T')
     
+
     ##############
     # CONECTIVIDAD
     ##############
     conectividad = {}
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        if (dict_verificacion['conectividad'] == "CON DATOS DE CONECTIVIDAD"):
-        # Los datos de conectividad solo se usan en departamentos
-            # Constuir consulta
-            query_conectividad = """SELECT A.AEROLINEA AS "Aerolínea",
-            A.CIUDAD_ORIGEN AS "Ciudad Origen",
-            A.CIUDAD_DESTINO AS "Ciudad Destino",
-            A.FRECUENCIAS AS "Frecuencias",
-            A.SEMANA AS "Semana de análisis"
-            FROM DOCUMENTOS_COLOMBIA.TURISMO.CONECTIVIDAD AS A
-            WHERE 1 = 1 """
-            # Agregar departamento
-            query_conectividad += f" AND A.COD_DIVIPOLA_DEPARTAMENTO_DESTINO IN ({DEPARTAMENTOS_TURISMO_sql})"
-
-            # Ejecutar consulta y agregar
-            df_conectividad = pd.DataFrame(session.sql(query_conectividad).collect())
-
-            # Agregar a un diccionario
-            conectividad['CONECTIVIDAD'] = df_conectividad
+    if 'CONECTIVIDAD' in consultas:
+        # Agregar a un diccionario
+        conectividad['CONECTIVIDAD'] = resultados['CONECTIVIDAD']
 
     ###############
     # OPORTUNIDADES
     ###############
 
+    # Las oportunidades se consultaron en una sola consulta junto con las demás (obtener_oportunidades)
     oportunidades = {}
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'DEPARTAMENTOS', 'COLOMBIA']: 
-        if (dict_verificacion['oportunidades_exportacion'] == "CON OPORTUNIDADES"):
-            # Exportación
-            query_oportunidades_exportacion = """
-            SELECT DISTINCT A.CADENA,
-                LOWER(A.SUBSECTOR) AS SUBSECTOR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-            WHERE A.OPORTUNIDAD = 'Exportación' 
-                AND A.CADENA NOT IN (('Turismo'))
-            """
-            # Países
-            if AGRUPACION in ['PAISES']:
-                query_oportunidades_exportacion += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-            # Departamentos
-            if AGRUPACION in ['DEPARTAMENTOS']:
-                query_oportunidades_exportacion += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-            # Order
-            query_oportunidades_exportacion += f" ORDER BY 1, 2 ASC"
-
-            # Ejecutar consulta
-            oportunidades_exportacion_df = pd.DataFrame(session.sql(query_oportunidades_exportacion).collect())
-            # Agregarlas a los resultados
-            oportunidades['EXPORTACIONES'] = oportunidades_exportacion_df
-
-        if (dict_verificacion['oportunidades_inversion'] == "CON OPORTUNIDADES"):
-            # Inversión
-            query_oportunidades_ied = """
-            SELECT DISTINCT A.CADENA,
-                LOWER(A.SUBSECTOR) AS SUBSECTOR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-            WHERE A.OPORTUNIDAD = 'IED'
-            """
-            # Países
-            if AGRUPACION in ['PAISES']:
-                query_oportunidades_ied += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-            # Departamentos
-            if AGRUPACION in ['DEPARTAMENTOS']:
-                query_oportunidades_ied += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-            # Order
-            query_oportunidades_ied += f" ORDER BY 1, 2 ASC"
-
-            # Ejecutar consulta
-            oportunidades_inversion_df = pd.DataFrame(session.sql(query_oportunidades_ied).collect())
-            # Agregarlas a los resultados
-            oportunidades['INVERSION'] = oportunidades_inversion_df
-
-        if (dict_verificacion['oportunidades_turismo'] == "CON OPORTUNIDADES"):
-            # Turismo
-            query_oportunidades_turismo = """
-            SELECT DISTINCT LOWER(A.SECTOR) AS SECTOR,
-                LOWER(A.SUBSECTOR) AS SUBSECTOR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-            WHERE A.CADENA IN ('Turismo')
-            """
-            # Países y agrupaciones de países
-            if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-                query_oportunidades_turismo += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-            # Departamentos
-            if AGRUPACION in ['DEPARTAMENTOS']:
-                query_oportunidades_turismo += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-            # Order
-            query_oportunidades_turismo += f" ORDER BY 1, 2 ASC"
-            # Ejecutar consulta
-            oportunidades_turismo_df = pd.DataFrame(session.sql(query_oportunidades_turismo).collect())
-            # Agregarlas a los resultados
-            oportunidades['TURISMO'] = oportunidades_turismo_df
+    tablas_oportunidades, _ = obtener_oportunidades(session, geo_params, resultados.get('OPORTUNIDADES'))
+    for clave, eje in [('oportunidades_exportacion', 'EXPORTACIONES'), ('oportunidades_inversion', 'INVERSION'), ('oportunidades_turismo', 'TURISMO')]:
+        if dict_verificacion[clave] == "CON OPORTUNIDADES":
+            oportunidades[eje] = tablas_oportunidades[eje]
 
     # 10. Retornar todos los resultados en un diccionario
     return {
@@ -2735,39 +1971,16 @@ def transform_year_column_name(col_name):
 
 def format_columns_exportaciones(df):
     """Aplica el formato adecuado a las columnas de valor, peso, variación y participación"""
-    # Formatear columnas de valor USD y peso
-    for col in df.columns:        
-        # Exportaciones
-        if 'USD' in col or 'TONELADAS' in col:
-            df[col] = df[col].apply(lambda x: f"{x:,.0f}".replace(',', 'X').replace('.', ',').replace('X', '.') if isinstance(x, (int, float)) else x)
-
-    # Formatear columnas de variación y participación
-    if 'Variación (%)' in df.columns:
-        df['Variación (%)'] = df['Variación (%)'].apply(lambda x: f"{x:.1f}%".replace('.', ',') if isinstance(x, (int, float)) else x)
-
-    # Formatear columnas de participación, buscando cualquier columna que comience con 'Participación (%)'
-    for col in df.columns:
-        if col.startswith('Participación (%)'):
-            df[col] = df[col].apply(lambda x: f"{x:.1f}%".replace('.', ',') if isinstance(x, (int, float)) else x)
-    
+    # Formatear columnas de valor USD y peso (sin decimales), variación y participación (un decimal y %)
+    fmt.aplicar_formato(df, fmt.FORMATO_EXPORTACIONES)
+
     # Devolver dataframe
     return df
 
 def format_columns_exportaciones_excel(df):
     """Aplica el formato adecuado a las columnas de valor, peso, variación y participación"""
-    # Formatear columnas de valor USD y peso
-    for col in df.columns:
-        if 'USD' in col or 'TONELADAS' in col:
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
-
-    # Formatear columnas de variación y participación
-    if 'Variación (%)' in df.columns:
-        df['Variación (%)'] = pd.to_numeric(df['Variación (%)'], errors='coerce').round(2)
-
-    # Formatear columnas de participación, buscando cualquier columna que comience con 'Participación (%)'
-    for col in df.columns:
-        if col.startswith('Participación (%)'):
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
+    # Convertir a números y redondear a dos decimales las columnas de valor, peso, variación y participación
+    fmt.redondear_columnas(df, fmt.FORMATO_EXPORTACIONES)
 
     # Devolver dataframe
     return df
@@ -2781,17 +1994,8 @@ def format_columns_inversion(df):
        first_col = df.columns[0]
        df[first_col] = df[first_col].apply(lambda x: ' '.join(word.capitalize() for word in x.split()))
 
-    # Formatear columnas de valor USD
-    for col in df.columns:
-        if 'USD' in col:
-            df[col] = df[col].apply(lambda x: f"{x:,.1f}".replace(',', 'X').replace('.', ',').replace('X', '.') if isinstance(x, (int, float)) else x)
-
-    # Formatear columnas de participación, buscando cualquier columna que comience con 'Participación (%)'
-    for col in df.columns:
-        if col.startswith('Participación (%)'):
-            df[col] = df[col].apply(lambda x: f"{x:.1f}%".replace('.', ',') if isinstance(x, (int, float)) else x)
-        if col.startswith('Variación (%)'):
-            df[col] = df[col].apply(lambda x: f"{x:.1f}%".replace('.', ',') if isinstance(x, (int, float)) else x)
+    # Formatear columnas de valor USD, participación y variación (un decimal)
+    fmt.aplicar_formato(df, fmt.FORMATO_INVERSION)
 
     # Devolver dataframe
     return df
@@ -2804,15 +2008,8 @@ def format_columns_inversion_excel(df):
         first_col = df.columns[0]
         df[first_col] = df[first_col].apply(lambda x: ' '.join(word.capitalize() for word in x.split()))
 
-    # Formatear columnas de valor USD
-    for col in df.columns:
-        if 'USD' in col:
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
-
-    # Formatear columnas de participación y variación, buscando cualquier columna que comience con 'Participación (%)' o 'Variación (%)'
-    for col in df.columns:
-        if col.startswith('Participación (%)') or col.startswith('Variación (%)'):
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
+    # Convertir a números y redondear a dos decimales las columnas de valor USD, participación y variación
+    fmt.redondear_columnas(df, fmt.FORMATO_INVERSION)
 
     # Devolver dataframe
     return df
@@ -2825,25 +2022,8 @@ def format_columns_turismo(df):
         first_col = df.columns[0]
         df[first_col] = df[first_col].apply(lambda x: ' '.join(word.capitalize() for word in x.split()) if isinstance(x, str) else x)
 
-    # Convertir columnas de valor a números
-    for col in df.columns:
-        if col.startswith('20') or col.startswith('Ene'):
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # Convertir columnas de participación y variación a números
-    for col in df.columns:
-        if col.startswith('Participación (%)') or col.startswith('Variación (%)') or col.startswith('Diferencia'):
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # Formatear columnas de valor
-    for col in df.columns:
-        if col.startswith('20') or col.startswith('Ene') or col.startswith('Diferencia'):
-            df[col] = df[col].apply(lambda x: f"{x:,.0f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notnull(x) else x)
-
-    # Formatear columnas de participación y variación
-    for col in df.columns:
-        if col.startswith('Participación (%)') or col.startswith('Variación (%)'):
-            df[col] = df[col].apply(lambda x: f"{x:.1f}%".replace('.', ',') if pd.notnull(x) else x)
+    # Convertir a números y formatear columnas de valor (sin decimales), participación y variación (un decimal y %)
+    fmt.aplicar_formato(df, fmt.FORMATO_TURISMO, convertir=True)
 
     # Devolver dataframe
     return df
@@ -2856,96 +2036,100 @@ def format_columns_turismo_excel(df):
         first_col = df.columns[0]
         df[first_col] = df[first_col].apply(lambda x: ' '.join(word.capitalize() for word in x.split()) if isinstance(x, str) else x)
 
-    # Convertir columnas de valor a números y redondear a dos decimales
-    for col in df.columns:
-        if col.startswith('20') or col.startswith('Ene'):
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
-
-    # Convertir columnas de participación y variación a números y redondear a dos decimales
-    for col in df.columns:
-        if col.startswith('Participación (%)') or col.startswith('Variación (%)') or col.startswith('Diferencia'):
-            df[col] = pd.to_numeric(df[col], errors='coerce').round(2)
+    # Convertir columnas de valor, participación y variación a números y redondear a dos decimales
+    fmt.redondear_columnas(df, fmt.FORMATO_TURISMO)
 
     # Devolver dataframe
     return df
 
 def obtener_paises_correlativa(session):
     """
-    Ejecuta la consulta en Snowflake y devuelve los resultados como un dataframe.
+    Devuelve la correlativa de países (COUNTRY_OR_AREA_UNSD no nulo) del GeografiaIndex en memoria (geografia.obtener_geografia),
+    cargada una sola vez por versión de datos. El dataframe es compartido: no se debe modificar.
 
     Parámetros:
     session (snowflake.connector.SnowflakeConnection): La conexión a la sesión de Snowflake.
 
     Retorna:
-    data: Una base de datos con los resultados de la consulta.
-    """
-    # Construir la consulta
-    query = """
-    SELECT A.CODIGO_DIAN,
-           A.COUNTRY_OR_AREA_UNSD,
-           A.PAIS_LLAVE_EXPORTACIONES,
-           A.CONTINENTE_DANE_DIAN_EXPORTACIONES,
-           A.PAIS_INVERSION_BANREP,
-           A.PAIS_CODIGO_TURISMO,
-           A.NOMBRE_PAIS_CODIGO_TURISMO
-    FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.PAISES_CORRELATIVA AS A
-    WHERE A.COUNTRY_OR_AREA_UNSD IS NOT NULL;
+    data: Una base de datos con la correlativa.
     """
-    # Realizar esa consulta
-    data = pd.DataFrame(session.sql(query).collect())
-        
-    return data
+    return geo.obtener_geografia(session).paises_correlativa
 
 def obtener_departamentos_correlativa(session):
     """
-    Ejecuta la consulta en Snowflake y devuelve los resultados como un dataframe.
+    Devuelve la correlativa de departamentos DIAN del GeografiaIndex en memoria (geografia.obtener_geografia),
+    cargada una sola vez por versión de datos. El dataframe es compartido: no se debe modificar.
 
     Parámetros:
     session (snowflake.connector.SnowflakeConnection): La conexión a la sesión de Snowflake.
 
     Retorna:
-    data: Una base de datos con los resultados de la consulta.
-    """
-    # Construir la consulta
-    query = """
-    SELECT A.DEPARTAMENTO_DIAN,
-           A.COD_DIAN_DEPARTAMENTO
-    FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIAN_DEPARTAMENTOS AS A;
+    data: Una base de datos con la correlativa.
     """
-    # Realizar la consulta
-    data = pd.DataFrame(session.sql(query).collect())
-        
-    return data
+    return geo.obtener_geografia(session).departamentos_correlativa
 
 def obtener_municipios_correlativa(session):
     """
-    Ejecuta la consulta en Snowflake y devuelve los resultados como un dataframe.
+    Devuelve la correlativa de municipios DIVIPOLA del GeografiaIndex en memoria (geografia.obtener_geografia),
+    cargada una sola vez por versión de datos. El dataframe es compartido: no se debe modificar.
 
     Parámetros:
     session (snowflake.connector.SnowflakeConnection): La conexión a la sesión de Snowflake.
 
     Retorna:
-    data: Una base de datos con los resultados de la consulta.
+    data: Una base de datos con la correlativa.
     """
-    # Construir la consulta
-    query = """
-    SELECT A.COD_DANE_MUNICIPIO,
-           A.MUNICIPIO_DANE
-    FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIVIPOLA_MUNICIPIOS AS A;
+    return geo.obtener_geografia(session).municipios_correlativa
+
+# Tablas con nombres geográficos por código: (llaves de get_data, sub llave o None para todas, columna o None para la primera,
+# búsqueda del GeografiaIndex con los nombres en limpio)
+NOMBRES_GEOGRAFICOS = [
+    (['CATEGORIAS CERRADO', 'CATEGORIAS CORRIDO'], 'PAIS', 'CATEGORIA', 'nombre_pais_exportaciones'),
+    (['IED PAISES', 'ICE PAISES'], None, 'UNIDAD', 'nombre_pais_inversion'),
+    (['TURISMO CERRADO', 'TURISMO CORRIDO'], 'PAIS_RESIDENCIA', None, 'nombre_pais_turismo'),
+    (['TURISMO CERRADO', 'TURISMO CORRIDO'], 'DPTO_HOSPEDAJE', None, 'nombre_departamento'),
+    (['TURISMO CERRADO', 'TURISMO CORRIDO'], 'CIUDAD_HOSPEDAJE', None, 'nombre_municipio'),
+]
+
+def resolver_nombres(data_dict, geografia):
     """
-    # Realizar la consulta
-    data = pd.DataFrame(session.sql(query).collect())
-        
-    return data
+    Reemplaza en el lugar los códigos geográficos de las tablas de get_data por sus nombres en limpio
+    (país UNSD, departamento DIAN y municipio DANE). Los códigos sin nombre se conservan.
+
+    Se aplica una sola vez al construir el ReportBundle, antes de process_data y process_data_excel, con
+    Series.map sobre los diccionarios del GeografiaIndex en lugar de merge y apply por fila.
+
+    Parámetros:
+    data_dict (dict): Diccionario de get_data.
+    geografia (GeografiaIndex): Índice geográfico del proceso.
+
+    Retorna:
+    data_dict: El mismo diccionario con los nombres resueltos.
+    """
+    for llaves, sub_llave, columna, busqueda in NOMBRES_GEOGRAFICOS:
+        nombres = getattr(geografia, busqueda)
+        for llave in llaves:
+            sub_dict = data_dict.get(llave)
+            if not isinstance(sub_dict, dict):
+                continue
+            for sub_key, df in sub_dict.items():
+                if sub_llave is not None and sub_key != sub_llave:
+                    continue
+                if not isinstance(df, pd.DataFrame) or df.empty:
+                    continue
+                nombre_columna = columna if columna is not None else df.columns[0]
+                if nombre_columna in df.columns:
+                    df[nombre_columna] = df[nombre_columna].map(nombres).fillna(df[nombre_columna])
+    return data_dict
 
 def format_number(value):
     """Formatea un número con coma como separador decimal y punto como separador de miles."""
-    return f"{value:,.1f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return fmt.formatear_numero(value, 1)
 
 
 def format_number_no_decimal(value):
     """Formatea un número con coma como separador decimal y punto como separador de miles, sin decimales."""
-    return f"{value:,.0f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return fmt.formatear_numero(value, 0)
 
 def inversion_palabra(valor):
     """Devuelve 'positivo' si el valor es mayor que 0, 'negativo' en caso contrario."""
@@ -2972,6 +2156,9 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     Un diccionario con las tablas de resumen y losz textos de resumen.
     """
 
+    # Tablas de resumen por columnas de get_data (resumen.ResumenDatos)
+    resumen = data_dict['RESUMEN']
+
     # Exportaciones:
     expo_columna_t_1_cerrado = f"{export_params['cerrado']['T_1']} (USD FOB millones)"
     expo_columna_t_cerrado = f"{export_params['cerrado']['T']} (USD FOB millones)"
@@ -2992,9 +2179,9 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     if dict_verif['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO':
         data_expo_cerrado = {
             'Tipo de exportación': variables_expo,
-            expo_columna_t_1_cerrado: [data_dict['RESUMEN']['ST_CATEGORIAS_CERRADO'].get(var, [{'sum_usd_t_1': 0}])[0]['sum_usd_t_1'] / 1e6 for var in variables_expo],
-            expo_columna_t_cerrado: [data_dict['RESUMEN']['ST_CATEGORIAS_CERRADO'].get(var, [{'sum_usd_t': 0}])[0]['sum_usd_t'] / 1e6 for var in variables_expo],
-            expo_variacion_cerrado: [data_dict['RESUMEN']['ST_CATEGORIAS_CERRADO'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_expo]            
+            expo_columna_t_1_cerrado: [valor / 1e6 for valor in resumen.tabla('EXPORTACIONES', 'CERRADO').valores(variables_expo, 't_1')],
+            expo_columna_t_cerrado: [valor / 1e6 for valor in resumen.tabla('EXPORTACIONES', 'CERRADO').valores(variables_expo, 't')],
+            expo_variacion_cerrado: resumen.tabla('EXPORTACIONES', 'CERRADO').valores(variables_expo, 'variacion')            
         }
     else:
         data_expo_cerrado = {
@@ -3007,9 +2194,9 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     # Verificar y construir la tabla de exportaciones corridas
     if dict_verif['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO':
         data_expo_corrido = {
-            expo_columna_t_1_corrido: [data_dict['RESUMEN']['ST_CATEGORIAS_CORRIDO'].get(var, [{'sum_usd_t_1': 0}])[0]['sum_usd_t_1'] / 1e6 for var in variables_expo],
-            expo_columna_t_corrido: [data_dict['RESUMEN']['ST_CATEGORIAS_CORRIDO'].get(var, [{'sum_usd_t': 0}])[0]['sum_usd_t'] / 1e6 for var in variables_expo],
-            expo_variacion_corrido: [data_dict['RESUMEN']['ST_CATEGORIAS_CORRIDO'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_expo]
+            expo_columna_t_1_corrido: [valor / 1e6 for valor in resumen.tabla('EXPORTACIONES', 'CORRIDO').valores(variables_expo, 't_1')],
+            expo_columna_t_corrido: [valor / 1e6 for valor in resumen.tabla('EXPORTACIONES', 'CORRIDO').valores(variables_expo, 't')],
+            expo_variacion_corrido: resumen.tabla('EXPORTACIONES', 'CORRIDO').valores(variables_expo, 'variacion')
         }
     else:
         data_expo_corrido = {
@@ -3047,12 +2234,12 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
         # Verificar y construir la tabla de IED cerradas
         if dict_verif['ied_cerrado'] == 'CON DATOS DE IED CERRADO':
             if agrupacion == 'PAISES':
-                variables_ied = list(data_dict['RESUMEN']['IED CERRADO PAISES'].keys())
+                variables_ied = resumen.tabla('IED PAISES', 'CERRADO').categorias.tolist()
             data_ied_cerrado = {
                 'Tipo de inversión': 'IED',
-                inv_columna_t_1_cerrado: [data_dict['RESUMEN']['IED CERRADO PAISES'].get(var, [{'sum_inversion_t_1': 0}])[0]['sum_inversion_t_1'] for var in variables_ied],
-                inv_columna_t_cerrado: [data_dict['RESUMEN']['IED CERRADO PAISES'].get(var, [{'sum_inversion_t': 0}])[0]['sum_inversion_t'] for var in variables_ied],
-                inv_variacion_cerrado: [data_dict['RESUMEN']['IED CERRADO PAISES'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_ied]
+                inv_columna_t_1_cerrado: resumen.tabla('IED PAISES', 'CERRADO').valores(variables_ied, 't_1'),
+                inv_columna_t_cerrado: resumen.tabla('IED PAISES', 'CERRADO').valores(variables_ied, 't'),
+                inv_variacion_cerrado: resumen.tabla('IED PAISES', 'CERRADO').valores(variables_ied, 'variacion')
             }
         else:
             data_ied_cerrado = {
@@ -3065,11 +2252,11 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
         # Verificar y construir la tabla de IED corridas
         if dict_verif['ied_corrido'] == 'CON DATOS DE IED CORRIDO':
             if agrupacion == 'PAISES' and not variables_ied:  # Para asegurarnos de que variables_ied esté llenado si no se llenó en el bloque anterior
-                variables_ied = list(data_dict['RESUMEN']['IED CORRIDO PAISES'].keys())
+                variables_ied = resumen.tabla('IED PAISES', 'CORRIDO').categorias.tolist()
             data_ied_corrido = {
-                inv_columna_t_1_corrido: [data_dict['RESUMEN']['IED CORRIDO PAISES'].get(var, [{'sum_inversion_t_1': 0}])[0]['sum_inversion_t_1'] for var in variables_ied],
-                inv_columna_t_corrido: [data_dict['RESUMEN']['IED CORRIDO PAISES'].get(var, [{'sum_inversion_t': 0}])[0]['sum_inversion_t'] for var in variables_ied],
-                inv_variacion_corrido: [data_dict['RESUMEN']['IED CORRIDO PAISES'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_ied]
+                inv_columna_t_1_corrido: resumen.tabla('IED PAISES', 'CORRIDO').valores(variables_ied, 't_1'),
+                inv_columna_t_corrido: resumen.tabla('IED PAISES', 'CORRIDO').valores(variables_ied, 't'),
+                inv_variacion_corrido: resumen.tabla('IED PAISES', 'CORRIDO').valores(variables_ied, 'variacion')
             }
         else:
             data_ied_corrido = {
@@ -3085,12 +2272,12 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
         # Verificar y construir la tabla de ICE cerradas
         if dict_verif['ice_cerrado'] == 'CON DATOS DE ICE CERRADO':
             if agrupacion == 'PAISES':
-                variables_ice = list(data_dict['RESUMEN']['ICE CERRADO PAISES'].keys())
+                variables_ice = resumen.tabla('ICE PAISES', 'CERRADO').categorias.tolist()
             data_ice_cerrado = {
                 'Tipo de inversión': 'ICE',
-                inv_columna_t_1_cerrado: [data_dict['RESUMEN']['ICE CERRADO PAISES'].get(var, [{'sum_inversion_t_1': 0}])[0]['sum_inversion_t_1'] for var in variables_ice],
-                inv_columna_t_cerrado: [data_dict['RESUMEN']['ICE CERRADO PAISES'].get(var, [{'sum_inversion_t': 0}])[0]['sum_inversion_t'] for var in variables_ice],
-                inv_variacion_cerrado: [data_dict['RESUMEN']['ICE CERRADO PAISES'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_ice]
+                inv_columna_t_1_cerrado: resumen.tabla('ICE PAISES', 'CERRADO').valores(variables_ice, 't_1'),
+                inv_columna_t_cerrado: resumen.tabla('ICE PAISES', 'CERRADO').valores(variables_ice, 't'),
+                inv_variacion_cerrado: resumen.tabla('ICE PAISES', 'CERRADO').valores(variables_ice, 'variacion')
             }
         else:
             data_ice_cerrado = {
@@ -3103,11 +2290,11 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
         # Verificar y construir la tabla de ICE corridas
         if dict_verif['ice_corrido'] == 'CON DATOS DE ICE CORRIDO':
             if agrupacion == 'PAISES' and not variables_ice:  # Para asegurarnos de que variables_ice esté llenado si no se llenó en el bloque anterior
-                variables_ice = list(data_dict['RESUMEN']['ICE CORRIDO PAISES'].keys())
+                variables_ice = resumen.tabla('ICE PAISES', 'CORRIDO').categorias.tolist()
             data_ice_corrido = {
-                inv_columna_t_1_corrido: [data_dict['RESUMEN']['ICE CORRIDO PAISES'].get(var, [{'sum_inversion_t_1': 0}])[0]['sum_inversion_t_1'] for var in variables_ice],
-                inv_columna_t_corrido: [data_dict['RESUMEN']['ICE CORRIDO PAISES'].get(var, [{'sum_inversion_t': 0}])[0]['sum_inversion_t'] for var in variables_ice],
-                inv_variacion_corrido: [data_dict['RESUMEN']['ICE CORRIDO PAISES'].get(var, [{'diferencia_porcentual': 0}])[0]['diferencia_porcentual'] for var in variables_ice]
+                inv_columna_t_1_corrido: resumen.tabla('ICE PAISES', 'CORRIDO').valores(variables_ice, 't_1'),
+                inv_columna_t_corrido: resumen.tabla('ICE PAISES', 'CORRIDO').valores(variables_ice, 't'),
+                inv_variacion_corrido: resumen.tabla('ICE PAISES', 'CORRIDO').valores(variables_ice, 'variacion')
             }
         else:
             data_ice_corrido = {
@@ -3151,9 +2338,9 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     if dict_verif['turismo_cerrado'] == 'CON DATOS DE TURISMO CERRADO':
         data_turismo_cerrado = {
             'Variable': 'Viajeros',
-            tur_columna_t_1_cerrado: [data_dict['RESUMEN']['TURISMO CERRADO PAISES'][var][0]['sum_turismo_t_1'] for var in variables_turismo],
-            tur_columna_t_cerrado: [data_dict['RESUMEN']['TURISMO CERRADO PAISES'][var][0]['sum_turismo_t'] for var in variables_turismo],
-            tur_variacion_cerrado: [data_dict['RESUMEN']['TURISMO CERRADO PAISES'][var][0]['diferencia_porcentual'] for var in variables_turismo]
+            tur_columna_t_1_cerrado: resumen.tabla('TURISMO PAISES', 'CERRADO').valores(variables_turismo, 't_1'),
+            tur_columna_t_cerrado: resumen.tabla('TURISMO PAISES', 'CERRADO').valores(variables_turismo, 't'),
+            tur_variacion_cerrado: resumen.tabla('TURISMO PAISES', 'CERRADO').valores(variables_turismo, 'variacion')
         }
     else:
         data_turismo_cerrado = {
@@ -3166,9 +2353,9 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     # Verificar y construir la tabla de turismo corridas
     if dict_verif['turismo_corrido'] == 'CON DATOS DE TURISMO CORRIDO':
         data_turismo_corrido = {
-            tur_columna_t_1_corrido: [data_dict['RESUMEN']['TURISMO CORRIDO PAISES'][var][0]['sum_turismo_t_1'] for var in variables_turismo],
-            tur_columna_t_corrido: [data_dict['RESUMEN']['TURISMO CORRIDO PAISES'][var][0]['sum_turismo_t'] for var in variables_turismo],
-            tur_variacion_corrido: [data_dict['RESUMEN']['TURISMO CORRIDO PAISES'][var][0]['diferencia_porcentual'] for var in variables_turismo]
+            tur_columna_t_1_corrido: resumen.tabla('TURISMO PAISES', 'CORRIDO').valores(variables_turismo, 't_1'),
+            tur_columna_t_corrido: resumen.tabla('TURISMO PAISES', 'CORRIDO').valores(variables_turismo, 't'),
+            tur_variacion_corrido: resumen.tabla('TURISMO PAISES', 'CORRIDO').valores(variables_turismo, 'variacion')
         }
     else:
         data_turismo_corrido = {
@@ -3189,49 +2376,45 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     # Obtener datos cuando existen o llenarlos con cero
     # Cerrado total
     if dict_verif['exportaciones_totales_cerrado'] == 'CON DATOS DE EXPORTACIONES TOTALES CERRADO':
-        exportaciones_totales_cerrado = data_dict['RESUMEN']['ST_CATEGORIAS_CERRADO']['Total'][0]
-        exportaciones_total_cerrado = exportaciones_totales_cerrado['sum_usd_t']
-        exportaciones_variacion_total_cerrado = exportaciones_totales_cerrado['diferencia_porcentual']
+        exportaciones_total_cerrado = resumen.tabla('EXPORTACIONES', 'CERRADO').valor('Total', 't')
+        exportaciones_variacion_total_cerrado = resumen.tabla('EXPORTACIONES', 'CERRADO').valor('Total', 'variacion')
     else:
         exportaciones_total_cerrado = 0
         exportaciones_variacion_total_cerrado = 0
     # Corrido
     if dict_verif['exportaciones_totales_corrido'] == 'CON DATOS DE EXPORTACIONES TOTALES CORRIDO':
-        exportaciones_totales_corrido = data_dict['RESUMEN']['ST_CATEGORIAS_CORRIDO']['Total'][0]
-        exportaciones_total_corrido = exportaciones_totales_corrido['sum_usd_t']
-        exportaciones_variacion_total_corrido = exportaciones_totales_corrido['diferencia_porcentual']
+        exportaciones_total_corrido = resumen.tabla('EXPORTACIONES', 'CORRIDO').valor('Total', 't')
+        exportaciones_variacion_total_corrido = resumen.tabla('EXPORTACIONES', 'CORRIDO').valor('Total', 'variacion')
     else:
         exportaciones_total_corrido = 0
         exportaciones_variacion_total_corrido = 0   
 
     # Cerrado NME
     if dict_verif['exportaciones_nme_cerrado'] == 'CON DATOS DE EXPORTACIONES NME CERRADO':
-        exportaciones_no_minero_cerrado = data_dict['RESUMEN']['ST_CATEGORIAS_CERRADO']['No Mineras'][0]
-        exportaciones_nme_cerrado = exportaciones_no_minero_cerrado['sum_usd_t']
-        exportaciones_variacion_nme_cerrado = exportaciones_no_minero_cerrado['diferencia_porcentual']
+        exportaciones_nme_cerrado = resumen.tabla('EXPORTACIONES', 'CERRADO').valor('No Mineras', 't')
+        exportaciones_variacion_nme_cerrado = resumen.tabla('EXPORTACIONES', 'CERRADO').valor('No Mineras', 'variacion')
     else:
         exportaciones_nme_cerrado = 0
         exportaciones_variacion_nme_cerrado = 0
     # Corrido NME
     if dict_verif['exportaciones_nme_corrido'] == 'CON DATOS DE EXPORTACIONES NME CORRIDO':
-        exportaciones_no_minero_corrido = data_dict['RESUMEN']['ST_CATEGORIAS_CORRIDO']['No Mineras'][0]
-        exportaciones_nme_corrido= exportaciones_no_minero_corrido['sum_usd_t']
-        exportaciones_variacion_nme_corrido = exportaciones_no_minero_corrido['diferencia_porcentual']
+        exportaciones_nme_corrido = resumen.tabla('EXPORTACIONES', 'CORRIDO').valor('No Mineras', 't')
+        exportaciones_variacion_nme_corrido = resumen.tabla('EXPORTACIONES', 'CORRIDO').valor('No Mineras', 'variacion')
     else:
         exportaciones_nme_corrido = 0
         exportaciones_variacion_nme_corrido = 0
 
     # Conteo cerrado
     if dict_verif['exportaciones_conteo_cerrado'] == 'CON DATOS DE CONTEO CERRADO':
-        periodo_cerrado = list(data_dict['RESUMEN']['CONTEO']['CERRADO'].keys())[0]
-        num_empresas_cerrado = data_dict['RESUMEN']['CONTEO']['CERRADO'][periodo_cerrado]
+        conteo_cerrado = resumen.tabla('CONTEO', 'CERRADO')
+        num_empresas_cerrado = conteo_cerrado.valor(conteo_cerrado.primera, 't')
     else:
         num_empresas_cerrado = 0
 
     # Conteo corrido
     if dict_verif['exportaciones_conteo_corrido'] == 'CON DATOS DE CONTEO CORRIDO':
-        periodo_corrido = list(data_dict['RESUMEN']['CONTEO']['CORRIDO'].keys())[0]
-        num_empresas_corrido = data_dict['RESUMEN']['CONTEO']['CORRIDO'][periodo_corrido]
+        conteo_corrido = resumen.tabla('CONTEO', 'CORRIDO')
+        num_empresas_corrido = conteo_corrido.valor(conteo_corrido.primera, 't')
     else: 
         num_empresas_corrido = 0
 
@@ -3255,77 +2438,79 @@ def resumen_datos(data_dict, agrupacion, unidad, export_params, inversion_params
     if agrupacion in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
         # Cerrado inversión
         if dict_verif['ied_cerrado'] == 'CON DATOS DE IED CERRADO':
-            # Obtener datos de IED cerrado por países o total
-            if agrupacion == 'PAISES':
-                inversion_total_cerrado = data_dict['RESUMEN']['IED CERRADO PAISES'][list(data_dict['RESUMEN']['IED CERRADO PAISES'].keys())[0]][0]
-            else:
-                inversion_total_cerrado = data_dict['RESUMEN']['IED CERRADO PAISES']['TOTAL'][0]
+            # Obtener datos de IED cerrado por países (primera unidad) o total
+            tabla_inversion = resumen.tabla('IED PAISES', 'CERRADO')
+            unidad_inversion = tabla_inversion.primera if agrupacion == 'PAISES' else 'TOTAL'
+            inversion_total_cerrado = tabla_inversion.valor(unidad_inversion, 't')
+            inversion_variacion_cerrado = tabla_inversion.valor(unidad_inversion, 'variacion')
         else:
             # Llenar con cero si no hay datos disponibles
-            inversion_total_cerrado = {'sum_inversion_t': 0, 'diferencia_porcentual': 0}
+            inversion_total_cerrado = 0
+            inversion_variacion_cerrado = 0
 
         if dict_verif['ice_cerrado'] == 'CON DATOS DE ICE CERRADO':
-            # Obtener datos de ICE cerrado por países o total
-            if agrupacion == 'PAISES':
-                ice_total_cerrado = data_dict['RESUMEN']['ICE CERRADO PAISES'][list(data_dict['RESUMEN']['ICE CERRADO PAISES'].keys())[0]][0]
-            else:
-                ice_total_cerrado = data_dict['RESUMEN']['ICE CERRADO PAISES']['TOTAL'][0]
+            # Obtener datos de ICE cerrado por países (primera unidad) o total
+            tabla_ice = resumen.tabla('ICE PAISES', 'CERRADO')
+            unidad_ice = tabla_ice.primera if agrupacion == 'PAISES' else 'TOTAL'
+            ice_total_cerrado = tabla_ice.valor(unidad_ice, 't')
+            ice_variacion_cerrado = tabla_ice.valor(unidad_ice, 'variacion')
         else:
             # Llenar con cero si no hay datos disponibles
-            ice_total_cerrado = {'sum_inversion_t': 0, 'diferencia_porcentual': 0}
+            ice_total_cerrado = 0
+            ice_variacion_cerrado = 0
 
         # Corrido inversión
         if dict_verif['ied_corrido'] == 'CON DATOS DE IED CORRIDO':
-            # Obtener datos de IED corrido por países o total
-            if agrupacion == 'PAISES':
-                inversion_total_corrido = data_dict['RESUMEN']['IED CORRIDO PAISES'][list(data_dict['RESUMEN']['IED CORRIDO PAISES'].keys())[0]][0]
-            else:
-                inversion_total_corrido = data_dict['RESUMEN']['IED CORRIDO PAISES']['TOTAL'][0]
+            # Obtener datos de IED corrido por países (primera unidad) o total
+            tabla_inversion = resumen.tabla('IED PAISES', 'CORRIDO')
+            unidad_inversion = tabla_inversion.primera if agrupacion == 'PAISES' else 'TOTAL'
+            inversion_total_corrido = tabla_inversion.valor(unidad_inversion, 't')
+            inversion_variacion_corrido = tabla_inversion.valor(unidad_inversion, 'variacion')
         else:
             # Llenar con cero si no hay datos disponibles
-            inversion_total_corrido = {'sum_inversion_t': 0, 'diferencia_porcentual': 0}
+            inversion_total_corrido = 0
+            inversion_variacion_corrido = 0
 
         if dict_verif['ice_corrido'] == 'CON DATOS DE ICE CORRIDO':
-            # Obtener datos de ICE corrido por países o total
-            if agrupacion == 'PAISES':
-                ice_total_corrido = data_dict['RESUMEN']['ICE CORRIDO PAISES'][list(data_dict['RESUMEN']['ICE CORRIDO PAISES'].keys())[0]][0]
-            else:
-                ice_total_corrido = data_dict['RESUMEN']['ICE CORRIDO PAISES']['TOTAL'][0]
+            # Obtener datos de ICE corrido por países (primera unidad) o total
+            tabla_ice = resumen.tabla('ICE PAISES', 'CORRIDO')
+            unidad_ice = tabla_ice.primera if agrupacion == 'PAISES' else 'TOTAL'
+            ice_total_corrido = tabla_ice.valor(unidad_ice, 't')
+            ice_variacion_corrido = tabla_ice.valor(unidad_ice, 'variacion')
         else:
             # Llenar con cero si no hay datos disponibles
-            ice_total_corrido = {'sum_inversion_t': 0, 'diferencia_porcentual': 0}
+            ice_total_corrido = 0
+            ice_variacion_corrido = 0
 
         # Texto por bullets de inversión
         if agrupacion in ['COLOMBIA']:
             # Generar texto para agrupación por Colombia
-            texto_inversion_b1_cerrado = f"""En {inversion_params['cerrado']['T']}, Colombia registró flujos {inversion_palabra(inversion_total_cerrado['sum_inversion_t'])} de inversión extranjera directa (IED) del Mundo por USD {format_number(inversion_total_cerrado['sum_inversion_t'])} millones, {format_number(abs(inversion_total_cerrado['diferencia_porcentual']))}% {variacion_palabra(inversion_total_cerrado['diferencia_porcentual'])} con respecto al {inversion_params['cerrado']['T_1']}."""
-            texto_inversion_b1_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(inversion_total_corrido['sum_inversion_t'])} de IED del Mundo por USD {format_number(inversion_total_corrido['sum_inversion_t'])} millones, {format_number(abs(inversion_total_corrido['diferencia_porcentual']))}% {variacion_palabra(inversion_total_corrido['diferencia_porcentual'])} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
-            texto_inversion_b2_cerrado = f"""En {inversion_params['cerrado']['T']}, se registraron flujos {inversion_palabra(ice_total_cerrado['sum_inversion_t'])} de inversión directa de Colombia en el exterior (ICE) en el Mundo por USD {format_number(ice_total_cerrado['sum_inversion_t'])} millones, {format_number(abs(ice_total_cerrado['diferencia_porcentual']))}% {variacion_palabra(ice_total_cerrado['diferencia_porcentual'])} con respecto al {inversion_params['cerrado']['T_1']}."""
-            texto_inversion_b2_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(ice_total_corrido['sum_inversion_t'])} de ICE en el Mundo por USD {format_number(ice_total_corrido['sum_inversion_t'])} millones, {format_number(abs(ice_total_corrido['diferencia_porcentual']))}% {variacion_palabra(ice_total_corrido['diferencia_porcentual'])} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
+            texto_inversion_b1_cerrado = f"""En {inversion_params['cerrado']['T']}, Colombia registró flujos {inversion_palabra(inversion_total_cerrado)} de inversión extranjera directa (IED) del Mundo por USD {format_number(inversion_total_cerrado)} millones, {format_number(abs(inversion_variacion_cerrado))}% {variacion_palabra(inversion_variacion_cerrado)} con respecto al {inversion_params['cerrado']['T_1']}."""
+            texto_inversion_b1_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(inversion_total_corrido)} de IED del Mundo por USD {format_number(inversion_total_corrido)} millones, {format_number(abs(inversion_variacion_corrido))}% {variacion_palabra(inversion_variacion_corrido)} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
+            texto_inversion_b2_cerrado = f"""En {inversion_params['cerrado']['T']}, se registraron flujos {inversion_palabra(ice_total_cerrado)} de inversión directa de Colombia en el exterior (ICE) en el Mundo por USD {format_number(ice_total_cerrado)} millones, {format_number(abs(ice_variacion_cerrado))}% {variacion_palabra(ice_variacion_cerrado)} con respecto al {inversion_params['cerrado']['T_1']}."""
+            texto_inversion_b2_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(ice_total_corrido)} de ICE en el Mundo por USD {format_number(ice_total_corrido)} millones, {format_number(abs(ice_variacion_corrido))}% {variacion_palabra(ice_variacion_corrido)} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
 
         if agrupacion in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
             # Generar texto para otras agrupaciones (continentes, hubs, TLCs, países)
-            texto_inversion_b1_cerrado = f"""En {inversion_params['cerrado']['T']}, Colombia registró flujos {inversion_palabra(inversion_total_cerrado['sum_inversion_t'])} de inversión extranjera directa (IED) de {unidad} por USD {format_number(inversion_total_cerrado['sum_inversion_t'])} millones, {format_number(abs(inversion_total_cerrado['diferencia_porcentual']))}% {variacion_palabra(inversion_total_cerrado['diferencia_porcentual'])} con respecto al {inversion_params['cerrado']['T_1']}."""
-            texto_inversion_b1_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(inversion_total_corrido['sum_inversion_t'])} de IED de {unidad} por USD {format_number(inversion_total_corrido['sum_inversion_t'])} millones, {format_number(abs(inversion_total_corrido['diferencia_porcentual']))}% {variacion_palabra(inversion_total_corrido['diferencia_porcentual'])} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
-            texto_inversion_b2_cerrado = f"""En {inversion_params['cerrado']['T']}, se registraron flujos {inversion_palabra(ice_total_cerrado['sum_inversion_t'])} de inversión directa de Colombia en el exterior (ICE) en {unidad} por USD {format_number(ice_total_cerrado['sum_inversion_t'])} millones, {format_number(abs(ice_total_cerrado['diferencia_porcentual']))}% {variacion_palabra(ice_total_cerrado['diferencia_porcentual'])} con respecto al {inversion_params['cerrado']['T_1']}."""
-            texto_inversion_b2_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(ice_total_corrido['sum_inversion_t'])} de ICE en {unidad} por USD {format_number(ice_total_corrido['sum_inversion_t'])} millones, {format_number(abs(ice_total_corrido['diferencia_porcentual']))}% {variacion_palabra(ice_total_corrido['diferencia_porcentual'])} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
+            texto_inversion_b1_cerrado = f"""En {inversion_params['cerrado']['T']}, Colombia registró flujos {inversion_palabra(inversion_total_cerrado)} de inversión extranjera directa (IED) de {unidad} por USD {format_number(inversion_total_cerrado)} millones, {format_number(abs(inversion_variacion_cerrado))}% {variacion_palabra(inversion_variacion_cerrado)} con respecto al {inversion_params['cerrado']['T_1']}."""
+            texto_inversion_b1_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(inversion_total_corrido)} de IED de {unidad} por USD {format_number(inversion_total_corrido)} millones, {format_number(abs(inversion_variacion_corrido))}% {variacion_palabra(inversion_variacion_corrido)} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
+            texto_inversion_b2_cerrado = f"""En {inversion_params['cerrado']['T']}, se registraron flujos {inversion_palabra(ice_total_cerrado)} de inversión directa de Colombia en el exterior (ICE) en {unidad} por USD {format_number(ice_total_cerrado)} millones, {format_number(abs(ice_variacion_cerrado))}% {variacion_palabra(ice_variacion_cerrado)} con respecto al {inversion_params['cerrado']['T_1']}."""
+            texto_inversion_b2_corrido = f"""En el {inversion_params['corrido']['T_TRIMESTER_NAME']} trimestre de {inversion_params['corrido']['T_YEAR']}, Colombia registró flujos {inversion_palabra(ice_total_corrido)} de ICE en {unidad} por USD {format_number(ice_total_corrido)} millones, {format_number(abs(ice_variacion_corrido))}% {variacion_palabra(ice_variacion_corrido)} con respecto al mismo periodo de {inversion_params['corrido']['T_1_YEAR']}."""
 
 
     # Obtener datos cuando existen o llenarlos con cero
     # Cerrado turismo
     if dict_verif['turismo_cerrado'] == 'CON DATOS DE TURISMO CERRADO':
-        turismo_cerrado = data_dict['RESUMEN']['TURISMO CERRADO PAISES']['TOTAL'][0]
-        turismo_cerrado_sum = turismo_cerrado['sum_turismo_t']
-        turismo_variacion_cerrado = turismo_cerrado['diferencia_porcentual']
+        turismo_cerrado_sum = resumen.tabla('TURISMO PAISES', 'CERRADO').valor('TOTAL', 't')
+        turismo_variacion_cerrado = resumen.tabla('TURISMO PAISES', 'CERRADO').valor('TOTAL', 'variacion')
     else:
         turismo_cerrado_sum = 0
         turismo_variacion_cerrado = 0
 
     # Corrido turismo
     if dict_verif['turismo_corrido'] == 'CON DATOS DE TURISMO CORRIDO':
-        turismo_corrido = data_dict['RESUMEN']['TURISMO CORRIDO PAISES']['TOTAL'][0]
-        turismo_corrido_sum = turismo_corrido['sum_turismo_t']
-        turismo_variacion_corrido = turismo_corrido['diferencia_porcentual']
+        turismo_corrido_sum = resumen.tabla('TURISMO PAISES', 'CORRIDO').valor('TOTAL', 't')
+        turismo_variacion_corrido = resumen.tabla('TURISMO PAISES', 'CORRIDO').valor('TOTAL', 'variacion')
     else:
         turismo_corrido_sum = 0
         turismo_variacion_corrido = 0
@@ -3384,19 +2569,9 @@ def crear_diccionario_cadenas(data):
     Retorna:
     dict: Diccionario con las cadenas y sus respectivos subsectoras concatenados en una string.
     """
-    # Crear un diccionario vacío para almacenar los resultados
-    diccionario = {}
-    
-    # Iterar sobre las filas del DataFrame
-    for cadena in data['CADENA'].unique():
-        # Obtener los subsectoras correspondientes a la cadena
-        subsectoras = data[data['CADENA'] == cadena]['SUBSECTOR']
-        # Concatenar los subsectoras en una sola string, separados por comas y con un punto al final
-        subsectoras_str = ', '.join(subsectoras) + '.'
-        # Asignar la cadena y sus subsectoras al diccionario
-        diccionario[cadena] = subsectoras_str
-    
-    return diccionario
+    # Una sola pasada agrupada (en lugar de filtrar el DataFrame una vez por cadena), en el orden de aparición
+    subsectoras = data.groupby('CADENA', sort=False)['SUBSECTOR'].agg(', '.join) + '.'
+    return subsectoras.to_dict()
 
 def crear_diccionario_turismo(data):
     """
@@ -3426,11 +2601,129 @@ def crear_diccionario_turismo(data):
     subsectores_str = ', '.join(subsectores) + '.'
     # Asignar al diccionario
     diccionario['SUBSECTOR'] = subsectores_str
-    
+
     return diccionario
 
 
-def process_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None):
+#####################################################
+# INSUMOS DEL REPORTE: UNA SOLA ETAPA DE EXTRACCIÓN
+#####################################################
+
+def get_parameters_documento(sesion):
+    """
+    Obtiene los parámetros que se usan en la portada de los documentos Word.
+
+    Parámetros:
+    - sesion: sesión de Snowflake.
+
+    Retorna:
+    Un diccionario {PARAMETRO: VALOR} con la fecha de actualización, el año cerrado y el texto del año corrido.
+    """
+    # Consulta de parámetros del documento
+    query = """
+    SELECT A.PARAMETRO, A.VALOR
+    FROM DOCUMENTOS_COLOMBIA.PARAMETROS.PARAMETROS AS A
+    WHERE A.PARAMETRO IN ('Fecha de actualización', 'Año cerrado (T)', 'Año corrido texto (T)')
+        AND A.EJE IN ('Transversal', 'Exportaciones');
+    """
+    data = pd.DataFrame(sesion.sql(query).collect())
+
+    # Convertir el DataFrame en un diccionario
+    return pd.Series(data.VALOR.values, index=data.PARAMETRO).to_dict()
+
+
+class ReportBundle:
+    """
+    Contenedor con todos los insumos de un reporte para una combinación (agrupacion, unidad, umbral).
+
+    Se construye una sola vez con construir_report_bundle y lo consumen process_data (Word y resumen),
+    process_data_excel (Excel) y las funciones documentos.create_document_*, de modo que ninguna
+    consulta a Snowflake se repite entre los distintos formatos de salida.
+
+    Atributos:
+    - geo_params: diccionario de get_data_parametros.
+    - dict_verificacion: diccionario con los indicadores CON/SIN DATOS, calculados con los resultados de get_data.
+    - params_exportaciones, params_inversion, params_turismo: parámetros T y T_1 de cada eje.
+    - params_documento: parámetros de la portada del documento Word.
+    - datos: diccionario de get_data con los nombres geográficos ya resueltos (resolver_nombres).
+      Los consumidores deben copiarlo antes de modificarlo.
+    - paises_correlativa, departamentos_correlativa, municipios_correlativa: tablas de nombres en limpio.
+    - geografia: GeografiaIndex con las búsquedas de nombres por código. Es compartido entre reportes: no se debe modificar.
+    """
+
+    def __init__(self, geo_params, dict_verificacion, params_exportaciones, params_inversion, params_turismo,
+                 params_documento, datos, paises_correlativa, departamentos_correlativa, municipios_correlativa,
+                 geografia=None):
+        self.geo_params = geo_params
+        self.dict_verificacion = dict_verificacion
+        self.params_exportaciones = params_exportaciones
+        self.params_inversion = params_inversion
+        self.params_turismo = params_turismo
+        self.params_documento = params_documento
+        self.datos = datos
+        self.paises_correlativa = paises_correlativa
+        self.departamentos_correlativa = departamentos_correlativa
+        self.municipios_correlativa = municipios_correlativa
+        self.geografia = geografia
+
+
+def construir_report_bundle(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None, max_concurrencia=None, progreso=None, version=None):
+    """
+    Etapa única de extracción: ejecuta todas las consultas que necesita un reporte y las agrupa en un ReportBundle.
+
+    Parámetros:
+    - session: sesión de Snowflake.
+    - agrupacion: el nivel de agrupación para filtrar los datos.
+    - continentes, paises, hubs, tlcs, departamentos: listas con la unidad seleccionada según la agrupación.
+    - umbral: valor USD exportado mínimo exportado para contar la empresa.
+    - max_concurrencia: (opcional) número máximo de consultas simultáneas en get_data.
+    - progreso: (opcional) función progreso(porcentaje, texto) que recibe el avance de la extracción entre 0 y 100.
+    - version: (opcional) versión de los datos con la que se identifica el reporte (la de su llave en la cache).
+      Los insumos compartidos por versión (índice de geografía, agregados de inversión) se resuelven con ella, de
+      modo que un reporte nunca mezcla datos de dos versiones. Por defecto cache_consultas.version_datos(session).
+
+    Retorna:
+    Un ReportBundle con los parámetros, la verificación de ejes, los datos de get_data y las correlativas.
+    """
+    # 1. Versión de los datos y parámetros geográficos (una sola vez por reporte)
+    if version is None:
+        version = cache.version_datos(session)
+    geo_params = get_data_parametros(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral, version)
+    geo_params['VERSION'] = version
+    if progreso:
+        progreso(10, "Parámetros identificados correctamente.")
+
+    # 2. Datos del reporte reutilizando los parámetros ya calculados (el avance de las consultas va de 10 a 90)
+    al_completar = None
+    if progreso:
+        al_completar = lambda completadas, total: progreso(10 + 80 * completadas // total, f"Consultando datos ({completadas} de {total}).")
+    datos = get_data(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral,
+                     geo_params=geo_params, max_concurrencia=max_concurrencia, al_completar=al_completar)
+    # Verificación de ejes: get_data la calculó con sus resultados y la dejó memorizada en geo_params
+    dict_verificacion = verif_ejes(session, geo_params)
+    # Nombres en limpio de países, departamentos y municipios (una sola vez para Word y Excel)
+    geografia = geo.obtener_geografia(session, version)
+    resolver_nombres(datos, geografia)
+    if progreso:
+        progreso(90, "Datos extraidos correctamente.")
+
+    # 3. Construir el bundle con parámetros de periodos y correlativas de nombres (en memoria, sin consultas)
+    return ReportBundle(
+        geo_params=geo_params,
+        dict_verificacion=dict_verificacion,
+        params_exportaciones=get_parameters_exportaciones(session),
+        params_inversion=get_parameters_inversion(session),
+        params_turismo=get_parameters_turismo(session),
+        params_documento=get_parameters_documento(session),
+        datos=datos,
+        paises_correlativa=geografia.paises_correlativa,
+        departamentos_correlativa=geografia.departamentos_correlativa,
+        municipios_correlativa=geografia.municipios_correlativa,
+        geografia=geografia
+    )
+
+
+def process_data(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None, bundle=None):
     """
     Esta función extrae y organiza datos de exportaciones desde una base de datos en Snowflake, 
     luego cambia los nombres de las columnas según los requisitos especificados.
@@ -3440,12 +2733,17 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
     - agrupacion: el nivel de agrupación para filtrar los datos.
     - unidad: la unidad de medida para filtrar los datos.
     - umbral: valor USD exportado mínimo exportado para contar la empresa.
+    - bundle: (opcional) ReportBundle ya construido con construir_report_bundle. Si no se entrega se construye aquí.
 
     Retorna:
     Un diccionario con los DataFrames procesados y las columnas renombradas.
     """
+    # Insumos del reporte: se consultan una sola vez y se comparten entre Word y Excel
+    if bundle is None:
+        bundle = construir_report_bundle(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+
     # Geo Parámetros 
-    geo_params = get_data_parametros(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    geo_params = bundle.geo_params
 
     # Parámetros para los datos de exportaciones
     AGRUPACION = geo_params['AGRUPACION']
@@ -3455,25 +2753,20 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
     # INDICADOR DE PRESENCIA DE DATOS
     #################################
 
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion
     
     # Obtener los parámetros T y T_1 para año cerrado y año corrido
-    params = get_parameters_exportaciones(session)
-    params_inversion = get_parameters_inversion(session)
-    params_turismo = get_parameters_turismo(session)
+    params = bundle.params_exportaciones
+    params_inversion = bundle.params_inversion
+    params_turismo = bundle.params_turismo
 
-    # Llamar a la función get_data() para obtener los datos de exportaciones
-    data_dict = get_data(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    # Copia de los datos del bundle: el procesamiento renombra columnas en el lugar
+    data_dict = copy.deepcopy(bundle.datos)
 
     # Procesar las tablas relevantes y cambiar los nombres de las columnas según corresponda
     processed_data = {}
 
-    # Obtener nombres en limpio de países
-    df_paises = obtener_paises_correlativa(session)
-    # Obtener nombres en limpio de departamentos
-    df_departamentos = obtener_departamentos_correlativa(session)
-    # Obtener nombres en limpio de municipios
-    df_municipios = obtener_municipios_correlativa(session)
+    # Los nombres en limpio de países, departamentos y municipios ya vienen resueltos en el bundle (resolver_nombres)
 
     ###############
     # Exportaciones
@@ -3496,18 +2789,6 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
         sub_dict = data_dict[key]
         processed_sub_dict = {}
         for sub_key, df in sub_dict.items():
-            # Renombrar los nombres de los países con el nombre real de la ONU
-            if sub_key == 'PAIS':
-                # Realizar la unión para reemplazar "Categoria" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_LLAVE_EXPORTACIONES', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='CATEGORIA',
-                              right_on='PAIS_LLAVE_EXPORTACIONES',
-                              how='left')
-                # Reemplazar valores en "CATEGORIA"
-                df['CATEGORIA'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['CATEGORIA'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_LLAVE_EXPORTACIONES', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
             # Renombrar la columna 'CATEGORIA' según el diccionario de nombres de columnas
             if 'CATEGORIA' in df.columns and sub_key in column_names_dict:
                 df.rename(columns={'CATEGORIA': column_names_dict[sub_key]}, inplace=True)
@@ -3650,16 +2931,6 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
             sub_dict = data_dict[key]
             processed_sub_dict = {}
             for sub_key, df in sub_dict.items():
-                # Realizar la unión para reemplazar "UNIDAD" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_INVERSION_BANREP', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='UNIDAD',
-                              right_on='PAIS_INVERSION_BANREP',
-                              how='left')
-                # Reemplazar valores en "UNIDAD"
-                df['UNIDAD'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['UNIDAD'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_INVERSION_BANREP', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)                              
                 # Renombrar la columna 'UNIDAD' según el diccionario de nombres de columnas de inversión
                 if 'UNIDAD' in df.columns and key in column_names_dict_inversion:
                     df.rename(columns={'UNIDAD': column_names_dict_inversion[key]}, inplace=True)  
@@ -3739,41 +3010,6 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
                             'DIFERENCIA_PORCENTUAL_T': f"Variación (%) {params_turismo['cerrado']['T']}",
                             'PARTICIPACION_T' : f"Participación (%) {params_turismo['cerrado']['T']}"
                         }, inplace=True)
-            # Usar nombres de países
-            if sub_key == 'PAIS_RESIDENCIA':
-                df = df.merge(df_paises[['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='País de residencia',
-                              right_on='PAIS_CODIGO_TURISMO',
-                              how='left')
-                # Reemplazar valores
-                df['País de residencia'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['País de residencia'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
-
-            # Usar nombres de departamentos
-            if sub_key == 'DPTO_HOSPEDAJE':
-                df = df.merge(df_departamentos[['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN']],
-                              left_on='Departamento de hospedaje',
-                              right_on='COD_DIAN_DEPARTAMENTO',
-                              how='left')
-                # Reemplazar valores en "Departamento de hospedaje"
-                df['Departamento de hospedaje'] = df.apply(
-                    lambda row: row['DEPARTAMENTO_DIAN'] if pd.notnull(row['DEPARTAMENTO_DIAN']) else row['Departamento de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN'], axis=1, inplace=True)
-
-            # Usar nombres de ciudades    
-            if sub_key == 'CIUDAD_HOSPEDAJE':
-                df = df.merge(df_municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']],
-                              left_on='Ciudad de hospedaje',
-                              right_on='COD_DANE_MUNICIPIO',
-                              how='left')
-                # Reemplazar valores en "Ciudad de hospedaje"
-                df['Ciudad de hospedaje'] = df.apply(
-                    lambda row: row['MUNICIPIO_DANE'] if pd.notnull(row['MUNICIPIO_DANE']) else row['Ciudad de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE'], axis=1, inplace=True)
             format_columns_turismo(df)  # Aplicar formato    
             processed_sub_dict[sub_key] = df
         processed_data[key] = processed_sub_dict
@@ -3793,40 +3029,6 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
                             'DIFERENCIA_PORCENTUAL': f"Variación (%) Ene - {params_turismo['corrido']['T_MONTH_NAME']} {params_turismo['corrido']['T']}",
                             'PARTICIPACION_T' : f"Participación (%) Ene - {params_turismo['corrido']['T_MONTH_NAME']} {params_turismo['corrido']['T']}"
                         }, inplace=True)
-            # Usar nombres de países
-            if sub_key == 'PAIS_RESIDENCIA':
-                # Realizar la unión para reemplazar "País de residencia" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='País de residencia',
-                              right_on='PAIS_CODIGO_TURISMO',
-                              how='left')
-                # Reemplazar valores en "UNIDAD"
-                df['País de residencia'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['País de residencia'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
-            # Usar nombres de departamentos
-            if sub_key == 'DPTO_HOSPEDAJE':
-                df = df.merge(df_departamentos[['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN']],
-                              left_on='Departamento de hospedaje',
-                              right_on='COD_DIAN_DEPARTAMENTO',
-                              how='left')
-                # Reemplazar valores en "Departamento de hospedaje"
-                df['Departamento de hospedaje'] = df.apply(
-                    lambda row: row['DEPARTAMENTO_DIAN'] if pd.notnull(row['DEPARTAMENTO_DIAN']) else row['Departamento de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN'], axis=1, inplace=True)
-            # Usar nombres de ciudades    
-            if sub_key == 'CIUDAD_HOSPEDAJE':
-                df = df.merge(df_municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']],
-                              left_on='Ciudad de hospedaje',
-                              right_on='COD_DANE_MUNICIPIO',
-                              how='left')
-                # Reemplazar valores en "Ciudad de hospedaje"
-                df['Ciudad de hospedaje'] = df.apply(
-                    lambda row: row['MUNICIPIO_DANE'] if pd.notnull(row['MUNICIPIO_DANE']) else row['Ciudad de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE'], axis=1, inplace=True)
             format_columns_turismo(df)  # Aplicar formato
             processed_sub_dict[sub_key] = df
         processed_data[key] = processed_sub_dict
@@ -3913,7 +3115,7 @@ def process_data(session, agrupacion, continentes=None, paises=None, hubs=None,
     return processed_data
      
 
-def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None):
+def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=None, bundle=None):
     """
     Esta función extrae y organiza datos de exportaciones desde una base de datos en Snowflake, 
     luego cambia los nombres de las columnas según los requisitos especificados.
@@ -3925,12 +3127,17 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
     - agrupacion: el nivel de agrupación para filtrar los datos.
     - unidad: la unidad de medida para filtrar los datos.
     - umbral: valor USD exportado mínimo exportado para contar la empresa.
+    - bundle: (opcional) ReportBundle ya construido con construir_report_bundle. Si no se entrega se construye aquí.
 
     Retorna:
     Un diccionario con los DataFrames procesados y las columnas renombradas.
     """
+    # Insumos del reporte: se consultan una sola vez y se comparten entre Word y Excel
+    if bundle is None:
+        bundle = construir_report_bundle(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+
     # Geo Parámetros 
-    geo_params = get_data_parametros(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    geo_params = bundle.geo_params
 
     # Parámetros para los datos de exportaciones
     AGRUPACION = geo_params['AGRUPACION']
@@ -3940,25 +3147,20 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
     # INDICADOR DE PRESENCIA DE DATOS
     #################################
 
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion
     
     # Obtener los parámetros T y T_1 para año cerrado y año corrido
-    params = get_parameters_exportaciones(session)
-    params_inversion = get_parameters_inversion(session)
-    params_turismo = get_parameters_turismo(session)
+    params = bundle.params_exportaciones
+    params_inversion = bundle.params_inversion
+    params_turismo = bundle.params_turismo
 
-    # Llamar a la función get_data() para obtener los datos de exportaciones
-    data_dict = get_data(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    # Copia de los datos del bundle: el procesamiento renombra columnas en el lugar
+    data_dict = copy.deepcopy(bundle.datos)
 
     # Procesar las tablas relevantes y cambiar los nombres de las columnas según corresponda
     processed_data = {}
 
-    # Obtener nombres en limpio de países
-    df_paises = obtener_paises_correlativa(session)
-    # Obtener nombres en limpio de departamentos
-    df_departamentos = obtener_departamentos_correlativa(session)
-    # Obtener nombres en limpio de municipios
-    df_municipios = obtener_municipios_correlativa(session)
+    # Los nombres en limpio de países, departamentos y municipios ya vienen resueltos en el bundle (resolver_nombres)
 
     ###############
     # Exportaciones
@@ -3981,18 +3183,6 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
         sub_dict = data_dict[key]
         processed_sub_dict = {}
         for sub_key, df in sub_dict.items():
-            # Renombrar los nombres de los países con el nombre real de la ONU
-            if sub_key == 'PAIS':
-                # Realizar la unión para reemplazar "Categoria" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_LLAVE_EXPORTACIONES', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='CATEGORIA',
-                              right_on='PAIS_LLAVE_EXPORTACIONES',
-                              how='left')
-                # Reemplazar valores en "CATEGORIA"
-                df['CATEGORIA'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['CATEGORIA'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_LLAVE_EXPORTACIONES', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
             # Renombrar la columna 'CATEGORIA' según el diccionario de nombres de columnas
             if 'CATEGORIA' in df.columns and sub_key in column_names_dict:
                 df.rename(columns={'CATEGORIA': column_names_dict[sub_key]}, inplace=True)
@@ -4135,16 +3325,6 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
             sub_dict = data_dict[key]
             processed_sub_dict = {}
             for sub_key, df in sub_dict.items():
-                # Realizar la unión para reemplazar "UNIDAD" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_INVERSION_BANREP', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='UNIDAD',
-                              right_on='PAIS_INVERSION_BANREP',
-                              how='left')
-                # Reemplazar valores en "UNIDAD"
-                df['UNIDAD'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['UNIDAD'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_INVERSION_BANREP', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)                              
                 # Renombrar la columna 'UNIDAD' según el diccionario de nombres de columnas de inversión
                 if 'UNIDAD' in df.columns and key in column_names_dict_inversion:
                     df.rename(columns={'UNIDAD': column_names_dict_inversion[key]}, inplace=True)  
@@ -4224,41 +3404,6 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
                             'DIFERENCIA_PORCENTUAL_T': f"Variación (%) {params_turismo['cerrado']['T']}",
                             'PARTICIPACION_T' : f"Participación (%) {params_turismo['cerrado']['T']}"
                         }, inplace=True)
-            # Usar nombres de países
-            if sub_key == 'PAIS_RESIDENCIA':
-                df = df.merge(df_paises[['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='País de residencia',
-                              right_on='PAIS_CODIGO_TURISMO',
-                              how='left')
-                # Reemplazar valores
-                df['País de residencia'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['País de residencia'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
-
-            # Usar nombres de departamentos
-            if sub_key == 'DPTO_HOSPEDAJE':
-                df = df.merge(df_departamentos[['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN']],
-                              left_on='Departamento de hospedaje',
-                              right_on='COD_DIAN_DEPARTAMENTO',
-                              how='left')
-                # Reemplazar valores en "Departamento de hospedaje"
-                df['Departamento de hospedaje'] = df.apply(
-                    lambda row: row['DEPARTAMENTO_DIAN'] if pd.notnull(row['DEPARTAMENTO_DIAN']) else row['Departamento de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN'], axis=1, inplace=True)
-
-            # Usar nombres de ciudades    
-            if sub_key == 'CIUDAD_HOSPEDAJE':
-                df = df.merge(df_municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']],
-                              left_on='Ciudad de hospedaje',
-                              right_on='COD_DANE_MUNICIPIO',
-                              how='left')
-                # Reemplazar valores en "Ciudad de hospedaje"
-                df['Ciudad de hospedaje'] = df.apply(
-                    lambda row: row['MUNICIPIO_DANE'] if pd.notnull(row['MUNICIPIO_DANE']) else row['Ciudad de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE'], axis=1, inplace=True)    
             # Cambiar numérico
             df.iloc[:, 1:] = df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce')
             format_columns_turismo_excel(df)  # Aplicar formato
@@ -4280,40 +3425,6 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
                             'DIFERENCIA_PORCENTUAL': f"Variación (%) Ene - {params_turismo['corrido']['T_MONTH_NAME']} {params_turismo['corrido']['T']}",
                             'PARTICIPACION_T' : f"Participación (%) Ene - {params_turismo['corrido']['T_MONTH_NAME']} {params_turismo['corrido']['T']}"
                         }, inplace=True)
-            # Usar nombres de países
-            if sub_key == 'PAIS_RESIDENCIA':
-                # Realizar la unión para reemplazar "País de residencia" con "COUNTRY_OR_AREA_UNSD"
-                df = df.merge(df_paises[['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD']],
-                              left_on='País de residencia',
-                              right_on='PAIS_CODIGO_TURISMO',
-                              how='left')
-                # Reemplazar valores en "UNIDAD"
-                df['País de residencia'] = df.apply(
-                    lambda row: row['COUNTRY_OR_AREA_UNSD'] if pd.notnull(row['COUNTRY_OR_AREA_UNSD']) else row['País de residencia'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['PAIS_CODIGO_TURISMO', 'COUNTRY_OR_AREA_UNSD'], axis=1, inplace=True)
-            # Usar nombres de departamentos
-            if sub_key == 'DPTO_HOSPEDAJE':
-                df = df.merge(df_departamentos[['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN']],
-                              left_on='Departamento de hospedaje',
-                              right_on='COD_DIAN_DEPARTAMENTO',
-                              how='left')
-                # Reemplazar valores en "Departamento de hospedaje"
-                df['Departamento de hospedaje'] = df.apply(
-                    lambda row: row['DEPARTAMENTO_DIAN'] if pd.notnull(row['DEPARTAMENTO_DIAN']) else row['Departamento de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN'], axis=1, inplace=True)
-            # Usar nombres de ciudades    
-            if sub_key == 'CIUDAD_HOSPEDAJE':
-                df = df.merge(df_municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']],
-                              left_on='Ciudad de hospedaje',
-                              right_on='COD_DANE_MUNICIPIO',
-                              how='left')
-                # Reemplazar valores en "Ciudad de hospedaje"
-                df['Ciudad de hospedaje'] = df.apply(
-                    lambda row: row['MUNICIPIO_DANE'] if pd.notnull(row['MUNICIPIO_DANE']) else row['Ciudad de hospedaje'], axis=1)
-                # Eliminar columnas innecesarias después de la unión
-                df.drop(['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE'], axis=1, inplace=True)
             # Cambiar numérico
             df.iloc[:, 1:] = df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce')
             format_columns_turismo_excel(df)  # Aplicar formato
@@ -4353,7 +3464,7 @@ def process_data_excel(session, agrupacion, continentes=None, paises=None, hubs=
     return processed_data
 
 
-def guardar_tablas_en_excel(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral, file_path):
+def guardar_tablas_en_excel(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral, file_path, bundle=None):
     """
     Guarda todas las tablas obtenidas de la función get_data en un archivo de Excel, 
     con cada tabla en una pestaña separada, usando un mapeo para nombres de pestañas específicos.
@@ -4368,9 +3479,10 @@ def guardar_tablas_en_excel(session, agrupacion, continentes, paises, hubs, tlcs
     departamentos (list): Lista de departamentos.
     umbral (list): Umbral para los datos.
     file_path (str): Ruta del archivo de Excel donde se guardarán las tablas.
+    bundle (ReportBundle, opcional): Insumos del reporte ya consultados. Si no se entrega se consultan.
     """
     # Obtener los datos usando la función get_data
-    data_dict = process_data_excel(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
+    data_dict = process_data_excel(session, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral, bundle=bundle)
     
     # Diccionario de mapeo para nombres de pestañas específicos
     sheet_name_mapping = {
@@ -0,0 +1,379 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import pandas as pd
+import numpy as np
+import snapshot_local as snap
+
+#########################################################
+# DATOS SINTÉTICOS PARA PRUEBAS DE DESEMPEÑO SIN SNOWFLAKE
+#########################################################
+
+# Semilla por defecto: la misma semilla y escala producen siempre las mismas tablas
+SEMILLA = 2024
+
+# Dimensiones fijas de la base
+CONTINENTES = ['América', 'Europa', 'Asia', 'África', 'Oceanía']
+HUBS = ['Norteamérica', 'Centroamérica y el Caribe', 'Andina', 'Cono Sur', 'Europa', 'Asia Pacífico']
+TLCS = ['Alianza del Pacífico', 'Comunidad Andina', 'Estados Unidos', 'Unión Europea', 'Mercosur', 'EFTA']
+SECTORES = ['Agroalimentos', 'Industrias 4.0', 'Metalmecánica y otras industrias', 'Químicos y ciencias de la vida',
+            'Sistema moda', 'Servicios', 'Minería', 'Energía']
+TIPOS = ['Mineras', 'No Mineras']
+MEDIOS = ['Marítimo', 'Aéreo', 'Terrestre', 'Fluvial', 'Otros']
+ACTIVIDADES = ['Servicios financieros y empresariales',
+               'Industrias manufactureras',
+               'Comercio al por mayor y al por menor, restaurantes y hoteles',
+               'Transportes, almacenamiento y comunicaciones',
+               'Electricidad, gas y agua',
+               'Servicios comunales sociales y personales',
+               'Construcción',
+               'Agricultura, caza, silvicultura y pesca']
+GENEROS = ['Masculino', 'Femenino', 'No informa']
+MOTIVOS = ['Vacaciones, recreo y ocio', 'Negocios y motivos profesionales', 'Visita a familiares o amigos',
+           'Eventos', 'Salud y atención médica', 'Educación y formación', 'Otros']
+CADENAS = ['Agroalimentos', 'Industrias 4.0', 'Metalmecánica y otras industrias', 'Químicos y ciencias de la vida',
+           'Sistema moda', 'Turismo']
+AEROLINEAS = ['Avianca', 'LATAM', 'Copa', 'American Airlines', 'Iberia', 'JetSMART', 'Wingo']
+
+# Tamaños a escala 1 (se multiplican por la escala)
+PAISES_POR_ESCALA = 40
+MUNICIPIOS_POR_DEPARTAMENTO = 10
+SUBSECTORES_POR_ESCALA = 25
+EMPRESAS_POR_UNIDAD = 60
+FILAS_TURISMO_POR_ESCALA = 20000
+DEPARTAMENTOS = 33
+
+
+def _variacion(valor_t, valor_t_1):
+    """
+    Variación porcentual vectorizada con las mismas reglas de calcular_diferencia_porcentual.
+    """
+    valor_t = np.asarray(valor_t, dtype=float)
+    valor_t_1 = np.asarray(valor_t_1, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacion = (valor_t - valor_t_1) / valor_t_1 * 100
+    variacion = np.where((valor_t_1 == 0) & (valor_t > 0), 100, variacion)
+    variacion = np.where((valor_t_1 == 0) & (valor_t == 0), 0, variacion)
+    return variacion
+
+
+def _repartir(rng, total, n):
+    """
+    Reparte un total en n valores positivos con una distribución sesgada (pocas categorías concentran el valor).
+    """
+    pesos = rng.lognormal(mean=0, sigma=1.5, size=n)
+    return total * pesos / pesos.sum()
+
+
+def _periodo(rng, valores_t_1):
+    """
+    Genera los valores del periodo T a partir de T-1 con un crecimiento aleatorio.
+    """
+    return valores_t_1 * np.clip(1 + rng.normal(0.05, 0.25, size=len(valores_t_1)), 0, None)
+
+
+def generar_geografia(rng, escala):
+    """
+    Genera las tablas de correlativas de GEOGRAFIA.
+
+    Retorna:
+    - diccionario {tabla: DataFrame} con PAISES_CORRELATIVA, DIAN_DEPARTAMENTOS,
+      DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS y DIVIPOLA_MUNICIPIOS.
+    """
+    # 1. Países con su continente, HUB y TLC
+    n_paises = PAISES_POR_ESCALA * escala
+    codigos = [f'{i:03d}' for i in range(1, n_paises + 1)]
+    nombres = [f'País {codigo}' for codigo in codigos]
+    continentes = np.array(CONTINENTES)[np.arange(n_paises) % len(CONTINENTES)]
+    paises = pd.DataFrame({
+        'CODIGO_DIAN': codigos,
+        'PAIS_LLAVE_EXPORTACIONES': [nombre.upper() for nombre in nombres],
+        'CONTINENTE_DANE_DIAN_EXPORTACIONES': continentes,
+        'OFICINA_COMERCIAL_EXPORTACIONES': [f'Oficina {hub}' for hub in np.array(HUBS)[np.arange(n_paises) % len(HUBS)]],
+        'HUB__C_EXPORTACIONES': np.array(HUBS)[np.arange(n_paises) % len(HUBS)],
+        'TIPO_ACUERDO_EXPORTACIONES': np.where(np.arange(n_paises) % 3 == 0, 'Sin acuerdo', 'TLC'),
+        'TLCS_EXPORTACIONES': np.array(TLCS)[rng.integers(0, len(TLCS), size=n_paises)],
+        'PAIS_INVERSION_BANREP': nombres,
+        'PAIS_CODIGO_TURISMO': codigos,
+        'NOMBRE_PAIS_CODIGO_TURISMO': nombres,
+        'COUNTRY_OR_AREA_UNSD': nombres,
+        'REGION_NAME_UNSD': continentes
+    })
+
+    # 2. Departamentos y municipios (mismo código DIAN y DANE de departamento)
+    codigos_departamento = [f'{j:02d}' for j in range(1, DEPARTAMENTOS + 1)]
+    departamentos = pd.DataFrame({
+        'COD_DIAN_DEPARTAMENTO': codigos_departamento,
+        'DEPARTAMENTO_DIAN': [f'Departamento {codigo}' for codigo in codigos_departamento]
+    })
+    n_municipios = MUNICIPIOS_POR_DEPARTAMENTO * escala
+    municipios = pd.DataFrame([
+        {'COD_DANE_DEPARTAMENTO': codigo,
+         'DEPARTAMENTO_DANE': f'Departamento {codigo}',
+         'COD_DANE_MUNICIPIO': f'{codigo}{k:03d}',
+         'MUNICIPIO_DANE': f'Municipio {codigo}{k:03d}'}
+        for codigo in codigos_departamento for k in range(1, n_municipios + 1)
+    ])
+
+    return {
+        'PAISES_CORRELATIVA': paises,
+        'DIAN_DEPARTAMENTOS': departamentos,
+        'DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS': municipios,
+        'DIVIPOLA_MUNICIPIOS': municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']].copy()
+    }
+
+
+def _unidades(geografia):
+    """
+    Lista de (AGRUPACION, UNIDAD) para las que existen datos de exportaciones.
+    """
+    paises = geografia['PAISES_CORRELATIVA']
+    unidades = [('COLOMBIA', 'COLOMBIA')]
+    unidades += [('CONTINENTES', continente) for continente in CONTINENTES]
+    unidades += [('HUBS', hub) for hub in HUBS]
+    unidades += [('TLCS', tlc) for tlc in TLCS]
+    unidades += [('PAISES', pais) for pais in paises['PAIS_LLAVE_EXPORTACIONES']]
+    unidades += [('DEPARTAMENTOS', departamento) for departamento in geografia['DIAN_DEPARTAMENTOS']['DEPARTAMENTO_DIAN']]
+    return unidades
+
+
+def generar_exportaciones(rng, escala, geografia, anio_t):
+    """
+    Genera las tablas ST_CATEGORIAS_*, ST_CATEGORIAS_PESO_*, ST_NIT_* y ST_CONTEO_EMPRESAS_* de EXPORTACIONES.
+
+    Las categorías de cada unidad suman el valor de 'No Mineras' y 'Mineras' + 'No Mineras' suma el total, de modo
+    que las filas 'Otros' y 'Total' de los reportes cuadran como en los datos reales.
+
+    Retorna:
+    - diccionario {tabla: DataFrame}.
+    """
+    # 1. Dimensiones de las categorías no minero energéticas
+    subsectores = [f'Subsector {i:03d}' for i in range(1, SUBSECTORES_POR_ESCALA * escala + 1)]
+    dimensiones = {
+        'CONTINENTE': CONTINENTES,
+        'HUBS': HUBS,
+        'TLCS': TLCS,
+        'PAIS': geografia['PAISES_CORRELATIVA']['PAIS_LLAVE_EXPORTACIONES'].tolist(),
+        'DEPARTAMENTOS': geografia['DIAN_DEPARTAMENTOS']['DEPARTAMENTO_DIAN'].tolist(),
+        'SECTORES': SECTORES,
+        'SUBSECTORES': subsectores
+    }
+
+    tablas = {}
+    unidades = _unidades(geografia)
+    for periodo in ['CERRADO', 'CORRIDO']:
+        filas_usd, filas_peso, filas_nit, filas_conteo = [], [], [], []
+        # El año del conteo de empresas es texto en Snowflake
+        anio_conteo = str(anio_t) if periodo == 'CERRADO' else str(anio_t + 1)
+        for agrupacion, unidad in unidades:
+            base = {'AGRUPACION': agrupacion, 'UNIDAD': unidad}
+
+            # 2. Totales y tipos en USD
+            total_t_1 = rng.lognormal(mean=20, sigma=1.5)
+            tipos_t_1 = _repartir(rng, total_t_1, len(TIPOS))
+            tipos_t = _periodo(rng, tipos_t_1)
+            filas_usd.append({**base, 'TABLA': 'TOTAL', 'CATEGORIA': 'TOTAL', 'SUMA_USD_T_1': tipos_t_1.sum(), 'SUMA_USD_T': tipos_t.sum()})
+            filas_usd += [{**base, 'TABLA': 'TIPOS', 'CATEGORIA': tipo, 'SUMA_USD_T_1': t_1, 'SUMA_USD_T': t}
+                          for tipo, t_1, t in zip(TIPOS, tipos_t_1, tipos_t)]
+
+            # 3. Categorías no minero energéticas que suman el valor de 'No Mineras'
+            for tabla, categorias in dimensiones.items():
+                valores_t_1 = _repartir(rng, tipos_t_1[1], len(categorias))
+                valores_t = _repartir(rng, tipos_t[1], len(categorias))
+                filas_usd += [{**base, 'TABLA': tabla, 'CATEGORIA': categoria, 'SUMA_USD_T_1': t_1, 'SUMA_USD_T': t}
+                              for categoria, t_1, t in zip(categorias, valores_t_1, valores_t)]
+
+            # 4. Totales, tipos y medios de transporte en peso
+            peso_t_1 = _repartir(rng, total_t_1 / rng.uniform(1, 5), len(TIPOS))
+            peso_t = _periodo(rng, peso_t_1)
+            filas_peso.append({**base, 'TABLA': 'TOTAL', 'CATEGORIA': 'TOTAL', 'SUMA_PESO_T_1': peso_t_1.sum(), 'SUMA_PESO_T': peso_t.sum()})
+            filas_peso += [{**base, 'TABLA': 'TIPOS', 'CATEGORIA': tipo, 'SUMA_PESO_T_1': t_1, 'SUMA_PESO_T': t}
+                           for tipo, t_1, t in zip(TIPOS, peso_t_1, peso_t)]
+            for tabla, t_1_tipo, t_tipo in [('MEDIO MINERAS', peso_t_1[0], peso_t[0]), ('MEDIO NO MINERAS', peso_t_1[1], peso_t[1])]:
+                filas_peso += [{**base, 'TABLA': tabla, 'CATEGORIA': medio, 'SUMA_PESO_T_1': t_1, 'SUMA_PESO_T': t}
+                               for medio, t_1, t in zip(MEDIOS, _repartir(rng, t_1_tipo, len(MEDIOS)), _repartir(rng, t_tipo, len(MEDIOS)))]
+
+            # 5. Empresas: parte del valor no minero energético y conteo de NIT por encima del umbral
+            n_empresas = EMPRESAS_POR_UNIDAD * escala
+            nits = [f'9{numero:08d}' for numero in rng.choice(10 ** 8, size=n_empresas, replace=False)]
+            empresas_t_1 = _repartir(rng, tipos_t_1[1] * 0.9, n_empresas)
+            empresas_t = _periodo(rng, empresas_t_1)
+            sectores = np.array(SECTORES[:6])[rng.integers(0, 6, size=n_empresas)]
+            filas_nit += [{**base, 'CATEGORIA': nit, 'RAZON_SOCIAL': f'Empresa {nit} S.A.S.', 'SECTOR_ESTRELLA': sector,
+                           'SUMA_USD_T_1': t_1, 'SUMA_USD_T': t}
+                          for nit, sector, t_1, t in zip(nits, sectores, empresas_t_1, empresas_t)]
+            filas_conteo += [{**base, 'YEAR': anio_conteo, 'NIT_EXPORTADOR': nit, 'VALOR_USD': valor}
+                             for nit, valor in zip(nits, rng.lognormal(mean=11, sigma=2.5, size=n_empresas))]
+
+        # 6. Variaciones porcentuales y tablas del periodo
+        for nombre, filas, prefijo in [(f'ST_CATEGORIAS_{periodo}', filas_usd, 'SUMA_USD'),
+                                       (f'ST_CATEGORIAS_PESO_{periodo}', filas_peso, 'SUMA_PESO'),
+                                       (f'ST_NIT_{periodo}', filas_nit, 'SUMA_USD')]:
+            data = pd.DataFrame(filas)
+            data['DIFERENCIA_PORCENTUAL'] = _variacion(data[f'{prefijo}_T'], data[f'{prefijo}_T_1'])
+            tablas[nombre] = data
+        tablas[f'ST_CONTEO_EMPRESAS_{periodo}'] = pd.DataFrame(filas_conteo)
+
+    # 7. Oportunidades por país y por departamento
+    filas_oportunidades = []
+    codigos = [('COD_PAIS', codigo) for codigo in geografia['PAISES_CORRELATIVA']['PAIS_CODIGO_TURISMO']]
+    codigos += [('COD_DIVIPOLA_DEPARTAMENTO', codigo) for codigo in geografia['DIAN_DEPARTAMENTOS']['COD_DIAN_DEPARTAMENTO']]
+    for columna, codigo in codigos:
+        for cadena in rng.choice(CADENAS, size=4, replace=False):
+            oportunidad = 'Turismo' if cadena == 'Turismo' else str(rng.choice(['Exportación', 'IED']))
+            filas_oportunidades.append({
+                'OPORTUNIDAD': oportunidad,
+                'CADENA': cadena,
+                'SECTOR': f'Sector {cadena}',
+                'SUBSECTOR': f'Subsector {rng.integers(1, 40):02d} de {cadena}',
+                'COD_PAIS': codigo if columna == 'COD_PAIS' else None,
+                'COD_DIVIPOLA_DEPARTAMENTO': codigo if columna == 'COD_DIVIPOLA_DEPARTAMENTO' else None
+            })
+    tablas['OPORTUNIDADES'] = pd.DataFrame(filas_oportunidades)
+
+    return tablas
+
+
+def generar_inversion(rng, geografia):
+    """
+    Genera las tablas ST_PAISES_* y ST_ACTIVIDADES_* de INVERSION (IED e ICE), incluida la fila 'TOTAL'.
+
+    Retorna:
+    - diccionario {tabla: DataFrame}.
+    """
+    tablas = {}
+    paises = geografia['PAISES_CORRELATIVA']['PAIS_INVERSION_BANREP'].tolist()
+    for periodo, columna_diferencia in [('CERRADO', 'DIFERENCIA_PORCENTUAL_T'), ('CORRIDO', 'DIFERENCIA_PORCENTUAL')]:
+        # 1. Países con su total para IED e ICE
+        filas_paises = []
+        for categoria in ['IED', 'ICE']:
+            valores_t_1 = _repartir(rng, rng.lognormal(mean=9.5, sigma=0.3), len(paises))
+            valores_t = _periodo(rng, valores_t_1)
+            filas_paises += [{'AGRUPACION': 'PAISES', 'UNIDAD': pais, 'CATEGORIA': categoria, 'SUMA_INVERSION_T_1': t_1, 'SUMA_INVERSION_T': t}
+                             for pais, t_1, t in zip(paises, valores_t_1, valores_t)]
+            filas_paises.append({'AGRUPACION': 'PAISES', 'UNIDAD': 'TOTAL', 'CATEGORIA': categoria,
+                                 'SUMA_INVERSION_T_1': valores_t_1.sum(), 'SUMA_INVERSION_T': valores_t.sum()})
+
+        # 2. Actividades económicas de la IED
+        valores_t_1 = _repartir(rng, rng.lognormal(mean=9.5, sigma=0.3), len(ACTIVIDADES))
+        valores_t = _periodo(rng, valores_t_1)
+        filas_actividades = [{'AGRUPACION': 'ACTIVIDADES', 'UNIDAD': actividad, 'TABLA': 'INVERSIÓN ACTIVIDADES', 'CATEGORIA': 'IED',
+                              'SUMA_INVERSION_T_1': t_1, 'SUMA_INVERSION_T': t}
+                             for actividad, t_1, t in zip(ACTIVIDADES, valores_t_1, valores_t)]
+        filas_actividades.append({'AGRUPACION': 'ACTIVIDADES', 'UNIDAD': 'TOTAL', 'TABLA': 'INVERSIÓN ACTIVIDADES', 'CATEGORIA': 'IED',
+                                  'SUMA_INVERSION_T_1': valores_t_1.sum(), 'SUMA_INVERSION_T': valores_t.sum()})
+
+        # 3. Variaciones porcentuales (el nombre de la columna cambia entre cerrado y corrido como en Snowflake)
+        for nombre, filas in [(f'ST_PAISES_{periodo}', filas_paises), (f'ST_ACTIVIDADES_{periodo}', filas_actividades)]:
+            data = pd.DataFrame(filas)
+            data[columna_diferencia] = _variacion(data['SUMA_INVERSION_T'], data['SUMA_INVERSION_T_1'])
+            tablas[nombre] = data
+
+    return tablas
+
+
+def generar_turismo(rng, escala, geografia):
+    """
+    Genera las tablas ST_PAISES_* y CONECTIVIDAD de TURISMO.
+
+    Retorna:
+    - diccionario {tabla: DataFrame}.
+    """
+    tablas = {}
+    paises = geografia['PAISES_CORRELATIVA']['PAIS_CODIGO_TURISMO'].to_numpy()
+    municipios = geografia['DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS']
+    n_filas = FILAS_TURISMO_POR_ESCALA * escala
+    for periodo in ['CERRADO', 'CORRIDO']:
+        # 1. Llegadas de viajeros por país de residencia, municipio de hospedaje, género y motivo
+        indices_municipio = rng.integers(0, len(municipios), size=n_filas)
+        llegadas_t_1 = rng.poisson(lam=rng.lognormal(mean=3, sigma=1.2, size=n_filas))
+        tablas[f'ST_PAISES_{periodo}'] = pd.DataFrame({
+            'PAIS_RESIDENCIA': paises[rng.integers(0, len(paises), size=n_filas)],
+            'DPTO_HOSPEDAJE': municipios['COD_DANE_DEPARTAMENTO'].to_numpy()[indices_municipio],
+            'CIUDAD_HOSPEDAJE': municipios['COD_DANE_MUNICIPIO'].to_numpy()[indices_municipio],
+            'DESCRIPCION_GENERO': np.array(GENEROS)[rng.choice(len(GENEROS), size=n_filas, p=[0.52, 0.46, 0.02])],
+            'MOVC_NOMBRE': np.array(MOTIVOS)[rng.integers(0, len(MOTIVOS), size=n_filas)],
+            'SUMA_TURISMO_T_1': llegadas_t_1,
+            'SUMA_TURISMO_T': np.round(_periodo(rng, llegadas_t_1)).astype(int)
+        })
+
+    # 2. Rutas aéreas internacionales con destino en cada departamento
+    filas_conectividad = []
+    for codigo in geografia['DIAN_DEPARTAMENTOS']['COD_DIAN_DEPARTAMENTO']:
+        for _ in range(int(rng.integers(0, 6))):
+            filas_conectividad.append({
+                'AEROLINEA': str(rng.choice(AEROLINEAS)),
+                'CIUDAD_ORIGEN': f'Ciudad {rng.integers(1, 60):02d}',
+                'CIUDAD_DESTINO': f'Municipio {codigo}001',
+                'FRECUENCIAS': int(rng.integers(1, 15)),
+                'SEMANA': 'Semana 1',
+                'COD_DIVIPOLA_DEPARTAMENTO_DESTINO': codigo
+            })
+    tablas['CONECTIVIDAD'] = pd.DataFrame(filas_conectividad)
+
+    return tablas
+
+
+def generar_parametros(anio_t):
+    """
+    Genera la tabla PARAMETROS con los periodos de cada eje y la fecha de actualización.
+    """
+    filas = [
+        ('Transversal', 'Fecha de actualización', f'{anio_t + 1}-07-15'),
+        ('Exportaciones', 'Año cerrado (T-1)', f'{anio_t - 1}'),
+        ('Exportaciones', 'Año cerrado (T)', f'{anio_t}'),
+        ('Exportaciones', 'Año corrido (T-1)', f'{anio_t}(ene-may)'),
+        ('Exportaciones', 'Año corrido (T)', f'{anio_t + 1}(ene-may)'),
+        ('Exportaciones', 'Mes corrido texto (T)', 'mayo'),
+        ('Exportaciones', 'Año corrido texto (T)', f'enero-mayo {anio_t + 1}'),
+        ('Inversión', 'Año cerrado (T-3)', f'{anio_t - 3}'),
+        ('Inversión', 'Año cerrado (T-2)', f'{anio_t - 2}'),
+        ('Inversión', 'Año cerrado (T-1)', f'{anio_t - 1}'),
+        ('Inversión', 'Año cerrado (T)', f'{anio_t}'),
+        ('Inversión', 'Año corrido (T-1)', f'{anio_t}-1'),
+        ('Inversión', 'Año corrido (T)', f'{anio_t + 1}-1'),
+        ('Turismo', 'Año cerrado (T-1)', f'{anio_t - 1}'),
+        ('Turismo', 'Año cerrado (T)', f'{anio_t}'),
+        ('Turismo', 'Año corrido (T-1)', f'{anio_t}'),
+        ('Turismo', 'Año corrido (T)', f'{anio_t + 1}'),
+        ('Turismo', 'Mes corrido', '5'),
+    ]
+    return pd.DataFrame(filas, columns=['EJE', 'PARAMETRO', 'VALOR'])
+
+
+def generar_tablas(escala=1, semilla=SEMILLA, anio_t=2023):
+    """
+    Genera todas las tablas de DOCUMENTOS_COLOMBIA que leen los reportes con datos sintéticos deterministas.
+
+    Parámetros:
+    - escala: multiplicador del número de países, municipios, subsectores, empresas y filas de turismo.
+    - semilla: semilla del generador aleatorio.
+    - anio_t: año cerrado (T) de los parámetros.
+
+    Retorna:
+    - diccionario {(esquema, tabla): DataFrame} con las mismas tablas de snapshot_local.TABLAS_SNAPSHOT.
+    """
+    rng = np.random.default_rng(semilla)
+    geografia = generar_geografia(rng, escala)
+    tablas = {('GEOGRAFIA', tabla): data for tabla, data in geografia.items()}
+    tablas.update({('EXPORTACIONES', tabla): data for tabla, data in generar_exportaciones(rng, escala, geografia, anio_t).items()})
+    tablas.update({('INVERSION', tabla): data for tabla, data in generar_inversion(rng, geografia).items()})
+    tablas.update({('TURISMO', tabla): data for tabla, data in generar_turismo(rng, escala, geografia).items()})
+    tablas[('PARAMETROS', 'PARAMETROS')] = generar_parametros(anio_t)
+    return tablas
+
+
+def crear_sesion_sintetica(directorio, escala=1, semilla=SEMILLA):
+    """
+    Genera el snapshot sintético en Parquet y retorna una sesión local que lo sirve con sql(query).collect().
+
+    Parámetros:
+    - directorio: carpeta donde se escribe el snapshot sintético.
+    - escala: multiplicador del tamaño de las tablas.
+    - semilla: semilla del generador aleatorio.
+
+    Retorna:
+    - sesion: snapshot_local.SesionLocal sobre las tablas sintéticas, utilizable en datos.get_data y process_data.
+    """
+    for (esquema, tabla), data in generar_tablas(escala, semilla).items():
+        snap.guardar_tabla_snapshot(data, directorio, esquema, tabla)
+    return snap.SesionLocal(directorio)
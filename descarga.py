@@ -3,52 +3,187 @@
 import datos as dat
 # Documentos 
 import documentos as doc
-# Conversión
+# Cache de consultas (versión de los datos) y de reportes
+import cache_consultas as cache
+import cache_reportes as cache_rep
+# Reportes pre-generados
+import almacen_reportes as alm
+# Generación en segundo plano
+import trabajos as trab
+# Registro de eventos en lotes
+import eventos as ev
+# Archivos en memoria
 import io
-import base64
 # Streamlit
 import streamlit as st
 
+# Fragmentos de Streamlit (st.fragment desde la versión 1.37, antes st.experimental_fragment)
+fragmento = getattr(st, 'fragment', None) or st.experimental_fragment
+
+
+# Detalle del evento de selección de cada agrupación
+DETALLES_SELECCION = {
+    'CONTINENTES': 'Selección de continente',
+    'PAISES': 'Selección de país',
+    'HUBS': 'Selección de HUB',
+    'TLCS': 'Selección de TLC',
+    'DEPARTAMENTOS': 'Selección de departamento',
+    'COLOMBIA': 'Selección de Colombia',
+}
+
 
 # Función para insertar datos en la tabla de seguimiento
 def registrar_evento(sesion_activa, tipo_evento, detalle_evento, unidad):
     """
     Registra un evento en la base de datos Snowflake.
 
+    El evento se agrega al registro en lotes de eventos.py, que lo envía en segundo plano con un INSERT parametrizado
+    de varias filas; la interfaz no espera a Snowflake y los eventos no se pierden si Snowflake no responde.
+
     Args:
     - sesion_activa: Sesión activa de conexión a la base de datos.
     - tipo_evento (str): Tipo de evento ('selección' o 'descarga').
     - detalle_evento (str): Detalle de evento ('selección continente', 'selección país', etc)
     - unidad (str): Unidad específica del evento (e.g., 'América', 'Colombia').
     """
-    # Crear objeto de conexión
-    conn = sesion_activa.connection
-    try:
-        # Crear consulta para el insert
-        query_insert = f"""
-        INSERT INTO DOCUMENTOS_COLOMBIA.SEGUIMIENTO.SEGUIMIENTO_EVENTOS (TIPO_EVENTO, DETALLE_EVENTO, UNIDAD, FECHA_HORA) 
-        VALUES ('{tipo_evento}', '{detalle_evento}', '{unidad}', CONVERT_TIMEZONE('America/Los_Angeles', 'America/Bogota', CURRENT_TIMESTAMP));
-        """
-        # Crear un cursor para ejecutar la consulta
-        cur = conn.cursor()
-        try:
-            # Ejecutar la consulta SQL con los valores
-            cur.execute(query_insert)
-        finally:
-            # Cerrar el cursor
-            cur.close()
-    # Error
-    except Exception as e:
-        st.write(f"Error al registrar evento: {e}")
+    # Crear objeto de conexión (la sesión local sobre el snapshot no tiene conexión a Snowflake y no registra eventos)
+    conn = getattr(sesion_activa, 'connection', None)
+    if conn is None:
+        return
+    # Agregar el evento al lote (el envío ocurre en segundo plano)
+    ev.registro_eventos.registrar(sesion_activa, tipo_evento, detalle_evento, unidad)
+
+
+class ArtefactoReporte:
+    """
+    Archivos Word y Excel de un reporte, en memoria y listos para descargar.
+
+    Guarda los bytes tal como los escriben doc.save y pd.ExcelWriter, sin pasar por disco ni por base64, de
+    modo que cache_reportes los guarda una sola vez y los botones de descarga los entregan sin decodificar.
+
+    Atributos:
+    - docx: bytes del documento Word.
+    - xlsx: bytes del archivo Excel.
+    - nombre_docx: nombre del archivo Word para la descarga.
+    - nombre_xlsx: nombre del archivo Excel para la descarga.
+    """
+
+    def __init__(self, docx, xlsx, nombre_docx, nombre_xlsx):
+        self.docx = docx
+        self.xlsx = xlsx
+        self.nombre_docx = nombre_docx
+        self.nombre_xlsx = nombre_xlsx
+
+    
+# Función que genera los archivos de un reporte en memoria
+def construir_artefacto(agrupacion, _sesion_activa, continentes, paises, hubs, tlcs, departamentos, umbral, header_image_left, footer_image, progreso, version=None):
+    """
+    Extrae los datos y genera en memoria el documento Word y el archivo Excel de un reporte.
+
+    Args:
+    - agrupacion (str): Tipo de agrupación para el informe.
+    - _sesion_activa: Sesión activa de conexión a la base de datos.
+    - continentes, paises, hubs, tlcs, departamentos (list): Unidad seleccionada en la lista de su agrupación, o None.
+    - umbral (list): Umbral de exportaciones para el conteo de empresas.
+    - header_image_left (str): Ruta a la imagen del encabezado izquierdo.
+    - footer_image (str): Ruta a la imagen del pie de página.
+    - progreso: Función progreso(porcentaje, texto) que publica el avance de cada etapa (TrabajoReporte.progreso).
+    - version (str): Versión de los datos de la llave del reporte; todos los insumos del reporte se resuelven con ella.
 
+    Returns:
+    - ArtefactoReporte con los archivos Word y Excel.
+    """
+    # Todas las consultas del reporte se resuelven con la versión de su llave (ver cache_consultas.fijar_version)
+    with cache.fijar_version(_sesion_activa, version) as sesion_reporte:
+        # Extraer una sola vez todos los insumos del reporte (compartidos por Word y Excel)
+        # (la extracción ocupa del 0 al 60 % del avance)
+        bundle = dat.construir_report_bundle(sesion_reporte, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral,
+                                             progreso=lambda porcentaje, texto: progreso(porcentaje * 60 // 100, texto),
+                                             version=version)
+        geo_params = bundle.geo_params
     
+        # Procesar datos
+        tables = dat.process_data(sesion_reporte, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral, bundle=bundle)
+        progreso(70, "Datos extraidos y transformados correctamente.")
+
+        # Determinar los nombres de los archivos
+        if agrupacion == 'COLOMBIA':
+            file_name_suffix = 'Colombia'
+        else:
+            entity_name = (continentes[0] if continentes else
+                           paises[0] if paises else
+                           hubs[0] if hubs else
+                           tlcs[0] if tlcs else
+                           departamentos[0])
+            file_name_suffix = f"{agrupacion} - {entity_name}"
+
+        # Buffers en memoria para generar archivos (sin escribir en disco ni compartir rutas entre sesiones)
+        file_path_docx = io.BytesIO()
+        file_path_xlsx = io.BytesIO()
+
+        # Generar el documento Word (el evento de selección lo registra generar_documentos en cada solicitud)
+        progreso(75, "Generando el documento Word.")
+        if agrupacion == 'CONTINENTES':
+            doc.create_document_continentes(tablas=tables, file_path=file_path_docx, titulo=continentes[0], header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        elif agrupacion == 'PAISES':
+            doc.create_document_paises(tablas=tables, file_path=file_path_docx, titulo=paises[0], header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        elif agrupacion == 'HUBS':
+            doc.create_document_hubs(tablas=tables, file_path=file_path_docx, titulo=hubs[0], header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        elif agrupacion == 'TLCS':
+            doc.create_document_tlcs(tablas=tables, file_path=file_path_docx, titulo=tlcs[0], header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        elif agrupacion == 'DEPARTAMENTOS':
+            doc.create_document_departamentos(tablas=tables, file_path=file_path_docx, titulo=departamentos[0], header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        elif agrupacion == 'COLOMBIA':
+            doc.create_document_colombia(tablas=tables, file_path=file_path_docx, header_image_left=header_image_left, footer_image=footer_image, session=sesion_reporte, geo_params=geo_params, bundle=bundle)
+        else:
+            raise ValueError("Agrupación no reconocida")
+
+        # Crear el archivo Excel utilizando la función original
+        progreso(85, "Generando el archivo Excel.")
+        dat.guardar_tablas_en_excel(session=sesion_reporte, agrupacion=agrupacion, continentes=continentes, paises=paises, hubs=hubs, tlcs=tlcs, departamentos=departamentos, umbral=umbral, file_path=file_path_xlsx, bundle=bundle)
+        progreso(95, "Documento creado con exito.")
+
+    # Preparar los archivos para descarga: los bytes de cada buffer y el nombre del archivo
+    return ArtefactoReporte(docx=file_path_docx.getvalue(), xlsx=file_path_xlsx.getvalue(),
+                            nombre_docx=f"Tres Ejes {file_name_suffix}.docx",
+                            nombre_xlsx=f"Tres Ejes {file_name_suffix}.xlsx")
+
+
+# Función que busca un reporte en el almacén de reportes pre-generados
+def obtener_pregenerado(agrupacion, unidad, umbral, version):
+    """
+    Retorna el reporte pre-generado por pregeneracion.py para la versión de datos y de plantilla actuales.
+
+    Args:
+    - agrupacion (str): Tipo de agrupación para el informe.
+    - unidad (str): Unidad seleccionada (e.g., 'América', 'Colombia').
+    - umbral (list): Umbral de exportaciones para el conteo de empresas.
+    - version (str): Versión de los datos.
+
+    Returns:
+    - ArtefactoReporte, o None si no hay almacén o el reporte no está pre-generado.
+    """
+    if not alm.almacen_reportes.activo:
+        return None
+    archivos = alm.almacen_reportes.obtener(alm.llave_almacen(agrupacion, unidad, umbral, version))
+    if archivos is None:
+        return None
+    docx, xlsx, nombre_docx, nombre_xlsx = archivos
+    return ArtefactoReporte(docx=docx, xlsx=xlsx, nombre_docx=nombre_docx, nombre_xlsx=nombre_xlsx)
+
+
 # Función para generar archivos sin generar botón de descarga
-@st.cache_data(show_spinner=False)
 def generar_documentos(agrupacion, _sesion_activa, continentes=None, paises=None, hubs=None, tlcs=None, departamentos=None, umbral=[10000], header_image_left=None, footer_image=None):
     
     """
     Genera documentos Word y Excel para la agrupación seleccionada y los pone disponibles para descarga.
 
+    Los reportes se guardan en cache_reportes con llave (agrupación, unidad, umbral, versión de datos), compartida
+    por todas las sesiones: si el reporte ya existe, o si pregeneracion.py lo dejó en el almacén de reportes, se
+    retorna sin volver a generarlo. Si no existe, se envía a la
+    cola de trabajos en segundo plano y se muestra su avance; la página se recarga cuando el trabajo termina.
+    El evento de selección se registra aquí, una vez por selección del usuario, sin importar de dónde sale el reporte.
+
     Args:
     - agrupacion (str): Tipo de agrupación para el informe (e.g., 'CONTINENTES', 'PAISES', 'HUBS', 'TLCS', 'DEPARTAMENTOS', 'COLOMBIA').
     - _sesion_activa: Sesión activa de conexión a la base de datos (OBJETO NO HASHEABLE POR ELLO SE PONE _ AL INICIO).
@@ -61,6 +196,9 @@ def generar_documentos(agrupacion, _sesion_activa, continentes=None, paises=None
     - header_image_left (str, optional): Ruta a la imagen del encabezado izquierdo. Default es None.
     - header_image_right (str, optional): Ruta a la imagen del encabezado derecho. Default es None.
     - footer_image (str, optional): Ruta a la imagen del pie de página. Default es None.
+
+    Returns:
+    - ArtefactoReporte con los archivos Word y Excel, o None si el reporte está en proceso o se produjo un error.
     """
 
     # Convertir tuplas a listas, o definir como None si no se proporcionan valores
@@ -71,107 +209,76 @@ def generar_documentos(agrupacion, _sesion_activa, continentes=None, paises=None
     departamentos = list(departamentos) if departamentos else None
     umbral = list(umbral) if umbral else None
 
-    # Mostrar barra de progreso y spinner
-    progress_bar = st.progress(0)
-    with st.spinner('Generando el documento, por favor espere...'):
-        try:
-            # Obtener parámetros de datos
-            geo_params = dat.get_data_parametros(_sesion_activa, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
-            # Actualizar progreso
-            progress_bar.progress(5, text="Parámetros identificados correctamente.")
-            
-            # Procesar datos
-            tables = dat.process_data(_sesion_activa, agrupacion, continentes, paises, hubs, tlcs, departamentos, umbral)
-            progress_bar.progress(50, text="Datos extraidos y transformados correctamente.")
-
-            # Determinar los nombres de los archivos
-            if agrupacion == 'COLOMBIA':
-                file_name_suffix = 'Colombia'
-            else:
-                entity_name = (continentes[0] if continentes else
-                               paises[0] if paises else
-                               hubs[0] if hubs else
-                               tlcs[0] if tlcs else
-                               departamentos[0])
-                file_name_suffix = f"{agrupacion} - {entity_name}"
-
-            # Filepath para generar archivos
-            file_path_docx = f"output/Tres Ejes {file_name_suffix}.docx"
-            file_path_xlsx = f"output/Tres Ejes {file_name_suffix}.xlsx"
-
-            # Generar el documento Word y registrar evento de selección en la base de datos
-            if agrupacion == 'CONTINENTES':
-                doc.create_document_continentes(tablas=tables, file_path=file_path_docx, titulo=continentes[0], header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de continente', unidad=continentes[0])
-            elif agrupacion == 'PAISES':
-                doc.create_document_paises(tablas=tables, file_path=file_path_docx, titulo=paises[0], header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de país', unidad=paises[0])
-            elif agrupacion == 'HUBS':
-                doc.create_document_hubs(tablas=tables, file_path=file_path_docx, titulo=hubs[0], header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de HUB', unidad=hubs[0])   
-            elif agrupacion == 'TLCS':
-                doc.create_document_tlcs(tablas=tables, file_path=file_path_docx, titulo=tlcs[0], header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de TLC', unidad=tlcs[0])
-            elif agrupacion == 'DEPARTAMENTOS':
-                doc.create_document_departamentos(tablas=tables, file_path=file_path_docx, titulo=departamentos[0], header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de departamento', unidad=departamentos[0])
-            elif agrupacion == 'COLOMBIA':
-                doc.create_document_colombia(tablas=tables, file_path=file_path_docx, header_image_left=header_image_left, footer_image=footer_image, session=_sesion_activa, geo_params=geo_params)
-                registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento='Selección de Colombia', unidad='Colombia')
-            else:
-                raise ValueError("Agrupación no reconocida")
-
-            # Crear el archivo Excel utilizando la función original
-            dat.guardar_tablas_en_excel(session=_sesion_activa, agrupacion=agrupacion, continentes=continentes, paises=paises, hubs=hubs, tlcs=tlcs, departamentos=departamentos, umbral=umbral, file_path=file_path_xlsx)
-            progress_bar.progress(75, text="Documento creado con exito.")
-
-            # Preparar los archivos para descarga
-            # DOCX
-            with open(file_path_docx, 'rb') as f:
-                doc_bytes = io.BytesIO(f.read())
-            # EXCEL
-            with open(file_path_xlsx, 'rb') as f:
-                excel_bytes = io.BytesIO(f.read())
-
-            # Codificar los archivos en base64
-            # DOCX
-            b64_docx = base64.b64encode(doc_bytes.getvalue()).decode()
-            # EXCEL
-            b64_xlsx = base64.b64encode(excel_bytes.getvalue()).decode()
-
-            # Modificar nombres y dejarlos sin output/ para un nombre más corto
-            file_path_docx = f"Tres Ejes {file_name_suffix}.docx"
-            file_path_xlsx = f"Tres Ejes {file_name_suffix}.xlsx"
-
-            # Actualizar progreso al 100%
-            progress_bar.progress(100, text="Proceso terminado")
-            
-            # Mostrar mensaje de éxito cuando los documentos están listos
-            st.success("El documento ha sido generado exitosamente. Puede descargarlo a continuación:")
-            
-        except Exception as e:
-            # Mostrar mensaje de error en caso de excepción
-            st.error(f"Se produjo un error durante la generación del documento: {e}")
-        finally:
-            # Finalizar barra de progreso
-            progress_bar.empty()
-    
-    # Return
-    return b64_docx, b64_xlsx, file_path_docx, file_path_xlsx
+    # Buscar el reporte en la cache compartida
+    filtro = continentes or paises or hubs or tlcs or departamentos
+    unidad = filtro[0] if filtro else 'Colombia'
+    version = cache.version_datos(_sesion_activa)
+    llave = cache_rep.llave_reporte(agrupacion, unidad, umbral, version)
+
+    # Registrar la selección una vez por solicitud del usuario, se sirva desde la cache, desde el almacén o se genere
+    # (los reruns de Streamlit de la misma selección no vuelven a registrarla)
+    if st.session_state.get('seleccion_registrada') != llave:
+        registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Selección', detalle_evento=DETALLES_SELECCION[agrupacion], unidad=unidad)
+        st.session_state['seleccion_registrada'] = llave
+    artefacto = cache_rep.cache_reportes.obtener(llave)
+    if artefacto is None:
+        # Reporte pre-generado en el almacén: se sirve sin generar y queda en la cache de reportes
+        artefacto = obtener_pregenerado(agrupacion, unidad, umbral, version)
+        if artefacto is not None:
+            cache_rep.cache_reportes.guardar(llave, artefacto)
+    if artefacto is not None:
+        st.success("El documento ha sido generado exitosamente. Puede descargarlo a continuación:")
+        return artefacto
+
+    # Trabajo en segundo plano de esta sesión para la llave, o uno nuevo (compartido si otra sesión ya lo envió)
+    trabajos_sesion = st.session_state.setdefault('trabajos_reportes', {})
+    trabajo = trab.cola_reportes.obtener(trabajos_sesion.get(llave))
+    if trabajo is None:
+        trabajo = trab.cola_reportes.enviar(
+            llave, lambda progreso: cache_rep.cache_reportes.obtener_o_generar(
+                llave, lambda: construir_artefacto(agrupacion, _sesion_activa, continentes, paises, hubs, tlcs, departamentos, umbral,
+                                                   header_image_left, footer_image, progreso, version=version)))
+        trabajos_sesion[llave] = trabajo.id
+
+    # Trabajo terminado: retornar el resultado o mostrar el error
+    if trabajo.terminado:
+        del trabajos_sesion[llave]
+        if trabajo.estado == trab.ERROR:
+            st.error(f"Se produjo un error durante la generación del documento: {trabajo.error}")
+            return None
+        st.success("El documento ha sido generado exitosamente. Puede descargarlo a continuación:")
+        return trabajo.artefacto
+
+    # Trabajo en curso: mostrar el avance real hasta que termine
+    mostrar_progreso(trabajo.id)
+    return None
+
+
+# Fragmento que se vuelve a ejecutar cada segundo sin recargar toda la página
+@fragmento(run_every=1)
+def mostrar_progreso(id_trabajo):
+    """
+    Muestra el avance de un trabajo de generación y recarga la página cuando termina.
+
+    Args:
+    - id_trabajo (str): Identificador del TrabajoReporte.
+    """
+    trabajo = trab.cola_reportes.obtener(id_trabajo)
+    if trabajo is None or trabajo.terminado:
+        # Recargar la página completa para mostrar los botones de descarga (o el error)
+        st.rerun()
+    st.progress(trabajo.porcentaje, text=trabajo.etapa)
 
 
 
 # Función para crear los botones de descarga
-def botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, agrupacion, _sesion_activa, unidad):
+def botones_descarga_word_xlsx(artefacto, agrupacion, _sesion_activa, unidad):
 
     """
     Genera botones de descarga para documentos en formatos Word y Excel, con eventos de registro.
 
     Args:
-    - b64_docx (str): Documento en formato Word codificado en base64.
-    - b64_xlsx (str): Documento en formato Excel codificado en base64.
-    - file_path_docx (str): Nombre del archivo Word para la descarga.
-    - file_path_xlsx (str): Nombre del archivo Excel para la descarga.
+    - artefacto (ArtefactoReporte): Archivos Word y Excel en memoria con sus nombres de descarga.
     - agrupacion (str): Tipo de agrupación para el informe (e.g., 'CONTINENTES', 'PAISES', 'HUBS', 'TLCS', 'DEPARTAMENTOS', 'COLOMBIA').
     - _sesion_activa: Sesión activa de conexión a la base de datos.
     - unidad (tuple or list): Unidad seleccionada para el evento (e.g., continente, país, HUB).
@@ -212,16 +319,17 @@ def botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xls
     # Agregar botones de descarga con widgets básicos de streamlit
     # Convertir tuplas a listas
     unidad_evento = str(unidad[0]) if isinstance(unidad, tuple) else str(unidad) if unidad else None
+    # Los bytes del artefacto se entregan directamente, sin copias ni decodificación
     # WORD
-    st.download_button(label='Descargar el documento en Microsoft Word', data=base64.b64decode(b64_docx), 
-                    file_name=file_path_docx, help='Presione el botón para descargar el archivo Word', 
+    st.download_button(label='Descargar el documento en Microsoft Word', data=artefacto.docx, 
+                    file_name=artefacto.nombre_docx, help='Presione el botón para descargar el archivo Word', 
                     mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document', 
                     on_click=lambda: registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Descarga', detalle_evento=descripcion_evento_word, unidad=unidad_evento),
                     type='secondary',
                     use_container_width=True)
     # EXCEL
-    st.download_button(label='Presione el botón para descargar el archivo Excel', data=base64.b64decode(b64_xlsx), 
-                    file_name=file_path_xlsx, help='Presione el botón para descargar el archivo Excel', 
+    st.download_button(label='Presione el botón para descargar el archivo Excel', data=artefacto.xlsx, 
+                    file_name=artefacto.nombre_xlsx, help='Presione el botón para descargar el archivo Excel', 
                     mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 
                     on_click=lambda: registrar_evento(sesion_activa=_sesion_activa, tipo_evento='Descarga', detalle_evento=descripcion_evento_excel, unidad=unidad_evento),
                     type='secondary',
@@ -1,7 +1,9 @@
 # Liberias 
+import copy
+import threading
 import pandas as pd
 from docx import Document
-from docx.shared import Pt, RGBColor, Inches, Cm
+from docx.shared import Pt, RGBColor, Inches, Cm, Emu
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_BREAK
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -10,552 +12,24 @@ from docx.oxml.ns import nsdecls, qn
 from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
 from docx.oxml.section import CT_SectPr
 from docx.table import _Row
+# Datos
+import datos as dat
 
 def verif_ejes(session, params):
     """
-    Función para verificar la existencia de datos en diferentes categorías (exportaciones, inversión y turismo)
-    agrupados por diferentes criterios (CONTINENTES, HUBS, TLCS, PAISES, DEPARTAMENTOS). La función ejecuta
-    consultas SQL en una sesión de Snowflake y agrega los resultados a un diccionario indicando si hay datos
-    disponibles o no en cada categoría y periodo (cerrado o corrido).
+    Verifica la existencia de datos por eje y periodo para la agrupación y unidad de params.
+
+    Usa datos.verif_ejes, que retorna los indicadores que get_data calculó con sus resultados y memorizó en
+    params, de modo que el documento comparte la misma respuesta que la extracción de datos.
 
     Parámetros:
     - session: Sesión activa de Snowflake.
-    - params: Diccionario con los parámetros necesarios para ejecutar las consultas, incluyendo AGRUPACION,
-              UNIDAD, UMBRAL, PAISES_INVERSION, PAISES_TURISMO_COD, y UNIDAD_COD.
+    - params: Diccionario de parámetros de get_data_parametros.
 
     Retorna:
-    - dict_verif: Diccionario con los resultados de la verificación, indicando si hay datos disponibles o no
-                  para cada categoría y periodo.
+    - dict_verif: Diccionario con los indicadores CON/SIN DATOS por categoría y periodo.
     """
-
-    # 1. Obtener los parámetros según sea la agrupación y unidad
-    # Parámetros para los datos de exportaciones
-    AGRUPACION = params['AGRUPACION']
-    UNIDAD = params['UNIDAD'][0]
-    UMBRAL = params['UMBRAL'][0]
-
-    # Parámetros para los datos de inversión
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        PAISES_INVERSION = [pais for pais in params['PAISES_INVERSION'] if pais is not None]
-        PAISES_INVERSION_sql = ', '.join(f"'{pais}'" for pais in PAISES_INVERSION)
-
-    # Parámetros para los datos de turismo
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-        PAISES_TURISMO = [pais for pais in params['PAISES_TURISMO_COD'] if pais is not None]
-        PAISES_TURISMO_sql = ', '.join(f"'{pais}'" for pais in PAISES_TURISMO)
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        DEPARTAMENTOS_TURISMO = [departamento for departamento in params['UNIDAD_COD'] if departamento is not None]
-        DEPARTAMENTOS_TURISMO_sql = ', '.join(f"'{departamento}'" for departamento in DEPARTAMENTOS_TURISMO)
-
-    # 2. Diccionario para almacenar los resultados
-    dict_verif = {}
-
-    # El siguiente proceso no es válido para la agrupación de COLOMBIA ya que esta siempre tiene datos: 
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'DEPARTAMENTOS']:
-
-        # 3. Verificación de exportaciones
-        # Consultas para verificar datos de exportaciones en periodos cerrados y corridos, tanto totales como No Mineras (NME)
-        
-        # Totales
-        # Cerrado
-        query_verif_exportaciones_total_cerrado = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CERRADO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TOTAL';
-        """
-        # Corrido
-        query_verif_exportaciones_total_corrido = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CORRIDO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TOTAL';
-        """
-
-        # NME
-        # Cerrado
-        query_verif_exportaciones_nme_cerrado = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CERRADO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TIPOS'
-            AND A.CATEGORIA = 'No Mineras';
-        """
-        # Corrido
-        query_verif_exportaciones_nme_corrido = f"""
-        SELECT DISTINCT A.UNIDAD
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_CORRIDO AS A
-        WHERE A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}')
-            AND A.TABLA = 'TIPOS'
-            AND A.CATEGORIA = 'No Mineras';
-        """
-
-        # Conteo de empresas
-        # Cerrado
-        query_verif_exportaciones_cuenta_cerrado = f"""
-        SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CERRADO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-        # Corrido
-        query_verif_exportaciones_cuenta_corrido = f"""
-        SELECT A.NIT_EXPORTADOR, A.YEAR
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CONTEO_EMPRESAS_CORRIDO AS A
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-                AND A.VALOR_USD > {UMBRAL}
-            ORDER BY A.YEAR ASC;
-        """
-
-        # Datos de empresas
-        # Cerrado
-        query_verif_exportaciones_empresas_cerrado = f"""
-            SELECT A.CATEGORIA, 
-                    A.RAZON_SOCIAL,
-                    A.SECTOR_ESTRELLA,
-                    A.SUMA_USD_T_1, 
-                    A.SUMA_USD_T, 
-                    A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_NIT_CERRADO AS A 
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-            ORDER BY SUMA_USD_T DESC LIMIT 5;
-        """
-        # Corrido
-        query_verif_exportaciones_empresas_corrido = f"""
-            SELECT A.CATEGORIA, 
-                    A.RAZON_SOCIAL,
-                    A.SECTOR_ESTRELLA,
-                    A.SUMA_USD_T_1, 
-                    A.SUMA_USD_T, 
-                    A.DIFERENCIA_PORCENTUAL
-            FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_NIT_CORRIDO AS A 
-            WHERE A.AGRUPACION = '{AGRUPACION}' 
-                AND A.UNIDAD = '{UNIDAD}'
-            ORDER BY SUMA_USD_T DESC LIMIT 5;
-        """
-
-        # Ejecución de consultas y agregar al diccionario si los países o departamentos son válidos o no        
-        df_export_total_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_total_cerrado).collect())
-        df_export_total_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_total_corrido).collect())
-        df_nme_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_nme_cerrado).collect())
-        df_nme_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_nme_corrido).collect())
-        df_conteo_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_cuenta_cerrado).collect())
-        df_conteo_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_cuenta_corrido).collect())
-        df_empresas_cerrado = pd.DataFrame(session.sql(query_verif_exportaciones_empresas_cerrado).collect())
-        df_empresas_corrido = pd.DataFrame(session.sql(query_verif_exportaciones_empresas_corrido).collect())
-
-
-        # Verificar y agregar al diccionario dict_verif
-        # Exportaciones Totales
-        if df_export_total_cerrado.empty:
-            dict_verif['exportaciones_totales_cerrado'] = "SIN DATOS DE EXPORTACIONES TOTALES CERRADO"
-        else:
-            dict_verif['exportaciones_totales_cerrado'] = "CON DATOS DE EXPORTACIONES TOTALES CERRADO"
-
-        if df_export_total_corrido.empty:
-            dict_verif['exportaciones_totales_corrido'] = "SIN DATOS DE EXPORTACIONES TOTALES CORRIDO"
-        else:
-            dict_verif['exportaciones_totales_corrido'] = "CON DATOS DE EXPORTACIONES TOTALES CORRIDO"
-
-        # Exportaciones NME
-        if df_nme_cerrado.empty:
-            dict_verif['exportaciones_nme_cerrado'] = "SIN DATOS DE EXPORTACIONES NME CERRADO"
-        else:
-            dict_verif['exportaciones_nme_cerrado'] = "CON DATOS DE EXPORTACIONES NME CERRADO"
-
-        if df_nme_corrido.empty:
-            dict_verif['exportaciones_nme_corrido'] = "SIN DATOS DE EXPORTACIONES NME CORRIDO"
-        else:
-            dict_verif['exportaciones_nme_corrido'] = "CON DATOS DE EXPORTACIONES NME CORRIDO"
-
-        # Conteo de empresas
-        if df_conteo_cerrado.empty:
-            dict_verif['exportaciones_conteo_cerrado'] = "SIN DATOS DE CONTEO CERRADO"
-        else:
-            dict_verif['exportaciones_conteo_cerrado'] = "CON DATOS DE CONTEO CERRADO"
-
-        if df_conteo_corrido.empty:
-            dict_verif['exportaciones_conteo_corrido'] = "SIN DATOS DE CONTEO CORRIDO"
-        else:
-            dict_verif['exportaciones_conteo_corrido'] = "CON DATOS DE CONTEO CORRIDO"
-
-        # Empresas
-        if df_empresas_cerrado.empty:
-            dict_verif['exportaciones_empresas_cerrado'] = "SIN DATOS DE EMPRESAS CERRADO"
-        else:
-            dict_verif['exportaciones_empresas_cerrado'] = "CON DATOS DE EMPRESAS CERRADO"
-
-        if df_empresas_corrido.empty:
-            dict_verif['exportaciones_empresas_corrido'] = "SIN DATOS DE EMPRESAS CORRIDO"
-        else:
-            dict_verif['exportaciones_empresas_corrido'] = "CON DATOS DE EMPRESAS CORRIDO"
-
-
-        # 4. Verificación de inversión 
-        # Consultas para verificar datos de inversión extranjera directa (IED) e inversión colombiana en el exterior (ICE)
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA']:
-            # IED
-            # CERRADO
-            query_verif_ied_cerrado = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'IED'
-            """
-            query_verif_ied_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-            # CORRIDO
-            query_verif_ied_corrido = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'IED'
-            """
-            query_verif_ied_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-
-            # ICE
-            # CERRADO
-            query_verif_ice_cerrado = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CERRADO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_verif_ice_cerrado += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-            # CORRIDO
-            query_verif_ice_corrido = f"""
-            SELECT DISTINCT A.UNIDAD
-            FROM DOCUMENTOS_COLOMBIA.INVERSION.ST_PAISES_CORRIDO AS A
-            WHERE A.AGRUPACION = 'PAISES'
-                AND A.UNIDAD NOT IN ('TOTAL')
-                AND A.CATEGORIA = 'ICE'
-            """
-            query_verif_ice_corrido += f" AND A.UNIDAD IN ({PAISES_INVERSION_sql})"
-
-            # Ejecución de consultas y agregar al diccionario si los países son válidos o no
-
-            # IED
-            try:
-                df_ied_cerrado = pd.DataFrame(session.sql(query_verif_ied_cerrado).collect())
-                if df_ied_cerrado.empty:
-                    dict_verif['ied_cerrado'] = "SIN DATOS DE IED CERRADO"
-                else:
-                    dict_verif['ied_cerrado'] = "CON DATOS DE IED CERRADO"
-            except Exception as e:
-                dict_verif['ied_cerrado'] = "SIN DATOS DE IED CERRADO"
-
-            try:
-                df_ied_corrido = pd.DataFrame(session.sql(query_verif_ied_corrido).collect())
-                if df_ied_corrido.empty:
-                    dict_verif['ied_corrido'] = "SIN DATOS DE IED CORRIDO"
-                else:
-                    dict_verif['ied_corrido'] = "CON DATOS DE IED CORRIDO"
-            except Exception as e:
-                dict_verif['ied_corrido'] = "SIN DATOS DE IED CORRIDO"
-
-            # ICE
-            try:
-                df_ice_cerrado = pd.DataFrame(session.sql(query_verif_ice_cerrado).collect())
-                if df_ice_cerrado.empty:
-                    dict_verif['ice_cerrado'] = "SIN DATOS DE ICE CERRADO"
-                else:
-                    dict_verif['ice_cerrado'] = "CON DATOS DE ICE CERRADO"
-            except Exception as e:
-                dict_verif['ice_cerrado'] = "SIN DATOS DE ICE CERRADO"
-
-            try:
-                df_ice_corrido = pd.DataFrame(session.sql(query_verif_ice_corrido).collect())
-                if df_ice_corrido.empty:
-                    dict_verif['ice_corrido'] = "SIN DATOS DE ICE CORRIDO"
-                else:
-                    dict_verif['ice_corrido'] = "CON DATOS DE ICE CORRIDO"
-            except Exception as e:
-                dict_verif['ice_corrido'] = "SIN DATOS DE ICE CORRIDO"
-
-        
-        # 5. Verificación de turismo
-        # Consultas para verificar datos de turismo en periodos cerrados y corridos, considerando agrupación por países o departamentos
-        # Cerrado
-        query_verif_turismo_cerrado = f"""
-        SELECT A.PAIS_RESIDENCIA,
-            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CERRADO AS A
-        WHERE 1=1
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_verif_turismo_cerrado += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_verif_turismo_cerrado += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-        
-        # Corrido
-        query_verif_turismo_corrido = f"""
-        SELECT A.PAIS_RESIDENCIA,
-            FROM DOCUMENTOS_COLOMBIA.TURISMO.ST_PAISES_CORRIDO AS A
-        WHERE 1=1
-        """
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_verif_turismo_corrido += f" AND A.PAIS_RESIDENCIA IN ({PAISES_TURISMO_sql})"
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_verif_turismo_corrido += f" AND A.DPTO_HOSPEDAJE IN ({DEPARTAMENTOS_TURISMO_sql})"
-        
-        # Ejecución de consultas y agregar al diccionario si los países son válidos o no
-        # Turismo
-        try:
-            df_turismo_cerrado = pd.DataFrame(session.sql(query_verif_turismo_cerrado).collect())
-            if df_turismo_cerrado.empty:
-                dict_verif['turismo_cerrado'] = "SIN DATOS DE TURISMO CERRADO"
-            else:
-                dict_verif['turismo_cerrado'] = "CON DATOS DE TURISMO CERRADO"
-        except Exception as e:
-            dict_verif['turismo_cerrado'] = "SIN DATOS DE TURISMO CERRADO"
-
-        try:
-            df_turismo_corrido = pd.DataFrame(session.sql(query_verif_turismo_corrido).collect())
-            if df_turismo_corrido.empty:
-                dict_verif['turismo_corrido'] = "SIN DATOS DE TURISMO CORRIDO"
-            else:
-                dict_verif['turismo_corrido'] = "CON DATOS DE TURISMO CORRIDO"
-        except Exception as e:
-            dict_verif['turismo_corrido'] = "SIN DATOS DE TURISMO CORRIDO"
-        
-    ##############
-    # CONECTIVIDAD
-    ##############
-
-    if AGRUPACION in ['DEPARTAMENTOS']:
-        # Construir consulta
-        query_conectividad = """
-        SELECT A.AEROLINEA AS "Aerolínea",
-            A.CIUDAD_ORIGEN AS "Ciudad Origen",
-            A.CIUDAD_DESTINO AS "Ciudad Destino",
-            A.FRECUENCIAS AS "Frecuencias",
-            A.SEMANA AS "Semana de análisis"
-        FROM DOCUMENTOS_COLOMBIA.TURISMO.CONECTIVIDAD AS A
-        WHERE 1 = 1
-        """
-        # Agregar departamento
-        query_conectividad += f" AND A.COD_DIVIPOLA_DEPARTAMENTO_DESTINO IN ({DEPARTAMENTOS_TURISMO_sql})"
-
-        # Verificación
-        try:
-            # Ejecutar la consulta y recolectar los resultados en un DataFrame
-            df_conectividad = pd.DataFrame(session.sql(query_conectividad).collect())
-            
-            # Verificar si el DataFrame está vacío
-            if df_conectividad.empty:
-                dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
-            else:
-                dict_verif['conectividad'] = "CON DATOS DE CONECTIVIDAD"
-        except Exception as e:
-            dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
-    
-    ###############
-    # OPORTUNIDADES
-    ###############
-    if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'DEPARTAMENTOS']:
-        # Exportación
-        query_oportunidades_exportacion = """
-        SELECT DISTINCT A.CADENA,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.OPORTUNIDAD = 'Exportación' 
-            AND A.CADENA NOT IN ('Turismo')
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_exportacion += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_exportacion += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_exportacion += f" ORDER BY 1, 2 ASC"
-
-        # Verificación
-        try:
-            df_oportunidades_exportacion = pd.DataFrame(session.sql(query_oportunidades_exportacion).collect())
-            if df_oportunidades_exportacion.empty:
-                dict_verif['oportunidades_exportacion'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_exportacion'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_exportacion'] = "SIN OPORTUNIDADES"
-
-        # Inversión
-        query_oportunidades_ied = """
-        SELECT DISTINCT A.CADENA,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.OPORTUNIDAD = 'IED'
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_ied += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_ied += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_ied += f" ORDER BY 1, 2 ASC"
-
-        # Verificación
-        try:
-            df_oportunidades_inversion = pd.DataFrame(session.sql(query_oportunidades_ied).collect())
-            if df_oportunidades_inversion.empty:
-                dict_verif['oportunidades_inversion'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_inversion'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_inversion'] = "SIN OPORTUNIDADES"
-        
-        # Turismo
-        query_oportunidades_turismo = """
-        SELECT DISTINCT A.SECTOR,
-            LOWER(A.SUBSECTOR) AS SUBSECTOR
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.OPORTUNIDADES AS A
-        WHERE A.CADENA IN ('Turismo')
-        """
-        # Países y agrupaciones de países
-        if AGRUPACION in ['CONTINENTES', 'HUBS', 'TLCS', 'PAISES']:
-            query_oportunidades_turismo += f" AND A.COD_PAIS IN ({PAISES_TURISMO_sql})"
-        # Departamentos
-        if AGRUPACION in ['DEPARTAMENTOS']:
-            query_oportunidades_turismo += f" AND A.COD_DIVIPOLA_DEPARTAMENTO IN ({DEPARTAMENTOS_TURISMO_sql})"
-        # Order
-        query_oportunidades_turismo += f" ORDER BY 1, 2 ASC"
-        # Verificación
-        try:
-            df_oportunidades_turismo = pd.DataFrame(session.sql(query_oportunidades_turismo).collect())
-            if df_oportunidades_turismo.empty:
-                dict_verif['oportunidades_turismo'] = "SIN OPORTUNIDADES"
-            else:
-                dict_verif['oportunidades_turismo'] = "CON OPORTUNIDADES"
-        except Exception as e:
-            dict_verif['oportunidades_turismo'] = "SIN OPORTUNIDADES"
-
-    
-    #################
-    # PESOS POR MEDIO
-    #################
-        # Mineros
-        # Cerrado
-        query_pesos_mineros_cerrado = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CERRADO AS A 
-        WHERE A.TABLA = 'MEDIO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_minero_cerrado = pd.DataFrame(session.sql(query_pesos_mineros_cerrado).collect())
-            if df_pesos_minero_cerrado.empty:
-                dict_verif['pesos_minero_cerrado'] = "SIN DATOS CERRADO"
-            else:
-                dict_verif['pesos_minero_cerrado'] = "CON DATOS CERRADO"
-        except Exception as e:
-            dict_verif['pesos_minero_cerrado'] = "SIN DATOS CERRADO"
-
-        # Corrido
-        query_pesos_mineros_corrido = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CORRIDO AS A 
-        WHERE A.TABLA = 'MEDIO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_minero_corrido = pd.DataFrame(session.sql(query_pesos_mineros_corrido).collect())
-            if df_pesos_minero_corrido.empty:
-                dict_verif['pesos_minero_corrido'] = "SIN DATOS CORRIDO"
-            else:
-                dict_verif['pesos_minero_corrido'] = "CON DATOS CORRIDO"
-        except Exception as e:
-            dict_verif['pesos_minero_corrido'] = "SIN DATOS CORRIDO"
-
-        # No mineros
-        # Cerrado
-        query_pesos_no_mineros_cerrado = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CERRADO AS A 
-        WHERE A.TABLA = 'MEDIO NO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_no_minero_cerrado = pd.DataFrame(session.sql(query_pesos_no_mineros_cerrado).collect())
-            if df_pesos_no_minero_cerrado.empty:
-                dict_verif['pesos_no_minero_cerrado'] = "SIN DATOS CERRADO"
-            else:
-                dict_verif['pesos_no_minero_cerrado'] = "CON DATOS CERRADO"
-        except Exception as e:
-            dict_verif['pesos_no_minero_cerrado'] = "SIN DATOS CERRADO"
-
-        # Corrido
-        query_pesos_no_mineros_corrido = f"""
-        SELECT A.CATEGORIA, 
-            A.SUMA_PESO_T_1, 
-            A.SUMA_PESO_T, 
-            A.DIFERENCIA_PORCENTUAL 
-        FROM DOCUMENTOS_COLOMBIA.EXPORTACIONES.ST_CATEGORIAS_PESO_CORRIDO AS A 
-        WHERE A.TABLA = 'MEDIO NO MINERAS'
-            AND A.AGRUPACION = '{AGRUPACION}' 
-            AND A.UNIDAD IN ('{UNIDAD}');
-        """
-        # Verificación
-        try:
-            df_pesos_no_minero_corrido = pd.DataFrame(session.sql(query_pesos_no_mineros_corrido).collect())
-            if df_pesos_no_minero_corrido.empty:
-                dict_verif['pesos_no_minero_corrido'] = "SIN DATOS CORRIDO"
-            else:
-                dict_verif['pesos_no_minero_corrido'] = "CON DATOS CORRIDO"
-        except Exception as e:
-            dict_verif['pesos_no_minero_corrido'] = "SIN DATOS CORRIDO"
-   
-    # Colombia es válidos para los tres ejes siempre:
-    if AGRUPACION == 'COLOMBIA':
-        dict_verif['exportaciones_totales_cerrado'] = "CON DATOS DE EXPORTACIONES TOTALES CERRADO"
-        dict_verif['exportaciones_totales_corrido'] = "CON DATOS DE EXPORTACIONES TOTALES CORRIDO"
-        dict_verif['exportaciones_nme_cerrado'] = "CON DATOS DE EXPORTACIONES NME CERRADO"
-        dict_verif['exportaciones_nme_corrido'] = "CON DATOS DE EXPORTACIONES NME CORRIDO"
-        dict_verif['ied_cerrado'] = "CON DATOS DE IED CERRADO"
-        dict_verif['ied_corrido'] = "CON DATOS DE IED CORRIDO"
-        dict_verif['ice_cerrado'] = "CON DATOS DE ICE CERRADO"
-        dict_verif['ice_corrido'] = "CON DATOS DE ICE CORRIDO"
-        dict_verif['turismo_cerrado'] = "CON DATOS DE TURISMO CERRADO"
-        dict_verif['turismo_corrido'] = "CON DATOS DE TURISMO CORRIDO"
-        dict_verif['exportaciones_conteo_cerrado'] = "CON DATOS DE CONTEO CERRADO"
-        dict_verif['exportaciones_conteo_corrido'] = "CON DATOS DE CONTEO CORRIDO"
-        dict_verif['exportaciones_empresas_cerrado'] = "CON DATOS DE EMPRESAS CERRADO"
-        dict_verif['exportaciones_empresas_corrido'] = "CON DATOS DE EMPRESAS CORRIDO"
-        dict_verif['oportunidades_exportacion'] = "CON OPORTUNIDADES"
-        dict_verif['oportunidades_inversion'] = "CON OPORTUNIDADES"
-        dict_verif['oportunidades_turismo'] = "CON OPORTUNIDADES"
-        dict_verif['conectividad'] = "SIN DATOS DE CONECTIVIDAD"
-        dict_verif['pesos_minero_cerrado'] = "CON DATOS CERRADO"
-        dict_verif['pesos_minero_corrido'] = "CON DATOS CORRIDO"
-        dict_verif['pesos_no_minero_cerrado'] = "CON DATOS CERRADO"
-        dict_verif['pesos_no_minero_corrido'] = "CON DATOS CORRIDO"
-
-    return dict_verif
+    return dat.verif_ejes(session, params)
 
 
 # Función auxiliar para personalizar estilos
@@ -676,92 +150,108 @@ def set_cell_border(cell, **kwargs):
                     element.set(qn("w:{}".format(key)), str(edge_data[key]))
 
 
-def add_table(doc: Document, dataframe: pd.DataFrame, style: str, font_size: int, fuente: str):
+def plantilla_celda_tabla(ancho, font_size, fill=None, bold=False, color=None):
     """
-    Agrega una tabla al documento a partir de un DataFrame y asegura que no se divida entre páginas.
-    También agrega una nota al final con la fuente de los datos, asegurando que esté en la misma página que la tabla.
+    Construye una celda <w:tc> de plantilla con el formato de las tablas del documento: ancho, alineación centrada,
+    bordes sencillos, sombreado opcional y un párrafo con un run vacío (keep_with_next y keep_together).
+
+    Args:
+    ancho (int): Ancho de la celda en twips.
+    font_size (int): Tamaño de la letra en puntos.
+    fill (str, optional): Color de sombreado de la celda (e.g., '#215E99').
+    bold (bool, optional): Texto en negrilla.
+    color (str, optional): Color hexadecimal del texto (e.g., 'FFFFFF').
+
+    Returns:
+    La celda de plantilla, que se copia con deepcopy para cada celda de la tabla.
+    """
+    borde = 'w:sz="1" w:val="single" w:color="000000"'
+    sombreado = f'<w:shd w:fill="{fill}"/>' if fill else ''
+    propiedades_run = ('<w:b/>' if bold else '') + (f'<w:color w:val="{color}"/>' if color else '') + f'<w:sz w:val="{int(Pt(font_size).pt * 2)}"/>'
+    return parse_xml(
+        f'<w:tc {nsdecls("w")}>'
+        f'<w:tcPr><w:tcW w:type="dxa" w:w="{ancho}"/><w:vAlign w:val="center"/>'
+        f'<w:tcBorders><w:top {borde}/><w:left {borde}/><w:bottom {borde}/><w:right {borde}/></w:tcBorders>'
+        f'{sombreado}</w:tcPr>'
+        '<w:p><w:pPr><w:keepNext/><w:keepLines/><w:jc w:val="center"/></w:pPr>'
+        f'<w:r><w:rPr>{propiedades_run}</w:rPr><w:t/></w:r></w:p>'
+        '</w:tc>'
+    )
+
+
+def agregar_fila_tabla(tbl, plantilla, valores):
+    """
+    Agrega una fila <w:tr> a la tabla copiando la celda de plantilla para cada valor.
+
+    Args:
+    tbl: Elemento <w:tbl> de la tabla.
+    plantilla: Celda <w:tc> de plantilla_celda_tabla.
+    valores (list): Textos de las celdas de la fila.
+    """
+    tr = OxmlElement('w:tr')
+    for valor in valores:
+        tc = copy.deepcopy(plantilla)
+        texto = str(valor)
+        r = tc[1][1]
+        if '\t' in texto or '\n' in texto or '\r' in texto:
+            # Tabulaciones y saltos de línea: se delega al run de python-docx (<w:tab/>, <w:br/>)
+            r.remove(r[1])
+            r.text = texto
+        else:
+            t = r[1]
+            t.text = texto
+            if len(texto.strip()) < len(texto):
+                t.set(qn('xml:space'), 'preserve')
+        tr.append(tc)
+    tbl.append(tr)
+
+
+def render_table(doc: Document, dataframe: pd.DataFrame, style: str, font_size: int, total_row: bool):
+    """
+    Renderiza un DataFrame como tabla de Word construyendo directamente el XML de las filas.
+
+    La tabla se crea vacía con python-docx (estilo, alineación y grilla) y las filas se agregan como copias de tres
+    celdas de plantilla (cabecera, datos y total), en lugar de recorrer la API de celdas de python-docx, que
+    reconstruye la grilla en cada acceso. El XML resultante es el mismo que producía el formato celda por celda:
+    cabecera con sombreado #215E99 y texto blanco en negrilla, bordes sencillos, celdas del ancho de las márgenes
+    y, si total_row es True, la última fila en negrilla con sombreado #DAE9F7.
 
     Args:
     doc (Document): El documento al que se añadirá la tabla.
     dataframe (DataFrame): El DataFrame que se convertirá en tabla.
     style (str): El estilo de la tabla.
     font_size (int): El tamaño de la letra para los títulos y el contenido de la tabla.
-    fuente (str): La fuente de los datos.
+    total_row (bool): Resaltar la última fila como fila de total.
     """
-    if not isinstance(dataframe, pd.DataFrame) or dataframe.empty:
-        print(f"El valor proporcionado no es un DataFrame válido o está vacío: {dataframe}")
-        return
-    
-    # Añadir la tabla al documento
-    table = doc.add_table(rows=1, cols=len(dataframe.columns))
+    # Añadir la tabla vacía al documento
+    table = doc.add_table(rows=0, cols=len(dataframe.columns))
     table.style = doc.styles[style]
     table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.autofit = True  # Desactivar ajuste automático para controlar el ancho de las celdas
-
-    # Configurar encabezados de la tabla
-    hdr_cells = table.rows[0].cells
-    for i, column in enumerate(dataframe.columns):
-        hdr_cells[i].text = str(column)
-        paragraph = hdr_cells[i].paragraphs[0]
-        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        paragraph_format = paragraph.paragraph_format
-        paragraph_format.keep_with_next = True  # Mantener la cabecera con la siguiente fila
-        paragraph_format.keep_together = True  # Mantener la cabecera en una sola página
-        hdr_cells[i].vertical_alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        hdr_cells[i].paragraphs[0].runs[0].bold = True
-        hdr_cells[i].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-        hdr_cells[i].paragraphs[0].runs[0].font.size = Pt(font_size)
-        set_cell_border(
-            hdr_cells[i],
-            top={"sz": 1, "val": "single", "color": "000000"},
-            bottom={"sz": 1, "val": "single", "color": "000000"},
-            left={"sz": 1, "val": "single", "color": "000000"},
-            right={"sz": 1, "val": "single", "color": "000000"},
-        )
-
-    # Añadir filas de datos a la tabla
-    for index, row in dataframe.iterrows():
-        row_cells = table.add_row().cells
-        for i, cell in enumerate(row):
-            row_cells[i].text = str(cell)
-            paragraph = row_cells[i].paragraphs[0]
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            paragraph_format = paragraph.paragraph_format
-            paragraph_format.keep_with_next = True  # Mantener cada celda con la siguiente en la misma fila
-            paragraph_format.keep_together = True  # Mantener el contenido de la celda en una sola página
-            row_cells[i].vertical_alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            row_cells[i].paragraphs[0].runs[0].font.size = Pt(font_size)
-            set_cell_border(
-                row_cells[i],
-                top={"sz": 1, "val": "single", "color": "000000"},
-                bottom={"sz": 1, "val": "single", "color": "000000"},
-                left={"sz": 1, "val": "single", "color": "000000"},
-                right={"sz": 1, "val": "single", "color": "000000"},
-            )
-
-    # Aplicar formato especial a la primera fila (cabecera)
-    for cell in hdr_cells:
-        shading_elm = OxmlElement("w:shd")
-        shading_elm.set(qn("w:fill"), "#215E99")
-        cell._element.get_or_add_tcPr().append(shading_elm)
-
-    # Aplicar formato especial a la última fila y asegurar que se mantenga unida con la fuente
-    last_row_cells = table.rows[-1].cells
-    for cell in last_row_cells:
-        paragraph = cell.paragraphs[0]
-        paragraph.paragraph_format.keep_with_next = True  # Mantener última fila unida con la fuente
-        cell.paragraphs[0].runs[0].bold = True
-        shading_elm = OxmlElement("w:shd")
-        shading_elm.set(qn("w:fill"), "#DAE9F7")
-        cell._element.get_or_add_tcPr().append(shading_elm)
-        cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(0, 0, 0)
-
-    # Ajustar el ancho de las celdas para que la tabla ocupe todo el ancho de las márgenes del documento
-    for row in table.rows:
-        for cell in row.cells:
-            cell.width = doc.sections[0].page_width - doc.sections[0].left_margin - doc.sections[0].right_margin
-
-    # Agregar la fuente de los datos en un nuevo párrafo y asegurar que esté en la misma página que la tabla
+    table.autofit = True
+    tbl = table._tbl
+
+    # Plantillas de celda con el ancho de las márgenes del documento
+    section = doc.sections[0]
+    ancho = Emu(section.page_width - section.left_margin - section.right_margin).twips
+    celda_cabecera = plantilla_celda_tabla(ancho, font_size, fill='#215E99', bold=True, color='FFFFFF')
+    celda_datos = plantilla_celda_tabla(ancho, font_size)
+    celda_total = plantilla_celda_tabla(ancho, font_size, fill='#DAE9F7', bold=True, color='000000') if total_row else celda_datos
+
+    # Cabecera y filas de datos (los valores de .values son los mismos que entrega iterrows)
+    agregar_fila_tabla(tbl, celda_cabecera, dataframe.columns)
+    filas = dataframe.values
+    for posicion, fila in enumerate(filas):
+        agregar_fila_tabla(tbl, celda_total if posicion == len(filas) - 1 else celda_datos, fila)
+
+
+def add_fuente_tabla(doc: Document, fuente: str):
+    """
+    Agrega la nota con la fuente de los datos debajo de una tabla, en la misma página que la tabla.
+
+    Args:
+    doc (Document): El documento al que se añadirá la fuente.
+    fuente (str): La fuente de los datos.
+    """
     fuente_paragraph = doc.add_paragraph(f"Fuente: {fuente}", style='Normal')
     fuente_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
     fuente_paragraph_format = fuente_paragraph.paragraph_format
@@ -772,10 +262,34 @@ def add_table(doc: Document, dataframe: pd.DataFrame, style: str, font_size: int
     fuente_paragraph.paragraph_format.left_indent = Cm(0.75)  # Indentación izquierda
     for run in fuente_paragraph.runs:
         run.font.size = Pt(9)  # Ajustar el tamaño de la fuente a 9 puntos
-    
+
+
+def add_table(doc: Document, dataframe: pd.DataFrame, style: str, font_size: int, fuente: str):
+    """
+    Agrega una tabla al documento a partir de un DataFrame y asegura que no se divida entre páginas.
+    La última fila se resalta como fila de total.
+    También agrega una nota al final con la fuente de los datos, asegurando que esté en la misma página que la tabla.
+
+    Args:
+    doc (Document): El documento al que se añadirá la tabla.
+    dataframe (DataFrame): El DataFrame que se convertirá en tabla.
+    style (str): El estilo de la tabla.
+    font_size (int): El tamaño de la letra para los títulos y el contenido de la tabla.
+    fuente (str): La fuente de los datos.
+    """
+    if not isinstance(dataframe, pd.DataFrame) or dataframe.empty:
+        print(f"El valor proporcionado no es un DataFrame válido o está vacío: {dataframe}")
+        return
+
+    # Tabla con fila de total y fuente
+    render_table(doc, dataframe, style, font_size, total_row=True)
+    add_fuente_tabla(doc, fuente)
+
+
 def add_table_resumen(doc: Document, dataframe: pd.DataFrame, style: str, font_size: int, fuente: str):
     """
     Agrega una tabla al documento a partir de un DataFrame y asegura que no se divida entre páginas.
+    A diferencia de add_table, la última fila no se resalta como total.
     También agrega una nota al final con la fuente de los datos, asegurando que esté en la misma página que la tabla.
 
     Args:
@@ -788,77 +302,10 @@ def add_table_resumen(doc: Document, dataframe: pd.DataFrame, style: str, font_s
     if not isinstance(dataframe, pd.DataFrame) or dataframe.empty:
         print(f"El valor proporcionado no es un DataFrame válido o está vacío: {dataframe}")
         return
-    
-    # Añadir la tabla al documento
-    table = doc.add_table(rows=1, cols=len(dataframe.columns))
-    table.style = doc.styles[style]
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.autofit = True  # Desactivar ajuste automático para controlar el ancho de las celdas
-    
-    # Configurar encabezados de la tabla
-    hdr_cells = table.rows[0].cells
-    for i, column in enumerate(dataframe.columns):
-        hdr_cells[i].text = str(column)
-        paragraph = hdr_cells[i].paragraphs[0]
-        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        paragraph_format = paragraph.paragraph_format
-        paragraph_format.keep_with_next = True  # Mantener la cabecera con la siguiente fila
-        paragraph_format.keep_together = True  # Mantener la cabecera en una sola página
-        hdr_cells[i].vertical_alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        hdr_cells[i].paragraphs[0].runs[0].bold = True
-        hdr_cells[i].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-        hdr_cells[i].paragraphs[0].runs[0].font.size = Pt(font_size)
-        set_cell_border(
-            hdr_cells[i],
-            top={"sz": 1, "val": "single", "color": "000000"},
-            bottom={"sz": 1, "val": "single", "color": "000000"},
-            left={"sz": 1, "val": "single", "color": "000000"},
-            right={"sz": 1, "val": "single", "color": "000000"},
-        )
-
-    # Añadir filas de datos a la tabla
-    for index, row in dataframe.iterrows():
-        row_cells = table.add_row().cells
-        for i, cell in enumerate(row):
-            row_cells[i].text = str(cell)
-            paragraph = row_cells[i].paragraphs[0]
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            paragraph_format = paragraph.paragraph_format
-            paragraph_format.keep_with_next = True  # Mantener cada celda con la siguiente en la misma fila
-            paragraph_format.keep_together = True  # Mantener el contenido de la celda en una sola página
-            row_cells[i].vertical_alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            row_cells[i].paragraphs[0].runs[0].font.size = Pt(font_size)
-            set_cell_border(
-                row_cells[i],
-                top={"sz": 1, "val": "single", "color": "000000"},
-                bottom={"sz": 1, "val": "single", "color": "000000"},
-                left={"sz": 1, "val": "single", "color": "000000"},
-                right={"sz": 1, "val": "single", "color": "000000"},
-            )
-
-    # Aplicar formato especial a la primera fila (cabecera)
-    for cell in hdr_cells:
-        shading_elm = OxmlElement("w:shd")
-        shading_elm.set(qn("w:fill"), "#215E99")
-        cell._element.get_or_add_tcPr().append(shading_elm)
-
-    # Ajustar el ancho de las celdas para que la tabla ocupe todo el ancho de las márgenes del documento
-    for row in table.rows:
-        for cell in row.cells:
-            cell.width = doc.sections[0].page_width - doc.sections[0].left_margin - doc.sections[0].right_margin
-
-    # Agregar la fuente de los datos en un nuevo párrafo y asegurar que esté en la misma página que la tabla
-    fuente_paragraph = doc.add_paragraph(f"Fuente: {fuente}", style='Normal')
-    fuente_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    fuente_paragraph_format = fuente_paragraph.paragraph_format
-    fuente_paragraph_format.keep_together = True  # Mantener la fuente en una sola página
-    fuente_paragraph_format.keep_with_next = False  # No es necesario mantener con otro contenido después
-    fuente_paragraph.space_before = Pt(12)  # Espacio antes del párrafo
-    fuente_paragraph.space_after = Pt(12)  # Espacio después del párrafo
-    fuente_paragraph.paragraph_format.left_indent = Cm(0.75)  # Indentación izquierda
-    for run in fuente_paragraph.runs:
-        run.font.size = Pt(9)  # Ajustar el tamaño de la fuente a 9 puntos
 
+    # Tabla sin fila de total y fuente
+    render_table(doc, dataframe, style, font_size, total_row=False)
+    add_fuente_tabla(doc, fuente)
 
 
 def agregar_tabla_contenidos(new_doc, font_size=8):
@@ -977,6 +424,52 @@ def add_header_footer(doc: Document, header_image_left: str, footer_image: str,
     footer_run_right = footer_paragraph_right.add_run()
     footer_run_right.add_picture(footer_image, width=Inches(2.0))
 
+# Texto del pie de página de todos los documentos
+FOOTER_TEXT = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
+
+# Plantillas base ya construidas: {(header_image_left, footer_image, footer_text): Document}
+_PLANTILLAS_BASE = {}
+_candado_plantillas = threading.Lock()
+
+
+def plantilla_base(header_image_left: str, footer_image: str, footer_text: str = FOOTER_TEXT):
+    """
+    Retorna la plantilla base del documento (estilos, márgenes, encabezado, pie de página, imágenes y campo PAGE).
+
+    La plantilla se construye una sola vez por proceso y combinación de imágenes y texto; después solo se lee,
+    por lo que se comparte entre hilos. No se debe modificar: para crear un documento use nuevo_documento.
+
+    Args:
+    header_image_left (str): Ruta de la imagen del encabezado.
+    footer_image (str): Ruta de la imagen del pie de página.
+    footer_text (str): Texto para el pie de página.
+    """
+    llave = (header_image_left, footer_image, footer_text)
+    with _candado_plantillas:
+        plantilla = _PLANTILLAS_BASE.get(llave)
+        if plantilla is None:
+            plantilla = Document()
+            estilos(plantilla)
+            add_header_footer(plantilla, header_image_left, footer_image, footer_text)
+            _PLANTILLAS_BASE[llave] = plantilla
+    return plantilla
+
+
+def nuevo_documento(header_image_left: str, footer_image: str, footer_text: str = FOOTER_TEXT):
+    """
+    Crea un documento nuevo copiando la plantilla base en memoria.
+
+    La copia profunda duplica las partes XML del paquete (documento, estilos, encabezado y pie de página) y
+    reutiliza los bytes de las imágenes, sin volver a descomprimir la plantilla de python-docx ni leer las imágenes.
+
+    Args:
+    header_image_left (str): Ruta de la imagen del encabezado.
+    footer_image (str): Ruta de la imagen del pie de página.
+    footer_text (str): Texto para el pie de página.
+    """
+    return copy.deepcopy(plantilla_base(header_image_left, footer_image, footer_text))
+
+
 def add_bullet_points(doc, bullet_points):
     """
     Agrega una lista de puntos de bala a un documento de Word con el texto justificado.
@@ -1055,22 +548,17 @@ def obtener_parametros_documento(session):
 
     return parametros_dict
 
-def create_document_continentes(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params):
+def create_document_continentes(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES CONTINENTES: {str(titulo).upper()}', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
     # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -1092,7 +580,7 @@ def create_document_continentes(tablas, file_path, titulo, header_image_left, fo
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -1501,22 +989,17 @@ def create_document_continentes(tablas, file_path, titulo, header_image_left, fo
     # Guardar el documento
     doc.save(file_path)
 
-def create_document_colombia(tablas, file_path, header_image_left, footer_image, session, geo_params):
+def create_document_colombia(tablas, file_path, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES COLOMBIA', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
         # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -1534,7 +1017,7 @@ def create_document_colombia(tablas, file_path, header_image_left, footer_image,
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -1929,22 +1412,17 @@ def create_document_colombia(tablas, file_path, header_image_left, footer_image,
 
 
 
-def create_document_hubs(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params):
+def create_document_hubs(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES HUBS: {str(titulo).upper()}', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
     # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -1966,7 +1444,7 @@ def create_document_hubs(tablas, file_path, titulo, header_image_left, footer_im
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -2372,22 +1850,17 @@ def create_document_hubs(tablas, file_path, titulo, header_image_left, footer_im
     doc.save(file_path)
 
 
-def create_document_tlcs(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params):
+def create_document_tlcs(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES TLCS: {str(titulo).upper()}', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
     # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -2409,7 +1882,7 @@ def create_document_tlcs(tablas, file_path, titulo, header_image_left, footer_im
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -2816,22 +2289,17 @@ def create_document_tlcs(tablas, file_path, titulo, header_image_left, footer_im
     doc.save(file_path)
 
 
-def create_document_paises(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params):
+def create_document_paises(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES PAÍSES: {str(titulo).upper()}', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
         # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -2853,7 +2321,7 @@ def create_document_paises(tablas, file_path, titulo, header_image_left, footer_
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -3185,22 +2653,17 @@ def create_document_paises(tablas, file_path, titulo, header_image_left, footer_
     doc.save(file_path)
 
 
-def create_document_departamentos(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params):
+def create_document_departamentos(tablas, file_path, titulo, header_image_left, footer_image, session, geo_params, bundle=None):
   
-    doc = Document()
-    estilos(doc)
-
-    # Agregar encabezado y pie de página
-    footer_text = """Calle 28 # 13ª - 15, Edificio CCI Pisos 35 - 36 | Bogotá, Colombia T: +57 (1) 560 0100 | info@procolombia.co | www.procolombia.co"""
-
-    add_header_footer(doc, header_image_left, footer_image, footer_text)
+    # Documento con estilos, encabezado y pie de página (copia de la plantilla base)
+    doc = nuevo_documento(header_image_left, footer_image)
         
     # Agregar el título principal del informe
     title_paragraph = doc.add_paragraph(f'TRES EJES DEPARTAMENTOS: {str(titulo).upper()}', style='Title')
     title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
         # Agregar la fecha
-    doc_params = obtener_parametros_documento(session)
+    doc_params = bundle.params_documento if bundle is not None else obtener_parametros_documento(session)
     fecha = doc_params['Fecha de actualización']
     date_paragraph = doc.add_paragraph(f'ÚLTIMA ACTUALIZACIÓN: {fecha.upper()}', style='Title')
     date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -3219,7 +2682,7 @@ def create_document_departamentos(tablas, file_path, titulo, header_image_left,
     disclaimer = "La información contenida en este documento es de orientación y guía general. En ningún caso, ProColombia, ni sus empleados, son responsables ante usted o cualquier otra persona por las decisiones o acciones que pueda tomar en relación con la información proporcionada, por lo cual debe tomarse como de carácter referencial únicamente."
 
     # Obtener parámetos de veríficación
-    dict_verificacion = verif_ejes(session, geo_params)
+    dict_verificacion = bundle.dict_verificacion if bundle is not None else verif_ejes(session, geo_params)
 
     #########
     # RESUMEN
@@ -0,0 +1,204 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import json
+import glob
+import time
+import atexit
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+#########################################################
+# REGISTRO DE EVENTOS EN LOTES Y EN SEGUNDO PLANO
+#########################################################
+
+# Segundos entre envíos de eventos a Snowflake
+INTERVALO_EVENTOS = int(os.environ.get('TRES_EJES_EVENTOS_INTERVALO', 10))
+# Número de eventos acumulados que adelanta el envío
+LOTE_EVENTOS = int(os.environ.get('TRES_EJES_EVENTOS_LOTE', 50))
+# Archivo local donde se guardan los eventos mientras Snowflake no responde (una línea JSON por evento)
+ARCHIVO_PENDIENTES = os.environ.get('TRES_EJES_EVENTOS_PENDIENTES', '.eventos_pendientes.jsonl')
+
+# Zona horaria de la fecha del evento (la misma que usaba CONVERT_TIMEZONE en el INSERT de una fila)
+ZONA_HORARIA = ZoneInfo('America/Bogota')
+
+# Inserción de varias filas con parámetros: el conector de Snowflake envía el lote en una sola instrucción
+QUERY_INSERTAR_EVENTOS = """
+INSERT INTO DOCUMENTOS_COLOMBIA.SEGUIMIENTO.SEGUIMIENTO_EVENTOS (TIPO_EVENTO, DETALLE_EVENTO, UNIDAD, FECHA_HORA)
+VALUES (%s, %s, %s, %s)
+"""
+
+
+class RegistroEventos:
+    """
+    Acumula los eventos de seguimiento en memoria y los envía a Snowflake en lotes desde un hilo en segundo plano.
+
+    registrar solo agrega el evento a la lista, por lo que no agrega latencia a la interfaz. El hilo envía los eventos
+    cada intervalo segundos, o antes si se acumulan lote eventos, con un INSERT parametrizado de varias filas. Si el
+    envío falla, los eventos se guardan en archivo_pendientes y se reintentan en el siguiente envío; al cerrar el
+    proceso se hace un último envío.
+    """
+    def __init__(self, intervalo=None, lote=None, archivo_pendientes=None):
+        self.intervalo = intervalo if intervalo is not None else INTERVALO_EVENTOS
+        self.lote = lote if lote is not None else LOTE_EVENTOS
+        self.archivo_pendientes = archivo_pendientes or ARCHIVO_PENDIENTES
+        self._eventos = []
+        self._sesion = None
+        self._hilo = None
+        self._despertar = threading.Event()
+        self._candado = threading.Lock()
+        self._candado_envio = threading.Lock()
+        self._huerfanos_revisados = False
+
+    def registrar(self, sesion_activa, tipo_evento, detalle_evento, unidad):
+        """
+        Agrega un evento a la lista de envío.
+
+        Parámetros:
+        - sesion_activa: sesión con atributo connection (conexión del conector de Snowflake).
+        - tipo_evento: tipo de evento ('Selección' o 'Descarga').
+        - detalle_evento: detalle del evento.
+        - unidad: unidad del evento.
+        """
+        fecha = datetime.now(ZONA_HORARIA).strftime('%Y-%m-%d %H:%M:%S.%f')
+        with self._candado:
+            self._sesion = sesion_activa
+            self._eventos.append([tipo_evento, detalle_evento, unidad, fecha])
+            lleno = len(self._eventos) >= self.lote
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._ciclo, name='registro-eventos', daemon=True)
+                self._hilo.start()
+                atexit.register(self.enviar)
+        if lleno:
+            self._despertar.set()
+
+    def _ciclo(self):
+        # Enviar cada intervalo segundos o cuando registrar avisa que se llenó el lote
+        while True:
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+            self.enviar()
+
+    def enviar(self):
+        """
+        Envía a Snowflake los eventos acumulados y los pendientes del archivo local.
+
+        Retorna:
+        - número de eventos enviados (0 si no había eventos o si el envío falló y quedaron pendientes).
+        """
+        with self._candado_envio:
+            # 1. Tomar los eventos acumulados y los pendientes de envíos fallidos
+            with self._candado:
+                eventos, self._eventos = self._eventos, []
+                sesion = self._sesion
+            reclamados = self._reclamar_pendientes()
+            eventos = [evento for reclamado in reclamados for evento in self._leer_pendientes(reclamado)] + eventos
+            if not eventos:
+                return 0
+
+            # 2. Un solo INSERT de varias filas; si falla, los eventos vuelven al archivo de pendientes
+            try:
+                conn = getattr(sesion, 'connection', None)
+                if conn is None:
+                    raise ConnectionError('No hay conexión a Snowflake para registrar eventos.')
+                cur = conn.cursor()
+                try:
+                    cur.executemany(QUERY_INSERTAR_EVENTOS, eventos)
+                finally:
+                    cur.close()
+            except Exception:
+                self._guardar_pendientes(eventos)
+                return 0
+            finally:
+                for reclamado in reclamados:
+                    try:
+                        os.remove(reclamado)
+                    except FileNotFoundError:
+                        pass
+            return len(eventos)
+
+    ##########################
+    # Archivo de pendientes
+    ##########################
+
+    def _reclamar_pendientes(self):
+        # Mover el archivo a un nombre propio del proceso para que otro proceso no envíe los mismos eventos.
+        # Los archivos reclamados terminan en el pid del proceso dueño: <archivo>.<marca>.<pid>
+        pid = os.getpid()
+        reclamados = self._reclamar_huerfanos() if not self._huerfanos_revisados else []
+        self._huerfanos_revisados = True
+        reclamado = f'{self.archivo_pendientes}.{time.time_ns()}.{pid}'
+        try:
+            os.replace(self.archivo_pendientes, reclamado)
+            reclamados.append(reclamado)
+        except FileNotFoundError:
+            pass
+        return reclamados
+
+    def _reclamar_huerfanos(self):
+        # Al iniciar: si un proceso terminó entre reclamar el archivo y enviarlo, sus eventos quedaron en
+        # <archivo>.*.<pid>; se reclaman los de procesos que ya no existen (y los de un proceso anterior con el
+        # mismo pid) para que no se pierdan
+        pid = os.getpid()
+        reclamados = []
+        for ruta in glob.glob(glob.escape(self.archivo_pendientes) + '.*'):
+            dueno = ruta.rsplit('.', 1)[-1]
+            if not dueno.isdigit():
+                continue
+            if int(dueno) == pid:
+                reclamados.append(ruta)
+                continue
+            if _proceso_activo(int(dueno)):
+                continue
+            # Pasar el archivo a nombre propio: si otro proceso que inicia lo reclama primero, os.replace falla aquí
+            propio = f'{ruta}.{pid}'
+            try:
+                os.replace(ruta, propio)
+                reclamados.append(propio)
+            except OSError:
+                continue
+        return reclamados
+
+    def _leer_pendientes(self, reclamado):
+        eventos = []
+        try:
+            with open(reclamado, encoding='utf-8') as f:
+                for linea in f:
+                    try:
+                        eventos.append(json.loads(linea))
+                    except ValueError:
+                        continue
+        except OSError:
+            return []
+        return eventos
+
+    def _guardar_pendientes(self, eventos):
+        # Agregar al final del archivo: los eventos nunca se descartan mientras se pueda escribir en disco
+        try:
+            with open(self.archivo_pendientes, 'a', encoding='utf-8') as f:
+                for evento in eventos:
+                    f.write(json.dumps(evento, ensure_ascii=False) + '\n')
+        except OSError:
+            with self._candado:
+                self._eventos = eventos + self._eventos
+
+
+def _proceso_activo(pid):
+    # En POSIX la señal 0 solo comprueba que el proceso exista. En otros sistemas no hay forma portable de
+    # comprobarlo y se asume terminado: en el peor caso un evento se envía dos veces, pero nunca se pierde
+    if os.name != 'posix':
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+# Registro único del proceso: lo comparten todas las sesiones de Streamlit
+registro_eventos = RegistroEventos()
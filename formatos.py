@@ -0,0 +1,132 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import re
+import numpy as np
+import pandas as pd
+
+#########################################################
+# FORMATO NUMÉRICO COLOMBIANO POR COLUMNAS
+#########################################################
+
+# Separadores del formato colombiano: punto para miles y coma para decimales (1.234.567,8)
+SEPARADOR_MILES = '.'
+SEPARADOR_DECIMAL = ','
+
+# Reglas de formato de las tablas del documento Word: (patrón del nombre de la columna, decimales, sufijo, separador de miles).
+# Cada columna toma la primera regla cuyo patrón coincide (re.search); las columnas sin regla no se modifican.
+FORMATO_EXPORTACIONES = [
+    (r'USD|TONELADAS', 0, '', True),
+    (r'^Variación \(%\)$', 1, '%', False),
+    (r'^Participación \(%\)', 1, '%', False),
+]
+FORMATO_INVERSION = [
+    (r'USD', 1, '', True),
+    (r'^(Participación|Variación) \(%\)', 1, '%', False),
+]
+FORMATO_TURISMO = [
+    (r'^(20|Ene|Diferencia)', 0, '', True),
+    (r'^(Participación|Variación) \(%\)', 1, '%', False),
+]
+
+# Cambio de los separadores de Python (1,234,567.8) a los colombianos (1.234.567,8)
+_SEPARADORES = str.maketrans({',': SEPARADOR_MILES, '.': SEPARADOR_DECIMAL})
+
+
+def _formato(decimales, sufijo, miles):
+    # Formato de Python con los decimales pedidos, el separador de miles opcional y el sufijo literal. El sufijo se
+    # traduce de antemano porque el cambio de separadores es un intercambio: así queda igual después de _SEPARADORES
+    return ('{:,.%df}' if miles else '{:.%df}') % decimales + sufijo.translate(_SEPARADORES).replace('{', '{{').replace('}', '}}')
+
+
+def formatear_numeros(valores, decimales=0, sufijo='', miles=True):
+    """
+    Formatea una columna completa de números con separador de miles '.' y separador decimal ','.
+
+    El redondeo es el mismo de f"{x:,.{decimales}f}" (o f"{x:.{decimales}f}" sin separador de miles). En lugar de tres replace por celda, la columna se formatea
+    en un solo paso y los separadores se cambian con un único translate sobre el texto de toda la columna.
+    Los valores nulos, infinitos y los que no son números se conservan sin cambios.
+
+    Parámetros:
+    - valores: Serie, arreglo o lista de valores.
+    - decimales: número de decimales.
+    - sufijo: texto que se agrega al final de cada número (por ejemplo '%').
+    - miles: si es False no se agrega el separador de miles (porcentajes).
+
+    Retorna:
+    - arreglo de NumPy (object) con los textos formateados.
+    """
+    # 1. Valores numéricos y posiciones de los nulos o no numéricos
+    valores = np.asarray(valores)
+    if valores.dtype.kind in 'biuf':
+        numeros = valores.astype(float)
+    else:
+        numeros = pd.to_numeric(pd.Series(valores, dtype=object), errors='coerce').to_numpy(dtype=float)
+    resultado = valores.astype(object)
+    validos = np.isfinite(numeros)
+    if not validos.any():
+        return resultado
+
+    # 2. Formato de Python con separadores de miles para toda la columna y cambio de separadores en un solo paso
+    texto = '\n'.join(map(_formato(decimales, sufijo, miles).format, numeros[validos].tolist()))
+    resultado[validos] = texto.translate(_SEPARADORES).split('\n')
+    return resultado
+
+
+def formatear_numero(valor, decimales=0, sufijo='', miles=True):
+    """
+    Formatea un solo número con el formato colombiano (ver formatear_numeros).
+    Reemplaza a format_number y format_number_no_decimal en los textos del resumen.
+    """
+    if isinstance(valor, (int, float, np.number)) and np.isfinite(valor):
+        return _formato(decimales, sufijo, miles).format(valor).translate(_SEPARADORES)
+    return formatear_numeros([valor], decimales, sufijo, miles)[0]
+
+
+def columnas_con_formato(df, reglas):
+    """
+    Retorna las columnas del DataFrame con su regla: lista de (columna, decimales, sufijo, miles).
+    Cada columna toma la primera regla cuyo patrón coincide.
+    """
+    columnas = []
+    for col in df.columns:
+        for patron, decimales, sufijo, miles in reglas:
+            if re.search(patron, col):
+                columnas.append((col, decimales, sufijo, miles))
+                break
+    return columnas
+
+
+def aplicar_formato(df, reglas, convertir=False):
+    """
+    Formatea en el lugar las columnas del DataFrame según reglas declarativas.
+
+    Parámetros:
+    - df: DataFrame.
+    - reglas: lista de (patrón del nombre de la columna, decimales, sufijo, miles), por ejemplo FORMATO_EXPORTACIONES.
+    - convertir: si es True, los valores que no son números quedan nulos (pd.to_numeric con errors='coerce').
+
+    Retorna:
+    - df: el mismo DataFrame con las columnas formateadas como texto.
+    """
+    for col, decimales, sufijo, miles in columnas_con_formato(df, reglas):
+        valores = pd.to_numeric(df[col], errors='coerce') if convertir else df[col]
+        df[col] = formatear_numeros(valores.to_numpy(), decimales, sufijo, miles)
+    return df
+
+
+def redondear_columnas(df, reglas, decimales=2):
+    """
+    Convierte a números y redondea en el lugar las columnas del DataFrame que tienen regla de formato.
+    Es la versión para Excel, donde los valores se conservan como números.
+
+    Parámetros:
+    - df: DataFrame.
+    - reglas: lista de (patrón del nombre de la columna, decimales, sufijo, miles).
+    - decimales: decimales del redondeo.
+
+    Retorna:
+    - df: el mismo DataFrame.
+    """
+    for col, _, _, _ in columnas_con_formato(df, reglas):
+        df[col] = pd.to_numeric(df[col], errors='coerce').round(decimales)
+    return df
@@ -0,0 +1,200 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import pandas as pd
+# Versión de los datos y filas de las consultas
+import cache_consultas as cache
+
+#########################################################
+# DIMENSIONES GEOGRÁFICAS EN MEMORIA
+#########################################################
+
+# Tablas de GEOGRAFIA que se cargan completas (son pequeñas y no cambian entre versiones de datos)
+QUERY_PAISES = """
+SELECT A.CODIGO_DIAN,
+       A.PAIS_LLAVE_EXPORTACIONES,
+       A.CONTINENTE_DANE_DIAN_EXPORTACIONES,
+       A.OFICINA_COMERCIAL_EXPORTACIONES,
+       A.HUB__C_EXPORTACIONES,
+       A.TIPO_ACUERDO_EXPORTACIONES,
+       A.TLCS_EXPORTACIONES,
+       A.PAIS_INVERSION_BANREP,
+       A.PAIS_CODIGO_TURISMO,
+       A.NOMBRE_PAIS_CODIGO_TURISMO,
+       A.COUNTRY_OR_AREA_UNSD,
+       A.REGION_NAME_UNSD
+FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.PAISES_CORRELATIVA AS A;
+"""
+QUERY_DEPARTAMENTOS = """
+SELECT A.COD_DIAN_DEPARTAMENTO,
+       A.DEPARTAMENTO_DIAN
+FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIAN_DEPARTAMENTOS AS A;
+"""
+QUERY_DEPARTAMENTOS_MUNICIPIOS = """
+SELECT A.COD_DANE_DEPARTAMENTO,
+       A.DEPARTAMENTO_DANE,
+       A.COD_DANE_MUNICIPIO,
+       A.MUNICIPIO_DANE
+FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS AS A;
+"""
+QUERY_MUNICIPIOS = """
+SELECT A.COD_DANE_MUNICIPIO,
+       A.MUNICIPIO_DANE
+FROM DOCUMENTOS_COLOMBIA.GEOGRAFIA.DIVIPOLA_MUNICIPIOS AS A;
+"""
+
+# Columnas de PAISES_CORRELATIVA por las que se filtran los parámetros de cada agrupación
+COLUMNA_CONTINENTE = 'CONTINENTE_DANE_DIAN_EXPORTACIONES'
+COLUMNA_PAIS = 'COUNTRY_OR_AREA_UNSD'
+COLUMNA_HUB = 'HUB__C_EXPORTACIONES'
+COLUMNA_TLC = 'TLCS_EXPORTACIONES'
+
+
+def _diccionario(data, llave, valor):
+    # {llave: valor} con la primera fila de cada llave (igual que el primer resultado de un merge)
+    data = data.dropna(subset=[llave]).drop_duplicates(subset=[llave])
+    return dict(zip(data[llave], data[valor]))
+
+
+def _grupos(data, columna):
+    # {valor: DataFrame con las filas de ese valor}, en el orden de la tabla
+    return {valor: grupo for valor, grupo in data.groupby(columna, sort=False)}
+
+
+def _opciones(serie, excluir=()):
+    # Valores distintos, sin nulos ni excluidos, ordenados alfabéticamente (igual que los selectores)
+    return sorted({valor for valor in serie.dropna() if valor not in excluir})
+
+
+class GeografiaIndex:
+    """
+    Tablas de GEOGRAFIA cargadas una sola vez e indexadas en diccionarios.
+
+    Reemplaza las consultas que repetían los selectores en cada rerun de Streamlit, get_data_parametros en cada
+    reporte y las correlativas de nombres de process_data y process_data_excel.
+
+    Atributos:
+    - paises, departamentos, departamentos_municipios, municipios: tablas completas.
+    - paises_correlativa, departamentos_correlativa, municipios_correlativa: tablas de nombres en limpio
+      (las mismas columnas y filas que obtener_*_correlativa en datos.py).
+    - nombre_pais_exportaciones, nombre_pais_inversion, nombre_pais_turismo: llave del eje -> nombre UNSD.
+    - nombre_departamento: código DIAN -> departamento. nombre_municipio: código DANE -> municipio.
+    - opciones_*: listas de los selectores de la aplicación.
+    """
+    def __init__(self, paises, departamentos, departamentos_municipios, municipios):
+        # 1. Tablas completas
+        self.paises = paises
+        self.departamentos = departamentos
+        self.departamentos_municipios = departamentos_municipios
+        self.municipios = municipios
+
+        # 2. Correlativas de nombres
+        self.paises_correlativa = paises[paises[COLUMNA_PAIS].notna()][[
+            'CODIGO_DIAN', COLUMNA_PAIS, 'PAIS_LLAVE_EXPORTACIONES', COLUMNA_CONTINENTE, 'PAIS_INVERSION_BANREP',
+            'PAIS_CODIGO_TURISMO', 'NOMBRE_PAIS_CODIGO_TURISMO']].reset_index(drop=True)
+        self.departamentos_correlativa = departamentos[['DEPARTAMENTO_DIAN', 'COD_DIAN_DEPARTAMENTO']]
+        self.municipios_correlativa = municipios[['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']]
+
+        # 3. Búsquedas de nombres
+        self.nombre_pais_exportaciones = _diccionario(self.paises_correlativa, 'PAIS_LLAVE_EXPORTACIONES', COLUMNA_PAIS)
+        self.nombre_pais_inversion = _diccionario(self.paises_correlativa, 'PAIS_INVERSION_BANREP', COLUMNA_PAIS)
+        self.nombre_pais_turismo = _diccionario(self.paises_correlativa, 'PAIS_CODIGO_TURISMO', COLUMNA_PAIS)
+        self.nombre_departamento = _diccionario(departamentos, 'COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN')
+        self.nombre_municipio = _diccionario(municipios, 'COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE')
+
+        # 4. Países con llave de exportaciones agrupados por continente, país, HUB y TLC
+        self.paises_exportaciones = paises[paises['PAIS_LLAVE_EXPORTACIONES'].notna()]
+        self._miembros = {columna: _grupos(self.paises_exportaciones, columna)
+                          for columna in [COLUMNA_CONTINENTE, COLUMNA_PAIS, COLUMNA_HUB, COLUMNA_TLC]}
+        # Departamentos por nombre y municipios por código de departamento (como texto, igual que en las consultas)
+        self._departamentos = _grupos(departamentos, 'DEPARTAMENTO_DIAN')
+        self._municipios = _grupos(departamentos_municipios.assign(
+            _COD=departamentos_municipios['COD_DANE_DEPARTAMENTO'].astype(str)), '_COD')
+
+        # 5. Opciones de los selectores
+        self.opciones_continentes = _opciones(paises[COLUMNA_CONTINENTE], ('NO ENCONTRADO EN BASE DE EXPORTACIONES', 'No Declarados'))
+        self.opciones_tlcs = _opciones(paises[COLUMNA_TLC], ('No Declarados', 'NO ENCONTRADO EN BASE DE EXPORTACIONES'))
+        self.opciones_hubs = _opciones(paises[COLUMNA_HUB], ('NO ENCONTRADO EN BASE DE EXPORTACIONES', 'Colombia'))
+        self.opciones_regiones = _opciones(paises['REGION_NAME_UNSD'], ('Antártida',))
+        self.opciones_departamentos = _opciones(departamentos['DEPARTAMENTO_DIAN'], ('Desconocido', 'Sin especificar'))
+        self._paises_por_region = {region: _opciones(grupo[COLUMNA_PAIS]) for region, grupo in _grupos(paises, 'REGION_NAME_UNSD').items()}
+        self._opciones_paises = _opciones(paises[COLUMNA_PAIS])
+
+    @classmethod
+    def cargar(cls, session):
+        """
+        Consulta las cuatro tablas de GEOGRAFIA y construye el índice.
+        """
+        return cls(
+            paises=cache.filas_a_dataframe(session.sql(QUERY_PAISES).collect(),
+                                           ['CODIGO_DIAN', 'PAIS_LLAVE_EXPORTACIONES', COLUMNA_CONTINENTE,
+                                            'OFICINA_COMERCIAL_EXPORTACIONES', COLUMNA_HUB, 'TIPO_ACUERDO_EXPORTACIONES',
+                                            COLUMNA_TLC, 'PAIS_INVERSION_BANREP', 'PAIS_CODIGO_TURISMO',
+                                            'NOMBRE_PAIS_CODIGO_TURISMO', COLUMNA_PAIS, 'REGION_NAME_UNSD']),
+            departamentos=cache.filas_a_dataframe(session.sql(QUERY_DEPARTAMENTOS).collect(),
+                                                  ['COD_DIAN_DEPARTAMENTO', 'DEPARTAMENTO_DIAN']),
+            departamentos_municipios=cache.filas_a_dataframe(session.sql(QUERY_DEPARTAMENTOS_MUNICIPIOS).collect(),
+                                                             ['COD_DANE_DEPARTAMENTO', 'DEPARTAMENTO_DANE', 'COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE']),
+            municipios=cache.filas_a_dataframe(session.sql(QUERY_MUNICIPIOS).collect(), ['COD_DANE_MUNICIPIO', 'MUNICIPIO_DANE'])
+        )
+
+    def opciones_paises(self, region=None):
+        """
+        Países (nombre UNSD) de una región UNSD, o todos si no se entrega región.
+        """
+        if region:
+            return list(self._paises_por_region.get(region, []))
+        return list(self._opciones_paises)
+
+    def filas_paises(self, continentes=None, paises=None, hubs=None, tlcs=None):
+        """
+        Filas de PAISES_CORRELATIVA con llave de exportaciones que cumplen los filtros (igual que la consulta de
+        get_data_parametros). El primer filtro se resuelve con el diccionario de miembros y los demás sobre ese resultado.
+
+        Retorna:
+        - DataFrame con las filas en el orden de la tabla.
+        """
+        data = None
+        for columna, valores in [(COLUMNA_CONTINENTE, continentes), (COLUMNA_PAIS, paises), (COLUMNA_HUB, hubs), (COLUMNA_TLC, tlcs)]:
+            if not valores:
+                continue
+            if data is None:
+                grupos = [self._miembros[columna][valor] for valor in valores if valor in self._miembros[columna]]
+                data = pd.concat(grupos).sort_index() if grupos else self.paises_exportaciones.iloc[0:0]
+            else:
+                data = data[data[columna].isin(valores)]
+        return self.paises_exportaciones if data is None else data
+
+    def filas_departamentos(self, departamentos):
+        """
+        Filas de DIAN_DEPARTAMENTOS de los departamentos (nombre DIAN) entregados.
+        """
+        grupos = [self._departamentos[departamento] for departamento in departamentos or [] if departamento in self._departamentos]
+        return pd.concat(grupos).sort_index() if grupos else self.departamentos.iloc[0:0]
+
+    def filas_municipios(self, codigos_departamento):
+        """
+        Filas de DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS de los códigos de departamento entregados.
+        """
+        grupos = [self._municipios[str(codigo)] for codigo in codigos_departamento if str(codigo) in self._municipios]
+        return pd.concat(grupos).sort_index().drop(columns='_COD') if grupos else self.departamentos_municipios.iloc[0:0]
+
+
+# Índice de la versión actual de los datos, compartido por todo el proceso
+_INDICE = cache.MemoPorVersion(lambda session: GeografiaIndex.cargar(session))
+
+
+def obtener_geografia(session, version=None):
+    """
+    Retorna el GeografiaIndex de la versión de los datos, cargándolo solo la primera vez.
+
+    El índice se comparte entre todas las sesiones y reportes del proceso. Cuando la versión de los datos
+    ('Fecha de actualización' de PARAMETROS) cambia, el índice se carga de nuevo y se descarta el de la versión anterior.
+
+    Parámetros:
+    - session: sesión activa (SesionCache, SesionLocal o sesión de Snowpark).
+    - version: (opcional) versión de los datos del reporte; por defecto cache_consultas.version_datos(session).
+
+    Retorna:
+    - GeografiaIndex.
+    """
+    return _INDICE.obtener(session, version)
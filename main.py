@@ -10,6 +10,11 @@ import datos as dat
 import documentos as doc
 # Descarga
 import descarga as desc
+# Cache de consultas
+import cache_consultas as cache
+# Snapshot local
+import os
+import snapshot_local as snap
 
 # Configuración página web
 st.set_page_config(page_title="Documentos Tres Ejes", page_icon = ':bar_chart:', layout="wide",  initial_sidebar_state="expanded")
@@ -21,15 +26,23 @@ def cargar_contraseñas(nombre_archivo):
 cargar_contraseñas(".streamlit/secrets.toml")
 
 # Datos de sesión de Snowflake
-connection = st.connection("snowflake")
-sesion_activa = connection.session()
+# Con TRES_EJES_SNAPSHOT_DIR definido los reportes se generan sobre el snapshot local en Parquet, sin Snowflake
+@st.cache_resource
+def sesion_snowflake():
+    # Los resultados de las consultas se guardan en disco según la versión de los datos. La sesión con cache se crea
+    # una sola vez por proceso: así la versión de datos se reutiliza durante INTERVALO_VERSION entre reruns
+    connection = st.connection("snowflake")
+    return cache.SesionCache(connection.session())
 
-# Limpiar cache
-def limpiar_cache():
-    """
-    Limpia el cache de datos de Streamlit.
-    """
-    st.cache_data.clear()  # Limpia el cache de datos de Streamlit
+@st.cache_resource
+def sesion_snapshot():
+    # Una sola conexión de DuckDB con las vistas del snapshot por proceso (no una nueva en cada rerun)
+    return snap.SesionLocal()
+
+if os.environ.get('TRES_EJES_SNAPSHOT_DIR'):
+    sesion_activa = sesion_snapshot()
+else:
+    sesion_activa = sesion_snowflake()
 
 # Imágenes
 # Aplicación
@@ -40,6 +53,8 @@ banner = 'Insumos/Banner.jpg'
 # Documento
 top_left_img = 'Insumos/doc_top_left.png'
 bottom_right = 'Insumos/doc_bottom_right.png'
+# Plantilla base de los documentos: se construye una sola vez por proceso y cada reporte la copia
+doc.plantilla_base(top_left_img, bottom_right)
 
 
 
@@ -164,7 +179,7 @@ def documentos():
         <h3>Pasos para descargar documentos</h3>
             <p class="indent"><strong>1. Elija el nivel de agrupación del informe que desea:</strong> Seleccione una de las opciones disponibles (Continente, HUB, TLC, País, Colombia, Departamento) para obtener un informe a nivel agregado.</p>
             <p class="indent"><strong>2. Seleccione una opción específica:</strong> Una vez haya elegido el nivel de agrupación, la aplicación le permitirá elegir un continente, HUB, TLC, país o departamento específico según la opción seleccionada en el punto 1.</p>
-            <p class="indent"><strong>3. Espere unos segundos:</strong> La aplicación procesará su solicitud y después de 45 segundos le habilitará tres botones de descarga.</p>
+            <p class="indent"><strong>3. Espere unos segundos:</strong> La aplicación procesará su solicitud, le mostrará el avance de cada etapa y al terminar le habilitará los botones de descarga.</p>
             <p class="indent"><strong>4. Descargue el documento:</strong> Haga clic en el botón correspondiente para descargar el archivo en el formato Word. También puede descargar un archivo Excel con los datos del informe.</p>
     </div>
     <h2>Empiece aquí</h2>
@@ -182,8 +197,7 @@ def documentos():
                                   '**Colombia:** Explore un informe organizado de Colombia.',
                                  '**Departamento:** Explore un informe organizado por departamento.'),
                                 # Aclaración
-                                help = "Seleccione una de las opciones para mostrar el contenido relacionado.",
-                                on_change=limpiar_cache)
+                                help = "Seleccione una de las opciones para mostrar el contenido relacionado.")
 
     # Continente
     if eleccion_usuario == "**Continente:** Explore un informe organizado por continente a nivel mundial.":
@@ -197,16 +211,16 @@ def documentos():
         if continente_elegido:
             # Generar los documentos, registrar el evento de selección y obtener los resultados
             continente_elegido_tuple = tuple([continente_elegido])
-            b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+            artefacto = desc.generar_documentos(
                 agrupacion='CONTINENTES',
                 _sesion_activa=sesion_activa,
                 continentes=continente_elegido_tuple,
                 header_image_left=top_left_img,
                 footer_image=bottom_right)
             # Botones de descarga
-            if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+            if artefacto:
                 # Se generan los botones solo si hay archivos creados
-                desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'CONTINENTES', sesion_activa, continente_elegido)
+                desc.botones_descarga_word_xlsx(artefacto, 'CONTINENTES', sesion_activa, continente_elegido)
                                 
    # HUB
     if eleccion_usuario == "**HUB:** Explore un informe organizado por HUB.":
@@ -220,16 +234,16 @@ def documentos():
         if hub_elegido:
             # Generar los documentos, registrar el evento de selección y obtener los resultados
             hub_elegido_tuple = tuple([hub_elegido])
-            b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+            artefacto = desc.generar_documentos(
                 agrupacion='HUBS',
                 _sesion_activa=sesion_activa,
                 hubs=hub_elegido_tuple,
                 header_image_left=top_left_img,
                 footer_image=bottom_right)
             # Botones de descarga
-            if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+            if artefacto:
                 # Se generan los botones solo si hay archivos creados
-                desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'HUBS', sesion_activa, hub_elegido)
+                desc.botones_descarga_word_xlsx(artefacto, 'HUBS', sesion_activa, hub_elegido)
             
     # TLCS
     if eleccion_usuario == '**TLC:** Explore un informe organizado por Tratado de Libre Comercio.':
@@ -243,16 +257,16 @@ def documentos():
         if tlc_elegido:
             # Generar los documentos, registrar el evento de selección y obtener los resultados
             tlc_elegido_tuple = tuple([tlc_elegido])
-            b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+            artefacto = desc.generar_documentos(
                 agrupacion='TLCS',
                 _sesion_activa=sesion_activa,
                 tlcs=tlc_elegido_tuple,
                 header_image_left=top_left_img,
                 footer_image=bottom_right)
             # Botones de descarga
-            if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+            if artefacto:
                 # Se generan los botones solo si hay archivos creados
-                desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'TLCS', sesion_activa, tlc_elegido)
+                desc.botones_descarga_word_xlsx(artefacto, 'TLCS', sesion_activa, tlc_elegido)
 
     # País
     if eleccion_usuario == "**País:** Explore un informe organizado por país.":
@@ -268,29 +282,29 @@ def documentos():
             if pais_elegido:
                 # Generar los documentos, registrar el evento de selección y obtener los resultados
                 pais_elegido_tuple = tuple([pais_elegido])
-                b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+                artefacto = desc.generar_documentos(
                     agrupacion='PAISES',
                     _sesion_activa=sesion_activa,
                     paises=pais_elegido_tuple,
                     header_image_left=top_left_img,
                     footer_image=bottom_right)
                 # Botones de descarga
-                if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+                if artefacto:
                     # Se generan los botones solo si hay archivos creados
-                    desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'PAISES', sesion_activa, pais_elegido)
+                    desc.botones_descarga_word_xlsx(artefacto, 'PAISES', sesion_activa, pais_elegido)
                     
     # Colombia 
     if eleccion_usuario =="**Colombia:** Explore un informe organizado de Colombia.":
         # Generar los documentos, registrar el evento de selección y obtener los resultados
-            b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+            artefacto = desc.generar_documentos(
                 agrupacion='COLOMBIA',
                 _sesion_activa=sesion_activa,
                 header_image_left=top_left_img,
                 footer_image=bottom_right)
             # Botones de descarga
-            if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+            if artefacto:
                 # Se generan los botones solo si hay archivos creados
-                desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'COLOMBIA', sesion_activa, 'Colombia')
+                desc.botones_descarga_word_xlsx(artefacto, 'COLOMBIA', sesion_activa, 'Colombia')
 
     # Departamento
     if eleccion_usuario == "**Departamento:** Explore un informe organizado por departamento.":
@@ -304,16 +318,16 @@ def documentos():
         if departamento_elegido:
             # Generar los documentos, registrar el evento de selección y obtener los resultados
             departamento_elegido_tuple = tuple([departamento_elegido])
-            b64_docx, b64_xlsx, file_path_docx, file_path_xlsx = desc.generar_documentos(
+            artefacto = desc.generar_documentos(
                 agrupacion='DEPARTAMENTOS',
                 _sesion_activa=sesion_activa,
                 departamentos=departamento_elegido_tuple,
                 header_image_left=top_left_img,
                 footer_image=bottom_right)
             # Botones de descarga
-            if [b64_docx, b64_xlsx, file_path_docx, file_path_xlsx]:
+            if artefacto:
                 # Se generan los botones solo si hay archivos creados
-                desc.botones_descarga_word_xlsx(b64_docx, b64_xlsx, file_path_docx, file_path_xlsx, 'DEPARTAMENTOS', sesion_activa, departamento_elegido)
+                desc.botones_descarga_word_xlsx(artefacto, 'DEPARTAMENTOS', sesion_activa, departamento_elegido)
 
     # Footer
     st.image(image=footer, caption=None, use_column_width="always")
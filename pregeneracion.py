@@ -0,0 +1,176 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# Opciones de los selectores
+import selectores
+# Generación de reportes
+import descarga as desc
+# Versión de los datos y sesión con cache de consultas
+import cache_consultas as cache
+# Almacén de reportes pre-generados
+import almacen_reportes as alm
+# Snapshot local
+import snapshot_local as snap
+
+#########################################################
+# PRE-GENERACIÓN DE TODOS LOS REPORTES
+#########################################################
+# Uso: python pregeneracion.py --almacen /ruta/del/almacen [--snapshot snapshot] [--trabajadores 4]
+# Se programa después de cada actualización de datos (por ejemplo, cada noche): genera el Word y el Excel de cada
+# continente, HUB, TLC, país, departamento y Colombia, y los publica en el almacén de reportes, desde donde la
+# aplicación los sirve sin generarlos. Los reportes que ya están en el almacén para la versión de datos y de
+# plantilla actuales no se vuelven a generar.
+
+# Imágenes del documento (las mismas de main.py)
+top_left_img = 'Insumos/doc_top_left.png'
+bottom_right = 'Insumos/doc_bottom_right.png'
+
+# Agrupación: argumento de construir_artefacto con la unidad
+ARGUMENTOS = {
+    'CONTINENTES': 'continentes',
+    'HUBS': 'hubs',
+    'TLCS': 'tlcs',
+    'PAISES': 'paises',
+    'COLOMBIA': None,
+    'DEPARTAMENTOS': 'departamentos',
+}
+
+
+def combinaciones_reportes(session, agrupaciones=None):
+    """
+    Retorna todas las combinaciones de agrupación y unidad que se pueden elegir en la aplicación.
+
+    Parámetros:
+    - session: sesión activa.
+    - agrupaciones: lista de agrupaciones a incluir (None para todas).
+
+    Retorna:
+    - lista de tuplas (agrupacion, unidad).
+    """
+    opciones = {
+        'CONTINENTES': lambda: selectores.selector_continentes(session),
+        'HUBS': lambda: selectores.selector_hubs(session),
+        'TLCS': lambda: selectores.selector_tlcs(session),
+        'PAISES': lambda: selectores.selector_paises(session, None),
+        'COLOMBIA': lambda: ['Colombia'],
+        'DEPARTAMENTOS': lambda: selectores.selector_departamento(session),
+    }
+    return [(agrupacion, unidad) for agrupacion in (agrupaciones or list(ARGUMENTOS)) for unidad in opciones[agrupacion]()]
+
+
+def pregenerar_reporte(session, almacen, agrupacion, unidad, version, umbral=None):
+    """
+    Genera el Word y el Excel de una combinación y los publica en el almacén.
+
+    Parámetros:
+    - session: sesión activa.
+    - almacen: AlmacenReportes.
+    - agrupacion: 'CONTINENTES', 'HUBS', 'TLCS', 'PAISES', 'COLOMBIA' o 'DEPARTAMENTOS'.
+    - unidad: unidad seleccionada ('Colombia' para COLOMBIA).
+    - version: versión de los datos.
+    - umbral: lista con el umbral de exportaciones (por defecto UMBRAL_PREGENERADO).
+    """
+    umbral = umbral or alm.UMBRAL_PREGENERADO
+    filtros = {'continentes': None, 'paises': None, 'hubs': None, 'tlcs': None, 'departamentos': None}
+    if ARGUMENTOS[agrupacion]:
+        filtros[ARGUMENTOS[agrupacion]] = [unidad]
+    artefacto = desc.construir_artefacto(agrupacion=agrupacion, _sesion_activa=session, umbral=umbral,
+                                         header_image_left=top_left_img, footer_image=bottom_right,
+                                         progreso=lambda porcentaje, texto: None, version=version, **filtros)
+    almacen.guardar(alm.llave_almacen(agrupacion, unidad, umbral, version),
+                    artefacto.docx, artefacto.xlsx, artefacto.nombre_docx, artefacto.nombre_xlsx)
+
+
+def pregenerar(session, almacen=None, agrupaciones=None, trabajadores=4, forzar=False, limpiar=True):
+    """
+    Pre-genera todos los reportes de la versión de datos actual y los publica en el almacén.
+
+    Parámetros:
+    - session: sesión activa.
+    - almacen: AlmacenReportes (por defecto el del proceso).
+    - agrupaciones: lista de agrupaciones a incluir (None para todas).
+    - trabajadores: reportes que se generan al mismo tiempo.
+    - forzar: si es True se vuelven a generar los reportes que ya están en el almacén.
+    - limpiar: si es True se eliminan del almacén los reportes de otras versiones de datos o de plantilla.
+
+    Retorna:
+    - diccionario con la versión, los reportes generados, los que ya existían y los errores (agrupacion, unidad, error).
+    """
+    almacen = almacen or alm.almacen_reportes
+    version = cache.version_datos(session)
+    umbral = alm.UMBRAL_PREGENERADO
+
+    # 1. Combinaciones que faltan en el almacén
+    combinaciones = combinaciones_reportes(session, agrupaciones)
+    pendientes = [(agrupacion, unidad) for agrupacion, unidad in combinaciones
+                  if forzar or not almacen.contiene(alm.llave_almacen(agrupacion, unidad, umbral, version))]
+
+    # 2. Generación en paralelo; un error en un reporte no detiene los demás
+    generados = 0
+    errores = []
+    with ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix='pregeneracion') as pool:
+        futuros = {pool.submit(pregenerar_reporte, session, almacen, agrupacion, unidad, version, umbral): (agrupacion, unidad)
+                   for agrupacion, unidad in pendientes}
+        for futuro in as_completed(futuros):
+            agrupacion, unidad = futuros[futuro]
+            try:
+                futuro.result()
+                generados += 1
+            except Exception as e:
+                errores.append((agrupacion, unidad, e))
+
+    # 3. Reportes de versiones anteriores
+    if limpiar:
+        almacen.limpiar({(version, alm.version_plantilla())})
+
+    return {
+        'VERSION': version,
+        'GENERADOS': generados,
+        'EXISTENTES': len(combinaciones) - len(pendientes),
+        'ERRORES': errores,
+    }
+
+
+def sesion_snowflake():
+    """
+    Crea la sesión de Snowflake con los parámetros de la conexión 'snowflake' de .streamlit/secrets.toml
+    (los mismos que usa st.connection en main.py), con la cache de consultas.
+    """
+    import streamlit as st
+    from snowflake.snowpark import Session
+    return cache.SesionCache(Session.builder.configs(dict(st.secrets['connections']['snowflake'])).create())
+
+
+def main():
+    # 1. Argumentos de la línea de comandos
+    parser = argparse.ArgumentParser(description='Pre-generación de todos los reportes Tres Ejes en el almacén de reportes.')
+    parser.add_argument('--almacen', default=alm.DIRECTORIO_ALMACEN, help='Carpeta del almacén (por defecto TRES_EJES_ALMACEN_DIR).')
+    parser.add_argument('--snapshot', default=None, help='Carpeta de un snapshot local en Parquet en lugar de Snowflake.')
+    parser.add_argument('--agrupaciones', nargs='+', default=list(ARGUMENTOS), choices=list(ARGUMENTOS))
+    parser.add_argument('--trabajadores', type=int, default=4, help='Reportes generados al mismo tiempo.')
+    parser.add_argument('--forzar', action='store_true', help='Volver a generar los reportes que ya están en el almacén.')
+    parser.add_argument('--sin-limpiar', action='store_true', help='Conservar los reportes de versiones anteriores.')
+    args = parser.parse_args()
+    if not args.almacen:
+        parser.error('Indique la carpeta del almacén con --almacen o TRES_EJES_ALMACEN_DIR.')
+
+    # 2. Sesión y generación
+    session = snap.SesionLocal(args.snapshot) if args.snapshot else sesion_snowflake()
+    inicio = time.perf_counter()
+    resultado = pregenerar(session, alm.AlmacenReportes(args.almacen), args.agrupaciones, args.trabajadores,
+                           forzar=args.forzar, limpiar=not args.sin_limpiar)
+
+    # 3. Resultado: código de salida 1 si algún reporte falló
+    print(f"Versión de datos {resultado['VERSION']}, plantilla {alm.version_plantilla()}: "
+          f"{resultado['GENERADOS']} reportes generados y {resultado['EXISTENTES']} existentes "
+          f"en {time.perf_counter() - inicio:.0f} s")
+    for agrupacion, unidad, error in resultado['ERRORES']:
+        print(f'Error en {agrupacion} - {unidad}: {error}')
+    return 1 if resultado['ERRORES'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
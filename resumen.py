@@ -0,0 +1,113 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import numpy as np
+
+#########################################################
+# MODELO COLUMNAR DEL RESUMEN DE LOS TRES EJES
+#########################################################
+
+# Medidas de cada tabla de resumen: valor en T-1, valor en T, variación porcentual y participación en T
+MEDIDAS = ('t_1', 't', 'variacion', 'participacion')
+
+
+class TablaResumen:
+    """
+    Valores de resumen de una tabla (eje y periodo) guardados por columnas.
+
+    Cada medida es un arreglo de NumPy alineado con categorias, y posiciones lleva cada categoría a su fila,
+    por lo que leer un valor es una búsqueda en un diccionario y un índice en un arreglo.
+
+    Atributos:
+    - categorias: arreglo de NumPy con las categorías (o unidades) en el orden en que aparecen por primera vez.
+    - posiciones: diccionario categoría -> fila.
+    - t_1, t, variacion, participacion: arreglos de NumPy con cada medida (None si la tabla no la tiene).
+    """
+    __slots__ = ('categorias', 'posiciones') + MEDIDAS
+
+    def __init__(self, categorias=(), t_1=None, t=None, variacion=None, participacion=None):
+        self.categorias = np.asarray(categorias, dtype=object)
+        self.posiciones = dict(zip(self.categorias.tolist(), range(len(self.categorias))))
+        self.t_1 = t_1
+        self.t = t
+        self.variacion = variacion
+        self.participacion = participacion
+
+    @classmethod
+    def desde_dataframe(cls, df, columna, t_1=None, t=None, variacion=None, participacion=None):
+        """
+        Construye la tabla con las columnas del DataFrame, sin recorrer sus filas.
+        Si una categoría se repite se conserva su primera fila.
+
+        Parámetros:
+        - df: DataFrame con los resultados.
+        - columna: columna con la categoría o unidad.
+        - t_1, t, variacion, participacion: nombre de la columna de cada medida (None si no aplica).
+
+        Retorna:
+        - TablaResumen.
+        """
+        primeras = ~df[columna].duplicated().to_numpy()
+        medidas = {
+            medida: (df[col].to_numpy()[primeras] if col is not None else None)
+            for medida, col in zip(MEDIDAS, (t_1, t, variacion, participacion))
+        }
+        return cls(df[columna].to_numpy(dtype=object)[primeras], **medidas)
+
+    def __contains__(self, categoria):
+        return categoria in self.posiciones
+
+    def __len__(self):
+        return len(self.categorias)
+
+    @property
+    def primera(self):
+        """
+        Primera categoría de la tabla (None si está vacía).
+        """
+        return self.categorias[0] if len(self.categorias) else None
+
+    def valor(self, categoria, medida, defecto=0):
+        """
+        Retorna el valor de una medida para una categoría, o defecto si la categoría o la medida no existen.
+        """
+        valores = getattr(self, medida)
+        fila = self.posiciones.get(categoria)
+        if valores is None or fila is None:
+            return defecto
+        return valores[fila]
+
+    def valores(self, categorias, medida, defecto=0):
+        """
+        Retorna la lista de valores de una medida para varias categorías (defecto para las que no existen).
+        """
+        return [self.valor(categoria, medida, defecto) for categoria in categorias]
+
+
+# Tabla sin categorías: todas sus lecturas retornan el valor por defecto
+_TABLA_VACIA = TablaResumen()
+
+
+class ResumenDatos:
+    """
+    Tablas de resumen de un reporte indexadas por (eje, periodo), por ejemplo ('IED PAISES', 'CERRADO').
+    Reemplaza al diccionario de listas de diccionarios que get_data armaba fila por fila.
+    """
+    __slots__ = ('tablas',)
+
+    def __init__(self):
+        self.tablas = {}
+
+    def agregar(self, eje, periodo, df, columna, **medidas):
+        """
+        Agrega la tabla de un eje y periodo construida con las columnas del DataFrame (ver TablaResumen.desde_dataframe).
+        """
+        self.tablas[(eje, periodo)] = TablaResumen.desde_dataframe(df, columna, **medidas)
+
+    def tabla(self, eje, periodo):
+        """
+        Retorna la tabla de un eje y periodo, o una tabla vacía si no se agregó.
+        """
+        return self.tablas.get((eje, periodo), _TABLA_VACIA)
+
+    def __contains__(self, llave):
+        return llave in self.tablas
@@ -0,0 +1,179 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import shutil
+import duckdb
+import pandas as pd
+
+#########################################################
+# SNAPSHOTS EN PARQUET Y SESIÓN LOCAL SIN SNOWFLAKE
+#########################################################
+
+# Carpeta local donde se guarda el snapshot (una carpeta por esquema y otra por tabla)
+DIRECTORIO_SNAPSHOT = os.environ.get('TRES_EJES_SNAPSHOT_DIR', 'snapshot')
+
+# Base de datos de Snowflake que se replica localmente
+BASE_DATOS = 'DOCUMENTOS_COLOMBIA'
+
+# Tablas que leen los selectores, get_data y los parámetros de los documentos (esquema, tabla)
+TABLAS_SNAPSHOT = [
+    # Exportaciones
+    ('EXPORTACIONES', 'ST_CATEGORIAS_CERRADO'),
+    ('EXPORTACIONES', 'ST_CATEGORIAS_CORRIDO'),
+    ('EXPORTACIONES', 'ST_CATEGORIAS_PESO_CERRADO'),
+    ('EXPORTACIONES', 'ST_CATEGORIAS_PESO_CORRIDO'),
+    ('EXPORTACIONES', 'ST_NIT_CERRADO'),
+    ('EXPORTACIONES', 'ST_NIT_CORRIDO'),
+    ('EXPORTACIONES', 'ST_CONTEO_EMPRESAS_CERRADO'),
+    ('EXPORTACIONES', 'ST_CONTEO_EMPRESAS_CORRIDO'),
+    ('EXPORTACIONES', 'OPORTUNIDADES'),
+    # Inversión
+    ('INVERSION', 'ST_PAISES_CERRADO'),
+    ('INVERSION', 'ST_PAISES_CORRIDO'),
+    ('INVERSION', 'ST_ACTIVIDADES_CERRADO'),
+    ('INVERSION', 'ST_ACTIVIDADES_CORRIDO'),
+    # Turismo
+    ('TURISMO', 'ST_PAISES_CERRADO'),
+    ('TURISMO', 'ST_PAISES_CORRIDO'),
+    ('TURISMO', 'CONECTIVIDAD'),
+    # Geografía
+    ('GEOGRAFIA', 'DIAN_DEPARTAMENTOS'),
+    ('GEOGRAFIA', 'DIVIPOLA_DEPARTAMENTOS_MUNICIPIOS'),
+    ('GEOGRAFIA', 'DIVIPOLA_MUNICIPIOS'),
+    ('GEOGRAFIA', 'PAISES_CORRELATIVA'),
+    # Parámetros
+    ('PARAMETROS', 'PARAMETROS'),
+]
+
+# Columna por la que se particionan las tablas que la tienen: todas las consultas de get_data filtran por ella
+COLUMNA_PARTICION = 'AGRUPACION'
+
+
+def guardar_tabla_snapshot(data, directorio, esquema, tabla):
+    """
+    Guarda un DataFrame como tabla del snapshot en directorio/ESQUEMA/TABLA, reemplazando la versión anterior.
+
+    Parámetros:
+    - data: DataFrame con el contenido de la tabla.
+    - directorio: carpeta raíz del snapshot.
+    - esquema: esquema de DOCUMENTOS_COLOMBIA (EXPORTACIONES, INVERSION, ...).
+    - tabla: nombre de la tabla.
+
+    Retorna:
+    - ruta: carpeta de la tabla.
+    """
+    # 1. Reemplazar el snapshot anterior de la tabla
+    ruta = os.path.join(directorio, esquema, tabla)
+    shutil.rmtree(ruta, ignore_errors=True)
+    os.makedirs(ruta, exist_ok=True)
+
+    # 2. Guardar en Parquet, particionado por AGRUPACION cuando existe la columna
+    if COLUMNA_PARTICION in data.columns and not data.empty:
+        data.to_parquet(ruta, index=False, partition_cols=[COLUMNA_PARTICION])
+    else:
+        data.to_parquet(os.path.join(ruta, 'datos.parquet'), index=False)
+    return ruta
+
+
+def exportar_snapshot(session, directorio=None, tablas=None):
+    """
+    Exporta a Parquet las tablas de DOCUMENTOS_COLOMBIA que usan los reportes.
+
+    Cada tabla se guarda en directorio/ESQUEMA/TABLA. Las tablas con columna AGRUPACION se particionan por ella
+    (AGRUPACION=valor/...) para que la sesión local solo lea la partición consultada. El snapshot anterior de
+    cada tabla se reemplaza completo.
+
+    Parámetros:
+    - session: sesión activa de Snowpark.
+    - directorio: (opcional) carpeta de destino. Por defecto DIRECTORIO_SNAPSHOT.
+    - tablas: (opcional) lista de tuplas (esquema, tabla). Por defecto TABLAS_SNAPSHOT.
+
+    Retorna:
+    - filas: diccionario {'ESQUEMA.TABLA': número de filas exportadas}.
+    """
+    # 1. Definir destino y tablas
+    directorio = directorio or DIRECTORIO_SNAPSHOT
+    tablas = tablas or TABLAS_SNAPSHOT
+
+    filas = {}
+    for esquema, tabla in tablas:
+        # 2. Leer la tabla completa desde Snowflake y guardarla en el snapshot
+        data = session.table(f'{BASE_DATOS}.{esquema}.{tabla}').to_pandas()
+        guardar_tabla_snapshot(data, directorio, esquema, tabla)
+        filas[f'{esquema}.{tabla}'] = len(data)
+
+    return filas
+
+
+class ConsultaLocal:
+    """
+    Resultado de SesionLocal.sql(query) con el método collect() de Snowpark.
+    """
+    def __init__(self, sesion_local, query):
+        self._sesion_local = sesion_local
+        self._query = query
+
+    def collect(self):
+        """
+        Ejecuta la consulta en DuckDB y retorna las filas como diccionarios {columna: valor}.
+        """
+        # Un cursor por consulta: permite ejecutar consultas desde varios hilos (ejecutar_consultas)
+        cursor = self._sesion_local.conexion.cursor()
+        try:
+            cursor.execute(self._query)
+            columnas = [descripcion[0] for descripcion in cursor.description]
+            return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def to_pandas(self):
+        """
+        Ejecuta la consulta en DuckDB y retorna un DataFrame.
+        """
+        return pd.DataFrame(self.collect())
+
+
+class SesionLocal:
+    """
+    Sesión sin conexión a Snowflake que responde sql(query).collect() sobre un snapshot en Parquet.
+
+    Usa DuckDB como motor embebido: la base DOCUMENTOS_COLOMBIA se crea en memoria con un esquema por carpeta del
+    snapshot y una vista por tabla sobre sus archivos Parquet, de modo que las consultas de datos.py y selectores.py
+    se ejecutan sin cambios.
+    """
+    def __init__(self, directorio=None):
+        self.directorio = directorio or DIRECTORIO_SNAPSHOT
+        if not os.path.isdir(self.directorio):
+            raise FileNotFoundError(f"No existe el snapshot en '{self.directorio}'. Ejecute exportar_snapshot primero.")
+
+        # 1. Base de datos en memoria con el mismo nombre que en Snowflake
+        self.conexion = duckdb.connect()
+        self.conexion.execute(f'ATTACH \':memory:\' AS {BASE_DATOS}')
+
+        # 2. Un esquema por carpeta y una vista por tabla
+        for esquema in sorted(os.listdir(self.directorio)):
+            ruta_esquema = os.path.join(self.directorio, esquema)
+            if not os.path.isdir(ruta_esquema):
+                continue
+            self.conexion.execute(f'CREATE SCHEMA IF NOT EXISTS {BASE_DATOS}.{esquema}')
+            for tabla in sorted(os.listdir(ruta_esquema)):
+                ruta_tabla = os.path.join(ruta_esquema, tabla)
+                if not os.path.isdir(ruta_tabla):
+                    continue
+                patron = os.path.join(os.path.abspath(ruta_tabla), '**', '*.parquet').replace("'", "''")
+                self.conexion.execute(f"""
+                    CREATE OR REPLACE VIEW {BASE_DATOS}.{esquema}.{tabla} AS
+                    SELECT * FROM read_parquet('{patron}', hive_partitioning = true, hive_types_autocast = false)
+                """)
+
+    def sql(self, query):
+        """
+        Retorna un objeto con collect() para la consulta, igual que session.sql de Snowpark.
+        """
+        return ConsultaLocal(self, query)
+
+    def close(self):
+        """
+        Cierra la conexión de DuckDB.
+        """
+        self.conexion.close()
@@ -0,0 +1,139 @@
+# Librerias
+# Solo se importan las librerías necesarias.
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+#########################################################
+# COLA DE GENERACIÓN DE REPORTES EN SEGUNDO PLANO
+#########################################################
+
+# Reportes que se generan al mismo tiempo en el proceso
+TRABAJADORES_REPORTES = int(os.environ.get('TRES_EJES_TRABAJADORES', 4))
+# Segundos durante los cuales se conserva un trabajo terminado para que la sesión recoja su resultado
+RETENCION_TRABAJOS = int(os.environ.get('TRES_EJES_RETENCION_TRABAJOS', 600))
+
+# Estados de un trabajo
+EN_COLA = 'EN COLA'
+EN_PROCESO = 'EN PROCESO'
+TERMINADO = 'TERMINADO'
+ERROR = 'ERROR'
+
+
+class TrabajoReporte:
+    """
+    Generación de un reporte en segundo plano.
+
+    Atributos:
+    - id: identificador del trabajo (se guarda en st.session_state para consultarlo en cada rerun).
+    - llave: llave del reporte en cache_reportes.
+    - estado: EN_COLA, EN_PROCESO, TERMINADO o ERROR.
+    - porcentaje: avance entre 0 y 100 publicado por la generación.
+    - etapa: texto de la etapa actual.
+    - artefacto: ArtefactoReporte cuando el estado es TERMINADO.
+    - error: excepción cuando el estado es ERROR.
+    """
+    def __init__(self, llave):
+        self.id = uuid.uuid4().hex
+        self.llave = llave
+        self.estado = EN_COLA
+        self.porcentaje = 0
+        self.etapa = 'En cola, esperando a que termine otro documento.'
+        self.artefacto = None
+        self.error = None
+        self.terminado_en = None
+        self._candado = threading.Lock()
+
+    def progreso(self, porcentaje, texto):
+        """
+        Publica el avance de la generación. El porcentaje nunca retrocede.
+        """
+        with self._candado:
+            self.estado = EN_PROCESO
+            self.porcentaje = max(self.porcentaje, min(100, int(porcentaje)))
+            self.etapa = texto
+
+    def terminar(self, artefacto):
+        with self._candado:
+            self.artefacto = artefacto
+            self.porcentaje = 100
+            self.etapa = 'Proceso terminado'
+            self.estado = TERMINADO
+            self.terminado_en = time.time()
+
+    def fallar(self, error):
+        with self._candado:
+            self.error = error
+            self.estado = ERROR
+            self.terminado_en = time.time()
+
+    @property
+    def terminado(self):
+        return self.estado in (TERMINADO, ERROR)
+
+
+class ColaReportes:
+    """
+    Pool de hilos que genera reportes fuera del hilo del script de Streamlit.
+
+    Cada envío recibe un TrabajoReporte con id, estado y avance que la interfaz consulta periódicamente, de modo
+    que la aplicación sigue respondiendo mientras se generan varios reportes a la vez. Si ya hay un trabajo en cola
+    o en proceso para la misma llave, enviar retorna ese mismo trabajo.
+    """
+    def __init__(self, trabajadores=None, retencion=None):
+        self.retencion = retencion if retencion is not None else RETENCION_TRABAJOS
+        self._pool = ThreadPoolExecutor(max_workers=trabajadores or TRABAJADORES_REPORTES, thread_name_prefix='reporte')
+        self._trabajos = {}
+        self._por_llave = {}
+        self._candado = threading.Lock()
+
+    def enviar(self, llave, generar):
+        """
+        Encola la generación de un reporte.
+
+        Parámetros:
+        - llave: llave del reporte en cache_reportes.
+        - generar: función generar(progreso) que retorna el ArtefactoReporte; progreso(porcentaje, texto) publica el avance.
+
+        Retorna:
+        - trabajo: TrabajoReporte nuevo, o el que ya estaba en curso para la misma llave.
+        """
+        with self._candado:
+            self._limpiar()
+            trabajo = self._por_llave.get(llave)
+            if trabajo is not None and not trabajo.terminado:
+                return trabajo
+            trabajo = TrabajoReporte(llave)
+            self._trabajos[trabajo.id] = trabajo
+            self._por_llave[llave] = trabajo
+        self._pool.submit(self._ejecutar, trabajo, generar)
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        """
+        Retorna el trabajo con el id, o None si no existe o ya se descartó.
+        """
+        with self._candado:
+            return self._trabajos.get(id_trabajo)
+
+    def _ejecutar(self, trabajo, generar):
+        trabajo.progreso(0, 'Generando el documento, por favor espere...')
+        try:
+            trabajo.terminar(generar(trabajo.progreso))
+        except Exception as e:
+            trabajo.fallar(e)
+
+    def _limpiar(self):
+        # Descartar los trabajos terminados hace más de self.retencion segundos
+        limite = time.time() - self.retencion
+        for id_trabajo, trabajo in list(self._trabajos.items()):
+            if trabajo.terminado and trabajo.terminado_en < limite:
+                del self._trabajos[id_trabajo]
+                if self._por_llave.get(trabajo.llave) is trabajo:
+                    del self._por_llave[trabajo.llave]
+
+
+# Cola única del proceso: la comparten todas las sesiones de Streamlit
+cola_reportes = ColaReportes()